@@ -4,6 +4,7 @@
 
 from astropy.tests.pytest_plugins import *
 import os
+import pytest
 from . import version
 
 # Uncomment the following line to treat all DeprecationWarnings as
@@ -30,3 +31,16 @@ except (NameError, KeyError):  # NameError is needed to support Astropy < 1.0
 
 packagename = os.path.basename(os.path.dirname(__file__))
 TESTED_VERSIONS[packagename] = version.version
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _temporary_cache_validation_registry(tmpdir_factory):
+    """ Store the validation results of the catalogs created by the tests
+    in a temporary registry rather than in the Halotools cache directory.
+    """
+    from .sim_manager import cache_log_utils
+    db_fname = tmpdir_factory.mktemp('cache_validation').join('cache_validation_registry.db')
+    cache_log_utils.set_validation_registry(
+        cache_log_utils.CacheValidationRegistry(str(db_fname)))
+    yield
+    cache_log_utils.set_validation_registry(None)
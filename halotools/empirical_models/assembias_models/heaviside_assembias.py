@@ -95,6 +95,11 @@ class HeavisideAssembias(object):
             in the logarithm of the primary halo property,
             rather than linearly. Default is True.
 
+        dlog10_prim_haloprop : float, optional
+            Logarithmic width of the bins of the primary halo property
+            within which the secondary halo property percentiles are computed.
+            Default value is specified in the `~halotools.empirical_models.model_defaults` module.
+
         """
         self._interpret_constructor_inputs(**kwargs)
 
@@ -108,11 +113,13 @@ class HeavisideAssembias(object):
             self.publications = ['arXiv:1512.03050']
 
     def _interpret_constructor_inputs(self, loginterp=True,
-            sec_haloprop_key=model_defaults.sec_haloprop_key, **kwargs):
+            sec_haloprop_key=model_defaults.sec_haloprop_key,
+            dlog10_prim_haloprop=model_defaults.dlog10_prim_haloprop_percentile_bins, **kwargs):
         """
         """
         self._loginterp = loginterp
         self.sec_haloprop_key = sec_haloprop_key
+        self._dlog10_prim_haloprop = dlog10_prim_haloprop
 
         required_attr_list = ['prim_haloprop_key', 'gal_type']
         for attr in required_attr_list:
@@ -355,6 +362,25 @@ class HeavisideAssembias(object):
 
         return result
 
+    @property
+    def conditional_percentile_key(self):
+        """ Tuple (prim_haloprop_key, sec_haloprop_key, dlog10_prim_haloprop)
+        specifying the conditional percentiles used to split the halos.
+
+        Mock factories use this tuple to compute the percentiles once per halo catalog,
+        and store them in the halo table column named by
+        `conditional_percentile_column_name`, which the decorated method then reads
+        instead of recomputing the percentiles at each call.
+        """
+        return (self.prim_haloprop_key, self.sec_haloprop_key, self._dlog10_prim_haloprop)
+
+    @property
+    def conditional_percentile_column_name(self):
+        """ Name of the halo table column storing the percentiles
+        specified by `conditional_percentile_key`.
+        """
+        return '_{1}_percentile_in_{0}_bins_dlog10_{2}'.format(*self.conditional_percentile_key)
+
     def assembias_decorator(self, func):
         """ Primary behavior of the `HeavisideAssembias` class.
 
@@ -452,11 +478,16 @@ class HeavisideAssembias(object):
                 elif self.sec_haloprop_key + '_percentile' in list(table.keys()):
                     no_edge_percentiles = table[self.sec_haloprop_key + '_percentile'][no_edge_mask]
                     type1_mask = no_edge_percentiles > no_edge_split
+                # the value of sec_haloprop_percentile has been cached by the mock factory
+                elif self.conditional_percentile_column_name in list(table.keys()):
+                    no_edge_percentiles = table[self.conditional_percentile_column_name][no_edge_mask]
+                    type1_mask = no_edge_percentiles > no_edge_split
                 else:
                     # the value of sec_haloprop_percentile will be computed from scratch
                     percentiles = compute_conditional_percentiles(
                         prim_haloprop=prim_haloprop,
-                        sec_haloprop=sec_haloprop
+                        sec_haloprop=sec_haloprop,
+                        dlog10_prim_haloprop=self._dlog10_prim_haloprop
                         )
                     no_edge_percentiles = percentiles[no_edge_mask]
                     type1_mask = no_edge_percentiles > no_edge_split
@@ -468,7 +499,8 @@ class HeavisideAssembias(object):
                 except KeyError:
                     percentiles = compute_conditional_percentiles(
                         prim_haloprop=prim_haloprop,
-                        sec_haloprop=sec_haloprop
+                        sec_haloprop=sec_haloprop,
+                        dlog10_prim_haloprop=self._dlog10_prim_haloprop
                         )
                 no_edge_percentiles = percentiles[no_edge_mask]
                 type1_mask = no_edge_percentiles > no_edge_split
@@ -7,12 +7,12 @@ from __future__ import division, print_function, absolute_import
 import numpy as np
 from astropy.extern import six
 from abc import ABCMeta
-from astropy.utils.misc import NumpyRNGContext
 
 from .. import model_defaults
 from .. import model_helpers
 
 from ...utils.array_utils import custom_len
+from ...utils.random_streams import random_state
 from ...custom_exceptions import HalotoolsError
 
 __all__ = ('BinaryGalpropModel', 'BinaryGalpropInterpolModel')
@@ -98,8 +98,7 @@ class BinaryGalpropModel(object):
 
         mean_func = getattr(self, 'mean_'+self.galprop_name+'_fraction')
         mean_galprop_fraction = mean_func(**kwargs)
-        with NumpyRNGContext(seed):
-            mc_generator = np.random.random(custom_len(mean_galprop_fraction))
+        mc_generator = random_state(seed).random_sample(custom_len(mean_galprop_fraction))
         result = np.where(mc_generator < mean_galprop_fraction, True, False)
         if 'table' in kwargs:
             kwargs['table'][self.galprop_name][:] = result
@@ -5,12 +5,12 @@ used to model stochasticity in the mapping between stellar mass and halo propert
 from __future__ import division, print_function, absolute_import, unicode_literals
 
 import numpy as np
-from astropy.utils.misc import NumpyRNGContext
 
 from .. import model_defaults
 from .. import model_helpers as model_helpers
 
 from ...utils.array_utils import custom_len
+from ...utils.random_streams import random_state
 
 
 __all__ = ('LogNormalScatterModel', )
@@ -139,8 +139,7 @@ class LogNormalScatterModel(object):
 
         # only draw from a normal distribution for non-zero values of scatter
         mask = (scatter_scale > 0.0)
-        with NumpyRNGContext(seed):
-            result[mask] = np.random.normal(loc=0, scale=scatter_scale[mask])
+        result[mask] = random_state(seed).normal(loc=0, scale=scatter_scale[mask])
 
         return result
 
@@ -10,3 +10,4 @@ from .model_factory_template import *
 from .hod_model_factory import *
 from .subhalo_model_factory import *
 from .prebuilt_model_factory import *
+from .tabulated_hod_clustering import *
@@ -9,16 +9,20 @@ and Halotools models.
 """
 
 import numpy as np
+import multiprocessing
+from multiprocessing import cpu_count
 from copy import copy
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
 from astropy.table import Table
-from astropy.utils.misc import NumpyRNGContext
 
 from .mock_factory_template import MockFactory
 
-from .. import model_helpers
+from .. import model_helpers, model_defaults
 
 from ...sim_manager import sim_defaults
-from ...utils.table_utils import SampleSelector
+from ...utils.table_utils import SampleSelector, compute_conditional_percentiles
+from ...utils.random_streams import random_state, substream_seed
 from ...custom_exceptions import HalotoolsError
 
 
@@ -33,6 +37,31 @@ missing_halo_upid_msg = ("All HOD-style models populate host halos with mock gal
     "with halo_upid = -1 for host halos and !=-1 for subhalos.\n"
     "The halo catalog you passed to the HodMockFactory does not have the ``halo_upid`` column.\n")
 
+unavailable_galaxy_table_column_msg = ("You requested the ``%s`` column of the ``galaxy_table``\n"
+    "by passing it in the ``galaxy_table_columns`` argument to ``populate``,\n"
+    "but this column is neither a galaxy property modeled by your model\n"
+    "nor a halo property inherited by the galaxies.\n")
+
+pruned_galaxy_table_column_msg = ("The ``%s`` method of your model raised a KeyError\n"
+    "while populating the mock with ``galaxy_table_columns`` = %s:\n%s\n"
+    "Columns of the ``galaxy_table`` that are not needed to compute the requested columns\n"
+    "are not allocated. The column was not identified as a dependency of the method.\n"
+    "Either add the column to ``galaxy_table_columns``, or add its name to the\n"
+    "``list_of_galprops_needed`` attribute of the component model.\n")
+
+# Names of the attributes of component models that store
+# the name of a column of the table they are applied to
+_column_name_attrs = ('prim_haloprop_key', 'sec_haloprop_key', 'halo_boundary_key',
+    'concentration_key', 'sfr_designation_key', 'prim_galprop_key',
+    'conditional_percentile_column_name')
+_column_list_attrs = ('list_of_haloprops_needed', 'list_of_galprops_needed',
+    'prof_param_keys', 'halo_prof_param_keys', 'gal_prof_param_keys')
+
+
+# Mock bound to the module namespace while populating in parallel,
+# so that forked worker processes can access it without pickling
+_mock_to_populate = None
+
 
 class HodMockFactory(MockFactory):
     """ Class responsible for populating a simulation with a
@@ -82,6 +111,12 @@ class HodMockFactory(MockFactory):
             will be thrown out immediately after reading the original halo catalog in memory.
             Default is 'halo_mvir'
 
+        use_buffer_pool : bool, optional
+            If set to True, the columns of the ``galaxy_table`` are views into
+            capacity-sized arrays that are recycled across calls to `populate`.
+            See `~halotools.empirical_models.MockFactory` for details.
+            Default is False.
+
         """
 
         MockFactory.__init__(self, **kwargs)
@@ -173,6 +208,17 @@ class HodMockFactory(MockFactory):
             except KeyError:
                 raise HalotoolsError(unavailable_haloprop_msg % key)
 
+        # Conditional percentiles of the halos, computed once per halo catalog
+        # and keyed by the conditional_percentile_key of assembly-biased components
+        self._conditional_percentiles = {}
+        # Names of the columns of the _orig_halo_table storing these percentiles
+        self._conditional_percentile_columns = set()
+
+        # Halo tables selected by the masking functions passed to populate
+        # with cache_masked_halo_table=True,
+        # dropped when the masking function is garbage-collected
+        self._masked_halo_tables = WeakKeyDictionary()
+
         self.model.build_lookup_tables()
 
     def populate(self, seed=None, **kwargs):
@@ -197,6 +243,14 @@ class HodMockFactory(MockFactory):
             as a fancy indexing mask. All masked halos will be ignored during
             mock population. Default is None.
 
+        cache_masked_halo_table : bool, optional
+            If set to True, the halo table selected by the ``masking_function``
+            is stored the first time the function object is passed, and is reused
+            when the same function is passed again with ``cache_masked_halo_table`` set to True.
+            Only use this option with functions whose mask depends on nothing
+            but the input table. Default is False, in which case
+            the mask is recomputed each time the mock is populated.
+
         enforce_PBC : bool, optional
             If set to True, after galaxy positions are assigned the
             `model_helpers.enforce_periodicity_of_box` will re-map
@@ -210,6 +264,57 @@ class HodMockFactory(MockFactory):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+            Each function in the ``_mock_generation_calling_sequence`` of the model
+            draws from its own random stream, whose seed is derived from ``seed`` and
+            the position of the function in the calling sequence
+            via `~halotools.utils.substream_seed`.
+
+        num_threads : int, optional
+            Number of processes used to populate the mock, where parallelization
+            is performed using the python multiprocessing module by
+            distributing blocks of consecutive halo chunks among the processes
+            (see ``halo_chunk_size``). Can also be the string 'max'.
+            If ``num_threads`` > 1 and ``halo_chunk_size`` is not passed,
+            the ``default_halo_chunk_size`` set in `~halotools.empirical_models.model_defaults`
+            will be used. For a given ``seed`` and ``halo_chunk_size``, the resulting
+            mock is identical for any value of ``num_threads``.
+            Only available on platforms supporting the ``fork`` start method.
+            Default is 1 for a purely serial calculation.
+
+        halo_chunk_size : int, optional
+            If passed, the halo table is partitioned into consecutive chunks of
+            ``halo_chunk_size`` halos, and each function in the
+            calling sequence is applied separately to each chunk (or to the galaxies
+            occupying the halos in the chunk), drawing from a random stream that is
+            labeled by both the calling-sequence position and the chunk index.
+            The resulting mock only depends on ``seed`` and ``halo_chunk_size``,
+            not on the order in which chunks are processed,
+            so that chunks can be populated independently of one another.
+            All component models must then be local to each halo; the conditional
+            percentiles of assembly-biased models are computed for the
+            entire halo table prior to the partitioning.
+            Default is None, in which case the entire halo table is populated at once.
+
+        galaxy_table_columns : list of strings, optional
+            Names of the columns of the ``galaxy_table`` needed by the caller.
+            If passed, only the functions of the calling sequence that compute these
+            columns (or that compute columns they depend upon) are called on the galaxies,
+            and only the host halo properties needed by these functions are inherited
+            by the galaxies, so that all other columns of the ``galaxy_table`` are
+            neither computed nor allocated. The ``gal_type`` column and the
+            phase space coordinates ``x``, ``y``, ``z``, ``vx``, ``vy``, ``vz``
+            are always included. Columns used by a ``galaxy_selection_func``
+            of the model must be included in the list.
+            Functions of the calling sequence called on the halos,
+            including all ``mc_occupation_`` functions, are always called.
+            Default is None, in which case all columns are computed.
+
+            The columns read by each component model are identified from
+            the column names stored in attributes such as ``prim_haloprop_key``
+            and ``list_of_haloprops_needed``. Component models reading additional
+            columns of the ``galaxy_table`` should list them in a
+            ``list_of_galprops_needed`` attribute.
+
         Notes
         -----
         Note the difference between the
@@ -247,8 +352,12 @@ class HodMockFactory(MockFactory):
         catalog is created and the old one
         deleted. However, on certain machines the memory usage was found to
         increase over time. If this is the case and memory usage is critical you
-        can try calling gc.collect() immediately following the call to
-        ``mock.populate`` to manually invoke python's garbage collection.
+        can instead pass ``use_buffer_pool=True`` to
+        `~halotools.empirical_models.ModelFactory.populate_mock`. In this mode,
+        the columns of the ``galaxy_table`` are views into arrays that persist
+        across calls to ``populate`` and only grow when a realization requires more
+        galaxies than ever before, so that memory usage remains flat
+        in long chains of repopulations.
 
         Examples
         ----------
@@ -298,13 +407,220 @@ class HodMockFactory(MockFactory):
         except KeyError:
             self.enforce_PBC = True
 
+        try:
+            self._halo_chunk_size = int(kwargs['halo_chunk_size'])
+        except (KeyError, TypeError):
+            self._halo_chunk_size = None
+        else:
+            if self._halo_chunk_size <= 0:
+                msg = ("\nThe ``halo_chunk_size`` keyword argument of ``populate`` "
+                    "must be a positive integer.\nYou passed ``halo_chunk_size`` = {0}.\n")
+                raise HalotoolsError(msg.format(kwargs['halo_chunk_size']))
+
+        try:
+            cache_masked_halo_table = kwargs['cache_masked_halo_table']
+        except KeyError:
+            cache_masked_halo_table = False
+
         try:
             masking_function = kwargs['masking_function']
-            mask = masking_function(self._orig_halo_table)
-            self.halo_table = self._orig_halo_table[mask]
+            self.halo_table = self._masked_halo_table(masking_function,
+                cache=cache_masked_halo_table)
+            masked = True
         except:
             self.halo_table = self._orig_halo_table
+            masked = False
+
+        self._bind_conditional_percentiles(masked=masked)
+
+        try:
+            galaxy_table_columns = kwargs['galaxy_table_columns']
+        except KeyError:
+            galaxy_table_columns = None
+        self._set_galaxy_table_columns(galaxy_table_columns)
+
+        try:
+            num_threads = kwargs['num_threads']
+        except KeyError:
+            num_threads = 1
+        if num_threads == 'max':
+            num_threads = cpu_count()
+
+        if num_threads == 1:
+            self._first_halo_chunk_index = 0
+            self._populate_galaxy_table(seed=seed)
+        else:
+            if self._halo_chunk_size is None:
+                self._halo_chunk_size = model_defaults.default_halo_chunk_size
+            self._populate_galaxy_table_in_parallel(num_threads, seed=seed)
+
+        if self.enforce_PBC is True:
+            self.galaxy_table['x'][:], self.galaxy_table['vx'][:] = (
+                model_helpers.enforce_periodicity_of_box(
+                    self.galaxy_table['x'], self.Lbox[0],
+                    velocity=self.galaxy_table['vx'],
+                    check_multiple_box_lengths=self._testing_mode)
+                )
+
+            self.galaxy_table['y'][:], self.galaxy_table['vy'][:] = (
+                model_helpers.enforce_periodicity_of_box(
+                    self.galaxy_table['y'], self.Lbox[1],
+                    velocity=self.galaxy_table['vy'],
+                    check_multiple_box_lengths=self._testing_mode)
+                )
+
+            self.galaxy_table['z'][:], self.galaxy_table['vz'][:] = (
+                model_helpers.enforce_periodicity_of_box(
+                    self.galaxy_table['z'], self.Lbox[2],
+                    velocity=self.galaxy_table['vz'],
+                    check_multiple_box_lengths=self._testing_mode)
+                )
+
+        if hasattr(self.model, 'galaxy_selection_func'):
+            mask = self.model.galaxy_selection_func(self.galaxy_table)
+            self.galaxy_table = self.galaxy_table[mask]
+
+    def _masked_halo_table(self, masking_function, cache=False):
+        """ Return the halo table selected by the ``masking_function``.
+        If ``cache`` is True, the result is cached for each function object.
+        """
+        if cache is True:
+            try:
+                return self._masked_halo_tables[masking_function]
+            except (KeyError, TypeError):
+                pass
+
+        mask = masking_function(self._orig_halo_table)
+        masked_halo_table = self._orig_halo_table[mask]
+        # Percentiles of the entire halo table do not apply to the selected halos
+        inherited_percentile_columns = [colname for colname in masked_halo_table.keys()
+            if colname in self._conditional_percentile_columns]
+        masked_halo_table.remove_columns(inherited_percentile_columns)
+        if cache is True:
+            try:
+                self._masked_halo_tables[masking_function] = masked_halo_table
+            except TypeError:
+                # Objects that cannot be weakly referenced are not cached
+                pass
+        return masked_halo_table
+
+    def _bind_conditional_percentiles(self, masked=False):
+        """ Method binds to the ``halo_table`` the conditional percentiles
+        of the secondary halo property required by each assembly-biased component of the model,
+        so that the decorated methods read these percentiles instead of recomputing them
+        each time the mock is populated.
+
+        For an unmasked ``halo_table``, the percentiles are computed only the first time
+        they are needed, and are cached on the mock keyed by the
+        ``conditional_percentile_key`` of the component, i.e., by the primary and
+        secondary halo properties and the binning of the primary halo property.
+        For a ``halo_table`` selected by a ``masking_function``, the percentiles
+        are computed for the selected halos, and are stored in the masked table
+        if it is cached.
+        """
+        for component_model in self.model.model_dictionary.values():
+            try:
+                key = component_model.conditional_percentile_key
+                colname = component_model.conditional_percentile_column_name
+            except AttributeError:
+                continue
+            prim_haloprop_key, sec_haloprop_key, dlog10_prim_haloprop = key
+
+            # Components relying on pre-computed halo types or percentiles do not need the cache
+            if ((sec_haloprop_key + '_percentile' in self.halo_table.keys()) or
+                    hasattr(component_model, 'halo_type_tuple')):
+                continue
+            if masked is True:
+                if colname in self.halo_table.keys():
+                    continue
+                self.halo_table[colname] = compute_conditional_percentiles(
+                    table=self.halo_table, prim_haloprop_key=prim_haloprop_key,
+                    sec_haloprop_key=sec_haloprop_key, dlog10_prim_haloprop=dlog10_prim_haloprop)
+            else:
+                if key not in self._conditional_percentiles:
+                    self._conditional_percentiles[key] = compute_conditional_percentiles(
+                        table=self.halo_table, prim_haloprop_key=prim_haloprop_key,
+                        sec_haloprop_key=sec_haloprop_key, dlog10_prim_haloprop=dlog10_prim_haloprop)
+                if colname not in self.halo_table.keys():
+                    self.halo_table[colname] = self._conditional_percentiles[key]
+                    self._conditional_percentile_columns.add(colname)
+
+    def _set_galaxy_table_columns(self, galaxy_table_columns=None):
+        """ Method determines which functions of the calling sequence
+        need to be called on the galaxies, and which columns need to be allocated
+        in the ``galaxy_table``, to compute the requested ``galaxy_table_columns``.
+
+        The result is bound to the mock in the ``_skipped_methods``
+        and ``_galaxy_table_keys`` attributes, and is cached for each distinct
+        set of requested columns.
+        """
+        if galaxy_table_columns is None:
+            self._galaxy_table_columns = None
+            self._skipped_methods = ()
+            self._galaxy_table_keys = None
+            return
+
+        if isinstance(galaxy_table_columns, str):
+            galaxy_table_columns = [galaxy_table_columns]
+        self._galaxy_table_columns = tuple(sorted(set(galaxy_table_columns)))
+
+        try:
+            cache = self._galaxy_table_columns_cache
+        except AttributeError:
+            cache = self._galaxy_table_columns_cache = {}
+        try:
+            self._skipped_methods, self._galaxy_table_keys = cache[self._galaxy_table_columns]
+            return
+        except KeyError:
+            pass
+
+        # Functions called on the galaxies are those following the mc_occupation functions
+        calling_sequence = self.model._mock_generation_calling_sequence
+        galaxy_methods = [method for method in calling_sequence
+            if 'mc_occupation' not in method]
+        for method in calling_sequence:
+            if 'mc_occupation' in method:
+                break
+            galaxy_methods.remove(method)
 
+        # Identify the component model of each function
+        components = OrderedDict()
+        for method in galaxy_methods:
+            func = getattr(self.model, method)
+            for component_model in self.model.model_dictionary.values():
+                if ((component_model.gal_type == func.gal_type) and
+                        (component_model.feature_name == func.feature_name)):
+                    components.setdefault(id(component_model), [component_model, []])[1].append(method)
+                    break
+
+        required_keys = set(self._galaxy_table_columns)
+        required_keys.update(('gal_type', 'x', 'y', 'z', 'vx', 'vy', 'vz'))
+
+        # Retain each component computing a required column, in which case the columns it
+        # computes and the columns it reads are also required, until no new component is retained
+        retained = set()
+        while True:
+            newly_retained = [key for key, (component_model, methods) in components.items()
+                if (key not in retained) and
+                (required_keys & set(component_model._galprop_dtypes_to_allocate.names))]
+            if len(newly_retained) == 0:
+                break
+            for key in newly_retained:
+                component_model = components[key][0]
+                retained.add(key)
+                required_keys.update(component_model._galprop_dtypes_to_allocate.names)
+                required_keys.update(_columns_read_by_component(component_model))
+
+        skipped_methods = tuple(method for key, (component_model, methods) in components.items()
+            if key not in retained for method in methods)
+        cache[self._galaxy_table_columns] = (skipped_methods, frozenset(required_keys))
+        self._skipped_methods, self._galaxy_table_keys = cache[self._galaxy_table_columns]
+
+    def _populate_galaxy_table(self, seed=None):
+        """ Method calls the entire mock-generation calling sequence of the model
+        on the ``halo_table`` bound to the mock, with the exception of the
+        periodic boundary conditions and the galaxy selection function.
+        """
         self.allocate_memory(seed=seed)
 
         # Loop over all gal_types in the model
@@ -324,15 +640,20 @@ class HodMockFactory(MockFactory):
             # Store all other relevant host halo properties into their
             # appropriate pre-allocated array
             for halocatkey in self.additional_haloprops:
-                self.galaxy_table[halocatkey][gal_type_slice] = np.repeat(
-                    self.halo_table[halocatkey], self._occupation[gal_type], axis=0)
+                if halocatkey in self.galaxy_table.keys():
+                    self.galaxy_table[halocatkey][gal_type_slice] = np.repeat(
+                        self.halo_table[halocatkey], self._occupation[gal_type], axis=0)
 
-        self.galaxy_table['x'] = self.galaxy_table['halo_x']
-        self.galaxy_table['y'] = self.galaxy_table['halo_y']
-        self.galaxy_table['z'] = self.galaxy_table['halo_z']
-        self.galaxy_table['vx'] = self.galaxy_table['halo_vx']
-        self.galaxy_table['vy'] = self.galaxy_table['halo_vy']
-        self.galaxy_table['vz'] = self.galaxy_table['halo_vz']
+            # Host halo positions that were pruned from the galaxy_table
+            # are broadcast directly into the galaxy positions
+            for key in ('x', 'y', 'z', 'vx', 'vy', 'vz'):
+                if 'halo_'+key not in self.galaxy_table.keys():
+                    self.galaxy_table[key][gal_type_slice] = np.repeat(
+                        self.halo_table['halo_'+key], self._occupation[gal_type], axis=0)
+
+        for key in ('x', 'y', 'z', 'vx', 'vy', 'vz'):
+            if 'halo_'+key in self.galaxy_table.keys():
+                self.galaxy_table[key][:] = self.galaxy_table['halo_'+key]
 
         for method in self._remaining_methods_to_call:
             func = getattr(self.model, method)
@@ -340,36 +661,103 @@ class HodMockFactory(MockFactory):
                 d = {key: getattr(self, key) for key in func.additional_kwargs}
             except AttributeError:
                 d = {}
-            gal_type_slice = self._gal_type_indices[func.gal_type]
-            if seed is not None:
-                seed += 1
-            func(table=self.galaxy_table[gal_type_slice], seed=seed, **d)
+            istage = self.model._mock_generation_calling_sequence.index(method)
+            try:
+                if self._halo_chunk_size is None:
+                    gal_type_slice = self._gal_type_indices[func.gal_type]
+                    func(table=self.galaxy_table[gal_type_slice],
+                        seed=substream_seed(seed, istage), **d)
+                else:
+                    galaxy_chunks = self._galaxy_chunk_indices[func.gal_type]
+                    for ichunk, galaxy_chunk in enumerate(galaxy_chunks, self._first_halo_chunk_index):
+                        func(table=self.galaxy_table[galaxy_chunk],
+                            seed=substream_seed(seed, istage, ichunk), **d)
+            except KeyError as err:
+                if self._galaxy_table_keys is None:
+                    raise
+                raise HalotoolsError(pruned_galaxy_table_column_msg %
+                    (method, list(self._galaxy_table_columns), err))
+
+    def _populate_galaxy_table_in_parallel(self, num_threads, seed=None):
+        """ Method partitions the ``halo_table`` into ``num_threads`` blocks of consecutive
+        halo chunks and calls `_populate_galaxy_table` on each block in a separate process.
+
+        Each block is populated with the same random streams as in a serial
+        calculation with the same ``halo_chunk_size``, and the galaxies of each block
+        are concatenated in the same order, so that the result does not depend on ``num_threads``.
+        The worker processes are forked from the current process so that they
+        share the memory of the halo catalog and the model with it.
+        """
+        global _mock_to_populate
 
-        if self.enforce_PBC is True:
-            self.galaxy_table['x'], self.galaxy_table['vx'] = (
-                model_helpers.enforce_periodicity_of_box(
-                    self.galaxy_table['x'], self.Lbox[0],
-                    velocity=self.galaxy_table['vx'],
-                    check_multiple_box_lengths=self._testing_mode)
-                )
+        # An explicit seed is required to give each chunk the same stream
+        # as in a serial calculation, regardless of the process populating it
+        if seed is None:
+            seed = random_state(None).randint(0, np.iinfo(np.int32).max)
 
-            self.galaxy_table['y'], self.galaxy_table['vy'] = (
-                model_helpers.enforce_periodicity_of_box(
-                    self.galaxy_table['y'], self.Lbox[1],
-                    velocity=self.galaxy_table['vy'],
-                    check_multiple_box_lengths=self._testing_mode)
-                )
+        halo_chunk_size = self._halo_chunk_size
+        num_halos = len(self.halo_table)
+        num_chunks = max(1, int(np.ceil(num_halos/float(halo_chunk_size))))
+        chunk_blocks = np.array_split(np.arange(num_chunks), min(num_threads, num_chunks))
+        halo_blocks = [(block[0]*halo_chunk_size, min((block[-1]+1)*halo_chunk_size, num_halos),
+            block[0], seed) for block in chunk_blocks]
 
-            self.galaxy_table['z'], self.galaxy_table['vz'] = (
-                model_helpers.enforce_periodicity_of_box(
-                    self.galaxy_table['z'], self.Lbox[2],
-                    velocity=self.galaxy_table['vz'],
-                    check_multiple_box_lengths=self._testing_mode)
-                )
+        try:
+            context = multiprocessing.get_context('fork')
+        except AttributeError:
+            context = multiprocessing
+        except ValueError:
+            msg = ("Mock population with ``num_threads`` > 1 requires "
+                "the ``fork`` start method of the multiprocessing module,\n"
+                "which is not available on your platform.\n")
+            raise HalotoolsError(msg)
+
+        _mock_to_populate = self
+        pool = context.Pool(num_threads)
+        try:
+            results = pool.map(_populate_halo_block, halo_blocks)
+        finally:
+            pool.close()
+            pool.join()
+            _mock_to_populate = None
 
-        if hasattr(self.model, 'galaxy_selection_func'):
-            mask = self.model.galaxy_selection_func(self.galaxy_table)
-            self.galaxy_table = self.galaxy_table[mask]
+        galaxy_blocks_by_gal_type, halo_columns_by_block, additional_haloprops = zip(*results)
+        self.additional_haloprops = list(additional_haloprops[0])
+
+        # Bind the new halo properties computed by each worker to the halo_table
+        for key in halo_columns_by_block[0].keys():
+            self.halo_table[key] = np.concatenate(
+                [halo_columns[key] for halo_columns in halo_columns_by_block])
+
+        self._occupation = {}
+        self._total_abundance = {}
+        self._gal_type_indices = {}
+        first_galaxy_index = 0
+        for gal_type in self.gal_types:
+            self._occupation[gal_type] = self.halo_table['halo_num_'+gal_type].data
+            self._total_abundance[gal_type] = self._occupation[gal_type].sum()
+            last_galaxy_index = first_galaxy_index + self._total_abundance[gal_type]
+            self._gal_type_indices[gal_type] = slice(first_galaxy_index, last_galaxy_index)
+            first_galaxy_index = last_galaxy_index
+        self.Ngals = first_galaxy_index
+
+        # Concatenate the galaxies of each gal_type in the order of the halo blocks
+        galaxy_blocks = [galaxy_blocks[gal_type] for gal_type in self.gal_types
+            for galaxy_blocks in galaxy_blocks_by_gal_type]
+        keys = galaxy_blocks[0].keys()
+        columns = []
+        for key in keys:
+            dtype = np.result_type(*[block[key].dtype for block in galaxy_blocks])
+            if self.use_buffer_pool is True:
+                column = self._galaxy_table_buffer(key, self.Ngals, dtype)
+            else:
+                column = np.empty(self.Ngals, dtype=dtype)
+            first = 0
+            for block in galaxy_blocks:
+                column[first:first+len(block)] = block[key]
+                first += len(block)
+            columns.append(column)
+        self.galaxy_table = Table(columns, names=keys, copy=False)
 
     def allocate_memory(self, seed=None):
         """ Method allocates the memory for all the numpy arrays
@@ -381,18 +769,37 @@ class HodMockFactory(MockFactory):
 
         """
 
-        self.galaxy_table = Table()
-
         # We will keep track of the calling sequence with a list called _remaining_methods_to_call
         # Each time a function in this list is called, we will remove that function from the list
         # Mock generation will be complete when _remaining_methods_to_call is exhausted
         self._remaining_methods_to_call = copy(self.model._mock_generation_calling_sequence)
 
+        # Functions of the calling sequence that are not needed to compute
+        # the requested galaxy_table_columns are never called
+        try:
+            skipped_methods = self._skipped_methods
+            galaxy_table_keys = self._galaxy_table_keys
+        except AttributeError:
+            skipped_methods, galaxy_table_keys = (), None
+
         # Call all composite model methods that should be called prior to mc_occupation
         # All such function calls must be applied to the table, since we do not yet know
         # how much memory we need for the mock galaxy_table
+        try:
+            halo_chunk_size = self._halo_chunk_size
+        except AttributeError:
+            halo_chunk_size = None
+        if halo_chunk_size is not None:
+            try:
+                first_chunk_index = self._first_halo_chunk_index
+            except AttributeError:
+                first_chunk_index = 0
+            num_halos = len(self.halo_table)
+            halo_chunks = [slice(first, min(first+halo_chunk_size, num_halos))
+                for first in range(0, num_halos, halo_chunk_size)] or [slice(0, 0)]
+
         galprops_assigned_to_halo_table = []
-        for func_name in self.model._mock_generation_calling_sequence:
+        for istage, func_name in enumerate(self.model._mock_generation_calling_sequence):
             if 'mc_occupation' in func_name:
                 # exit when we encounter a ``mc_occupation_`` function
                 break
@@ -402,9 +809,21 @@ class HodMockFactory(MockFactory):
                     d = {key: getattr(self, key) for key in func.additional_kwargs}
                 except AttributeError:
                     d = {}
-                if seed is not None:
-                    seed += 1
-                func(table=self.halo_table, seed=seed, **d)
+                if halo_chunk_size is None:
+                    func(table=self.halo_table, seed=substream_seed(seed, istage), **d)
+                else:
+                    for ichunk, halo_chunk in enumerate(halo_chunks, first_chunk_index):
+                        chunk_table = self.halo_table[halo_chunk]
+                        func(table=chunk_table, seed=substream_seed(seed, istage, ichunk), **d)
+                        # Columns created by func on the chunk are not automatically
+                        # created on the parent halo_table, so copy them back
+                        created_keys = (key for key in func._galprop_dtypes_to_allocate.names
+                            if key in chunk_table.keys())
+                        for key in created_keys:
+                            if key not in self.halo_table.keys():
+                                self.halo_table[key] = np.zeros(len(self.halo_table),
+                                    dtype=chunk_table[key].dtype)
+                            self.halo_table[key][halo_chunk] = chunk_table[key]
                 galprops_assigned_to_halo_table_by_func = func._galprop_dtypes_to_allocate.names
                 galprops_assigned_to_halo_table.extend(galprops_assigned_to_halo_table_by_func)
                 self._remaining_methods_to_call.remove(func_name)
@@ -416,12 +835,16 @@ class HodMockFactory(MockFactory):
         # then all we need to do is append to this list
         galprops_assigned_to_halo_table = list(set(
             galprops_assigned_to_halo_table))
+        self._halo_table_galprop_keys = (
+            [key for key in galprops_assigned_to_halo_table if key in self.halo_table.keys()] +
+            ['halo_num_'+gal_type for gal_type in self.gal_types])
         self.additional_haloprops.extend(galprops_assigned_to_halo_table)
         self.additional_haloprops = list(set(self.additional_haloprops))
 
         self._occupation = {}
         self._total_abundance = {}
         self._gal_type_indices = {}
+        self._galaxy_chunk_indices = {}
 
         for gal_type in self.gal_types:
             self.halo_table['halo_num_'+gal_type] = 0
@@ -430,12 +853,16 @@ class HodMockFactory(MockFactory):
         for gal_type in self.gal_types:
             occupation_func_name = 'mc_occupation_'+gal_type
             occupation_func = getattr(self.model, occupation_func_name)
+            istage = self.model._mock_generation_calling_sequence.index(occupation_func_name)
             # Call the component model to get a Monte Carlo
             # realization of the abundance of gal_type galaxies
-            if seed is not None:
-                seed += 1
-
-            self._occupation[gal_type] = occupation_func(table=self.halo_table, seed=seed)
+            if halo_chunk_size is None:
+                self._occupation[gal_type] = occupation_func(
+                    table=self.halo_table, seed=substream_seed(seed, istage))
+            else:
+                self._occupation[gal_type] = np.concatenate([occupation_func(
+                    table=self.halo_table[halo_chunk], seed=substream_seed(seed, istage, ichunk))
+                    for ichunk, halo_chunk in enumerate(halo_chunks, first_chunk_index)])
             self.halo_table['halo_num_'+gal_type][:] = self._occupation[gal_type]
 
             # Now use the above result to set up the indexing scheme
@@ -447,6 +874,14 @@ class HodMockFactory(MockFactory):
             # which array elements pertain to which gal_type.
             self._gal_type_indices[gal_type] = slice(
                 first_galaxy_index, last_galaxy_index)
+            # When populating in chunks, also keep track of which
+            # array elements pertain to the halos of each chunk
+            if halo_chunk_size is not None:
+                first_galaxy_in_chunk = first_galaxy_index + np.append(0,
+                    np.cumsum(self._occupation[gal_type]))[[c.start for c in halo_chunks]]
+                last_galaxy_in_chunk = np.append(first_galaxy_in_chunk[1:], last_galaxy_index)
+                self._galaxy_chunk_indices[gal_type] = [slice(first, last)
+                    for first, last in zip(first_galaxy_in_chunk, last_galaxy_in_chunk)]
             first_galaxy_index = last_galaxy_index
             # Remove the mc_occupation function from the list of methods to call
             self._remaining_methods_to_call.remove(occupation_func_name)
@@ -456,21 +891,46 @@ class HodMockFactory(MockFactory):
 
         # Allocate memory for all additional halo properties,
         # including profile parameters of the halos such as 'conc_NFWmodel'
+        galaxy_table_dtypes = OrderedDict()
         for halocatkey in self.additional_haloprops:
-            self.galaxy_table[halocatkey] = np.zeros(self.Ngals,
-                dtype=self.halo_table[halocatkey].dtype)
+            galaxy_table_dtypes[halocatkey] = self.halo_table[halocatkey].dtype
 
         # Separately allocate memory for the galaxy profile parameters
         for galcatkey in self.model.halo_prof_param_keys:
-            self.galaxy_table[galcatkey] = 0.
+            galaxy_table_dtypes.setdefault(galcatkey, float)
         for galcatkey in self.model.gal_prof_param_keys:
-            self.galaxy_table[galcatkey] = 0.
+            galaxy_table_dtypes.setdefault(galcatkey, float)
 
-        self.galaxy_table['gal_type'] = np.zeros(self.Ngals, dtype=object)
+        galaxy_table_dtypes.setdefault('gal_type', object)
 
         dt = self.model._galprop_dtypes_to_allocate
         for key in dt.names:
-            self.galaxy_table[key] = np.zeros(self.Ngals, dtype=dt[key].type)
+            galaxy_table_dtypes.setdefault(key, dt[key].type)
+
+        # Galaxies always inherit the phase space coordinates of their host halo,
+        # even if the model has no phase space component
+        for key in ('x', 'y', 'z', 'vx', 'vy', 'vz'):
+            galaxy_table_dtypes.setdefault(key, self.halo_table['halo_'+key].dtype)
+
+        # Only allocate the columns needed to compute the requested galaxy_table_columns
+        if galaxy_table_keys is not None:
+            for key in self._galaxy_table_columns:
+                if key not in galaxy_table_dtypes:
+                    raise HalotoolsError(unavailable_galaxy_table_column_msg % key)
+            galaxy_table_dtypes = OrderedDict((key, dtype)
+                for key, dtype in galaxy_table_dtypes.items() if key in galaxy_table_keys)
+            for method in skipped_methods:
+                self._remaining_methods_to_call.remove(method)
+
+        if self.use_buffer_pool is True:
+            columns = [self._galaxy_table_buffer(key, self.Ngals, galaxy_table_dtypes[key])
+                for key in galaxy_table_dtypes.keys()]
+        else:
+            columns = [np.zeros(self.Ngals, dtype=galaxy_table_dtypes[key])
+                for key in galaxy_table_dtypes.keys()]
+
+        # Bind the newly allocated arrays to the galaxy_table without copying them
+        self.galaxy_table = Table(columns, names=list(galaxy_table_dtypes.keys()), copy=False)
 
     def estimate_ngals(self, seed=None):
         """ Method to estimate the number of galaxies produced by the
@@ -486,13 +946,13 @@ class HodMockFactory(MockFactory):
         # Call all composite model methods that should be called prior to mc_occupation
         # All such function calls must be applied to the table.
         halo_table = np.copy(self.halo_table)
-        for func_name in self.model._mock_generation_calling_sequence:
+        for istage, func_name in enumerate(self.model._mock_generation_calling_sequence):
             if 'mc_occupation' in func_name:
                 # exit when we encounter a ``mc_occupation_`` function
                 break
             else:
                 func = getattr(self.model, func_name)
-                func(table=halo_table)
+                func(table=halo_table, seed=substream_seed(seed, istage))
 
         # Call the component model to get a Monte Carlo
         # realization of the abundance of galaxies for all gal_type.
@@ -500,8 +960,43 @@ class HodMockFactory(MockFactory):
         for gal_type in self.gal_types:
             occupation_func_name = 'mc_occupation_'+gal_type
             occupation_func = getattr(self.model, occupation_func_name)
-            if seed is not None:
-                seed += 1
-            ngals = ngals + np.sum(occupation_func(table=halo_table, seed=seed))
+            istage = self.model._mock_generation_calling_sequence.index(occupation_func_name)
+            ngals = ngals + np.sum(occupation_func(
+                table=halo_table, seed=substream_seed(seed, istage)))
 
         return ngals
+
+
+def _columns_read_by_component(component_model):
+    """ Function returns the names of the table columns
+    stored in the attributes of the input component model.
+    """
+    columns = []
+    for attr in _column_name_attrs:
+        key = getattr(component_model, attr, None)
+        if isinstance(key, str):
+            columns.append(key)
+    for attr in _column_list_attrs:
+        keys = getattr(component_model, attr, None)
+        if keys is not None:
+            columns.extend(key for key in keys if isinstance(key, str))
+    return columns
+
+
+def _populate_halo_block(args):
+    """ Function called by each worker process of
+    `HodMockFactory._populate_galaxy_table_in_parallel`
+    to populate a block of consecutive halo chunks.
+    """
+    first_halo, last_halo, first_chunk_index, seed = args
+
+    mock = _mock_to_populate
+    mock.halo_table = mock.halo_table[first_halo:last_halo]
+    mock._first_halo_chunk_index = first_chunk_index
+    mock.use_buffer_pool = False
+    mock._populate_galaxy_table(seed=seed)
+
+    galaxy_blocks = {gal_type: mock.galaxy_table[mock._gal_type_indices[gal_type]]
+        for gal_type in mock.gal_types}
+    halo_columns = {key: mock.halo_table[key].data for key in mock._halo_table_galprop_keys}
+    return galaxy_blocks, halo_columns, mock.additional_haloprops
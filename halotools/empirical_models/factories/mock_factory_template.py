@@ -51,6 +51,16 @@ class MockFactory(object):
         model : object
             A model built by a sub-class of `~halotools.empirical_models.ModelFactory`.
 
+        use_buffer_pool : bool, optional
+            If set to True, the columns of the ``galaxy_table`` are stored as views
+            into capacity-sized arrays that persist across calls to ``populate``.
+            The buffers grow geometrically whenever a new realization requires more
+            galaxies than the current capacity, so that repeated population
+            proceeds with flat memory usage and without re-allocating every column.
+            Note that in this mode each call to ``populate`` overwrites the
+            memory of the previous ``galaxy_table``, so you should make an explicit
+            copy of any realization you wish to keep. Default is False.
+
         """
 
         required_kwargs = ['model']
@@ -86,6 +96,33 @@ class MockFactory(object):
 
         self.galaxy_table = Table()
 
+        try:
+            self.use_buffer_pool = kwargs['use_buffer_pool']
+        except KeyError:
+            self.use_buffer_pool = False
+        self._galaxy_table_buffers = {}
+
+    def _galaxy_table_buffer(self, key, num_gals, dtype):
+        """ Method returns a zero-initialized, length-``num_gals`` view into the
+        persistent buffer storing the ``key`` column of the ``galaxy_table``.
+
+        The buffer is only re-allocated if its dtype changes or if its capacity
+        is smaller than ``num_gals``, in which case the new capacity is larger than
+        the old one by the ``default_buffer_growth_factor`` set in the
+        `~halotools.empirical_models.model_defaults` module.
+        """
+        dtype = np.dtype(dtype)
+        buf = self._galaxy_table_buffers.get(key, np.empty(0, dtype=dtype))
+        if (buf.dtype != dtype) | (len(buf) < num_gals):
+            growth_factor = model_defaults.default_buffer_growth_factor
+            capacity = max(num_gals, int(growth_factor*len(buf)))
+            buf = np.empty(capacity, dtype=dtype)
+            self._galaxy_table_buffers[key] = buf
+
+        result = buf[:num_gals]
+        result[:] = 0
+        return result
+
     @abstractmethod
     def populate(self, **kwargs):
         """
@@ -138,8 +175,9 @@ class MockFactory(object):
         catalog is created and the old one
         deleted. However, on certain machines the memory usage was found to
         increase over time. If this is the case and memory usage is critical you
-        can try calling gc.collect() immediately following the call to
-        ``mock.populate`` to manually invoke python's garbage collection.
+        can instead pass ``use_buffer_pool=True`` to
+        `~halotools.empirical_models.ModelFactory.populate_mock`, in which case
+        the ``galaxy_table`` columns are recycled between realizations.
 
         Examples
         ----------
@@ -5,7 +5,9 @@ any composite model of the galaxy-halo connection.
 """
 
 import numpy as np
+from collections import OrderedDict
 from astropy.extern import six
+from astropy.table import Table
 from abc import ABCMeta
 
 
@@ -13,6 +15,7 @@ from .. import model_defaults
 
 from ...sim_manager import CachedHaloCatalog, FakeSim
 from ...sim_manager import sim_defaults
+from ...utils.table_utils import SampleSelector, compute_conditional_percentiles
 from ...custom_exceptions import HalotoolsError
 
 __all__ = ['ModelFactory']
@@ -35,6 +38,9 @@ inconsistent_version_name_error_msg = ("Inconsistency between the version_name "
     "already bound to the existing mock = ``%s`` "
     "and the version_name passed as a keyword argument = ``%s``.\n"
     "You should instantiate a new model object if you wish to switch halo catalogs.")
+missing_mean_occupation_msg = ("The expected abundance of galaxies can only be computed for models\n"
+    "with a ``mean_occupation_<gal_type>`` method for every gal_type, \n"
+    "but the ``mean_occupation_%s`` method is not available.")
 
 
 @six.add_metaclass(ABCMeta)
@@ -129,6 +135,13 @@ class ModelFactory(object):
             Default is 'halo_mvir'.
             Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
 
+        use_buffer_pool : bool, optional
+            If set to True, the columns of the ``galaxy_table`` are stored in
+            buffers that are recycled across subsequent calls to ``model.mock.populate``,
+            which keeps memory usage flat over long chains of repopulations.
+            Note that each realization then overwrites the memory of the previous one.
+            Default is False.
+
         masking_function : function, optional
             Function object used to place a mask on the halo table prior to
             calling the mock generating functions. Calling signature of the
@@ -136,6 +149,11 @@ class ModelFactory(object):
             a table, and returning a boolean numpy array that will be used
             as a fancy indexing mask. All masked halos will be ignored during
             mock population. Default is None.
+            For instances of `~halotools.empirical_models.HodModelFactory`,
+            passing ``cache_masked_halo_table=True`` caches the masked halo table
+            for each function object, so that repopulating with the same function
+            does not recompute the mask. To avoid loading masked halos into memory in the first place,
+            see the row cut arguments of `~halotools.sim_manager.CachedHaloCatalog`.
 
         enforce_PBC : bool, optional
             If set to True, after galaxy positions are assigned the
@@ -151,6 +169,26 @@ class ModelFactory(object):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        halo_chunk_size : int, optional
+            If passed, halos are populated in consecutive chunks of ``halo_chunk_size`` halos,
+            each chunk drawing from its own random stream,
+            so that the Monte Carlo realization does not depend on the order in which
+            chunks are processed. Default is None.
+            Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
+
+        num_threads : int, optional
+            Number of processes used to populate the mock
+            using the python multiprocessing module. Default is 1.
+            Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
+
+        galaxy_table_columns : list of strings, optional
+            Names of the columns of the ``galaxy_table`` needed by the caller.
+            If passed, functions of the calling sequence and host halo properties
+            that are not needed to compute these columns are skipped.
+            See `~halotools.empirical_models.HodMockFactory.populate` for details.
+            Default is None, in which case all columns are computed.
+            Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
+
         Notes
         -----
         Note the difference between the
@@ -228,9 +266,14 @@ class ModelFactory(object):
             mock_factory_init_args['halo_mass_column_key'] = kwargs['halo_mass_column_key']
         except KeyError:
             pass
+        try:
+            mock_factory_init_args['use_buffer_pool'] = kwargs['use_buffer_pool']
+        except KeyError:
+            pass
         self.mock = self.mock_factory(**mock_factory_init_args)
 
-        additional_potential_kwargs = ('masking_function', '_testing_mode', 'enforce_PBC', 'seed')
+        additional_potential_kwargs = ('masking_function', 'cache_masked_halo_table', '_testing_mode',
+            'enforce_PBC', 'seed', 'halo_chunk_size', 'num_threads', 'galaxy_table_columns')
         mockpop_keys = set(additional_potential_kwargs) & set(kwargs)
         mockpop_kwargs = {key: kwargs[key] for key in mockpop_keys}
         self.mock.populate(**mockpop_kwargs)
@@ -707,3 +750,248 @@ class ModelFactory(object):
                 rbin_centers, xi_coll[i, :] = self.mock.compute_galaxy_matter_cross_clustering(**kwargs)
             xi = summary_func(xi_coll, axis=0)
             return rbin_centers, xi
+
+    def expected_number_density(self, halocat=None, **kwargs):
+        r"""
+        Comoving number density of galaxies predicted for the current values of the ``param_dict``,
+        computed by summing the ``mean_occupation_<gal_type>`` methods of the model over the
+        halos rather than by counting the galaxies of a Monte Carlo realization.
+
+        Comparing the result to a target number density allows trial parameters to be
+        rejected or tuned before paying for mock population.
+        Any ``galaxy_selection_func`` of the model is ignored.
+
+        Parameters
+        ----------
+        halocat : object, optional
+            Either an instance of `~halotools.sim_manager.CachedHaloCatalog`
+            or `~halotools.sim_manager.UserSuppliedHaloCatalog`.
+            As in `~halotools.empirical_models.HodMockFactory`, only host halos passing
+            the cut on ``halo_mass_column_key`` set by ``Num_ptcl_requirement`` are used,
+            and the selected halo table is cached on the model so that subsequent calls
+            with the same ``halocat`` only evaluate the occupation functions.
+            Default is None, in which case the ``halo_table`` of the mock bound to the model
+            by the most recent call to `populate_mock` is used.
+
+        masking_function : function, optional
+            Function object used to place a mask on the halo table, with the same
+            calling signature as the ``masking_function`` of `populate_mock`. Default is None.
+
+        num_prim_haloprop_bins : int, optional
+            If passed, the halos are histogrammed into ``num_prim_haloprop_bins``
+            logarithmically-spaced bins of the ``prim_haloprop_key`` of the occupation components,
+            and the occupation functions are evaluated once per bin at the mean
+            logarithmic value of the halos in the bin. The cost is then independent
+            of the number of halos, at the price of an error that is second-order in the
+            bin width. Only available for models whose occupation functions
+            depend on a single halo property. Default is None, for an exact sum over all halos.
+
+        Num_ptcl_requirement : int, optional
+            Requirement on the number of dark matter particles in the halo.
+            Ignored when ``halocat`` is None.
+            Default value is set in `~halotools.sim_defaults.Num_ptcl_requirement`.
+
+        halo_mass_column_key : string, optional
+            Column of the halo catalog used in the ``Num_ptcl_requirement`` cut
+            and in `expected_mean_host_mass`. Ignored when ``halocat`` is None.
+            Default is 'halo_mvir'.
+
+        Returns
+        -------
+        number_density : float
+            Comoving number density in units of :math:`(h/Mpc)^{3}`.
+
+        Examples
+        --------
+        >>> from halotools.empirical_models import PrebuiltHodModelFactory
+        >>> from halotools.sim_manager import FakeSim
+        >>> model = PrebuiltHodModelFactory('zheng07')
+        >>> halocat = FakeSim()
+        >>> ngal = model.expected_number_density(halocat)
+        >>> fsat = model.expected_satellite_fraction(halocat)
+
+        After calling `populate_mock`, the halo catalog of the mock is used by default:
+
+        >>> model.populate_mock(halocat)
+        >>> model.param_dict['logMmin'] = 12.5
+        >>> ngal = model.expected_number_density()
+        >>> ngal_approx = model.expected_number_density(num_prim_haloprop_bins=100)
+        """
+        totals, __, volume = self._expected_occupation_sums(halocat, **kwargs)
+        return sum(totals.values())/float(volume)
+
+    def expected_satellite_fraction(self, halocat=None, **kwargs):
+        r"""
+        Fraction of galaxies that are satellites predicted for the current
+        values of the ``param_dict``, where every gal_type other than ``centrals``
+        is treated as a satellite.
+
+        The expected numbers of galaxies are computed from the ``mean_occupation_<gal_type>``
+        methods without populating a mock. See `expected_number_density` for a description
+        of the arguments.
+
+        Returns
+        -------
+        satellite_fraction : float
+        """
+        totals, __, __ = self._expected_occupation_sums(halocat, **kwargs)
+        ngals = sum(totals.values())
+        nsats = sum(totals[gal_type] for gal_type in totals if gal_type != 'centrals')
+        return nsats/float(ngals)
+
+    def expected_mean_host_mass(self, halocat=None, gal_type=None, **kwargs):
+        r"""
+        Mean value of the ``halo_mass_column_key`` of the host halos of the galaxies
+        predicted for the current values of the ``param_dict``, i.e., the halo mass
+        averaged over the halos weighted by their mean occupation.
+
+        The mean occupations are computed from the ``mean_occupation_<gal_type>``
+        methods without populating a mock. See `expected_number_density` for a description
+        of the remaining arguments.
+
+        Parameters
+        ----------
+        gal_type : string, optional
+            If passed, only galaxies of this type are included in the average.
+            Default is None, in which case all galaxies are included.
+
+        Returns
+        -------
+        mean_host_mass : float
+        """
+        totals, mass_weighted_totals, __ = self._expected_occupation_sums(halocat, **kwargs)
+        if gal_type is None:
+            gal_types = list(totals.keys())
+        elif gal_type in totals:
+            gal_types = [gal_type]
+        else:
+            msg = ("Input ``gal_type`` = ``{0}`` is not one of the gal_types {1} of the model")
+            raise HalotoolsError(msg.format(gal_type, list(totals.keys())))
+
+        ngals = sum(totals[key] for key in gal_types)
+        return sum(mass_weighted_totals[key] for key in gal_types)/float(ngals)
+
+    def _expected_occupation_sums(self, halocat=None, masking_function=None,
+            num_prim_haloprop_bins=None, Num_ptcl_requirement=sim_defaults.Num_ptcl_requirement,
+            halo_mass_column_key='halo_mvir'):
+        r""" Expected number of galaxies of each gal_type, the same numbers weighted by
+        the host halo mass, and the comoving volume of the halo catalog.
+        """
+        occupation_funcs = OrderedDict()
+        for gal_type in getattr(self, 'gal_types', []):
+            try:
+                occupation_funcs[gal_type] = getattr(self, 'mean_occupation_' + gal_type)
+            except AttributeError:
+                raise HalotoolsError(missing_mean_occupation_msg % gal_type)
+        if len(occupation_funcs) == 0:
+            raise HalotoolsError(missing_mean_occupation_msg % '<gal_type>')
+
+        if halocat is None:
+            try:
+                halo_table = self.mock.halo_table
+                Lbox = self.mock.Lbox
+                halo_mass_column_key = self.mock.halo_mass_column_key
+            except AttributeError:
+                msg = ("Must either pass a ``halocat`` or first call the ``populate_mock`` method\n"
+                    "to compute the expected abundance of galaxies")
+                raise HalotoolsError(msg)
+        else:
+            halo_table = self._expected_occupation_halo_table(halocat,
+                Num_ptcl_requirement, halo_mass_column_key)
+            Lbox = halocat.Lbox
+
+        if masking_function is not None:
+            halo_table = halo_table[masking_function(halo_table)]
+            self._bind_expected_occupation_percentiles(halo_table, overwrite=True)
+
+        mass = np.asarray(halo_table[halo_mass_column_key], dtype=float)
+        totals, mass_weighted_totals = OrderedDict(), OrderedDict()
+        if num_prim_haloprop_bins is None:
+            for gal_type, func in occupation_funcs.items():
+                mean_occupation = np.asarray(func(table=halo_table), dtype=float)
+                totals[gal_type] = np.sum(mean_occupation)
+                mass_weighted_totals[gal_type] = np.sum(mean_occupation*mass)
+        else:
+            prim_haloprop_key = self._expected_occupation_prim_haloprop_key()
+            log_prim_haloprop = np.log10(np.asarray(halo_table[prim_haloprop_key], dtype=float))
+            num_bins = int(num_prim_haloprop_bins)
+            edges = np.linspace(log_prim_haloprop.min(), log_prim_haloprop.max(), num_bins + 1)
+            ibin = np.clip(np.searchsorted(edges, log_prim_haloprop, side='right') - 1, 0, num_bins - 1)
+            counts = np.bincount(ibin, minlength=num_bins)
+            occupied = counts > 0
+            mean_log_prim_haloprop = np.bincount(ibin, log_prim_haloprop, num_bins)[occupied]/counts[occupied]
+            binned_table = Table({prim_haloprop_key: 10**mean_log_prim_haloprop})
+            binned_mass = np.bincount(ibin, mass, num_bins)[occupied]
+            for gal_type, func in occupation_funcs.items():
+                try:
+                    mean_occupation = np.asarray(func(table=binned_table), dtype=float)
+                except KeyError:
+                    msg = ("The ``num_prim_haloprop_bins`` option is only available for models\n"
+                        "whose occupation functions depend on ``{0}`` alone")
+                    raise HalotoolsError(msg.format(prim_haloprop_key))
+                totals[gal_type] = np.sum(counts[occupied]*mean_occupation)
+                mass_weighted_totals[gal_type] = np.sum(binned_mass*mean_occupation)
+
+        return totals, mass_weighted_totals, np.prod(np.zeros(3) + Lbox)
+
+    def _expected_occupation_halo_table(self, halocat, Num_ptcl_requirement, halo_mass_column_key):
+        r""" Host halos of ``halocat`` passing the completeness cut, including any
+        new halo properties and conditional percentiles required by the model,
+        cached on the model for subsequent calls with the same arguments.
+        """
+        cache_key = (Num_ptcl_requirement, halo_mass_column_key)
+        try:
+            cached_halocat, cached_key, halo_table = self._expected_occupation_cache
+            if (cached_halocat is halocat) & (cached_key == cache_key):
+                return halo_table
+        except AttributeError:
+            pass
+
+        halo_table = SampleSelector.host_halo_selection(table=halocat.halo_table)
+        cutoff = Num_ptcl_requirement*halocat.particle_mass
+        halo_table = halo_table[halo_table[halo_mass_column_key] > cutoff]
+        try:
+            for new_haloprop_key, new_haloprop_func in self.new_haloprop_func_dict.items():
+                halo_table[new_haloprop_key] = new_haloprop_func(table=halo_table)
+        except AttributeError:
+            pass
+        self._bind_expected_occupation_percentiles(halo_table)
+
+        self._expected_occupation_cache = (halocat, cache_key, halo_table)
+        return halo_table
+
+    def _bind_expected_occupation_percentiles(self, halo_table, overwrite=False):
+        r""" Bind to ``halo_table`` the conditional percentiles of the secondary halo property
+        required by each assembly-biased component, as in the mock population.
+        """
+        for component_model in self.model_dictionary.values():
+            try:
+                key = component_model.conditional_percentile_key
+                colname = component_model.conditional_percentile_column_name
+            except AttributeError:
+                continue
+            prim_haloprop_key, sec_haloprop_key, dlog10_prim_haloprop = key
+            if ((sec_haloprop_key + '_percentile' in halo_table.keys()) or
+                    hasattr(component_model, 'halo_type_tuple')):
+                continue
+            if overwrite or (colname not in halo_table.keys()):
+                halo_table[colname] = compute_conditional_percentiles(
+                    table=halo_table, prim_haloprop_key=prim_haloprop_key,
+                    sec_haloprop_key=sec_haloprop_key, dlog10_prim_haloprop=dlog10_prim_haloprop)
+
+    def _expected_occupation_prim_haloprop_key(self):
+        r""" Unique ``prim_haloprop_key`` of the occupation components of the model.
+        """
+        prim_haloprop_keys = set()
+        for component_model in self.model_dictionary.values():
+            if hasattr(component_model, 'mean_occupation'):
+                if hasattr(component_model, 'sec_haloprop_key'):
+                    msg = ("The ``num_prim_haloprop_bins`` option is not available for models\n"
+                        "whose occupation functions depend on a secondary halo property")
+                    raise HalotoolsError(msg)
+                prim_haloprop_keys.add(component_model.prim_haloprop_key)
+        if len(prim_haloprop_keys) != 1:
+            msg = ("The ``num_prim_haloprop_bins`` option requires all occupation components\n"
+                "to share the same ``prim_haloprop_key``")
+            raise HalotoolsError(msg)
+        return prim_haloprop_keys.pop()
@@ -16,6 +16,7 @@ from astropy.table import Table
 from .mock_factory_template import MockFactory
 
 from .. import model_defaults
+from ...utils.random_streams import substream_seed
 from ...custom_exceptions import HalotoolsError
 
 
@@ -58,6 +59,13 @@ class SubhaloMockFactory(MockFactory):
             If set to ``False``, the class will perform all pre-processing tasks
             but will not call the ``model`` to populate the ``galaxy_table``
             with mock galaxies and their observable properties. Default is ``True``.
+
+        use_buffer_pool : bool, optional
+            If set to True, the columns of the ``galaxy_table`` that are computed
+            by the model are recycled across calls to `populate` rather than
+            being re-allocated for every realization.
+            See `~halotools.empirical_models.MockFactory` for details.
+            Default is False.
         """
 
         MockFactory.__init__(self, **kwargs)
@@ -157,6 +165,11 @@ class SubhaloMockFactory(MockFactory):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+            Each function in the ``_mock_generation_calling_sequence`` of the model
+            draws from its own random stream, whose seed is derived from ``seed`` and
+            the position of the function in the calling sequence
+            via `~halotools.utils.substream_seed`.
+
         Notes
         -----
         Note the difference between the
@@ -194,8 +207,10 @@ class SubhaloMockFactory(MockFactory):
         catalog is created and the old one
         deleted. However, on certain machines the memory usage was found to
         increase over time. If this is the case and memory usage is critical you
-        can try calling gc.collect() immediately following the call to
-        ``mock.populate`` to manually invoke python's garbage collection.
+        can instead pass ``use_buffer_pool=True`` to
+        `~halotools.empirical_models.ModelFactory.populate_mock`, in which case
+        the columns of the ``galaxy_table`` computed by the model are
+        recycled between realizations.
 
         Examples
         ----------
@@ -231,18 +246,20 @@ class SubhaloMockFactory(MockFactory):
         """
         self._allocate_memory(seed=seed)
 
-        for method in self.model._mock_generation_calling_sequence:
+        for istage, method in enumerate(self.model._mock_generation_calling_sequence):
             func = getattr(self.model, method)
-            if seed is not None:
-                seed += 1
-            func(table=self.galaxy_table, seed=seed)
+            func(table=self.galaxy_table, seed=substream_seed(seed, istage))
 
         if hasattr(self.model, 'galaxy_selection_func'):
             mask = self.model.galaxy_selection_func(self.galaxy_table)
             self.galaxy_table = self.galaxy_table[mask]
 
     def _allocate_memory(self, seed=None):
-        """
+        """ Method allocates the memory for the ``galaxy_table`` columns
+        that are computed by the model during each call to `populate`.
+
+        When the mock uses a buffer pool, the columns from the previous
+        realization are reused whenever they already have the correct length and dtype.
         """
         Ngals = len(self.galaxy_table)
 
@@ -251,4 +268,11 @@ class SubhaloMockFactory(MockFactory):
 
         for key in new_column_generator:
             dt = self.model._galprop_dtypes_to_allocate[key]
+            if self.use_buffer_pool is True:
+                try:
+                    col = self.galaxy_table[key]
+                    if (col.dtype == dt) & (len(col) == Ngals):
+                        continue
+                except KeyError:
+                    pass
             self.galaxy_table[key] = np.empty(Ngals, dtype=dt)
@@ -0,0 +1,595 @@
+"""
+Module containing the `~halotools.empirical_models.TabulatedHodClustering` class
+used to predict the clustering of HOD-style models without populating mock catalogs.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import numpy as np
+from astropy.table import Table
+
+from ..phase_space_models.analytic_models.satellites.nfw.kernels import nfw_cumulative_mass_PDF
+
+from ...sim_manager import sim_defaults
+from ...utils.table_utils import SampleSelector
+from ...utils.random_streams import random_state
+from ...custom_exceptions import HalotoolsError
+
+try:
+    import h5py
+    _HAS_H5PY = True
+except ImportError:
+    _HAS_H5PY = False
+
+try:
+    from ... import mock_observables
+    HAS_MOCKOBS = True
+except ImportError:
+    HAS_MOCKOBS = False
+
+
+__all__ = ('TabulatedHodClustering', )
+__author__ = ('Andrew Hearin', )
+
+
+class TabulatedHodClustering(object):
+    r""" Class used to predict the galaxy two-point functions :math:`\xi_{\rm gg}(r)`
+    and :math:`w_{\rm p}(r_{\rm p})` of HOD-style models directly from tabulated
+    pair counts of the host halos, without populating a mock.
+
+    In an HOD-style model, centrals sit at the centers of host halos and satellites
+    are distributed according to an NFW profile, so that the expected number of
+    galaxy pairs is a sum over pairs of halos weighted by the mean occupations
+    of the halos, plus a one-halo term from the galaxies sharing a host.
+    Upon instantiation, the host halos are divided into bins of ``prim_haloprop_key``
+    (and optionally of ``sec_haloprop_key``), and the following tables are computed
+    once with the `~halotools.mock_observables.npairs_3d` and
+    `~halotools.mock_observables.npairs_xy_z` pair counters:
+
+    * the pairs between the centers of the halos in every combination of two halo bins;
+    * the pairs between halo centers and satellite tracers, and between two satellite tracers,
+      where each halo carries one tracer randomly drawn from its NFW profile;
+    * the fraction of central-satellite and satellite-satellite pairs of a halo
+      in each separation bin, averaged over the halos in each halo bin,
+      computed from Monte Carlo realizations of NFW profiles tabulated on a grid of concentrations.
+
+    The `tpcf` and `wp` methods then predict the clustering of any
+    `~halotools.empirical_models.HodModelFactory` instance, for any values of its ``param_dict``,
+    by weighting these tables with the mean occupations of the halos in each bin.
+    The cost of a prediction is that of evaluating the mean occupation functions on the halos.
+
+    The prediction is exact in the limit of narrow halo bins for models
+    in which the ``centrals`` are located at the halo center, all other galaxy types
+    are distributed according to the NFW profile of the host halo,
+    and the numbers of centrals and satellites in a halo are independent,
+    with Poisson-distributed satellite occupations.
+    Positions are in real space, and ``pi_max`` is the line-of-sight distance
+    along the z-axis used in the `wp` prediction.
+    """
+
+    def __init__(self, halocat=None, rbins=None, rp_bins=None, pi_max=40.,
+            prim_haloprop_key='halo_mvir', prim_haloprop_bins=20,
+            sec_haloprop_key=None, num_sec_haloprop_bins=1,
+            Num_ptcl_requirement=sim_defaults.Num_ptcl_requirement,
+            concentration_key='halo_nfw_conc', halo_radius_key='halo_rvir',
+            num_profile_draws=int(1e4), num_conc_bins=25, num_threads=1, seed=None, fname=None):
+        """
+        Parameters
+        ----------
+        halocat : object, optional
+            Halo catalog with periodic boundary conditions, e.g., a
+            `~halotools.sim_manager.CachedHaloCatalog` or `~halotools.sim_manager.FakeSim`.
+            Only host halos, i.e., halos with ``halo_upid`` = -1, are used.
+            If ``halocat`` is None, the tables are instead read from ``fname``.
+
+        rbins : array_like, optional
+            Boundaries of the 3-d separation bins of the `tpcf` prediction.
+            Default is None, in which case `tpcf` is unavailable.
+
+        rp_bins : array_like, optional
+            Boundaries of the projected separation bins of the `wp` prediction.
+            Default is None, in which case `wp` is unavailable.
+
+        pi_max : float, optional
+            Maximum line-of-sight separation of the `wp` prediction. Default is 40.
+
+        prim_haloprop_key : string, optional
+            Column of the halo catalog used to bin the halos. Default is ``halo_mvir``.
+
+        prim_haloprop_bins : int or array_like, optional
+            Either the number of logarithmically-spaced bins spanning the range of
+            ``prim_haloprop_key``, or an array of bin boundaries. Halos outside the range of
+            the boundaries are assigned to the first or last bin. Default is 20.
+
+        sec_haloprop_key : string, optional
+            Column of the halo catalog used to further divide each bin of
+            ``prim_haloprop_key`` into ``num_sec_haloprop_bins`` bins of equal numbers
+            of halos, as appropriate for assembly-biased models. Default is None.
+
+        num_sec_haloprop_bins : int, optional
+            Number of bins of ``sec_haloprop_key``. Default is 1.
+
+        Num_ptcl_requirement : int, optional
+            As in `~halotools.empirical_models.HodMockFactory`, halos with
+            ``prim_haloprop_key`` below Num_ptcl_requirement*halocat.particle_mass are discarded.
+
+        concentration_key : string, optional
+            Column storing the NFW concentration of the halos. Default is ``halo_nfw_conc``.
+
+        halo_radius_key : string, optional
+            Column storing the halo boundary in Mpc/h. Default is ``halo_rvir``.
+
+        num_profile_draws : int, optional
+            Number of pairs of points drawn from the NFW profile at each
+            tabulated concentration to compute the one-halo term. Default is 1e4.
+
+        num_conc_bins : int, optional
+            Number of logarithmically-spaced concentrations spanning the range of
+            ``concentration_key`` at which the NFW profile is tabulated.
+            Each halo uses the profile of the nearest tabulated concentration. Default is 25.
+
+        num_threads : int, optional
+            Number of threads used by the pair counters. Default is 1.
+
+        seed : int, optional
+            Random number seed used to draw the satellite tracers. Default is None.
+
+        fname : string, optional
+            Path to an hdf5 file written by `write_to_disk`, from which the tables are
+            read when ``halocat`` is None.
+
+        Examples
+        --------
+        >>> from halotools.sim_manager import FakeSim
+        >>> from halotools.empirical_models import PrebuiltHodModelFactory
+        >>> halocat = FakeSim()
+        >>> rbins = np.logspace(-1, 1, 10)
+        >>> predictor = TabulatedHodClustering(halocat, rbins=rbins, seed=43)
+        >>> model = PrebuiltHodModelFactory('zheng07')
+        >>> xi = predictor.tpcf(model)
+        >>> model.param_dict['logMmin'] = 12.5
+        >>> xi = predictor.tpcf(model)
+
+        The tables can be stored with `write_to_disk` and later reloaded
+        without the halo catalog:
+
+        >>> predictor.write_to_disk('tables.hdf5') # doctest: +SKIP
+        >>> predictor = TabulatedHodClustering(fname='tables.hdf5') # doctest: +SKIP
+        """
+        if not HAS_MOCKOBS:
+            msg = ("The TabulatedHodClustering class requires the mock_observables sub-package")
+            raise HalotoolsError(msg)
+
+        if halocat is None:
+            if fname is None:
+                msg = ("Must pass either ``halocat`` or ``fname`` to TabulatedHodClustering")
+                raise HalotoolsError(msg)
+            self._read_from_disk(fname)
+            return
+
+        if (rbins is None) & (rp_bins is None):
+            msg = ("Must pass at least one of ``rbins`` or ``rp_bins`` to TabulatedHodClustering")
+            raise HalotoolsError(msg)
+        get_bins = mock_observables.mock_observables_helpers.get_separation_bins_array
+        self.rbins = None if rbins is None else get_bins(rbins)
+        self.rp_bins = None if rp_bins is None else get_bins(rp_bins)
+        self.pi_max = float(pi_max)
+        self.prim_haloprop_key = prim_haloprop_key
+        self.sec_haloprop_key = sec_haloprop_key
+
+        try:
+            num_profile_draws = int(num_profile_draws)
+            num_conc_bins = int(num_conc_bins)
+            assert num_profile_draws >= 1
+            assert num_conc_bins >= 1
+        except (TypeError, ValueError, AssertionError):
+            msg = ("Inputs ``num_profile_draws`` and ``num_conc_bins`` must be positive integers")
+            raise HalotoolsError(msg)
+
+        self.Lbox = np.zeros(3) + halocat.Lbox
+        self.halo_table = self._host_halo_table(halocat, Num_ptcl_requirement,
+            concentration_key, halo_radius_key)
+        self.halo_bin, self.num_halo_bins = self._assign_halo_bins(prim_haloprop_bins,
+            num_sec_haloprop_bins)
+
+        conc = np.asarray(self.halo_table[concentration_key], dtype=float)
+        halo_radius = np.asarray(self.halo_table[halo_radius_key], dtype=float)
+        if (self.rp_bins is not None) and (self.pi_max < 2*halo_radius.max()):
+            msg = ("Input ``pi_max`` = {0:.2f} must be at least the diameter {1:.2f} "
+                "of the largest halo".format(self.pi_max, 2*halo_radius.max()))
+            raise HalotoolsError(msg)
+
+        rng = random_state(seed)
+        halo_pos = np.vstack([self.halo_table[key] for key in ('halo_x', 'halo_y', 'halo_z')]).T
+        tracer_offsets = _nfw_offsets(conc, halo_radius, 1, rng)[:, 0, :]
+        tracer_pos = (halo_pos + tracer_offsets) % self.Lbox
+
+        #  Dimensionless central-satellite and satellite-satellite separation vectors
+        #  drawn at each tabulated concentration
+        log_conc = np.log10(conc)
+        conc_grid = np.linspace(log_conc.min(), log_conc.max(), num_conc_bins)
+        conc_index = np.clip(np.round((log_conc - conc_grid[0]) /
+            max(conc_grid[-1] - conc_grid[0], 1e-10)*(num_conc_bins - 1)), 0, num_conc_bins-1)
+        draws = _nfw_offsets(10**conc_grid, np.ones(num_conc_bins), 2*num_profile_draws, rng)
+        cen_sat_vectors = draws[:, :num_profile_draws, :]
+        sat_sat_vectors = draws[:, :num_profile_draws, :] - draws[:, num_profile_draws:, :]
+        profile_samples = (conc_index.astype(int), halo_radius, cen_sat_vectors, sat_sat_vectors)
+
+        self._tables = {}
+        for observable, bins in (('tpcf', self.rbins), ('wp', self.rp_bins)):
+            if bins is not None:
+                self._tables[observable] = self._tabulate(observable, bins,
+                    halo_pos, tracer_pos, tracer_offsets, profile_samples, num_threads)
+
+    def _host_halo_table(self, halocat, Num_ptcl_requirement, concentration_key, halo_radius_key):
+        """ Select the host halos populated by HOD-style models.
+        """
+        halo_table = SampleSelector.host_halo_selection(table=halocat.halo_table)
+        cutoff = Num_ptcl_requirement*halocat.particle_mass
+        halo_table = halo_table[halo_table[self.prim_haloprop_key] > cutoff]
+
+        required_keys = [self.prim_haloprop_key, concentration_key, halo_radius_key,
+            'halo_x', 'halo_y', 'halo_z']
+        if self.sec_haloprop_key is not None:
+            required_keys.append(self.sec_haloprop_key)
+        for key in required_keys:
+            if key not in halo_table.keys():
+                msg = ("The ``{0}`` column required by TabulatedHodClustering "
+                    "does not appear in the halo catalog".format(key))
+                raise HalotoolsError(msg)
+
+        if len(halo_table) == 0:
+            msg = ("No host halos of the halo catalog pass the cut "
+                "``{0}`` > {1:.2e}".format(self.prim_haloprop_key, cutoff))
+            raise HalotoolsError(msg)
+        return halo_table
+
+    def _assign_halo_bins(self, prim_haloprop_bins, num_sec_haloprop_bins):
+        """ Assign each host halo to a bin of ``prim_haloprop_key``,
+        subdivided into ``num_sec_haloprop_bins`` quantiles of ``sec_haloprop_key``.
+        """
+        prim_haloprop = np.asarray(self.halo_table[self.prim_haloprop_key], dtype=float)
+
+        if np.ndim(prim_haloprop_bins) == 0:
+            logmin, logmax = np.log10(prim_haloprop.min()), np.log10(prim_haloprop.max())
+            edges = np.logspace(logmin, logmax + 1e-6, int(prim_haloprop_bins) + 1)
+        else:
+            edges = np.asarray(prim_haloprop_bins, dtype=float)
+        num_prim_bins = len(edges) - 1
+        if num_prim_bins < 1:
+            msg = ("Input ``prim_haloprop_bins`` must define at least one bin")
+            raise HalotoolsError(msg)
+        self.prim_haloprop_bins = edges
+        prim_bin = np.clip(np.searchsorted(edges, prim_haloprop, side='right') - 1,
+            0, num_prim_bins - 1)
+
+        num_sec_bins = int(num_sec_haloprop_bins)
+        if (self.sec_haloprop_key is None) | (num_sec_bins <= 1):
+            self.num_sec_haloprop_bins = 1
+            return prim_bin, num_prim_bins
+
+        #  rank of each halo within its primary bin, ties broken by the input order
+        sec_haloprop = np.asarray(self.halo_table[self.sec_haloprop_key])
+        idx_sorted = np.lexsort((sec_haloprop, prim_bin))
+        counts = np.bincount(prim_bin, minlength=num_prim_bins)
+        starts = np.cumsum(counts) - counts
+        rank = np.empty(len(prim_bin), dtype=int)
+        rank[idx_sorted] = np.arange(len(prim_bin)) - np.repeat(starts, counts)
+        sec_bin = (rank*num_sec_bins) // counts[prim_bin]
+
+        self.num_sec_haloprop_bins = num_sec_bins
+        return prim_bin*num_sec_bins + sec_bin, num_prim_bins*num_sec_bins
+
+    def _tabulate(self, observable, bins, halo_pos, tracer_pos, tracer_offsets,
+            profile_samples, num_threads):
+        """ Tabulate the pair counts between all combinations of halo bins
+        and the one-halo profile terms in the input ``bins``.
+        """
+        nbins = self.num_halo_bins
+        nr = len(bins) - 1
+        members = [np.flatnonzero(self.halo_bin == a) for a in range(nbins)]
+
+        def pair_counts(sample1, sample2):
+            if (len(sample1) == 0) | (len(sample2) == 0):
+                return np.zeros(nr)
+            if observable == 'tpcf':
+                counts = mock_observables.npairs_3d(sample1, sample2, bins, period=self.Lbox,
+                    num_threads=num_threads)
+            else:
+                counts = mock_observables.npairs_xy_z(sample1, sample2, bins, np.array((0., self.pi_max)),
+                    period=self.Lbox, num_threads=num_threads)[:, -1]
+            return np.diff(counts)
+
+        cen_cen = np.zeros((nbins, nbins, nr))
+        cen_sat = np.zeros((nbins, nbins, nr))
+        sat_sat = np.zeros((nbins, nbins, nr))
+        for a in range(nbins):
+            for b in range(nbins):
+                cen_sat[a, b] = pair_counts(halo_pos[members[a]], tracer_pos[members[b]])
+                if b >= a:
+                    cen_cen[a, b] = pair_counts(halo_pos[members[a]], halo_pos[members[b]])
+                    sat_sat[a, b] = pair_counts(tracer_pos[members[a]], tracer_pos[members[b]])
+                    cen_cen[b, a] = cen_cen[a, b]
+                    sat_sat[b, a] = sat_sat[a, b]
+
+        #  Remove the pair of each halo center with its own tracer
+        own_pairs = _separation_histogram(tracer_offsets, bins, observable, self.pi_max)
+        cen_sat[np.arange(nbins), np.arange(nbins)] -= _bin_sum(own_pairs, self.halo_bin, nbins)
+
+        #  Average fraction of one-halo pairs per separation bin
+        conc_index, halo_radius, cen_sat_vectors, sat_sat_vectors = profile_samples
+        cen_sat_profile = _profile_fractions(cen_sat_vectors, conc_index, halo_radius,
+            bins, observable)
+        sat_sat_profile = _profile_fractions(sat_sat_vectors, conc_index, halo_radius,
+            bins, observable)
+
+        num_halos = np.bincount(self.halo_bin, minlength=nbins).astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            one_halo_cen_sat = _bin_sum(cen_sat_profile, self.halo_bin, nbins)/num_halos[:, None]
+            one_halo_sat_sat = _bin_sum(sat_sat_profile, self.halo_bin, nbins)/num_halos[:, None]
+
+        return {'cen_cen': cen_cen, 'cen_sat': cen_sat, 'sat_sat': sat_sat,
+            'one_halo_cen_sat': np.nan_to_num(one_halo_cen_sat),
+            'one_halo_sat_sat': np.nan_to_num(one_halo_sat_sat)}
+
+    def mean_occupations(self, model):
+        """ Mean number of centrals and satellites in each host halo
+        for the current values of ``model.param_dict``.
+
+        Parameters
+        ----------
+        model : object
+            Instance of `~halotools.empirical_models.HodModelFactory`.
+            The ``centrals`` galaxy type is located at the halo center,
+            and all other galaxy types are treated as satellites.
+
+        Returns
+        -------
+        ncen, nsat : ndarrays
+            Arrays of shape (num_halos, ) storing the mean occupations.
+        """
+        try:
+            gal_types = model.gal_types
+        except AttributeError:
+            msg = ("TabulatedHodClustering requires an instance of HodModelFactory")
+            raise HalotoolsError(msg)
+
+        try:
+            for new_haloprop_key, new_haloprop_func in model.new_haloprop_func_dict.items():
+                if new_haloprop_key not in self.halo_table.keys():
+                    self.halo_table[new_haloprop_key] = new_haloprop_func(table=self.halo_table)
+        except AttributeError:
+            pass
+
+        ncen = np.zeros(len(self.halo_table))
+        nsat = np.zeros(len(self.halo_table))
+        for gal_type in gal_types:
+            func = getattr(model, 'mean_occupation_' + gal_type)
+            mean_occupation = np.asarray(func(table=self.halo_table), dtype=float)
+            if gal_type == 'centrals':
+                ncen += mean_occupation
+            else:
+                nsat += mean_occupation
+        return ncen, nsat
+
+    def number_density(self, model):
+        """ Comoving number density of galaxies in units of :math:`(h/Mpc)^{3}`
+        predicted for the current values of ``model.param_dict``.
+        """
+        ncen, nsat = self.mean_occupations(model)
+        return (ncen.sum() + nsat.sum())/np.prod(self.Lbox)
+
+    def tpcf(self, model):
+        r""" Predict the galaxy correlation function :math:`\xi_{\rm gg}(r)` in the ``rbins``
+        for the current values of ``model.param_dict``, as would be computed by
+        `~halotools.mock_observables.tpcf` with the ``Natural`` estimator on a mock.
+
+        Parameters
+        ----------
+        model : object
+            Instance of `~halotools.empirical_models.HodModelFactory`.
+
+        Returns
+        -------
+        xi : ndarray
+            Array of shape (len(rbins)-1, ).
+        """
+        if 'tpcf' not in self._tables:
+            msg = ("The ``rbins`` argument must be passed to TabulatedHodClustering "
+                "to predict the tpcf")
+            raise HalotoolsError(msg)
+        dd, ngals = self._galaxy_pair_counts(model, self._tables['tpcf'])
+        dv = 4*np.pi*np.diff(self.rbins**3)/3.
+        rr = ngals*ngals*dv/np.prod(self.Lbox)
+        return dd/rr - 1.
+
+    def wp(self, model):
+        r""" Predict the projected correlation function :math:`w_{\rm p}(r_{\rm p})`
+        in the ``rp_bins`` for the current values of ``model.param_dict``,
+        as would be computed by `~halotools.mock_observables.wp` with the ``Natural``
+        estimator on a mock, using the z-axis as the line-of-sight.
+
+        Parameters
+        ----------
+        model : object
+            Instance of `~halotools.empirical_models.HodModelFactory`.
+
+        Returns
+        -------
+        wp : ndarray
+            Array of shape (len(rp_bins)-1, ).
+        """
+        if 'wp' not in self._tables:
+            msg = ("The ``rp_bins`` argument must be passed to TabulatedHodClustering "
+                "to predict wp")
+            raise HalotoolsError(msg)
+        dd, ngals = self._galaxy_pair_counts(model, self._tables['wp'])
+        dv = np.pi*np.diff(self.rp_bins**2)*2*self.pi_max
+        rr = ngals*ngals*dv/np.prod(self.Lbox)
+        return 2*self.pi_max*(dd/rr - 1.)
+
+    def _galaxy_pair_counts(self, model, tables):
+        """ Expected number of ordered galaxy pairs in each separation bin,
+        together with the expected number of galaxies.
+        """
+        ncen, nsat = self.mean_occupations(model)
+        nbins = self.num_halo_bins
+        num_halos = np.bincount(self.halo_bin, minlength=nbins)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_ncen = np.nan_to_num(np.bincount(self.halo_bin, ncen, nbins)/num_halos)
+            mean_nsat = np.nan_to_num(np.bincount(self.halo_bin, nsat, nbins)/num_halos)
+
+        two_halo = (np.einsum('a,b,abr->r', mean_ncen, mean_ncen, tables['cen_cen']) +
+            2*np.einsum('a,b,abr->r', mean_ncen, mean_nsat, tables['cen_sat']) +
+            np.einsum('a,b,abr->r', mean_nsat, mean_nsat, tables['sat_sat']))
+
+        #  Ordered pairs sharing a host: 2<Ncen><Nsat> cen-sat and <Nsat>^2 sat-sat pairs
+        one_halo = (2*np.dot(np.bincount(self.halo_bin, ncen*nsat, nbins), tables['one_halo_cen_sat']) +
+            np.dot(np.bincount(self.halo_bin, nsat*nsat, nbins), tables['one_halo_sat_sat']))
+
+        return two_halo + one_halo, ncen.sum() + nsat.sum()
+
+    def write_to_disk(self, fname, overwrite=False):
+        """ Store the tables and the host halo catalog in an hdf5 file
+        that can be passed to the ``fname`` argument of the constructor.
+
+        Parameters
+        ----------
+        fname : string
+            Path to the hdf5 file.
+
+        overwrite : bool, optional
+            If False, an existing file at ``fname`` raises an exception. Default is False.
+        """
+        if not _HAS_H5PY:
+            msg = ("Must have h5py installed to use the write_to_disk method")
+            raise HalotoolsError(msg)
+        if os.path.isfile(fname) & (not overwrite):
+            msg = ("The file {0} already exists. \n"
+                "Set ``overwrite`` to True to replace it".format(fname))
+            raise HalotoolsError(msg)
+
+        with h5py.File(fname, 'w') as f:
+            f.attrs['pi_max'] = self.pi_max
+            f.attrs['prim_haloprop_key'] = self.prim_haloprop_key
+            f.attrs['sec_haloprop_key'] = '' if self.sec_haloprop_key is None else self.sec_haloprop_key
+            f.attrs['num_sec_haloprop_bins'] = self.num_sec_haloprop_bins
+            f.attrs['num_halo_bins'] = self.num_halo_bins
+            f['Lbox'] = self.Lbox
+            f['prim_haloprop_bins'] = self.prim_haloprop_bins
+            f['halo_bin'] = self.halo_bin
+            for key in ('rbins', 'rp_bins'):
+                if getattr(self, key) is not None:
+                    f[key] = getattr(self, key)
+            for observable, tables in self._tables.items():
+                for key, table in tables.items():
+                    f[observable + '/' + key] = table
+            for key in self.halo_table.keys():
+                f['halo_table/' + key] = np.asarray(self.halo_table[key])
+
+    def _read_from_disk(self, fname):
+        if not _HAS_H5PY:
+            msg = ("Must have h5py installed to read TabulatedHodClustering tables from disk")
+            raise HalotoolsError(msg)
+        if not os.path.isfile(fname):
+            msg = ("The file {0} does not exist".format(fname))
+            raise HalotoolsError(msg)
+
+        def as_str(s):
+            return s.decode() if isinstance(s, bytes) else str(s)
+
+        with h5py.File(fname, 'r') as f:
+            self.pi_max = float(f.attrs['pi_max'])
+            self.prim_haloprop_key = as_str(f.attrs['prim_haloprop_key'])
+            self.sec_haloprop_key = as_str(f.attrs['sec_haloprop_key']) or None
+            self.num_sec_haloprop_bins = int(f.attrs['num_sec_haloprop_bins'])
+            self.num_halo_bins = int(f.attrs['num_halo_bins'])
+            self.Lbox = f['Lbox'][...]
+            self.prim_haloprop_bins = f['prim_haloprop_bins'][...]
+            self.halo_bin = f['halo_bin'][...]
+            self.rbins = f['rbins'][...] if 'rbins' in f else None
+            self.rp_bins = f['rp_bins'][...] if 'rp_bins' in f else None
+            self._tables = {}
+            for observable in ('tpcf', 'wp'):
+                if observable in f:
+                    self._tables[observable] = {key: f[observable][key][...]
+                        for key in f[observable].keys()}
+            self.halo_table = Table()
+            for key in f['halo_table'].keys():
+                self.halo_table[key] = f['halo_table'][key][...]
+
+
+def _nfw_offsets(conc, halo_radius, num_draws, seed):
+    """ Halo-centric positions of ``num_draws`` points drawn from the NFW profile of each halo,
+    returned as an array of shape (num_halos, num_draws, 3).
+    The ``seed`` may also be a `numpy.random.RandomState` instance.
+    """
+    conc = np.asarray(conc, dtype=float)[:, None]
+    halo_radius = np.asarray(halo_radius, dtype=float)[:, None]
+    shape = (len(conc), num_draws)
+
+    rng = random_state(seed)
+    u = rng.uniform(0, 1, shape)
+    cos_t = rng.uniform(-1, 1, shape)
+    phi = rng.uniform(0, 2*np.pi, shape)
+
+    #  Inverse transform sampling of the cumulative mass PDF by bisection
+    low, high = np.zeros(shape), np.ones(shape)
+    for __ in range(40):
+        mid = 0.5*(low + high)
+        below = nfw_cumulative_mass_PDF(mid, conc) < u
+        low = np.where(below, mid, low)
+        high = np.where(below, high, mid)
+    r = 0.5*(low + high)*halo_radius
+
+    sin_t = np.sqrt(1 - cos_t**2)
+    return np.stack((r*sin_t*np.cos(phi), r*sin_t*np.sin(phi), r*cos_t), axis=-1)
+
+
+def _separation(vectors, observable):
+    if observable == 'tpcf':
+        return np.sqrt(np.sum(vectors**2, axis=-1))
+    else:
+        return np.sqrt(vectors[..., 0]**2 + vectors[..., 1]**2)
+
+
+def _separation_histogram(offsets, bins, observable, pi_max):
+    """ Indicator of the bin of the separation vector of each halo,
+    returned as an array of shape (num_halos, len(bins)-1).
+    """
+    s = _separation(offsets, observable)
+    inside = np.ones_like(s, dtype=bool)
+    if observable == 'wp':
+        inside = np.abs(offsets[:, 2]) <= pi_max
+    #  pairs with s exactly on a bin boundary belong to the lower bin, as in the pair counters
+    idx = np.searchsorted(bins, s, side='left') - 1
+    inside &= (idx >= 0) & (idx < len(bins) - 1)
+
+    nr = len(bins) - 1
+    result = np.zeros((len(s), nr))
+    result[np.flatnonzero(inside), idx[inside]] = 1
+    return result
+
+
+def _profile_fractions(vectors, conc_index, halo_radius, bins, observable):
+    """ Fraction of the dimensionless separation ``vectors`` tabulated at the concentration
+    of each halo falling in each bin, returned as an array of shape (num_halos, len(bins)-1).
+    One-halo separations never exceed the halo diameter, which is required to be
+    less than ``pi_max``, so that the line-of-sight separation is irrelevant.
+    """
+    result = np.zeros((len(conc_index), len(bins) - 1))
+    for i in np.unique(conc_index):
+        mask = conc_index == i
+        s = np.sort(_separation(vectors[i], observable))
+        scaled_bins = bins[None, :]/halo_radius[mask][:, None]
+        cumulative = np.searchsorted(s, scaled_bins, side='right')/float(len(s))
+        result[mask] = np.diff(cumulative, axis=1)
+    return result
+
+
+def _bin_sum(per_halo, halo_bin, nbins):
+    """ Sum the rows of ``per_halo`` belonging to each halo bin.
+    """
+    result = np.zeros((nbins, per_halo.shape[1]))
+    np.add.at(result, halo_bin, per_halo)
+    return result
@@ -6,12 +6,15 @@ import pytest
 from astropy.config.paths import _find_home
 import numpy as np
 from copy import deepcopy
+from astropy.utils.misc import NumpyRNGContext
+from astropy.table import Table
 
 from ....mock_observables import return_xyz_formatted_array, tpcf_one_two_halo_decomp
 
 from ....sim_manager import FakeSim, CachedHaloCatalog
 from ....sim_manager.fake_sim import FakeSimHalosNearBoundaries
 from ..prebuilt_model_factory import PrebuiltHodModelFactory
+from ....utils.table_utils import compute_conditional_percentiles
 from ....custom_exceptions import HalotoolsError
 
 # Determine whether the machine is mine
@@ -97,6 +100,49 @@ def test_mock_population_mask():
     assert np.any(model.mock.galaxy_table['halo_x'] < 100)
 
 
+def test_cached_mock_population_mask():
+    """ Verify that the halo table selected by a masking_function
+    is only computed the first time the function is passed
+    with cache_masked_halo_table set to True.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-22)
+    halocat = FakeSim()
+
+    calls = []
+
+    def f150z(t):
+        calls.append(1)
+        return t['halo_z'] > 150
+
+    model.populate_mock(halocat, masking_function=f150z,
+        cache_masked_halo_table=True, seed=fixed_seed)
+    masked_halo_table = model.mock.halo_table
+    assert np.all(masked_halo_table['halo_z'] > 150)
+
+    model.mock.populate(masking_function=f150z, cache_masked_halo_table=True, seed=fixed_seed)
+    assert model.mock.halo_table is masked_halo_table
+    assert len(calls) == 1
+
+    model.mock.populate(seed=fixed_seed)
+    assert model.mock.halo_table is model.mock._orig_halo_table
+
+    model.mock.populate(masking_function=lambda t: t['halo_z'] < 150, seed=fixed_seed)
+    assert np.all(model.mock.galaxy_table['halo_z'] < 150)
+    assert len(calls) == 1
+
+    # By default the mask is recomputed, so it may depend on outside state
+    zmin = [100]
+
+    def fzmin(t):
+        return t['halo_z'] > zmin[0]
+
+    model.mock.populate(masking_function=fzmin, seed=fixed_seed)
+    assert np.any(model.mock.halo_table['halo_z'] < 200)
+    zmin[0] = 200
+    model.mock.populate(masking_function=fzmin, seed=fixed_seed)
+    assert np.all(model.mock.halo_table['halo_z'] > 200)
+
+
 def test_mock_population_pbcs():
     """ Verify that periodic boundary conditions are being properly applied
     to satellites, and that they are never applied to centrals.
@@ -197,6 +243,214 @@ def test_deterministic_mock_making():
             pass
 
 
+def test_buffer_pool_mock_making():
+    """ Verify that populating a mock with recycled galaxy_table buffers gives
+    the same result as the default allocation scheme, and that the buffers
+    persist and grow across repeated calls to populate.
+    """
+    halocat = FakeSim(seed=fixed_seed)
+
+    model = PrebuiltHodModelFactory('zheng07', threshold=-21)
+    model.populate_mock(halocat, seed=fixed_seed)
+    h1 = deepcopy(model.mock.galaxy_table)
+
+    model2 = PrebuiltHodModelFactory('zheng07', threshold=-21)
+    model2.populate_mock(halocat, seed=fixed_seed, use_buffer_pool=True)
+    h2 = model2.mock.galaxy_table
+
+    assert len(h1) == len(h2)
+    assert set(h1.keys()) == set(h2.keys())
+    for key in h1.keys():
+        assert np.all(h1[key] == h2[key])
+
+    xbuf = model2.mock._galaxy_table_buffers['x']
+    assert np.shares_memory(xbuf, model2.mock.galaxy_table['x'])
+
+    model2.param_dict['logMmin'] -= 1
+    model2.mock.populate(seed=fixed_seed)
+    assert len(model2.mock.galaxy_table) > len(h1)
+    xbuf2 = model2.mock._galaxy_table_buffers['x']
+    assert len(xbuf2) >= len(model2.mock.galaxy_table)
+    assert np.shares_memory(xbuf2, model2.mock.galaxy_table['x'])
+
+    model2.param_dict['logMmin'] += 1
+    model2.mock.populate(seed=fixed_seed)
+    assert model2.mock._galaxy_table_buffers['x'] is xbuf2
+    for key in h1.keys():
+        assert np.all(h1[key] == model2.mock.galaxy_table[key])
+
+
+def test_halo_chunked_mock_making():
+    """ Verify that halo-chunked mock population is deterministic
+    for a given seed and chunk size, and that seeded population
+    leaves the global state of numpy.random untouched.
+    """
+    halocat = FakeSim(seed=fixed_seed)
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+
+    model.populate_mock(halocat, seed=fixed_seed, halo_chunk_size=1000)
+    h1 = deepcopy(model.mock.galaxy_table)
+    model.mock.populate(seed=fixed_seed, halo_chunk_size=1000)
+    h2 = model.mock.galaxy_table
+    assert len(h1) == len(h2)
+    for key in h1.keys():
+        assert np.all(h1[key] == h2[key])
+
+    model.mock.populate(seed=fixed_seed, halo_chunk_size=333)
+    h3 = model.mock.galaxy_table
+    assert np.any(h1['x'][:len(h3)] != h3['x'][:len(h1)])
+
+    with NumpyRNGContext(fixed_seed):
+        model.mock.populate(seed=fixed_seed+1, halo_chunk_size=1000)
+        x = np.random.random(10)
+    with NumpyRNGContext(fixed_seed):
+        y = np.random.random(10)
+    assert np.all(x == y)
+
+    # Unseeded population leaves the global state of numpy.random untouched as well
+    with NumpyRNGContext(fixed_seed):
+        model.mock.populate(halo_chunk_size=1000)
+        x = np.random.random(10)
+    assert np.all(x == y)
+
+    for halo_chunk_size in (0, -1000):
+        with pytest.raises(HalotoolsError) as err:
+            model.mock.populate(seed=fixed_seed, halo_chunk_size=halo_chunk_size)
+        substr = "must be a positive integer"
+        assert substr in err.value.args[0]
+
+
+def test_halo_chunked_mock_making_sfr_designation():
+    """ Verify that the halo-table columns created by functions called
+    prior to mc_occupation are propagated when populating in chunks.
+    """
+    halocat = FakeSim(seed=fixed_seed)
+    model = PrebuiltHodModelFactory('tinker13')
+    model.populate_mock(halocat, seed=fixed_seed, halo_chunk_size=500)
+    sfr_designation = model.mock.galaxy_table['central_sfr_designation']
+    assert set(sfr_designation) == set(('quiescent', 'active'))
+
+
+def test_parallel_mock_making():
+    """ Verify that populating a mock with multiple processes gives
+    the same galaxies as a serial calculation with the same seed and chunk size.
+    """
+    halocat = FakeSim(seed=fixed_seed)
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+
+    model.populate_mock(halocat, seed=fixed_seed, halo_chunk_size=300)
+    h1 = deepcopy(model.mock.galaxy_table)
+    model.mock.populate(seed=fixed_seed, halo_chunk_size=300, num_threads=2)
+    h2 = model.mock.galaxy_table
+    assert len(h1) == len(h2) == model.mock.Ngals
+    assert set(h1.keys()) == set(h2.keys())
+    for key in h1.keys():
+        assert np.all(h1[key] == h2[key])
+    assert np.all(model.mock.halo_table['halo_num_centrals'] ==
+        model.mock._occupation['centrals'])
+
+
+def test_parallel_mock_making_sfr_designation():
+    """ Verify that the halo-table columns created by functions called
+    prior to mc_occupation are propagated when populating in parallel.
+    """
+    halocat = FakeSim(seed=fixed_seed)
+    model = PrebuiltHodModelFactory('tinker13')
+    model.populate_mock(halocat, seed=fixed_seed, halo_chunk_size=500)
+    sfr_designation1 = np.copy(model.mock.halo_table['central_sfr_designation'])
+    model.mock.populate(seed=fixed_seed, halo_chunk_size=500, num_threads=3)
+    sfr_designation2 = model.mock.halo_table['central_sfr_designation']
+    assert np.all(sfr_designation1 == sfr_designation2)
+
+
+def test_cached_conditional_percentiles():
+    """ Verify that the conditional percentiles of assembly-biased models are
+    computed once per halo catalog, and that they reproduce the
+    percentiles computed from scratch by the decorated methods.
+    """
+    halocat = FakeSim(seed=fixed_seed)
+    model = PrebuiltHodModelFactory('hearin15')
+    model.populate_mock(halocat, seed=fixed_seed)
+
+    cens = model.model_dictionary['centrals_occupation']
+    key = cens.conditional_percentile_key
+    colname = cens.conditional_percentile_column_name
+    assert list(model.mock._conditional_percentiles.keys()) == [key]
+    cached_percentiles = model.mock._conditional_percentiles[key]
+    assert np.all(model.mock.halo_table[colname] == cached_percentiles)
+
+    model.mock.populate(seed=fixed_seed)
+    assert model.mock._conditional_percentiles[key] is cached_percentiles
+
+    halo_table = model.mock.halo_table
+    uncached_halo_table = Table([halo_table[key] for key in halo_table.keys() if key != colname])
+    assert np.allclose(cens.mean_occupation(table=halo_table),
+        cens.mean_occupation(table=uncached_halo_table))
+
+
+def test_masked_conditional_percentiles():
+    """ Verify that the conditional percentiles bound to a masked halo table
+    are computed from the selected halos, even after an unmasked population
+    has bound the percentiles of the entire halo table.
+    """
+    halocat = FakeSim(seed=fixed_seed)
+    model = PrebuiltHodModelFactory('hearin15', threshold=10.5)
+    model.populate_mock(halocat, seed=fixed_seed)
+
+    cens = model.model_dictionary['centrals_occupation']
+    prim_haloprop_key, sec_haloprop_key, dlog10_prim_haloprop = cens.conditional_percentile_key
+    colname = cens.conditional_percentile_column_name
+    assert colname in model.mock._orig_halo_table.keys()
+
+    model.mock.populate(masking_function=lambda t: t['halo_z'] > 150, seed=fixed_seed)
+    halo_table = model.mock.halo_table
+    correct_percentiles = compute_conditional_percentiles(table=halo_table,
+        prim_haloprop_key=prim_haloprop_key, sec_haloprop_key=sec_haloprop_key,
+        dlog10_prim_haloprop=dlog10_prim_haloprop)
+    assert np.all(halo_table[colname] == correct_percentiles)
+
+
+def test_galaxy_table_columns():
+    """ Verify that pruning the galaxy_table to the requested columns
+    reproduces the corresponding columns of the full mock.
+    """
+    halocat = FakeSim(seed=fixed_seed)
+    model = PrebuiltHodModelFactory('tinker13')
+    model.populate_mock(halocat, seed=fixed_seed)
+    full_galaxy_table = deepcopy(model.mock.galaxy_table)
+
+    model.mock.populate(seed=fixed_seed, galaxy_table_columns=['halo_mvir'])
+    galaxy_table = model.mock.galaxy_table
+    assert set(('gal_type', 'x', 'y', 'z', 'vx', 'vy', 'vz', 'halo_mvir')) <= set(galaxy_table.keys())
+    assert 'halo_upid' not in galaxy_table.keys()
+    assert 'sfr_designation' not in galaxy_table.keys()
+    assert 'mc_sfr_designation_quiescent_satellites' in model.mock._skipped_methods
+    for key in galaxy_table.keys():
+        assert np.all(galaxy_table[key] == full_galaxy_table[key])
+
+    #  requesting a galaxy property retains the component modeling it
+    model.mock.populate(seed=fixed_seed, galaxy_table_columns=['sfr_designation'])
+    galaxy_table = model.mock.galaxy_table
+    assert len(model.mock._skipped_methods) == 0
+    assert np.all(galaxy_table['sfr_designation'] == full_galaxy_table['sfr_designation'])
+
+    model.mock.populate(seed=fixed_seed, halo_chunk_size=500, num_threads=2,
+        galaxy_table_columns=['halo_mvir'])
+    assert 'halo_upid' not in model.mock.galaxy_table.keys()
+
+    model.mock.populate(seed=fixed_seed)
+    assert set(model.mock.galaxy_table.keys()) == set(full_galaxy_table.keys())
+
+
+def test_galaxy_table_columns_bad_column():
+    halocat = FakeSim(seed=fixed_seed)
+    model = PrebuiltHodModelFactory('zheng07')
+    with pytest.raises(HalotoolsError) as err:
+        model.populate_mock(halocat, galaxy_table_columns=['stellar_mass'])
+    substr = "requested the ``stellar_mass`` column"
+    assert substr in err.value.args[0]
+
+
 def test_zero_satellite_edge_case():
 
     model = PrebuiltHodModelFactory('zheng07', threshold=-18)
@@ -6,6 +6,7 @@ import pytest
 
 import numpy as np
 from copy import deepcopy
+from astropy.utils.misc import NumpyRNGContext
 
 from ...factories import HodModelFactory, PrebuiltHodModelFactory
 
@@ -265,3 +266,76 @@ def test_raises_appropriate_exception8():
         model.set_model_redshift()
     substr = "Inconsistency between the redshifts of the component models"
     assert substr in err.value.args[0]
+
+
+def test_expected_number_density_agrees_with_mocks():
+    """ Verify that the expected abundance of galaxies computed from the mean occupations
+    agrees with the average over Monte Carlo realizations.
+    """
+    model = PrebuiltHodModelFactory('zheng07')
+    halocat = FakeSim()
+    ngal = model.expected_number_density(halocat)
+    fsat = model.expected_satellite_fraction(halocat)
+    mhost_sats = model.expected_mean_host_mass(halocat, gal_type='satellites')
+
+    model.populate_mock(halocat, seed=43)
+    assert np.isclose(model.expected_number_density(), ngal)
+
+    num_mocks = 10
+    ngal_mocks, fsat_mocks, mhost_sats_mocks = np.zeros((3, num_mocks))
+    for i in range(num_mocks):
+        model.mock.populate(seed=43 + i)
+        gals = model.mock.galaxy_table
+        ngal_mocks[i] = model.mock.number_density
+        fsat_mocks[i] = model.mock.satellite_fraction
+        mhost_sats_mocks[i] = np.mean(gals['halo_mvir'][gals['gal_type'] == 'satellites'])
+    assert np.allclose(ngal, np.mean(ngal_mocks), rtol=0.01)
+    assert np.allclose(fsat, np.mean(fsat_mocks), rtol=0.01)
+    assert np.allclose(mhost_sats, np.mean(mhost_sats_mocks), rtol=0.01)
+
+    mask_func = lambda t: t['halo_mvir'] > 1e13
+    model.mock.populate(seed=43, masking_function=mask_func)
+    assert not np.isclose(model.expected_number_density(), ngal)
+    assert np.isclose(model.expected_number_density(halocat, masking_function=mask_func),
+        model.expected_number_density())
+
+
+def test_expected_number_density_binned():
+    model = PrebuiltHodModelFactory('zheng07')
+    halocat = FakeSim(seed=43)
+    with NumpyRNGContext(43):
+        halocat.halo_table['halo_mvir'] *= 10**np.random.uniform(-0.5, 0.5, len(halocat.halo_table))
+
+    ngal = model.expected_number_density(halocat)
+    ngal_binned = model.expected_number_density(halocat, num_prim_haloprop_bins=200)
+    assert np.allclose(ngal, ngal_binned, rtol=1e-3)
+    mhost = model.expected_mean_host_mass(halocat)
+    mhost_binned = model.expected_mean_host_mass(halocat, num_prim_haloprop_bins=200)
+    assert np.allclose(mhost, mhost_binned, rtol=1e-3)
+
+    #  the selected halo table is cached for repeated calls with the same halocat
+    halo_table = model._expected_occupation_cache[2]
+    model.param_dict['logMmin'] += 0.5
+    assert model.expected_number_density(halocat) < ngal
+    assert model._expected_occupation_cache[2] is halo_table
+
+
+def test_expected_number_density_raises_appropriate_exceptions():
+    model = PrebuiltHodModelFactory('zheng07')
+    with pytest.raises(HalotoolsError) as err:
+        __ = model.expected_number_density()
+    substr = "Must either pass a ``halocat`` or first call the ``populate_mock`` method"
+    assert substr in err.value.args[0]
+
+    halocat = FakeSim()
+    with pytest.raises(HalotoolsError) as err:
+        __ = model.expected_mean_host_mass(halocat, gal_type='orphans')
+    substr = "is not one of the gal_types"
+    assert substr in err.value.args[0]
+
+    model = PrebuiltHodModelFactory('hearin15')
+    __ = model.expected_number_density(halocat)
+    with pytest.raises(HalotoolsError) as err:
+        __ = model.expected_number_density(halocat, num_prim_haloprop_bins=20)
+    substr = "depend on a secondary halo property"
+    assert substr in err.value.args[0]
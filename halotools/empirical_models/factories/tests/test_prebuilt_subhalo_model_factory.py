@@ -47,6 +47,21 @@ def test_fake_mock_population():
         model2.populate_mock(halocat)
 
 
+def test_buffer_pool_mock_population():
+    """ Verify that the model-computed columns of a subhalo-based mock
+    are recycled across repopulations when using a buffer pool.
+    """
+    halocat = FakeSim()
+    model = PrebuiltSubhaloModelFactory('behroozi10')
+    model.populate_mock(halocat, seed=43, use_buffer_pool=True)
+    sm1 = np.copy(model.mock.galaxy_table['stellar_mass'])
+    col = model.mock.galaxy_table['stellar_mass']
+
+    model.mock.populate(seed=43)
+    assert model.mock.galaxy_table['stellar_mass'] is col
+    assert np.all(model.mock.galaxy_table['stellar_mass'] == sm1)
+
+
 @pytest.mark.slow
 def test_fake_mock_observations1():
     for modelname in PrebuiltSubhaloModelFactory.prebuilt_model_nickname_list:
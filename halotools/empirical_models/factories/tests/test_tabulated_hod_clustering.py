@@ -0,0 +1,131 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import numpy as np
+import pytest
+
+from ..tabulated_hod_clustering import TabulatedHodClustering
+from ..hod_model_factory import HodModelFactory
+from ..prebuilt_model_factory import PrebuiltHodModelFactory
+from ...occupation_models import Zheng07Cens
+from ...phase_space_models import TrivialPhaseSpace
+
+from ....sim_manager import FakeSim
+from ....mock_observables import tpcf, wp, return_xyz_formatted_array
+from ....custom_exceptions import HalotoolsError
+
+__all__ = ('test_tabulated_hod_clustering_centrals_only', )
+
+fixed_seed = 43
+
+
+def test_tabulated_hod_clustering_centrals_only():
+    """ When every host halo hosts exactly one central and no satellites,
+    the prediction reduces to the clustering of the host halos themselves.
+    """
+    halocat = FakeSim()
+    rbins = np.logspace(-1, 1.2, 8)
+    rp_bins = np.logspace(-1, 1.2, 6)
+    predictor = TabulatedHodClustering(halocat, rbins=rbins, rp_bins=rp_bins,
+        pi_max=20., seed=fixed_seed)
+
+    model = HodModelFactory(centrals_occupation=Zheng07Cens(),
+        centrals_profile=TrivialPhaseSpace())
+    model.param_dict['logMmin'] = 0.
+    ncen, nsat = predictor.mean_occupations(model)
+    assert np.allclose(ncen, 1)
+    assert np.all(nsat == 0)
+
+    halos = predictor.halo_table
+    pos = return_xyz_formatted_array(halos['halo_x'], halos['halo_y'], halos['halo_z'])
+    assert np.allclose(predictor.tpcf(model), tpcf(pos, rbins, period=halocat.Lbox))
+    assert np.allclose(predictor.wp(model), wp(pos, rp_bins, 20., period=halocat.Lbox))
+    assert np.isclose(predictor.number_density(model), len(halos)/np.prod(halocat.Lbox))
+
+
+def test_tabulated_hod_clustering_mock_agreement():
+    """ Compare the prediction to the clustering of mocks averaged over several realizations
+    in the separation bins dominated by pairs of galaxies sharing a host halo.
+    """
+    halocat = FakeSim()
+    rbins = np.logspace(-1, 0, 5)
+    predictor = TabulatedHodClustering(halocat, rbins=rbins, seed=fixed_seed)
+
+    model = PrebuiltHodModelFactory('zheng07', threshold=-20)
+    model.param_dict['logM1'] = 13.5
+    xi_pred = predictor.tpcf(model)
+
+    num_mocks = 3
+    xi_mocks = np.zeros((num_mocks, len(rbins)-1))
+    ngals = np.zeros(num_mocks)
+    for i in range(num_mocks):
+        model.populate_mock(halocat, seed=fixed_seed + i)
+        gals = model.mock.galaxy_table
+        pos = return_xyz_formatted_array(gals['x'], gals['y'], gals['z'])
+        xi_mocks[i] = tpcf(pos, rbins, period=halocat.Lbox)
+        ngals[i] = len(gals)
+
+    assert np.allclose(predictor.number_density(model), np.mean(ngals)/np.prod(halocat.Lbox), rtol=0.02)
+    assert np.allclose(xi_pred, np.mean(xi_mocks, axis=0), rtol=0.1)
+
+
+def test_tabulated_hod_clustering_secondary_bins():
+    halocat = FakeSim()
+    predictor = TabulatedHodClustering(halocat, rbins=np.logspace(-1, 1, 5),
+        prim_haloprop_bins=10, sec_haloprop_key='halo_nfw_conc', num_sec_haloprop_bins=2,
+        seed=fixed_seed)
+    assert predictor.num_halo_bins == 20
+
+    #  each primary bin is split into two halves ordered by concentration
+    prim_bin, sec_bin = predictor.halo_bin // 2, predictor.halo_bin % 2
+    conc = predictor.halo_table['halo_nfw_conc']
+    for ibin in np.unique(prim_bin):
+        mask = prim_bin == ibin
+        counts = np.bincount(sec_bin[mask], minlength=2)
+        assert abs(counts[0] - counts[1]) <= 1
+        if np.all(counts > 0):
+            assert conc[mask & (sec_bin == 0)].max() <= conc[mask & (sec_bin == 1)].min()
+
+    model = PrebuiltHodModelFactory('zheng07')
+    assert np.all(np.isfinite(predictor.tpcf(model)))
+
+
+def test_tabulated_hod_clustering_write_to_disk(tmpdir):
+    halocat = FakeSim()
+    predictor = TabulatedHodClustering(halocat, rbins=np.logspace(-1, 1, 5),
+        rp_bins=np.logspace(-1, 1, 4), seed=fixed_seed)
+    model = PrebuiltHodModelFactory('zheng07')
+
+    fname = os.path.join(str(tmpdir), 'tabulated_hod_clustering.hdf5')
+    predictor.write_to_disk(fname)
+    predictor2 = TabulatedHodClustering(fname=fname)
+    assert np.allclose(predictor.tpcf(model), predictor2.tpcf(model))
+    assert np.allclose(predictor.wp(model), predictor2.wp(model))
+    assert np.allclose(predictor.number_density(model), predictor2.number_density(model))
+
+    with pytest.raises(HalotoolsError) as err:
+        predictor.write_to_disk(fname)
+    substr = "already exists"
+    assert substr in err.value.args[0]
+
+
+def test_tabulated_hod_clustering_bad_args():
+    halocat = FakeSim()
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = TabulatedHodClustering(halocat)
+    substr = "Must pass at least one of ``rbins`` or ``rp_bins``"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = TabulatedHodClustering(halocat, rp_bins=np.logspace(-1, 1, 5), pi_max=0.1)
+    substr = "must be at least the diameter"
+    assert substr in err.value.args[0]
+
+    predictor = TabulatedHodClustering(halocat, rbins=np.logspace(-1, 1, 5), seed=fixed_seed)
+    with pytest.raises(HalotoolsError) as err:
+        __ = predictor.wp(PrebuiltHodModelFactory('zheng07'))
+    substr = "The ``rp_bins`` argument must be passed"
+    assert substr in err.value.args[0]
@@ -34,8 +34,21 @@ default_haloprop_list_inherited_by_mock = (
 prim_haloprop_key = 'halo_mvir'
 sec_haloprop_key = 'halo_nfw_conc'
 
+# Logarithmic width of the bins of the primary halo property
+# in which assembly-biased models compute secondary property percentiles
+dlog10_prim_haloprop_percentile_bins = 0.05
+
 halo_mass_definition = 'vir'
 
+# Factor by which the persistent galaxy_table buffers of a mock
+# grow whenever a new realization exceeds their current capacity.
+# Only relevant for mocks populated with ``use_buffer_pool=True``.
+default_buffer_growth_factor = 1.5
+
+# Number of halos per chunk used when populating mocks in parallel
+# without explicitly passing a ``halo_chunk_size``
+default_halo_chunk_size = int(1e5)
+
 
 def get_halo_boundary_key(mdef):
     """ For the input mass definition,
@@ -15,7 +15,8 @@ from ..custom_exceptions import HalotoolsError
 __all__ = ('solve_for_polynomial_coefficients', 'polynomial_from_table',
      'enforce_periodicity_of_box', 'custom_spline', 'create_composite_dtype',
      'bind_default_kwarg_mixin_safe',
-     'custom_incomplete_gamma', 'bounds_enforcing_decorator_factory')
+     'custom_incomplete_gamma', 'custom_incomplete_gamma_inverse',
+     'bounds_enforcing_decorator_factory')
 
 __author__ = ['Andrew Hearin', 'Surhud More', 'Johannes Ulf Lange']
 
@@ -306,6 +307,41 @@ def bind_required_kwargs(required_kwargs, obj, **kwargs):
             raise KeyError(msg)
 
 
+def update_param_dict_if_changed(source_param_dict, target_param_dict, key_pairs, previous_values=None):
+    r""" Copy the values ``source_param_dict[source_key]`` into ``target_param_dict[target_key]``
+    for each ``(source_key, target_key)`` of ``key_pairs``, unless the values are identical
+    to the ``previous_values`` returned by the previous call.
+
+    Used by component models that propagate their ``param_dict`` down to
+    a model they are built from, so that the propagation reduces to a single
+    tuple comparison when the parameters have not changed.
+
+    Parameters
+    ----------
+    source_param_dict : dict
+
+    target_param_dict : dict
+
+    key_pairs : sequence
+        Sequence of ``(source_key, target_key)`` pairs.
+
+    previous_values : tuple, optional
+        Values returned by the previous call. Default is None,
+        in which case all values are copied.
+
+    Returns
+    -------
+    values : tuple
+        Values of ``source_param_dict`` for the ``key_pairs``,
+        to be passed as ``previous_values`` to the next call.
+    """
+    values = tuple(source_param_dict[source_key] for source_key, __ in key_pairs)
+    if values != previous_values:
+        for (__, target_key), value in zip(key_pairs, values):
+            target_param_dict[target_key] = value
+    return values
+
+
 def create_composite_dtype(dtype_list):
     r""" Find the union of the dtypes in the input list, and return a composite
     dtype after verifying consistency of typing of possibly repeated fields.
@@ -447,6 +483,103 @@ def custom_incomplete_gamma(a, x):
 custom_incomplete_gamma.__author__ = ['Surhud More', 'Johannes Ulf Lange']
 
 
+def custom_incomplete_gamma_inverse(a, x_min, u, num_x_table=1000, num_gamma_table=4000,
+        delta_a_table=0.01):
+    r""" Inverse of the incomplete gamma function normalized to its value at ``x_min``,
+    i.e., the value of :math:`x \geq x_{\rm min}` solving
+    :math:`\Gamma(a, x) = u\ \Gamma(a, x_{\rm min})`.
+
+    For uniform randoms ``u``, the returned values follow the distribution
+    :math:`x^{a-1}e^{-x}` truncated below ``x_min``. As for `custom_incomplete_gamma`,
+    negative values of ``a`` are supported. The inversion is performed by
+    tabulating :math:`\ln\Gamma(a, x)` with `custom_incomplete_gamma` on a
+    logarithmic grid in :math:`x` and a linear grid in :math:`a`. The table is then
+    inverted on a linear grid in :math:`\ln\Gamma`, so that all the points are
+    inverted simultaneously by interpolating the inverse table, without any iteration.
+    The normalized incomplete gamma function of the returned values agrees with ``u``
+    to an absolute accuracy set by the spacing of the :math:`\ln\Gamma` grid.
+
+    Parameters
+    -----------
+    a : array_like
+
+    x_min : array_like
+        Strictly positive lower limit of the returned values.
+
+    u : array_like
+        Values in the interval (0, 1].
+
+    num_x_table : int, optional
+        Number of points of the logarithmic grid in :math:`x`. Default is 1000.
+
+    num_gamma_table : int, optional
+        Number of points of the linear grid in :math:`\ln\Gamma`. Default is 4000.
+
+    delta_a_table : float, optional
+        Spacing of the linear grid in :math:`a`. Default is 0.01.
+
+    Returns
+    --------
+    x : array_like
+        Array with the shape of the broadcast input arrays.
+
+    Examples
+    --------
+    >>> a, x_min = -0.5, 0.01
+    >>> u = np.random.uniform(0, 1, 100)
+    >>> x = custom_incomplete_gamma_inverse(a, x_min, 1 - u)
+    """
+    a, x_min, u = np.broadcast_arrays(np.asarray(a, dtype=float),
+        np.asarray(x_min, dtype=float), np.asarray(u, dtype=float))
+    shape = a.shape
+    a, x_min, u = a.flatten(), x_min.flatten(), u.flatten()
+    if len(a) == 0:
+        return np.zeros(shape)
+
+    a_table = np.arange(a.min(), a.max() + delta_a_table, delta_a_table)
+    if len(a_table) == 1:
+        a_table = np.append(a_table, a_table[0] + delta_a_table)
+
+    # Beyond x_min + 100, the normalized incomplete gamma function
+    # is smaller than any uniform random in double precision
+    log_x_table = np.linspace(np.log(x_min.min()),
+        np.log(x_min.max() + 100. + max(a.max(), 0.)), num_x_table)
+    delta_log_x = log_x_table[1] - log_x_table[0]
+
+    aa, xx = np.meshgrid(a_table, np.exp(log_x_table), indexing='ij')
+    with np.errstate(divide='ignore'):
+        log_gamma_table = np.log(custom_incomplete_gamma(aa.flatten(), xx.flatten()))
+    log_gamma_table = np.maximum(log_gamma_table.reshape(aa.shape),
+        np.log(np.finfo(float).tiny))
+
+    # Interpolate the table at each point to normalize it at x_min
+    ia = np.minimum(((a - a_table[0]) / delta_a_table).astype(int), len(a_table) - 2)
+    wa = (a - a_table[ia]) / delta_a_table
+    x_index_min = (np.log(x_min) - log_x_table[0]) / delta_log_x
+    ix = np.minimum(x_index_min.astype(int), num_x_table - 2)
+    wx = x_index_min - ix
+    log_gamma_min = ((1. - wa) * ((1. - wx) * log_gamma_table[ia, ix] +
+        wx * log_gamma_table[ia, ix + 1]) + wa * ((1. - wx) * log_gamma_table[ia + 1, ix] +
+        wx * log_gamma_table[ia + 1, ix + 1]))
+    log_gamma_target = np.log(u) + log_gamma_min
+
+    # Invert each row of the table on a common linear grid in ln(Gamma)
+    log_gamma_grid = np.linspace(log_gamma_target.min(), log_gamma_min.max(), num_gamma_table)
+    delta_log_gamma = max(log_gamma_grid[1] - log_gamma_grid[0], np.finfo(float).tiny)
+    log_x_inverse_table = np.array([np.interp(log_gamma_grid, row[::-1], log_x_table[::-1])
+        for row in log_gamma_table])
+
+    gamma_index = (log_gamma_target - log_gamma_grid[0]) / delta_log_gamma
+    ig = np.clip(gamma_index.astype(int), 0, num_gamma_table - 2)
+    wg = np.clip(gamma_index - ig, 0, 1)
+    log_x = ((1. - wa) * ((1. - wg) * log_x_inverse_table[ia, ig] +
+        wg * log_x_inverse_table[ia, ig + 1]) + wa * ((1. - wg) * log_x_inverse_table[ia + 1, ig] +
+        wg * log_x_inverse_table[ia + 1, ig + 1]))
+    log_x = np.maximum(log_x, np.log(x_min))
+
+    return np.exp(log_x).reshape(shape)
+
+
 def bounds_enforcing_decorator_factory(lower_bound, upper_bound, warning=True):
     r"""
     Function returns a decorator that can be used to clip the values
@@ -5,13 +5,11 @@ model.
 
 import numpy as np
 from scipy.special import erfc, erfcinv
-from astropy.utils.misc import NumpyRNGContext
 
 from .occupation_model_template import OccupationComponent
-from .engines import cacciato09_sats_mc_prim_galprop_engine
-
-from .. import custom_incomplete_gamma
+from .. import custom_incomplete_gamma, custom_incomplete_gamma_inverse
 
+from ...utils.random_streams import random_state
 from ...custom_exceptions import HalotoolsError
 
 __all__ = ('Cacciato09Cens', 'Cacciato09Sats')
@@ -259,28 +257,27 @@ class Cacciato09Cens(OccupationComponent):
 
         prim_galprop = np.zeros(len(mean_occupation))
 
-        with NumpyRNGContext(seed):
-
-            # Draw cumulative distribution function (CDF) values for the
-            # primary galaxy properties in [0, 1).
-            x = np.random.random(len(mass))
-
-            # Take into account that the occupation with one central sets a
-            # lower limit on the CDF values. We also compute 1 - CDF because
-            # for low expected occupations CDF ~ 1 which can lead to numerical
-            # problems.
-            cdf = mean_occupation * x + (1 - mean_occupation)
-            cdfc = mean_occupation * (1 - x)  # 1 - cdf
-
-            # Draw primary galaxy properties.
-            mask = cdf <= 0.5
-            prim_galprop[mask] = 10**(-erfcinv(2 * cdf[mask]) *
-                                      np.sqrt(2 * self.param_dict['sigma']**2) +
-                                      log_median_prim_galprop[mask])
-            mask = np.logical_not(mask)  # cdf > 0.5
-            prim_galprop[mask] = 10**(erfcinv(2 * cdfc[mask]) *
-                                      np.sqrt(2 * self.param_dict['sigma']**2) +
-                                      log_median_prim_galprop[mask])
+        rng = random_state(seed)
+        # Draw cumulative distribution function (CDF) values for the
+        # primary galaxy properties in [0, 1).
+        x = rng.random_sample(len(mass))
+
+        # Take into account that the occupation with one central sets a
+        # lower limit on the CDF values. We also compute 1 - CDF because
+        # for low expected occupations CDF ~ 1 which can lead to numerical
+        # problems.
+        cdf = mean_occupation * x + (1 - mean_occupation)
+        cdfc = mean_occupation * (1 - x)  # 1 - cdf
+
+        # Draw primary galaxy properties.
+        mask = cdf <= 0.5
+        prim_galprop[mask] = 10**(-erfcinv(2 * cdf[mask]) *
+                                  np.sqrt(2 * self.param_dict['sigma']**2) +
+                                  log_median_prim_galprop[mask])
+        mask = np.logical_not(mask)  # cdf > 0.5
+        prim_galprop[mask] = 10**(erfcinv(2 * cdfc[mask]) *
+                                  np.sqrt(2 * self.param_dict['sigma']**2) +
+                                  log_median_prim_galprop[mask])
 
         if 'table' in list(kwargs.keys()):
             kwargs['table'][self.prim_galprop_key][:] = prim_galprop
@@ -655,23 +652,20 @@ class Cacciato09Sats(OccupationComponent):
                    "``Cacciato09Sats`` class.\n")
             raise HalotoolsError(msg)
 
-        alpha_sat = self.alpha_sat(**kwargs)
-        prim_galprop_cut = self.prim_galprop_cut(**kwargs)
-        prim_galprop = np.zeros(len(mass))
-
-        if np.any(alpha_sat > 10):
-            msg = ("\nThe ``mc_prim_galprop`` function of the "
-                   "``Cacciato09Sats`` class does not support models where "
-                   "alpha_sat is bigger than 10.\n")
-            raise HalotoolsError(msg)
+        alpha_sat = self.alpha_sat(prim_haloprop=mass)
+        prim_galprop_cut = self.prim_galprop_cut(prim_haloprop=mass)
+        delta = 10**(self.param_dict['delta_1'] + self.param_dict['delta_2'] *
+                     (np.log10(mass) - 12))
 
+        # In terms of y = delta * (prim_galprop / prim_galprop_cut)^2, the CLF
+        # is a gamma distribution of shape alpha_sat / 2 + 1 / 2 truncated at the
+        # threshold, which is sampled by inverting its incomplete gamma function.
         seed = kwargs.get('seed', None)
-        with NumpyRNGContext(seed):
-            while np.any(prim_galprop == 0):
-                randoms = np.random.random(size=len(mass) * 2)
-                prim_galprop = cacciato09_sats_mc_prim_galprop_engine(
-                    prim_galprop, randoms, alpha_sat, prim_galprop_cut,
-                    10**self.threshold)
+        uran = 1.0 - random_state(seed).random_sample(size=len(mass))
+        y_min = delta * (10**self.threshold / prim_galprop_cut)**2
+        y = custom_incomplete_gamma_inverse(alpha_sat / 2.0 + 0.5, y_min, uran)
+        prim_galprop = np.maximum(prim_galprop_cut * np.sqrt(y / delta),
+                                  10**self.threshold)
 
         if 'table' in list(kwargs.keys()):
             kwargs['table'][self.prim_galprop_key][:] = prim_galprop
@@ -1,7 +0,0 @@
-# Licensed under a 3-clause BSD style license - see LICENSE.rst
-
-from __future__ import absolute_import, division, print_function, unicode_literals
-
-from .cacciato09_sats_mc_prim_galprop_engine import cacciato09_sats_mc_prim_galprop_engine
-
-__all__ = ('cacciato09_sats_mc_prim_galprop_engine', )
@@ -10,6 +10,7 @@ import warnings
 from .occupation_model_template import OccupationComponent
 
 from .. import model_defaults
+from ..model_helpers import update_param_dict_if_changed
 from ..smhm_models import Behroozi10SmHm
 from ..assembias_models import HeavisideAssembias
 
@@ -74,6 +75,8 @@ class Leauthaud11Cens(OccupationComponent):
 
         for key, value in self.smhm_model.param_dict.items():
             self.param_dict[key] = value
+        self._smhm_key_pairs = tuple((key, key) for key in self.smhm_model.param_dict)
+        self._smhm_param_values = None
 
         self._methods_to_inherit = (
             ['mc_occupation', 'mean_occupation',
@@ -122,9 +125,7 @@ class Leauthaud11Cens(OccupationComponent):
         -----
         Assumes constant scatter in the stellar-to-halo-mass relation.
         """
-        for key, value in self.param_dict.items():
-            if key in list(self.smhm_model.param_dict.keys()):
-                self.smhm_model.param_dict[key] = value
+        self._update_smhm_param_dict()
 
         logmstar = np.log10(self.smhm_model.mean_stellar_mass(
             redshift=self.redshift, **kwargs))
@@ -155,9 +156,7 @@ class Leauthaud11Cens(OccupationComponent):
             Array containing stellar masses living in the input table.
         """
 
-        for key, value in self.param_dict.items():
-            if key in self.smhm_model.param_dict:
-                self.smhm_model.param_dict[key] = value
+        self._update_smhm_param_dict()
         return self.smhm_model.mean_stellar_mass(redshift=self.redshift, **kwargs)
 
     def mean_log_halo_mass(self, log_stellar_mass):
@@ -174,12 +173,17 @@ class Leauthaud11Cens(OccupationComponent):
         log_halo_mass : array_like
             Array containing 10-base logarithm of halo mass in h=1 solar mass units.
         """
-        for key, value in self.param_dict.items():
-            if key in self.smhm_model.param_dict:
-                self.smhm_model.param_dict[key] = value
+        self._update_smhm_param_dict()
         return self.smhm_model.mean_log_halo_mass(log_stellar_mass,
             redshift=self.redshift)
 
+    def _update_smhm_param_dict(self):
+        r""" Propagate the values of ``self.param_dict`` to the ``smhm_model``,
+        which is skipped when the values have not changed since the previous call.
+        """
+        self._smhm_param_values = update_param_dict_if_changed(self.param_dict,
+            self.smhm_model.param_dict, self._smhm_key_pairs, self._smhm_param_values)
+
 
 class Leauthaud11Sats(OccupationComponent):
     r""" HOD-style model for any satellite galaxy occupation that derives from
@@ -337,6 +341,8 @@ class Leauthaud11Sats(OccupationComponent):
 
         for key, value in self.central_occupation_model.param_dict.items():
             self.param_dict[key] = value
+        self._central_key_pairs = tuple((key, key) for key in self.central_occupation_model.param_dict)
+        self._central_param_values = None
 
         self._update_satellite_params()
 
@@ -344,9 +350,9 @@ class Leauthaud11Sats(OccupationComponent):
         """ Private method to update the model parameters.
 
         """
-        for key, value in self.param_dict.items():
-            if key in self.central_occupation_model.param_dict:
-                self.central_occupation_model.param_dict[key] = value
+        self._central_param_values = update_param_dict_if_changed(self.param_dict,
+            self.central_occupation_model.param_dict, self._central_key_pairs,
+            self._central_param_values)
 
         log_halo_mass_threshold = self.central_occupation_model.mean_log_halo_mass(
             log_stellar_mass=self.threshold)
@@ -8,11 +8,11 @@ import numpy as np
 from scipy.stats import poisson
 from astropy.extern import six
 from abc import ABCMeta
-from astropy.utils.misc import NumpyRNGContext
 
 from .. import model_defaults, model_helpers
 
 from ...utils.array_utils import custom_len
+from ...utils.random_streams import random_state
 from ...custom_exceptions import HalotoolsError
 
 __all__ = ('OccupationComponent', )
@@ -154,8 +154,7 @@ class OccupationComponent(object):
         mc_abundance : array
             Integer array giving the number of galaxies in each of the input table.
         """
-        with NumpyRNGContext(seed):
-            mc_generator = np.random.random(custom_len(first_occupation_moment))
+        mc_generator = random_state(seed).random_sample(custom_len(first_occupation_moment))
 
         result = np.where(mc_generator < first_occupation_moment, 1, 0)
         if 'table' in kwargs:
@@ -185,8 +184,7 @@ class OccupationComponent(object):
         first_occupation_moment = np.where(first_occupation_moment <= 0,
             model_defaults.default_tiny_poisson_fluctuation, first_occupation_moment)
 
-        with NumpyRNGContext(seed):
-            result = poisson.rvs(first_occupation_moment)
+        result = poisson.rvs(first_occupation_moment, random_state=random_state(seed))
         if 'table' in kwargs:
             kwargs['table']['halo_num_'+self.gal_type] = result
         return result
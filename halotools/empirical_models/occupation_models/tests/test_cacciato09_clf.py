@@ -252,6 +252,31 @@ def test_Cacciato09Sats5():
     assert p_value > 0.001
 
 
+def test_Cacciato09Sats6():
+    """
+    Check that luminosities follow the expected distribution for steep
+    power-law slopes and for a non-trivial cut-off shape parameter.
+    """
+    model = Cacciato09Sats(threshold=9.0)
+    model.param_dict['a_1'] = 7.0
+    model.param_dict['delta_1'] = 0.3
+    assert model.alpha_sat(prim_haloprop=1e11) > 10
+    for prim_haloprop in (1e11, 5e13):
+        lum_mc = model.mc_prim_galprop(
+            prim_haloprop=np.ones(int(1e5))*prim_haloprop, seed=1)
+        assert np.all(lum_mc >= 10**model.threshold)
+
+        def cdf(lum):
+            return np.array([(model.mean_occupation(prim_haloprop=prim_haloprop) -
+                              model.mean_occupation(prim_haloprop=prim_haloprop,
+                                                    prim_galprop_min=l)) /
+                             model.mean_occupation(prim_haloprop=prim_haloprop)
+                             for l in lum])
+
+        p_value = kstest(lum_mc, cdf)[1]
+        assert p_value > 0.001
+
+
 def test_Cacciato09Sats_phi_sat_raises_exception():
     model = Cacciato09Sats(threshold=11.0)
     with pytest.raises(HalotoolsError) as err:
@@ -5,7 +5,7 @@ import numpy as np
 
 from .. import Leauthaud11Cens, Leauthaud11Sats
 
-__all__ = ('test_Leauthaud11Cens', 'test_Leauthaud11Sats')
+__all__ = ('test_Leauthaud11Cens', 'test_Leauthaud11Sats', 'test_Leauthaud11_param_dict_propagation')
 
 
 def test_Leauthaud11Cens():
@@ -120,3 +120,33 @@ def test_Leauthaud11Sats():
     ncen105 = model105.central_occupation_model.mean_occupation(prim_haloprop=5e12)
     ncen11 = model11.central_occupation_model.mean_occupation(prim_haloprop=5e12)
     assert ncen10 > ncen105 > ncen11
+
+
+def test_Leauthaud11_param_dict_propagation():
+    """ Verify that changes to the param_dict propagate to the stellar-to-halo-mass model
+    of the centrals and satellites, including after reverting to previous values.
+    """
+    cens, sats = Leauthaud11Cens(), Leauthaud11Sats()
+    mass = np.logspace(11, 15, 50)
+    ncen1, nsat1 = cens.mean_occupation(prim_haloprop=mass), sats.mean_occupation(prim_haloprop=mass)
+
+    for model in (cens, sats):
+        model.param_dict['smhm_m0_0'] += 0.2
+        model.param_dict['smhm_delta_0'] += 0.1
+    ncen2, nsat2 = cens.mean_occupation(prim_haloprop=mass), sats.mean_occupation(prim_haloprop=mass)
+    assert not np.allclose(ncen1, ncen2)
+    assert not np.allclose(nsat1, nsat2)
+
+    cens3, sats3 = Leauthaud11Cens(), Leauthaud11Sats()
+    for model in (cens3, sats3):
+        model.param_dict['smhm_m0_0'] += 0.2
+        model.param_dict['smhm_delta_0'] += 0.1
+    assert np.allclose(ncen2, cens3.mean_occupation(prim_haloprop=mass))
+    assert np.allclose(nsat2, sats3.mean_occupation(prim_haloprop=mass))
+    assert cens.smhm_model.param_dict['smhm_m0_0'] == cens.param_dict['smhm_m0_0']
+
+    for model in (cens, sats):
+        model.param_dict['smhm_m0_0'] -= 0.2
+        model.param_dict['smhm_delta_0'] -= 0.1
+    assert np.allclose(ncen1, cens.mean_occupation(prim_haloprop=mass))
+    assert np.allclose(nsat1, sats.mean_occupation(prim_haloprop=mass))
@@ -79,3 +79,22 @@ def test_Tinker13Cens7():
     result = model.mean_stellar_mass_quiescent(prim_haloprop=prim_haloprop)
     result = model.mean_log_halo_mass_active(log_stellar_mass=logsm)
     result = model.mean_log_halo_mass_quiescent(log_stellar_mass=logsm)
+
+
+def test_Tinker13Cens_alternating_sfr_designations():
+    """ Verify that the active and quiescent stellar-to-halo-mass relations
+    sharing the same ``smhm_model`` do not contaminate one another.
+    """
+    model = Tinker13Cens()
+    mass = np.logspace(11, 15, 50)
+    mstar_active = model.mean_stellar_mass_active(prim_haloprop=mass)
+    mstar_quiescent = model.mean_stellar_mass_quiescent(prim_haloprop=mass)
+    assert not np.allclose(mstar_active, mstar_quiescent)
+    assert np.all(model.mean_stellar_mass_active(prim_haloprop=mass) == mstar_active)
+
+    model.param_dict['smhm_m1_0_quiescent'] += 0.1
+    assert np.all(model.mean_stellar_mass_active(prim_haloprop=mass) == mstar_active)
+    mstar_quiescent2 = model.mean_stellar_mass_quiescent(prim_haloprop=mass)
+    assert np.all(mstar_quiescent2 < mstar_quiescent)
+    model.param_dict['smhm_m1_0_quiescent'] -= 0.1
+    assert np.all(model.mean_stellar_mass_quiescent(prim_haloprop=mass) == mstar_quiescent)
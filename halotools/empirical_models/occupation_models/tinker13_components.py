@@ -5,16 +5,17 @@ This module contains occupation components used by the Tinker13 composite model.
 import numpy as np
 import math
 from scipy.special import erf
-from astropy.utils.misc import NumpyRNGContext
 
 from .occupation_model_template import OccupationComponent
 
 from .. import model_defaults, model_helpers
+from ..model_helpers import update_param_dict_if_changed
 from ..smhm_models import Behroozi10SmHm
 from ..assembias_models import HeavisideAssembias
 from ..model_helpers import bounds_enforcing_decorator_factory
 
 from ...utils.array_utils import custom_len
+from ...utils.random_streams import random_state
 from ... import sim_manager
 from ...custom_exceptions import HalotoolsError
 
@@ -80,6 +81,10 @@ class Tinker13Cens(OccupationComponent):
             prim_haloprop_key=prim_haloprop_key, **kwargs)
 
         self._initialize_param_dict(**kwargs)
+        self._smhm_key_pairs = {sfr_key: tuple((key + '_' + sfr_key, key)
+            for key in self.smhm_model.param_dict if key + '_' + sfr_key in self.param_dict)
+            for sfr_key in ('active', 'quiescent')}
+        self._smhm_param_values = None
 
         self.sfr_designation_key = 'central_sfr_designation'
 
@@ -167,8 +172,7 @@ class Tinker13Cens(OccupationComponent):
         """
         quiescent_fraction = self.mean_quiescent_fraction(**kwargs)
 
-        with NumpyRNGContext(seed):
-            mc_generator = np.random.random(custom_len(quiescent_fraction))
+        mc_generator = random_state(seed).random_sample(custom_len(quiescent_fraction))
 
         result = np.where(mc_generator < quiescent_fraction, 'quiescent', 'active')
         if 'table' in kwargs:
@@ -276,14 +280,11 @@ class Tinker13Cens(OccupationComponent):
             redshift=self.redshift)
 
     def _update_smhm_param_dict(self, sfr_key):
-
-        for key, value in self.param_dict.items():
-            if sfr_key in key:
-                stripped_key = key[:-len(sfr_key)-1]
-            else:
-                stripped_key = key
-            if stripped_key in self.smhm_model.param_dict:
-                self.smhm_model.param_dict[stripped_key] = value
+        """ Propagate the ``sfr_key`` values of ``self.param_dict`` to the ``smhm_model``,
+        which is skipped when the values have not changed since the previous call.
+        """
+        self._smhm_param_values = update_param_dict_if_changed(self.param_dict,
+            self.smhm_model.param_dict, self._smhm_key_pairs[sfr_key], self._smhm_param_values)
 
 
 class AssembiasTinker13Cens(Tinker13Cens, HeavisideAssembias):
@@ -497,6 +498,9 @@ class Tinker13QuiescentSats(OccupationComponent):
         self.param_dict['smhm_beta_0_quiescent'] = 0.32
         self.param_dict['smhm_delta_0_quiescent'] = 0.93
         self.param_dict['smhm_gamma_0_quiescent'] = 0.81
+        self._smhm_key_pairs = tuple((key + '_quiescent', key)
+            for key in self.smhm_model.param_dict if key + '_quiescent' in self.param_dict)
+        self._smhm_param_values = None
 
         self._update_satellite_params()
 
@@ -504,10 +508,8 @@ class Tinker13QuiescentSats(OccupationComponent):
         """ Private method to update the model parameters.
 
         """
-        for key, value in self.param_dict.items():
-            stripped_key = key[:-len('_quiescent')]
-            if stripped_key in self.smhm_model.param_dict:
-                self.smhm_model.param_dict[stripped_key] = value
+        self._smhm_param_values = update_param_dict_if_changed(self.param_dict,
+            self.smhm_model.param_dict, self._smhm_key_pairs, self._smhm_param_values)
 
         log_halo_mass_threshold = self.smhm_model.mean_log_halo_mass(
             log_stellar_mass=self.threshold, redshift=self.redshift)
@@ -661,6 +663,9 @@ class Tinker13ActiveSats(OccupationComponent):
         self.param_dict['smhm_beta_0_active'] = 0.44
         self.param_dict['smhm_delta_0_active'] = 0.52
         self.param_dict['smhm_gamma_0_active'] = 1.48
+        self._smhm_key_pairs = tuple((key + '_active', key)
+            for key in self.smhm_model.param_dict if key + '_active' in self.param_dict)
+        self._smhm_param_values = None
 
         self._update_satellite_params()
 
@@ -668,10 +673,8 @@ class Tinker13ActiveSats(OccupationComponent):
         """ Private method to update the model parameters.
 
         """
-        for key, value in self.param_dict.items():
-            stripped_key = key[:-len('_active')]
-            if stripped_key in self.smhm_model.param_dict:
-                self.smhm_model.param_dict[stripped_key] = value
+        self._smhm_param_values = update_param_dict_if_changed(self.param_dict,
+            self.smhm_model.param_dict, self._smhm_key_pairs, self._smhm_param_values)
 
         log_halo_mass_threshold = self.smhm_model.mean_log_halo_mass(
             log_stellar_mass=self.threshold, redshift=self.redshift)
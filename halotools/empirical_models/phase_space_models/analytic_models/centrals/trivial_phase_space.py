@@ -45,6 +45,8 @@ class TrivialPhaseSpace(object):
             ('x', 'f8'), ('y', 'f8'), ('z', 'f8'),
             ('vx', 'f8'), ('vy', 'f8'), ('vz', 'f8'),
             ])
+        self.list_of_galprops_needed = ['halo_x', 'halo_y', 'halo_z',
+            'halo_vx', 'halo_vy', 'halo_vz']
 
         self.param_dict = {}
 
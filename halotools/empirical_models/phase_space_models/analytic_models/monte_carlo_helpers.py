@@ -10,11 +10,11 @@ of the full phase space distribution of galaxies within their halos.
 import numpy as np
 
 from itertools import product
-from astropy.utils.misc import NumpyRNGContext
 
 from ...model_helpers import custom_spline, call_func_table
 from ... import model_defaults
 
+from ....utils.random_streams import random_state
 from ....custom_exceptions import HalotoolsError
 
 
@@ -171,8 +171,7 @@ class MonteCarloGalProf(object):
         # These will be turned into random radial positions
         # by inverting the tabulated cumulative_gal_PDF
         seed = kwargs.get('seed', None)
-        with NumpyRNGContext(seed):
-            rho = np.random.random(len(profile_params[0]))
+        rho = random_state(seed).random_sample(len(profile_params[0]))
 
         # Discretize each profile parameter for every galaxy
         # Store the collection of arrays in digitized_param_list
@@ -228,11 +227,9 @@ class MonteCarloGalProf(object):
         x, y, z : array_like
             Length-Npts arrays of the coordinate positions.
         """
-        seed = kwargs.get('seed', None)
-
-        with NumpyRNGContext(seed):
-            cos_t = np.random.uniform(-1., 1., Npts)
-            phi = np.random.uniform(0, 2*np.pi, Npts)
+        rng = random_state(kwargs.get('seed', None))
+        cos_t = rng.uniform(-1., 1., Npts)
+        phi = rng.uniform(0, 2*np.pi, Npts)
         sin_t = np.sqrt((1.-cos_t*cos_t))
 
         x = sin_t * np.cos(phi)
@@ -287,15 +284,13 @@ class MonteCarloGalProf(object):
         if Ngals == 0:
             return None, None, None
 
-        seed = kwargs.get('seed', None)
-        x, y, z = self.mc_unit_sphere(Ngals, seed=seed)
+        # Draw the angles and radii sequentially from the same random stream
+        rng = random_state(kwargs.get('seed', None))
+        x, y, z = self.mc_unit_sphere(Ngals, seed=rng)
 
         # Get the radial positions of the galaxies scaled by the halo radius
-
-        if seed is not None:
-            seed += 1
         dimensionless_radial_distance = self._mc_dimensionless_radial_distance(
-            *profile_params, seed=seed)
+            *profile_params, seed=rng)
 
         # get random positions within the solid sphere
         x *= dimensionless_radial_distance
@@ -570,8 +565,7 @@ class MonteCarloGalProf(object):
         radial_dispersions = np.where(radial_dispersions < 0, 0, radial_dispersions)
 
         seed = kwargs.get('seed', None)
-        with NumpyRNGContext(seed):
-            radial_velocities = np.random.normal(scale=radial_dispersions)
+        radial_velocities = random_state(seed).normal(scale=radial_dispersions)
 
         return radial_velocities
 
@@ -623,13 +617,11 @@ class MonteCarloGalProf(object):
 
         total_mass = table[self.prim_haloprop_key]
 
-        vx = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params, seed=seed)
-        if seed is not None:
-            seed += 1
-        vy = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params, seed=seed)
-        if seed is not None:
-            seed += 1
-        vz = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params, seed=seed)
+        # Draw all three velocity components sequentially from the same random stream
+        rng = random_state(seed)
+        vx = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params, seed=rng)
+        vy = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params, seed=rng)
+        vz = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params, seed=rng)
 
         if overwrite_table_velocities is True:
             table['vx'][:] += vx
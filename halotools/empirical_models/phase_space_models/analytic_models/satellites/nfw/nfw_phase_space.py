@@ -12,6 +12,8 @@ from ...monte_carlo_helpers import MonteCarloGalProf
 
 from ..... import model_defaults
 
+from ......utils.random_streams import random_state
+
 
 __author__ = ['Andrew Hearin']
 __all__ = ['NFWPhaseSpace']
@@ -107,10 +109,9 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
             Default is None, which will produce stochastic results.
 
         """
-        MonteCarloGalProf.mc_pos(self, table=table, seed=seed)
-        if seed is not None:
-            seed += 1
-        MonteCarloGalProf.mc_vel(self, table=table, seed=seed)
+        rng = random_state(seed)
+        MonteCarloGalProf.mc_pos(self, table=table, seed=rng)
+        MonteCarloGalProf.mc_vel(self, table=table, seed=rng)
 
     def conc_NFWmodel(self, *args, **kwargs):
         r""" NFW concentration as a function of halo mass.
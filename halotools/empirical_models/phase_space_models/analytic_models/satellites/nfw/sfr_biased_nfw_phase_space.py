@@ -144,6 +144,9 @@ class SFRBiasedNFWPhaseSpace(BiasedNFWPhaseSpace):
         """
         BiasedNFWPhaseSpace.__init__(self, **kwargs)
 
+        # Column of the galaxy_table computed by some other component model
+        self.list_of_galprops_needed = ['quiescent']
+
     def _initialize_conc_bias_param_dict(self, **kwargs):
         r""" Set up the appropriate number of keys in the parameter dictionary
         and give the keys standardized names.
@@ -6,6 +6,7 @@ from __future__ import (
     division, print_function, absolute_import, unicode_literals)
 
 import numpy as np
+from collections import OrderedDict
 
 from .smhm_helpers import safely_retrieve_redshift
 
@@ -94,6 +95,11 @@ class Behroozi10SmHm(PrimGalpropModel):
 
         self.publications = ['arXiv:1001.0015']
 
+        # Memoized splines of the inverse relation, see _inverse_smhm_spline
+        self._smhm_param_keys = tuple(sorted(self.retrieve_default_param_dict().keys()))
+        self._inverse_smhm_cache = OrderedDict()
+        self._inverse_smhm_cache_size = 8
+
     def retrieve_default_param_dict(self):
         """ Method returns a dictionary of all model parameters
         set to the column 2 values in Table 2 of Behroozi et al. (2010).
@@ -205,13 +211,39 @@ class Behroozi10SmHm(PrimGalpropModel):
             raise KeyError("Must pass one of the following keyword arguments "
                 "to mean_occupation:\n``table`` or ``prim_haloprop``")
 
-        log_stellar_mass_table = np.linspace(8.5, 12.5, 100)
-        log_halo_mass_table = self.mean_log_halo_mass(log_stellar_mass_table, redshift=redshift)
-
-        interpol_func = model_helpers.custom_spline(log_halo_mass_table, log_stellar_mass_table)
+        interpol_func = self._inverse_smhm_spline(redshift)
 
         log_stellar_mass = interpol_func(np.log10(halo_mass))
 
         stellar_mass = 10.**log_stellar_mass
 
         return stellar_mass
+
+    def _inverse_smhm_spline(self, redshift):
+        """ Spline of the base-10 logarithm of stellar mass as a function of
+        the base-10 logarithm of halo mass, obtained by inverting `mean_log_halo_mass`.
+
+        The spline is memoized on the values of the parameters of the relation
+        and the redshift, so that repeated calls with unchanged parameters do not
+        rebuild the spline, and a new spline is built whenever a parameter changes.
+        The most recently used ``_inverse_smhm_cache_size`` splines are kept.
+        """
+        try:
+            cache_key = (tuple(self.param_dict[key] for key in self._smhm_param_keys) +
+                (self.littleh, float(redshift)))
+        except TypeError:
+            cache_key = None
+
+        try:
+            interpol_func = self._inverse_smhm_cache.pop(cache_key)
+        except KeyError:
+            log_stellar_mass_table = np.linspace(8.5, 12.5, 100)
+            log_halo_mass_table = self.mean_log_halo_mass(log_stellar_mass_table, redshift=redshift)
+            interpol_func = model_helpers.custom_spline(log_halo_mass_table, log_stellar_mass_table)
+            if (cache_key is None) or (self._inverse_smhm_cache_size < 1):
+                return interpol_func
+            while len(self._inverse_smhm_cache) >= self._inverse_smhm_cache_size:
+                self._inverse_smhm_cache.popitem(last=False)
+
+        self._inverse_smhm_cache[cache_key] = interpol_func
+        return interpol_func
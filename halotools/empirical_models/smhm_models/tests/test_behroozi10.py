@@ -121,3 +121,36 @@ def test_behroozi10_smhm_z1():
     z1_ratio = z1_sm / halo_mass_z1
     z1_result = np.log10(z1_ratio)
     assert np.allclose(z1_result, logmratio_z1, rtol=0.02)
+
+
+def test_behroozi10_inverse_smhm_cache():
+    """ Verify that the memoized inverse relation is rebuilt whenever
+    a parameter or the redshift changes, and reused otherwise.
+    """
+    model = Behroozi10SmHm()
+    halo_mass = np.logspace(10, 15, 100)
+
+    mstar1 = model.mean_stellar_mass(prim_haloprop=halo_mass, redshift=0.5)
+    spline1 = model._inverse_smhm_spline(0.5)
+    assert model._inverse_smhm_spline(0.5) is spline1
+
+    model.param_dict['smhm_m1_0'] += 0.1
+    mstar2 = model.mean_stellar_mass(prim_haloprop=halo_mass, redshift=0.5)
+    assert np.all(mstar2 < mstar1)
+    model2 = Behroozi10SmHm()
+    model2.param_dict['smhm_m1_0'] += 0.1
+    model2._inverse_smhm_cache_size = 0
+    assert np.allclose(mstar2, model2.mean_stellar_mass(prim_haloprop=halo_mass, redshift=0.5))
+
+    mstar3 = model.mean_stellar_mass(prim_haloprop=halo_mass, redshift=1)
+    assert not np.allclose(mstar2, mstar3)
+
+    model.param_dict['smhm_m1_0'] -= 0.1
+    assert np.all(model.mean_stellar_mass(prim_haloprop=halo_mass, redshift=0.5) == mstar1)
+    assert model._inverse_smhm_spline(0.5) is spline1
+    assert len(model._inverse_smhm_cache) == 3
+
+    for i in range(2*model._inverse_smhm_cache_size):
+        model.param_dict['smhm_beta_0'] += 0.01
+        __ = model.mean_stellar_mass(prim_haloprop=halo_mass, redshift=0.5)
+    assert len(model._inverse_smhm_cache) == model._inverse_smhm_cache_size
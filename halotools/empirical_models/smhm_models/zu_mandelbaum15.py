@@ -5,10 +5,11 @@ stellar mass and halo mass based on Zu & Mandelbaum et al. (2015).
 from __future__ import division, print_function, absolute_import, unicode_literals
 import numpy as np
 from warnings import warn
-from astropy.utils.misc import NumpyRNGContext
 
 from ..component_model_templates import PrimGalpropModel
 
+from ...utils.random_streams import random_state
+
 __all__ = ('ZuMandelbaum15SmHm', )
 
 
@@ -192,7 +193,6 @@ class ZuMandelbaum15SmHm(PrimGalpropModel):
 
         # only draw from a normal distribution for non-zero values of scatter
         mask = (scatter_scale > 0.0)
-        with NumpyRNGContext(seed):
-            result[mask] = np.random.normal(loc=0, scale=scatter_scale[mask])
+        result[mask] = random_state(seed).normal(loc=0, scale=scatter_scale[mask])
 
         return result
@@ -7,6 +7,7 @@ from astropy.utils.misc import NumpyRNGContext
 from ..model_helpers import custom_spline, create_composite_dtype
 from ..model_helpers import bounds_enforcing_decorator_factory, enforce_periodicity_of_box
 from ..model_helpers import call_func_table, bind_default_kwarg_mixin_safe
+from ..model_helpers import custom_incomplete_gamma, custom_incomplete_gamma_inverse
 
 from ...custom_exceptions import HalotoolsError
 
@@ -187,3 +188,29 @@ def test_call_func_table2():
 
 def test_call_func_table3():
     pass
+
+
+def test_custom_incomplete_gamma_inverse1():
+    """ Verify that the inverse recovers the input randoms for
+    positive and negative values of ``a``.
+    """
+    with NumpyRNGContext(fixed_seed):
+        a = np.random.uniform(-1.5, 1.5, 1000)
+        x_min = 10**np.random.uniform(-3, 1, 1000)
+        u = 1 - np.random.uniform(0, 1, 1000)
+
+    x = custom_incomplete_gamma_inverse(a, x_min, u)
+    assert x.shape == u.shape
+    assert np.all(x >= x_min)
+    u_inferred = custom_incomplete_gamma(a, x) / custom_incomplete_gamma(a, x_min)
+    assert np.allclose(u_inferred, u, atol=0.005)
+
+
+def test_custom_incomplete_gamma_inverse2():
+    """ Verify that the inverse is monotonic in ``u`` and broadcasts scalar inputs.
+    """
+    u = np.linspace(1, 0.001, 100)
+    x = custom_incomplete_gamma_inverse(-0.5, 0.01, u)
+    assert np.all(np.diff(x) >= 0)
+    assert np.isclose(x[0], 0.01)
+    assert len(custom_incomplete_gamma_inverse(-0.5, 0.01, np.zeros(0))) == 0
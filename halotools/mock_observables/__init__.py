@@ -12,11 +12,13 @@ from .isolation_functions import *
 from .void_statistics import *
 from .catalog_analysis_helpers import *
 from .pair_counters import (npairs_3d, npairs_projected, npairs_xy_z,
-    marked_npairs_3d, marked_npairs_xy_z)
+    marked_npairs_3d, marked_npairs_xy_z,
+    register_weighting_function, unregister_weighting_function)
 from .radial_profiles import *
 from .two_point_clustering import *
 from .large_scale_density import *
 from .counts_in_cells import *
 from .occupation_stats import hod_from_mock, get_haloprop_of_galaxies
+from .chunked_sample import ChunkedSample
 from .surface_density import *
 from .velocity_decomposition import *
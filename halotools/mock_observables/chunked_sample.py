@@ -0,0 +1,351 @@
+""" Module containing the `~halotools.mock_observables.ChunkedSample` class
+used to pass samples of points that are too large to be stored in memory
+to the functions in `~halotools.mock_observables`.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+
+from ..custom_exceptions import HalotoolsError
+
+__all__ = ('ChunkedSample', )
+__author__ = ('Andrew Hearin', )
+
+
+class ChunkedSample(object):
+    r"""
+    Sample of points that is read from its data source one chunk at a time.
+
+    A `ChunkedSample` can be passed in place of an in-memory array of points
+    to `~halotools.mock_observables.npairs_3d`, `~halotools.mock_observables.npairs_xy_z`,
+    `~halotools.mock_observables.tpcf`, `~halotools.mock_observables.wp`,
+    `~halotools.mock_observables.rp_pi_tpcf`, `~halotools.mock_observables.delta_sigma`,
+    `~halotools.mock_observables.total_mass_enclosed_in_stack_of_cylinders`
+    and `~halotools.mock_observables.mean_radial_velocity_vs_r`,
+    allowing these functions to be applied to samples such as
+    full-resolution dark matter particle snapshots that are larger than the available memory.
+    For the two-point functions, the ``sample1``, ``sample2`` and ``randoms``
+    arguments may all be chunked.
+
+    When a chunked sample is paired with an in-memory sample, e.g.,
+    when computing the mass in cylinders surrounding a galaxy sample, the pairs are
+    counted chunk by chunk. When both samples of a pair count are chunked,
+    the box is divided into slabs along the x-dimension, and the pairs are counted
+    slab by slab, so that only the points of one slab of the first sample,
+    and the points within the search length of this slab in the second sample,
+    are stored in memory at any one time. Each slab requires a pass through
+    the data sources, so that the computation trades memory for repeated reads.
+
+    Parameters
+    ----------
+    positions : data source
+        Data source of the positions of the points, i.e., an array-like
+        of shape (Npts, 3) read one chunk at a time. See Notes for the accepted data sources.
+
+    chunk_size : int, optional
+        Number of points read from array-like data sources at a time.
+        When both samples of a pair count are chunked, the number of slabs is
+        chosen so that each slab of the first sample holds roughly ``chunk_size`` points.
+        Default is 10**6.
+
+    **columns : data sources, optional
+        Data sources of additional properties of the points, e.g.,
+        ``velocities`` or ``masses``, with the same number of points as ``positions``
+        and of the same kind of data source.
+
+    Notes
+    -----
+    The following data sources are accepted:
+
+    * Any array-like supporting ``len`` and slicing along the first axis, e.g.,
+      a Numpy `~numpy.memmap`, an array loaded with ``np.load(fname, mmap_mode='r')``,
+      or an h5py dataset.
+
+    * A two-element tuple ``(fname, dataset_name)`` of strings storing the name of an
+      hdf5 file and the path to the dataset within that file. The file is opened
+      anew for each pass through the data. Reading hdf5 files requires h5py.
+
+    * A list of arrays storing the consecutive chunks of the data.
+
+    * A function called without arguments that returns an iterable over the consecutive
+      chunks of the data, e.g., a generator function reading the chunks from disk.
+      The function is called once for each pass through the data.
+
+    Examples
+    --------
+    >>> period = 250.
+    >>> positions = np.random.uniform(0, period, 3*10**4).reshape((10**4, 3))
+    >>> chunked_positions = ChunkedSample(positions, chunk_size=2500)
+
+    >>> from halotools.mock_observables import tpcf
+    >>> rbins = np.logspace(-1, 1, 10)
+    >>> xi = tpcf(chunked_positions, rbins, period=period)
+
+    In practice, the positions would be stored in a file too large to load,
+    e.g., in an hdf5 file with a ``positions`` dataset of shape (Npts, 3):
+
+    >>> chunked_positions = ChunkedSample(('particles.hdf5', 'positions'), chunk_size=10**7) # doctest: +SKIP
+    """
+
+    def __init__(self, positions, chunk_size=10**6, **columns):
+        self.chunk_size = int(chunk_size)
+        try:
+            assert self.chunk_size > 0
+        except AssertionError:
+            msg = "Input ``chunk_size`` must be a positive integer"
+            raise HalotoolsError(msg)
+
+        self._positions = positions
+        self._columns = columns
+        self.column_names = tuple(sorted(columns.keys()))
+
+        _verify_data_source(positions, 'positions')
+        for name in self.column_names:
+            _verify_data_source(columns[name], name)
+
+        self._num_points = _array_like_length(positions)
+        for name in self.column_names:
+            num_points = _array_like_length(columns[name])
+            if (self._num_points is not None) & (num_points is not None):
+                if num_points != self._num_points:
+                    msg = ("The ``{0}`` data source has {1} points, \n"
+                        "but the ``positions`` data source has {2} points")
+                    raise HalotoolsError(msg.format(name, num_points, self._num_points))
+
+    def __len__(self):
+        if self._num_points is None:
+            self._num_points = sum(len(positions) for positions, __ in self.iter_chunks())
+        return self._num_points
+
+    @property
+    def shape(self):
+        return (len(self), 3)
+
+    def iter_chunks(self):
+        """ Iterate over the chunks of the sample.
+
+        Returns
+        -------
+        chunks : generator
+            Generator yielding a tuple ``(positions, columns)`` for each chunk,
+            where ``positions`` is an array of shape (npts_chunk, 3)
+            and ``columns`` is a dictionary storing the
+            additional properties of the points in the chunk.
+        """
+        iterators = [_chunk_iterator(self._positions, self.chunk_size)]
+        iterators.extend(_chunk_iterator(self._columns[name], self.chunk_size)
+            for name in self.column_names)
+
+        for chunks in zip(*iterators):
+            positions = np.atleast_2d(np.array(chunks[0], dtype='f8'))
+            try:
+                assert positions.shape[1] == 3
+            except AssertionError:
+                msg = ("Each chunk of the ``positions`` of a ChunkedSample "
+                    "must be of shape (npts_chunk, 3)")
+                raise HalotoolsError(msg)
+
+            columns = {}
+            for name, chunk in zip(self.column_names, chunks[1:]):
+                chunk = np.asarray(chunk)
+                try:
+                    assert len(chunk) == len(positions)
+                except AssertionError:
+                    msg = ("The chunks of the ``{0}`` data source do not have "
+                        "the same number of points as the chunks of the ``positions``")
+                    raise HalotoolsError(msg.format(name))
+                columns[name] = chunk
+            yield positions, columns
+
+    def select_slabs(self, xranges, period):
+        """ Load the points with x-coordinate within each of the input ranges
+        with a single pass through the data.
+
+        Parameters
+        ----------
+        xranges : list
+            List of ``(xmin, xmax)`` pairs.
+
+        period : array_like or None
+            If not None, the ranges are periodic in the x-dimension with length ``period[0]``.
+
+        Returns
+        -------
+        slabs : list
+            List storing a tuple ``(positions, columns)`` for each range.
+        """
+        selected = [([], dict((name, []) for name in self.column_names)) for __ in xranges]
+        for positions, columns in self.iter_chunks():
+            x = positions[:, 0]
+            for (xmin, xmax), (positions_list, columns_lists) in zip(xranges, selected):
+                mask = _slab_mask(x, xmin, xmax, period)
+                positions_list.append(positions[mask])
+                for name in self.column_names:
+                    columns_lists[name].append(columns[name][mask])
+
+        slabs = []
+        for positions_list, columns_lists in selected:
+            positions = _concatenate(positions_list, (0, 3), 'f8')
+            columns = dict((name, _concatenate(columns_lists[name], (0, ), 'f8'))
+                for name in self.column_names)
+            slabs.append((positions, columns))
+        return slabs
+
+    def xrange(self):
+        """ Minimum and maximum x-coordinate of the points, computed with a pass through the data.
+        """
+        xmin, xmax = np.inf, -np.inf
+        for positions, __ in self.iter_chunks():
+            if len(positions) > 0:
+                xmin = min(xmin, np.min(positions[:, 0]))
+                xmax = max(xmax, np.max(positions[:, 0]))
+        return xmin, xmax
+
+
+def _verify_data_source(source, name):
+    if callable(source) or _is_hdf5_path(source):
+        return
+    elif isinstance(source, list):
+        return
+    elif hasattr(source, '__len__') & hasattr(source, '__getitem__') & hasattr(source, 'shape'):
+        return
+    else:
+        msg = ("The ``{0}`` data source of a ChunkedSample must be an array-like, \n"
+            "a (fname, dataset_name) tuple of an hdf5 dataset, a list of arrays, \n"
+            "or a function returning an iterable of arrays")
+        raise HalotoolsError(msg.format(name))
+
+
+def _is_hdf5_path(source):
+    try:
+        fname, dataset_name = source
+        return isinstance(source, tuple) & isinstance(fname, str) & isinstance(dataset_name, str)
+    except (TypeError, ValueError):
+        return False
+
+
+def _array_like_length(source):
+    if callable(source) or _is_hdf5_path(source):
+        return None
+    elif isinstance(source, list):
+        return sum(len(chunk) for chunk in source)
+    else:
+        return len(source)
+
+
+def _chunk_iterator(source, chunk_size):
+    if callable(source):
+        for chunk in source():
+            yield chunk
+    elif _is_hdf5_path(source):
+        try:
+            import h5py
+        except ImportError:
+            msg = ("Must have h5py package installed \n"
+                "to read a ChunkedSample from an hdf5 file")
+            raise HalotoolsError(msg)
+        fname, dataset_name = source
+        with h5py.File(fname, 'r') as f:
+            dataset = f[dataset_name]
+            for first in range(0, len(dataset), chunk_size):
+                yield dataset[first:first+chunk_size]
+    elif isinstance(source, list):
+        for chunk in source:
+            yield chunk
+    else:
+        for first in range(0, len(source), chunk_size):
+            yield source[first:first+chunk_size]
+
+
+def _slab_mask(x, xmin, xmax, period):
+    if period is None:
+        return (x >= xmin) & (x < xmax)
+    elif xmax - xmin >= period[0]:
+        return np.ones(len(x), dtype=bool)
+    else:
+        return np.mod(x - xmin, period[0]) < (xmax - xmin)
+
+
+def _concatenate(arrays, empty_shape, empty_dtype):
+    if len(arrays) == 0:
+        return np.zeros(empty_shape, dtype=empty_dtype)
+    else:
+        return np.concatenate(arrays)
+
+
+def _chunked_pair_counts(counter, sample1, sample2, search_length, period, empty_result,
+        columns1=None, columns2=None):
+    """ Accumulate the result of ``counter`` over the chunks or slabs
+    of the input samples, either of which may be a `ChunkedSample`.
+
+    Parameters
+    ----------
+    counter : function
+        Function with signature ``counter(positions1, columns1, positions2, columns2)``
+        returning the result for the input points. The result must be additive
+        over disjoint subsets of the points of ``sample1``, such as cumulative pair counts.
+
+    sample1, sample2 : `ChunkedSample` or ndarray
+        Samples passed to ``counter``. Samples that are not a `ChunkedSample`
+        are arrays of shape (Npts, 3) stored in memory.
+
+    search_length : float
+        Largest x-separation of the pairs contributing to the result.
+
+    period : array_like or None
+        Length-3 sequence storing the periodic boundary conditions, or None.
+
+    empty_result : ndarray
+        Result of ``counter`` for samples without any points.
+
+    columns1, columns2 : dict, optional
+        Additional properties of the points of samples stored in memory.
+
+    Returns
+    -------
+    result : ndarray
+        Sum of ``counter`` over the chunks or slabs.
+    """
+    result = np.copy(empty_result)
+    columns1 = {} if columns1 is None else columns1
+    columns2 = {} if columns2 is None else columns2
+
+    if not isinstance(sample2, ChunkedSample):
+        for positions1, chunk_columns1 in sample1.iter_chunks():
+            if (len(positions1) > 0) & (len(sample2) > 0):
+                result += counter(positions1, chunk_columns1, sample2, columns2)
+        return result
+    elif not isinstance(sample1, ChunkedSample):
+        for positions2, chunk_columns2 in sample2.iter_chunks():
+            if (len(sample1) > 0) & (len(positions2) > 0):
+                result += counter(sample1, columns1, positions2, chunk_columns2)
+        return result
+
+    # Both samples are chunked, so count pairs slab-by-slab in the x-dimension
+    if period is None:
+        xmin, xmax = sample1.xrange()
+        if xmin > xmax:
+            return result
+        xmax = np.nextafter(xmax, np.inf)
+    else:
+        xmin, xmax = 0., period[0]
+
+    max_num_slabs = max(1, int((xmax - xmin)/search_length))
+    num_slabs = int(np.ceil(max(len(sample1), 1)/float(sample1.chunk_size)))
+    num_slabs = min(max(num_slabs, 1), max_num_slabs)
+    slab_edges = np.linspace(xmin, xmax, num_slabs+1)
+    slab_edges[-1] = xmax
+
+    for slab_min, slab_max in zip(slab_edges[:-1], slab_edges[1:]):
+        xrange1 = (slab_min, slab_max)
+        xrange2 = (slab_min - search_length, slab_max + search_length)
+        if sample1 is sample2:
+            slab1, slab2 = sample1.select_slabs((xrange1, xrange2), period)
+        else:
+            slab1, = sample1.select_slabs((xrange1, ), period)
+            slab2, = sample2.select_slabs((xrange2, ), period)
+        positions1, slab_columns1 = slab1
+        positions2, slab_columns2 = slab2
+        if (len(positions1) > 0) & (len(positions2) > 0):
+            result += counter(positions1, slab_columns1, positions2, slab_columns2)
+    return result
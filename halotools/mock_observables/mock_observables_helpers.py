@@ -173,3 +173,27 @@ def get_line_of_sight_bins_array(pi_bins):
         raise TypeError(msg)
 
     return pi_bins
+
+
+def get_line_of_sight_axes(los_axes):
+    """ Function converts the input ``los_axes`` into a 1d Numpy array of
+    integers in {0, 1, 2}, one per requested line-of-sight, where each entry
+    of ``los_axes`` is either one of the strings 'x', 'y', 'z' or the
+    corresponding integer.
+
+    """
+    axis_indices = {'x': 0, 'y': 1, 'z': 2, 0: 0, 1: 1, 2: 2}
+    if isinstance(los_axes, (str, int)):
+        los_axes = (los_axes, )
+
+    try:
+        result = np.array([axis_indices[axis] for axis in los_axes], dtype=np.int64)
+        assert len(result) > 0
+        assert len(set(result)) == len(result)
+    except (KeyError, TypeError, AssertionError):
+        msg = ("\n Input ``los_axes`` must be a non-empty sequence of distinct axes, \n"
+            "each of which is one of 'x', 'y', 'z', or the integers 0, 1, 2.\n"
+            "Received los_axes = {0}".format(los_axes))
+        raise ValueError(msg)
+
+    return result
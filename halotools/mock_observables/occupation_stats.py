@@ -3,7 +3,7 @@ such as the first occupation moment.
 """
 import numpy as np
 from scipy.stats import binned_statistic
-from ..utils import crossmatch
+from ..utils import crossmatch, CrossmatchIndex
 
 
 __all__ = ('hod_from_mock', 'get_haloprop_of_galaxies')
@@ -91,11 +91,14 @@ def get_haloprop_of_galaxies(halo_id_galaxies, halo_id_halos, haloprop_halos):
         Integer array of shape (num_galaxies, ) storing the ``halo_id``
         that each galaxy belongs to.
 
-    halo_id_halos : ndarray
+    halo_id_halos : ndarray or `~halotools.utils.CrossmatchIndex`
         Integer array of shape (num_halos, ) storing the ``halo_id``
         of every host halo in the entire halo catalog used to populate the mock.
         Repeated entries are not permissible,
         but halos with zero or multiple galaxies are accepted.
+        When calling this function repeatedly with the same halo catalog,
+        you can instead pass in a `~halotools.utils.CrossmatchIndex` built once
+        from the ``halo_id`` of the halos.
 
     haloprop_halos : ndarray
         Array of shape (num_halos, ) storing the halo property of interest,
@@ -130,9 +133,18 @@ def get_haloprop_of_galaxies(halo_id_galaxies, halo_id_halos, haloprop_halos):
     to retrieve the ``halo_spin`` of the halos; in order to save memory,
     the version of the ``halo_table`` that is bound to ``model.mock`` has a
     restricted subset of columns.
+
+    When retrieving several halo properties, or the properties of several
+    galaxy samples, index the ``halo_id`` of the halos only once:
+
+    >>> from halotools.utils import CrossmatchIndex
+    >>> halo_id_index = CrossmatchIndex(halo_id_halos)
+    >>> halo_vmax_galaxies = get_haloprop_of_galaxies(halo_id_galaxies,
+    ...     halo_id_index, halocat.halo_table['halo_vmax'])
     """
     halo_id_galaxies = np.atleast_1d(halo_id_galaxies)
-    halo_id_halos = np.atleast_1d(halo_id_halos)
+    if not isinstance(halo_id_halos, CrossmatchIndex):
+        halo_id_halos = np.atleast_1d(halo_id_halos)
     haloprop_halos = np.atleast_1d(haloprop_halos)
     result = np.zeros_like(halo_id_galaxies) + np.nan
     idxA, idxB = crossmatch(halo_id_galaxies, halo_id_halos)
@@ -7,6 +7,8 @@ from .npairs_projected import npairs_projected
 from .npairs_xy_z import npairs_xy_z
 from .marked_npairs_3d import marked_npairs_3d
 from .marked_npairs_xy_z import marked_npairs_xy_z
+from .marked_cpairs.weighting_function_registry import (register_weighting_function,
+    unregister_weighting_function)
 from .npairs_jackknife_3d import npairs_jackknife_3d
 from .npairs_jackknife_xy_z import npairs_jackknife_xy_z
 from .npairs_s_mu import npairs_s_mu
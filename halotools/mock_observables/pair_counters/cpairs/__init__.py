@@ -13,3 +13,4 @@ from .npairs_per_object_3d_engine import npairs_per_object_3d_engine
 from .pairwise_distance_3d_engine import pairwise_distance_3d_engine
 from .pairwise_distance_xy_z_engine import pairwise_distance_xy_z_engine
 from .npairs_jackknife_xy_z_engine import npairs_jackknife_xy_z_engine
+from .npairs_xy_z_multi_los_engine import npairs_xy_z_multi_los_engine
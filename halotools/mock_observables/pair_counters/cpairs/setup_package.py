@@ -6,7 +6,8 @@ SOURCES = ("distances.pyx", "pairwise_distances.pyx",
     "npairs_3d_engine.pyx", "npairs_projected_engine.pyx",
     "npairs_xy_z_engine.pyx", "npairs_jackknife_3d_engine.pyx", "npairs_s_mu_engine.pyx",
     "pairwise_distance_3d_engine.pyx", "pairwise_distance_xy_z_engine.pyx",
-    "weighted_npairs_s_mu_engine.pyx", "npairs_jackknife_xy_z_engine.pyx")
+    "weighted_npairs_s_mu_engine.pyx", "npairs_jackknife_xy_z_engine.pyx",
+    "npairs_xy_z_multi_los_engine.pyx")
 THIS_PKG_NAME = '.'.join(__name__.split('.')[:-1])
 
 
@@ -3,5 +3,5 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 from .conditional_pairwise_distances import *
-from .marked_npairs_3d_engine import marked_npairs_3d_engine
+from .marked_npairs_3d_engine import marked_npairs_3d_engine, marked_npairs_3d_multi_engine
 from .marked_npairs_xy_z_engine import marked_npairs_xy_z_engine
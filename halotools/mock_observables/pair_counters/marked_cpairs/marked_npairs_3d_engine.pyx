@@ -7,13 +7,10 @@ cimport numpy as cnp
 cimport cython 
 from libc.math cimport ceil
 
-from .marking_functions cimport *
-from .custom_marking_func cimport custom_func
+from .weighting_kernels cimport *
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
-__all__ = ('marked_npairs_3d_engine', )
-
-ctypedef double (*f_type)(cnp.float64_t* w1, cnp.float64_t* w2)
+__all__ = ('marked_npairs_3d_engine', 'marked_npairs_3d_multi_engine')
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -58,9 +55,29 @@ def marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
 
     """
     cdef int weight_func_id = weight_func_idin
+    cdef f_type wfunc = weighting_function_pointer(weight_func_id)
+
+    if weight_func_id == 1:
+        return _marked_npairs_3d_engine(<product_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 2:
+        return _marked_npairs_3d_engine(<sum_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 3:
+        return _marked_npairs_3d_engine(<equality_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple)
+    else:
+        return _marked_npairs_3d_engine(<generic_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple)
+
 
-    cdef f_type wfunc
-    wfunc = return_weighting_function(weight_func_id)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cdef object _marked_npairs_3d_engine(weighting_kernel* kernel, f_type wfunc, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple):
+    """ Pair-counting loop of `marked_npairs_3d_engine`, specialized for each weighting kernel.
+    """
 
     cdef cnp.float64_t[:] rbins_squared = rbins*rbins
     cdef cnp.float64_t xperiod = double_mesh.xperiod
@@ -207,7 +224,7 @@ def marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                                     dz = z1tmp - z_icell2[j]
                                     dsq = dx*dx + dy*dy + dz*dz
 
-                                    weight = wfunc(&w_icell1[i,0], &w_icell2[j,0])
+                                    weight = pair_weight(kernel, wfunc, &w_icell1[i,0], &w_icell2[j,0])
                                     k = num_rbins-1
                                     while dsq <= rbins_squared[k]:
                                         counts[k] += weight
@@ -217,32 +234,222 @@ def marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     return np.array(counts)
 
 
-cdef f_type return_weighting_function(weight_func_id):
-    """
-    returns a pointer to the user-specified weighting function.
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def marked_npairs_3d_multi_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+    weights1in, weights2in, weight_func_idin, rbins, cell1_tuple):
+    """ Cython engine for counting pairs of points as a function of three-dimensional separation,
+    simultaneously for a block of *K* different sets of weights.
+
+    Each pair is located in its separation bin only once, after which the
+    weighting function is evaluated for each of the *K* sets of weights.
+    The cost of *K* weighted pair counts is thus a single traversal of the mesh
+    plus *K* evaluations of the weighting function per pair.
+
+    Parameters
+    ------------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+
+    x1in, y1in, z1in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 1
+
+    x2in, y2in, z2in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 2
+
+    weights1in : array
+        Numpy array of shape (K, Npts1, N_weights) storing
+        the K sets of weights for points in sample 1
+
+    weights2in : array
+        Numpy array of shape (K, Npts2, N_weights) storing
+        the K sets of weights for points in sample 2
+
+    weight_func_id : int, optional
+        weighting function integer ID.
+
+    rbins : array
+        Boundaries defining the bins in which pairs are counted.
+
+    cell1_tuple : tuple
+        Two-element tuple defining the first and last cells in
+        double_mesh.mesh1 that will be looped over. Intended for use with
+        python multiprocessing.
+
+    Returns
+    --------
+    counts : array
+        Array of shape (K, len(rbins)) giving, for each set of weights,
+        the weighted number of pairs separated by a distance less than
+        the corresponding entry of ``rbins``.
+
     """
-    
-    if weight_func_id==0:
-        return custom_func
-    elif weight_func_id==1:
-        return mweights
-    elif weight_func_id==2:
-        return sweights
-    elif weight_func_id==3:
-        return eqweights
-    elif weight_func_id==4:
-        return ineqweights
-    elif weight_func_id==5:
-        return gweights
-    elif weight_func_id==6:
-        return lweights
-    elif weight_func_id==7:
-        return tgweights
-    elif weight_func_id==8:
-        return tlweights
-    elif weight_func_id==9:
-        return tweights
-    elif weight_func_id==10:
-        return exweights
+    cdef int weight_func_id = weight_func_idin
+    cdef f_type wfunc = weighting_function_pointer(weight_func_id)
+
+    if weight_func_id == 1:
+        return _marked_npairs_3d_multi_engine(<product_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 2:
+        return _marked_npairs_3d_multi_engine(<sum_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 3:
+        return _marked_npairs_3d_multi_engine(<equality_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple)
     else:
-        raise ValueError('marking function does not exist')
+        return _marked_npairs_3d_multi_engine(<generic_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cdef object _marked_npairs_3d_multi_engine(weighting_kernel* kernel, f_type wfunc, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple):
+    """ Pair-counting loop of `marked_npairs_3d_multi_engine`, specialized for each weighting kernel.
+    """
+
+    cdef cnp.float64_t[:] rbins_squared = rbins*rbins
+    cdef cnp.float64_t xperiod = double_mesh.xperiod
+    cdef cnp.float64_t yperiod = double_mesh.yperiod
+    cdef cnp.float64_t zperiod = double_mesh.zperiod
+    cdef cnp.int64_t first_cell1_element = cell1_tuple[0]
+    cdef cnp.int64_t last_cell1_element = cell1_tuple[1]
+    cdef int PBCs = double_mesh._PBCs
+
+    cdef int num_rbins = len(rbins)
+    cdef int num_weight_sets = weights1in.shape[0]
+    cdef cnp.float64_t rmax_squared = rbins_squared[num_rbins-1]
+
+    # Each pair is only added to the smallest bin enclosing its separation,
+    # and the cumulative counts are computed once the traversal is complete
+    cdef cnp.float64_t[:, :] counts = np.zeros((num_weight_sets, num_rbins), dtype=np.float64)
+
+    cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z1 = np.ascontiguousarray(z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] x2 = np.ascontiguousarray(x2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y2 = np.ascontiguousarray(y2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z2 = np.ascontiguousarray(z2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:, :, :] weights1 = np.ascontiguousarray(
+        weights1in[:, double_mesh.mesh1.idx_sorted, :], dtype=np.float64)
+    cdef cnp.float64_t[:, :, :] weights2 = np.ascontiguousarray(
+        weights2in[:, double_mesh.mesh2.idx_sorted, :], dtype=np.float64)
+
+    cdef cnp.int64_t icell1, icell2
+    cdef cnp.int64_t[:] cell1_indices = np.ascontiguousarray(double_mesh.mesh1.cell_id_indices, dtype=np.int64)
+    cdef cnp.int64_t[:] cell2_indices = np.ascontiguousarray(double_mesh.mesh2.cell_id_indices, dtype=np.int64)
+
+    cdef cnp.int64_t ifirst1, ilast1, ifirst2, ilast2
+
+    cdef int ix2, iy2, iz2, ix1, iy1, iz1
+    cdef int nonPBC_ix2, nonPBC_iy2, nonPBC_iz2
+
+    cdef int num_x2_covering_steps = int(np.ceil(
+        double_mesh.search_xlength / double_mesh.mesh2.xcell_size))
+    cdef int num_y2_covering_steps = int(np.ceil(
+        double_mesh.search_ylength / double_mesh.mesh2.ycell_size))
+    cdef int num_z2_covering_steps = int(np.ceil(
+        double_mesh.search_zlength / double_mesh.mesh2.zcell_size))
+
+    cdef int leftmost_ix2, rightmost_ix2
+    cdef int leftmost_iy2, rightmost_iy2
+    cdef int leftmost_iz2, rightmost_iz2
+
+    cdef int num_x1divs = double_mesh.mesh1.num_xdivs
+    cdef int num_y1divs = double_mesh.mesh1.num_ydivs
+    cdef int num_z1divs = double_mesh.mesh1.num_zdivs
+    cdef int num_x2divs = double_mesh.mesh2.num_xdivs
+    cdef int num_y2divs = double_mesh.mesh2.num_ydivs
+    cdef int num_z2divs = double_mesh.mesh2.num_zdivs
+    cdef int num_x2_per_x1 = num_x2divs // num_x1divs
+    cdef int num_y2_per_y1 = num_y2divs // num_y1divs
+    cdef int num_z2_per_z1 = num_z2divs // num_z1divs
+
+    cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dsq
+    cdef cnp.float64_t x1tmp, y1tmp, z1tmp
+    cdef int Ni, Nj, i, j, k, p
+    cdef cnp.int64_t ipt1, ipt2
+
+    for icell1 in range(first_cell1_element, last_cell1_element):
+
+        ifirst1 = cell1_indices[icell1]
+        ilast1 = cell1_indices[icell1+1]
+
+        Ni = ilast1 - ifirst1
+        if Ni > 0:
+
+            ix1 = icell1 // (num_y1divs*num_z1divs)
+            iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
+            iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
+
+            leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
+            leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
+            leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
+
+            rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
+            rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
+            rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
+
+            for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
+                if nonPBC_ix2 < 0:
+                    x2shift = -xperiod*PBCs
+                elif nonPBC_ix2 >= num_x2divs:
+                    x2shift = +xperiod*PBCs
+                else:
+                    x2shift = 0.
+                # Now apply the PBCs
+                ix2 = nonPBC_ix2 % num_x2divs
+
+                for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
+                    if nonPBC_iy2 < 0:
+                        y2shift = -yperiod*PBCs
+                    elif nonPBC_iy2 >= num_y2divs:
+                        y2shift = +yperiod*PBCs
+                    else:
+                        y2shift = 0.
+                    # Now apply the PBCs
+                    iy2 = nonPBC_iy2 % num_y2divs
+
+                    for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
+                        if nonPBC_iz2 < 0:
+                            z2shift = -zperiod*PBCs
+                        elif nonPBC_iz2 >= num_z2divs:
+                            z2shift = +zperiod*PBCs
+                        else:
+                            z2shift = 0.
+                        # Now apply the PBCs
+                        iz2 = nonPBC_iz2 % num_z2divs
+
+                        icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                        ifirst2 = cell2_indices[icell2]
+                        ilast2 = cell2_indices[icell2+1]
+
+                        Nj = ilast2 - ifirst2
+                        #loop over points in cell1 points
+                        if Nj > 0:
+                            for i in range(0,Ni):
+                                ipt1 = ifirst1 + i
+                                x1tmp = x1[ipt1] - x2shift
+                                y1tmp = y1[ipt1] - y2shift
+                                z1tmp = z1[ipt1] - z2shift
+                                #loop over points in cell2 points
+                                for j in range(0,Nj):
+                                    ipt2 = ifirst2 + j
+                                    #calculate the square distance
+                                    dx = x1tmp - x2[ipt2]
+                                    dy = y1tmp - y2[ipt2]
+                                    dz = z1tmp - z2[ipt2]
+                                    dsq = dx*dx + dy*dy + dz*dz
+
+                                    if dsq <= rmax_squared:
+                                        k = num_rbins-1
+                                        while k > 0:
+                                            if dsq > rbins_squared[k-1]: break
+                                            k = k-1
+                                        for p in range(num_weight_sets):
+                                            counts[p, k] += pair_weight(kernel, wfunc,
+                                                &weights1[p, ipt1, 0], &weights2[p, ipt2, 0])
+
+    return np.cumsum(counts, axis=1)
@@ -7,14 +7,11 @@ cimport numpy as cnp
 cimport cython
 from libc.math cimport ceil
 
-from .marking_functions cimport *
-from .custom_marking_func cimport custom_func
+from .weighting_kernels cimport *
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 __all__ = ('marked_npairs_xy_z_engine', )
 
-ctypedef double (*f_type)(cnp.float64_t* w1, cnp.float64_t* w2)
-
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.nonecheck(False)
@@ -61,9 +58,29 @@ def marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
 
     """
     cdef int weight_func_id = weight_func_idin
+    cdef f_type wfunc = weighting_function_pointer(weight_func_id)
+
+    if weight_func_id == 1:
+        return _marked_npairs_xy_z_engine(<product_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 2:
+        return _marked_npairs_xy_z_engine(<sum_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 3:
+        return _marked_npairs_xy_z_engine(<equality_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    else:
+        return _marked_npairs_xy_z_engine(<generic_kernel*>NULL, wfunc, double_mesh,
+            x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
 
-    cdef f_type wfunc
-    wfunc = return_weighting_function(weight_func_id)
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cdef object _marked_npairs_xy_z_engine(weighting_kernel* kernel, f_type wfunc, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rp_bins, pi_bins, cell1_tuple):
+    """ Pair-counting loop of `marked_npairs_xy_z_engine`, specialized for each weighting kernel.
+    """
 
     cdef cnp.float64_t[:] rp_bins_squared = rp_bins*rp_bins
     cdef cnp.float64_t[:] pi_bins_squared = pi_bins*pi_bins
@@ -213,7 +230,7 @@ def marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                                     dxy_sq = dx*dx + dy*dy
                                     dz_sq = dz*dz
 
-                                    weight = wfunc(&w_icell1[i,0], &w_icell2[j,0])
+                                    weight = pair_weight(kernel, wfunc, &w_icell1[i,0], &w_icell2[j,0])
                                     k = num_rp_bins-1
                                     while dxy_sq<=rp_bins_squared[k]:
                                         g = num_pi_bins-1
@@ -225,34 +242,3 @@ def marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                                         if k<0: break
 
     return np.array(counts)
-
-
-cdef f_type return_weighting_function(weight_func_id):
-    """
-    returns a pointer to the user-specified weighting function.
-    """
-
-    if weight_func_id==0:
-        return custom_func
-    elif weight_func_id==1:
-        return mweights
-    elif weight_func_id==2:
-        return sweights
-    elif weight_func_id==3:
-        return eqweights
-    elif weight_func_id==4:
-        return ineqweights
-    elif weight_func_id==5:
-        return gweights
-    elif weight_func_id==6:
-        return lweights
-    elif weight_func_id==7:
-        return tgweights
-    elif weight_func_id==8:
-        return tlweights
-    elif weight_func_id==9:
-        return tweights
-    elif weight_func_id==10:
-        return exweights
-    else:
-        raise ValueError('marking function does not exist')
@@ -0,0 +1,130 @@
+""" Module storing the user-supplied compiled weighting functions
+that can be called by the marked pair counters.
+"""
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import ctypes
+
+from ....custom_exceptions import HalotoolsError
+
+__author__ = ('Andrew Hearin', )
+
+__all__ = ('register_weighting_function', 'unregister_weighting_function')
+
+# Integer IDs 0-10 are reserved for the built-in weighting functions
+first_registered_weight_func_id = 11
+
+# Dictionary mapping the integer ID of each registered weighting function
+# to a tuple storing (address, num_weights, func). The input func is stored
+# so that the compiled function it points to is not garbage-collected.
+_registered_weighting_functions = {}
+
+
+def register_weighting_function(func, num_weights):
+    r"""
+    Register a compiled weighting function so that it can be used by
+    `~halotools.mock_observables.marked_npairs_3d`,
+    `~halotools.mock_observables.marked_npairs_xy_z`
+    and the marked correlation functions built on them,
+    without editing and recompiling Halotools.
+
+    The weighting function must have the C signature
+    ``double func(double* w1, double* w2)``, where ``w1`` and ``w2`` point to the
+    *N_weights* weights of the two points of a pair, and the returned value
+    is the weight of the pair.
+
+    Parameters
+    ----------
+    func : object
+        The compiled weighting function. Can be any of the following:
+
+        * A numba ``cfunc`` object, e.g., decorated with ``@cfunc(float64(CPointer(float64), CPointer(float64)))``.
+
+        * A ``ctypes`` function pointer.
+
+        * A ``PyCapsule`` wrapping a Cython ``cdef`` function, e.g., an entry of the ``__pyx_capi__`` dictionary of a Cython module declaring the function in its pxd file.
+
+        * The integer address of the function.
+
+    num_weights : int
+        Number of weights per point, *N_weights*, expected by ``func``.
+
+    Returns
+    -------
+    weight_func_id : int
+        Integer ID of the registered function, to be passed as the ``weight_func_id``
+        argument of the marked pair counters.
+
+    Notes
+    -----
+    The marked pair counters call the weighting function for every pair,
+    so it must not raise exceptions or acquire the GIL.
+    Functions must be registered before the pair counter is called, so that the
+    registry is inherited by the processes used when ``num_threads`` > 1.
+
+    Examples
+    --------
+    >>> from halotools.mock_observables.pair_counters.marked_cpairs import marking_functions
+    >>> capsule = marking_functions.__pyx_capi__['mweights']
+    >>> weight_func_id = register_weighting_function(capsule, 1)
+    >>> unregister_weighting_function(weight_func_id)
+    """
+    address = _weighting_function_address(func)
+
+    try:
+        assert int(num_weights) == num_weights
+        assert num_weights > 0
+    except (AssertionError, TypeError, ValueError):
+        msg = ("\nThe input ``num_weights`` must be a positive integer.\n")
+        raise HalotoolsError(msg)
+
+    weight_func_id = max([first_registered_weight_func_id-1] +
+        list(_registered_weighting_functions.keys())) + 1
+    _registered_weighting_functions[weight_func_id] = (address, int(num_weights), func)
+    return weight_func_id
+
+
+def unregister_weighting_function(weight_func_id):
+    """
+    Remove a weighting function previously registered with
+    `~halotools.mock_observables.register_weighting_function`.
+
+    Parameters
+    ----------
+    weight_func_id : int
+        Integer ID returned by `~halotools.mock_observables.register_weighting_function`.
+    """
+    try:
+        del _registered_weighting_functions[weight_func_id]
+    except KeyError:
+        msg = ("\nThe value ``weight_func_id`` = %s is not a registered weighting function.\n")
+        raise HalotoolsError(msg % str(weight_func_id))
+
+
+def _weighting_function_address(func):
+    """
+    Return the integer address of the input compiled function.
+    """
+    if isinstance(func, int):
+        address = func
+    elif hasattr(func, 'address'):
+        # numba cfunc
+        address = func.address
+    elif isinstance(func, ctypes._CFuncPtr):
+        address = ctypes.cast(func, ctypes.c_void_p).value
+    elif type(func).__name__ == 'PyCapsule':
+        get_name = ctypes.pythonapi.PyCapsule_GetName
+        get_name.restype = ctypes.c_char_p
+        get_name.argtypes = [ctypes.py_object]
+        get_pointer = ctypes.pythonapi.PyCapsule_GetPointer
+        get_pointer.restype = ctypes.c_void_p
+        get_pointer.argtypes = [ctypes.py_object, ctypes.c_char_p]
+        address = get_pointer(func, get_name(func))
+    else:
+        msg = ("\nThe input ``func`` must be a numba cfunc, a ctypes function pointer, \n"
+            "a PyCapsule wrapping a Cython cdef function, or an integer address.\n"
+            "Received an object of type %s.\n")
+        raise HalotoolsError(msg % type(func))
+
+    if not address:
+        raise HalotoolsError("\nThe input ``func`` points to NULL.\n")
+    return address
@@ -0,0 +1,48 @@
+cimport numpy as cnp
+
+##### weighting kernels shared by the marked pair-counting engines ####
+
+ctypedef cnp.float64_t (*f_type)(cnp.float64_t* w1, cnp.float64_t* w2)
+
+# Empty tags used to generate specialized copies of the engines.
+# The built-in product, sum and equality weights are inlined into the
+# specialized pair-counting loops, while the generic engine calls the weighting
+# function through a pointer, either a built-in or a registered one.
+cdef struct generic_kernel:
+    char _unused
+
+cdef struct product_kernel:
+    char _unused
+
+cdef struct sum_kernel:
+    char _unused
+
+cdef struct equality_kernel:
+    char _unused
+
+ctypedef fused weighting_kernel:
+    generic_kernel
+    product_kernel
+    sum_kernel
+    equality_kernel
+
+
+cdef inline cnp.float64_t pair_weight(weighting_kernel* kernel, f_type wfunc,
+        cnp.float64_t* w1, cnp.float64_t* w2):
+    """
+    Weight of a pair, resolved at compile time for the specialized kernels.
+    """
+    if weighting_kernel is product_kernel:
+        return w1[0]*w2[0]
+    elif weighting_kernel is sum_kernel:
+        return w1[0]+w2[0]
+    elif weighting_kernel is equality_kernel:
+        if w1[0] == w2[0]:
+            return w1[1]*w2[1]
+        else:
+            return 0.0
+    else:
+        return wfunc(w1, w2)
+
+
+cdef f_type weighting_function_pointer(int weight_func_id) except NULL
@@ -0,0 +1,39 @@
+# cython: profile=False
+"""
+Look-up of the weighting functions called by the marked pair-counting engines.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+cimport numpy as cnp
+
+from .marking_functions cimport *
+from .custom_marking_func cimport custom_func
+
+from .weighting_function_registry import _registered_weighting_functions
+
+__author__ = ["Andrew Hearin", "Duncan Campbell"]
+
+DEF NUM_BUILTIN_WEIGHTING_FUNCTIONS = 11
+
+# Table of built-in weighting functions, indexed by weight_func_id
+cdef f_type builtin_weighting_functions[NUM_BUILTIN_WEIGHTING_FUNCTIONS]
+builtin_weighting_functions[:] = [custom_func, mweights, sweights, eqweights, ineqweights,
+    gweights, lweights, tgweights, tlweights, tweights, exweights]
+
+
+cdef f_type weighting_function_pointer(int weight_func_id) except NULL:
+    """
+    returns a pointer to the weighting function with the input integer ID,
+    either a built-in function or one that has been registered with
+    `~halotools.mock_observables.register_weighting_function`.
+    """
+    cdef size_t address
+
+    if 0 <= weight_func_id < NUM_BUILTIN_WEIGHTING_FUNCTIONS:
+        return builtin_weighting_functions[weight_func_id]
+
+    try:
+        address = _registered_weighting_functions[weight_func_id][0]
+    except KeyError:
+        raise ValueError('marking function does not exist')
+    return <f_type>address
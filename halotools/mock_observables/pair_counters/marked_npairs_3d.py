@@ -10,7 +10,8 @@ from .npairs_3d import _npairs_3d_process_args
 from .mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
 from .rectangular_mesh import RectangularDoubleMesh
 
-from .marked_cpairs import marked_npairs_3d_engine
+from .marked_cpairs import marked_npairs_3d_engine, marked_npairs_3d_multi_engine
+from .marked_cpairs.weighting_function_registry import _registered_weighting_functions
 
 from ...custom_exceptions import HalotoolsError
 
@@ -68,8 +69,11 @@ def marked_npairs_3d(sample1, sample2, rbins,
 
     weight_func_id : int, optional
         weighting function integer ID. Each weighting function requires a specific
-        number of weights per point, *N_weights*.  See the Notes for a description of
-        available weighting functions.
+        number of weights per point, *N_weights*.  See the Notes of
+        `~halotools.mock_observables.marked_tpcf` for a description of
+        available weighting functions. Compiled weighting functions supplied by the user
+        can be used by passing the ID returned by
+        `~halotools.mock_observables.register_weighting_function`.
 
     verbose : Boolean, optional
         If True, print out information and progress.
@@ -175,6 +179,86 @@ def marked_npairs_3d(sample1, sample2, rbins,
     return np.array(counts)
 
 
+def _marked_npairs_3d_multi_weights(sample1, sample2, rbins, weights1, weights2,
+        period=None, weight_func_id=0, verbose=False, num_threads=1,
+        approx_cell1_size=None, approx_cell2_size=None):
+    """
+    Private function computing `marked_npairs_3d` simultaneously for
+    *K* sets of weights with a single traversal of the mesh.
+
+    Parameters
+    ----------
+    weights1 : array_like
+        Array of shape (K, Npts1, N_weights) storing K sets of weights
+        for the points in ``sample1``.
+
+    weights2 : array_like
+        Array of shape (K, Npts2, N_weights) storing K sets of weights
+        for the points in ``sample2``.
+
+    See `marked_npairs_3d` for a description of the remaining parameters.
+
+    Returns
+    -------
+    wN_pairs : numpy.array
+        Array of shape (K, Nrbins) whose kth row is the result of `marked_npairs_3d`
+        for ``weights1[k]`` and ``weights2[k]``.
+    """
+    result = _npairs_3d_process_args(sample1, sample2, rbins, period,
+            verbose, num_threads, approx_cell1_size, approx_cell2_size)
+    x1in, y1in, z1in, x2in, y2in, z2in = result[0:6]
+    rbins, period, num_threads, PBCs, approx_cell1_size, approx_cell2_size = result[6:]
+    xperiod, yperiod, zperiod = period
+
+    rmax = np.max(rbins)
+    search_xlength, search_ylength, search_zlength = rmax, rmax, rmax
+
+    weights1 = np.asarray(weights1, dtype=np.float64)
+    weights2 = np.asarray(weights2, dtype=np.float64)
+    correct_num_weights = _func_signature_int_from_wfunc(weight_func_id)
+    correct_shape1 = (weights1.shape[0], np.shape(sample1)[0], correct_num_weights)
+    correct_shape2 = (weights1.shape[0], np.shape(sample2)[0], correct_num_weights)
+    if (weights1.shape != correct_shape1) | (weights2.shape != correct_shape2):
+        msg = ("\n The input `weights1` and `weights2` must have shapes "
+               "(K, Npts1, N_weights) and (K, Npts2, N_weights), \n"
+               "where N_weights = %i for `weight_func_id` = %i.\n"
+               "The shapes of the input weights are %s and %s.\n")
+        raise HalotoolsError(msg %
+            (correct_num_weights, weight_func_id, weights1.shape, weights2.shape))
+
+    # Compute the estimates for the cell sizes
+    approx_cell1_size, approx_cell2_size = (
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        )
+    approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
+    approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
+
+    # Build the rectangular mesh
+    double_mesh = RectangularDoubleMesh(x1in, y1in, z1in, x2in, y2in, z2in,
+        approx_x1cell_size, approx_y1cell_size, approx_z1cell_size,
+        approx_x2cell_size, approx_y2cell_size, approx_z2cell_size,
+        search_xlength, search_ylength, search_zlength, xperiod, yperiod, zperiod, PBCs)
+
+    # Create a function object that has a single argument, for parallelization purposes
+    engine = partial(marked_npairs_3d_multi_engine, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in,
+        weights1, weights2, weight_func_id, rbins)
+
+    # Calculate the cell1 indices that will be looped over by the engine
+    num_threads, cell1_tuples = _cell1_parallelization_indices(
+        double_mesh.mesh1.ncells, num_threads)
+
+    if num_threads > 1:
+        pool = multiprocessing.Pool(num_threads)
+        result = pool.map(engine, cell1_tuples)
+        counts = np.sum(np.array(result), axis=0)
+        pool.close()
+    else:
+        counts = engine(cell1_tuples[0])
+
+    return np.array(counts)
+
+
 def _marked_npairs_process_weights(sample1, sample2, weights1, weights2, weight_func_id):
     """
     """
@@ -299,6 +383,8 @@ def _func_signature_int_from_wfunc(weight_func_id):
         return 2
     elif weight_func_id == 10:
         return 2
+    elif weight_func_id in _registered_weighting_functions:
+        return _registered_weighting_functions[weight_func_id][1]
     else:
         msg = ("The value ``weight_func_id`` = %i is not recognized")
         raise HalotoolsError(msg % weight_func_id)
@@ -75,7 +75,9 @@ def marked_npairs_xy_z(sample1, sample2, rp_bins, pi_bins,
     wfunc : int, optional
         weighting function integer ID. Each weighting function requires a specific
         number of weights per point, *N_weights*.  See the Notes for a description of
-        available weighting functions.
+        available weighting functions. Compiled weighting functions supplied by the user
+        can be used by passing the ID returned by
+        `~halotools.mock_observables.register_weighting_function`.
 
     verbose : Boolean, optional
         If True, print out information and progress.
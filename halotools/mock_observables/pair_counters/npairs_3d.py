@@ -9,6 +9,8 @@ from functools import partial
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import _set_approximate_cell_sizes, _enclose_in_box, _cell1_parallelization_indices
 from .cpairs import npairs_3d_engine
+from ..chunked_sample import ChunkedSample, _chunked_pair_counts
+from ..mock_observables_helpers import get_period
 from ...utils.array_utils import array_is_monotonic, custom_len
 
 
@@ -47,6 +49,8 @@ def npairs_3d(sample1, sample2, rbins, period=None,
     sample2 : array_like
         Numpy array of shape (Npts2, 3) containing 3-D positions of points.
         Should be identical to sample1 for cases of auto-sample pair counts.
+        Either sample may instead be a `~halotools.mock_observables.ChunkedSample`
+        for samples too large to be stored in memory.
 
     rbins : array_like
         Boundaries defining the bins in which pairs are counted.
@@ -111,6 +115,14 @@ def npairs_3d(sample1, sample2, rbins, period=None,
     >>> result = npairs_3d(sample1, sample2, rbins, period = period)
 
     """
+    if isinstance(sample1, ChunkedSample) or isinstance(sample2, ChunkedSample):
+        def counter(positions1, columns1, positions2, columns2):
+            return npairs_3d(positions1, positions2, rbins, period=period, verbose=verbose,
+                num_threads=num_threads, approx_cell1_size=approx_cell1_size,
+                approx_cell2_size=approx_cell2_size)
+        rbins = np.atleast_1d(rbins)
+        return _chunked_pair_counts(counter, sample1, sample2, np.max(rbins),
+            get_period(period)[0], np.zeros(len(rbins), dtype=int))
 
     # Process the inputs with the helper function
     result = _npairs_3d_process_args(sample1, sample2, rbins, period,
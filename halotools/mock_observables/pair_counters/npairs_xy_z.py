@@ -9,7 +9,9 @@ from functools import partial
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import (_set_approximate_cell_sizes, _enclose_in_box,
     _cell1_parallelization_indices)
-from .cpairs import npairs_xy_z_engine
+from .cpairs import npairs_xy_z_engine, npairs_xy_z_multi_los_engine
+from ..chunked_sample import ChunkedSample, _chunked_pair_counts
+from ..mock_observables_helpers import get_period, get_line_of_sight_axes
 from ...utils.array_utils import array_is_monotonic, custom_len
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
@@ -19,7 +21,7 @@ __all__ = ('npairs_xy_z', )
 
 def npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=None,
         verbose=False, num_threads=1,
-        approx_cell1_size=None, approx_cell2_size=None):
+        approx_cell1_size=None, approx_cell2_size=None, los_axes=None):
     """
     Function counts the number of pairs of points with separation in the xy-plane
     less than the input ``rp_bins`` and separation in the z-dimension less than
@@ -49,6 +51,8 @@ def npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=None,
         Numpy array of shape (Npts2, 3) containing 3-D positions of points.
         Should be identical to sample1 for cases of auto-sample pair counts.
         Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+        Either sample may instead be a `~halotools.mock_observables.ChunkedSample`
+        for samples too large to be stored in memory.
 
     rp_bins : array_like
         array of boundaries defining the radial bins perpendicular to the LOS in which
@@ -91,10 +95,20 @@ def npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=None,
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
         ``approx_cell1_size`` for details.
 
+    los_axes : sequence, optional
+        Sequence of Cartesian axes, each one of 'x', 'y' or 'z', to be used
+        in turn as the line-of-sight, e.g., ``('x', 'y', 'z')``.
+        The pairs are counted for all lines-of-sight during a single pass over
+        the pairs of points. Default is None, in which case the z-axis is
+        the line-of-sight.
+
     Returns
     -------
     num_pairs : array_like
-        Numpy array of length len(rp_bins) storing the numbers of pairs in the input bins.
+        Numpy array of shape (len(rp_bins), len(pi_bins)) storing the numbers of pairs
+        in the input bins. If ``los_axes`` is not None, the returned array has shape
+        (len(los_axes), len(rp_bins), len(pi_bins)), where ``num_pairs[i]`` stores
+        the pairs counted with ``los_axes[i]`` as the line-of-sight.
 
     Examples
     --------
@@ -122,18 +136,44 @@ def npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=None,
 
     >>> result = npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period = period)
 
+    The pairs can be counted using each of the three Cartesian axes as the line-of-sight
+    with a single traversal of the pairs:
+
+    >>> result = npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=period, los_axes=('x', 'y', 'z'))
+    >>> assert result.shape == (3, len(rp_bins), len(pi_bins))
+
     """
+    if isinstance(sample1, ChunkedSample) or isinstance(sample2, ChunkedSample):
+        def counter(positions1, columns1, positions2, columns2):
+            return npairs_xy_z(positions1, positions2, rp_bins, pi_bins, period=period,
+                verbose=verbose, num_threads=num_threads,
+                approx_cell1_size=approx_cell1_size, approx_cell2_size=approx_cell2_size,
+                los_axes=los_axes)
+        rp_bins, pi_bins = np.atleast_1d(rp_bins), np.atleast_1d(pi_bins)
+        shape = (len(rp_bins), len(pi_bins))
+        search_length = np.max(rp_bins)
+        if los_axes is not None:
+            shape = (len(get_line_of_sight_axes(los_axes)), ) + shape
+            search_length = max(search_length, np.max(pi_bins))
+        return _chunked_pair_counts(counter, sample1, sample2, search_length,
+            get_period(period)[0], np.zeros(shape, dtype=int))
 
     # Process the inputs with the helper function
     result = _npairs_xy_z_process_args(sample1, sample2, rp_bins, pi_bins, period,
-            verbose, num_threads, approx_cell1_size, approx_cell2_size)
+            verbose, num_threads, approx_cell1_size, approx_cell2_size, los_axes)
     x1in, y1in, z1in, x2in, y2in, z2in = result[0:6]
     rp_bins, pi_bins, period, num_threads, PBCs, approx_cell1_size, approx_cell2_size = result[6:]
+    if los_axes is not None:
+        los_axes = get_line_of_sight_axes(los_axes)
     xperiod, yperiod, zperiod = period
 
     rp_max = np.max(rp_bins)
     pi_max = np.max(pi_bins)
-    search_xlength, search_ylength, search_zlength = rp_max, rp_max, pi_max
+    if los_axes is None:
+        search_xlength, search_ylength, search_zlength = rp_max, rp_max, pi_max
+    else:
+        # every dimension may be the line-of-sight or lie in the projected plane
+        search_xlength = search_ylength = search_zlength = max(rp_max, pi_max)
 
     # Compute the estimates for the cell sizes
     approx_cell1_size, approx_cell2_size = (
@@ -149,8 +189,12 @@ def npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=None,
         search_xlength, search_ylength, search_zlength, xperiod, yperiod, zperiod, PBCs)
 
     # # Create a function object that has a single argument, for parallelization purposes
-    engine = partial(npairs_xy_z_engine,
-        double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, rp_bins, pi_bins)
+    if los_axes is None:
+        engine = partial(npairs_xy_z_engine,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, rp_bins, pi_bins)
+    else:
+        engine = partial(npairs_xy_z_multi_los_engine,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, rp_bins, pi_bins, los_axes)
 
     # # Calculate the cell1 indices that will be looped over by the engine
     num_threads, cell1_tuples = _cell1_parallelization_indices(
@@ -168,7 +212,7 @@ def npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=None,
 
 
 def _npairs_xy_z_process_args(sample1, sample2, rp_bins, pi_bins, period,
-        verbose, num_threads, approx_cell1_size, approx_cell2_size):
+        verbose, num_threads, approx_cell1_size, approx_cell2_size, los_axes=None):
     """
     """
     if num_threads is not 1:
@@ -209,12 +253,18 @@ def _npairs_xy_z_process_args(sample1, sample2, rp_bins, pi_bins, period,
         raise ValueError(msg)
     pi_max = np.max(pi_bins)
 
+    if los_axes is None:
+        search_length = np.array((rp_max, rp_max, pi_max))
+    else:
+        los_axes = get_line_of_sight_axes(los_axes)
+        search_length = np.zeros(3) + max(rp_max, pi_max)
+
     # Set the boolean value for the PBCs variable
     if period is None:
         PBCs = False
         x1, y1, z1, x2, y2, z2, period = (
             _enclose_in_box(x1, y1, z1, x2, y2, z2,
-                min_size=[rp_max*3.0, rp_max*3.0, pi_max*3.0]))
+                min_size=search_length*3.0))
     else:
         PBCs = True
         period = np.atleast_1d(period).astype(float)
@@ -236,12 +286,20 @@ def _npairs_xy_z_process_args(sample1, sample2, rp_bins, pi_bins, period,
             "positive scalar less than period[2]/3 = %.2f" % (pi_max, min_required_pi_max))
         raise ValueError(msg)
 
+    if los_axes is not None:
+        try:
+            assert np.all(search_length < period/3.)
+        except AssertionError:
+            msg = ("When passing ``los_axes``, both ``rp_max`` = %.2f and ``pi_max`` = %.2f \n"
+                "must be less than period/3 in every dimension" % (rp_max, pi_max))
+            raise ValueError(msg)
+
     if approx_cell1_size is None:
-        approx_cell1_size = [rp_max, rp_max, pi_max]
+        approx_cell1_size = list(search_length)
     elif custom_len(approx_cell1_size) == 1:
         approx_cell1_size = [approx_cell1_size, approx_cell1_size, approx_cell1_size]
     if approx_cell2_size is None:
-        approx_cell2_size = [rp_max, rp_max, pi_max]
+        approx_cell2_size = list(search_length)
     elif custom_len(approx_cell2_size) == 1:
         approx_cell2_size = [approx_cell2_size, approx_cell2_size, approx_cell2_size]
 
@@ -9,6 +9,7 @@ from astropy.config.paths import _find_home
 
 from ..pairs import wnpairs as pure_python_weighted_pairs
 from ..marked_npairs_3d import marked_npairs_3d, _func_signature_int_from_wfunc
+from ..marked_npairs_3d import _marked_npairs_3d_multi_weights
 
 from ....custom_exceptions import HalotoolsError
 
@@ -411,3 +412,39 @@ def test_marked_npairs_behavior_weight_func_id10():
     result = marked_npairs_3d(grid_points, grid_points, rbins, period=period,
     weights1=weights, weights2=weights, weight_func_id=10, approx_cell1_size=[rmax, rmax, rmax])
     assert np.all(result == -3*test_result), error_msg
+
+
+def test_marked_npairs_3d_multi_weights():
+    """ Verify that counting pairs for several sets of weights in a single pass
+    agrees with separate calls to `marked_npairs_3d`.
+    """
+    Npts1, Npts2, num_sets = 200, 150, 4
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((Npts1, 3))
+        sample2 = np.random.random((Npts2, 3))
+        weights1 = np.random.random((num_sets, Npts1, 1))
+        weights2 = np.random.random((num_sets, Npts2, 1))
+    rbins = np.array([0.0, 0.05, 0.1, 0.2])
+
+    result = _marked_npairs_3d_multi_weights(sample1, sample2, rbins,
+        weights1, weights2, period=1, weight_func_id=1)
+    assert result.shape == (num_sets, len(rbins))
+
+    for k in range(num_sets):
+        correct_result = marked_npairs_3d(sample1, sample2, rbins, period=1,
+            weights1=weights1[k, :, 0], weights2=weights2[k, :, 0], weight_func_id=1)
+        assert np.allclose(result[k], correct_result)
+
+
+def test_marked_npairs_3d_multi_weights_bad_shape():
+    Npts1, Npts2 = 20, 15
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((Npts1, 3))
+        sample2 = np.random.random((Npts2, 3))
+    rbins = np.array([0.0, 0.05, 0.1, 0.2])
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = _marked_npairs_3d_multi_weights(sample1, sample2, rbins,
+            np.ones((2, Npts1, 1)), np.ones((2, Npts2, 2)), period=1, weight_func_id=1)
+    substr = "must have shapes (K, Npts1, N_weights) and (K, Npts2, N_weights)"
+    assert substr in err.value.args[0]
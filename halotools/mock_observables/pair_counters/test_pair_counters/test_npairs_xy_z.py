@@ -307,3 +307,49 @@ def test_sensible_period():
         result = npairs_xy_z(data1, data2, rp_bins, pi_bins, period=np.inf)
     substr = "Input ``period`` must be a bounded positive number in all dimensions"
     assert substr in err.value.args[0]
+
+
+@pytest.mark.parametrize('period', (1., None))
+def test_npairs_xy_z_los_axes(period):
+    """ Verify that counting pairs for several lines-of-sight at once
+    agrees with counting pairs separately in each permutation of the coordinates.
+    """
+    npts1, npts2 = 500, 400
+    with NumpyRNGContext(fixed_seed):
+        data1 = np.random.random((npts1, 3))
+        data2 = np.random.random((npts2, 3))
+    rp_bins = np.array((0.01, 0.05, 0.1, 0.2))
+    pi_bins = np.array((0.02, 0.1, 0.25))
+
+    los_axes = ('y', 'x', 'z')
+    result = npairs_xy_z(data1, data2, rp_bins, pi_bins, period=period, los_axes=los_axes)
+    assert result.shape == (3, len(rp_bins), len(pi_bins))
+
+    permutations = {'x': [1, 2, 0], 'y': [2, 0, 1], 'z': [0, 1, 2]}
+    for i, los in enumerate(los_axes):
+        perm = permutations[los]
+        correct_result = npairs_xy_z(data1[:, perm], data2[:, perm], rp_bins, pi_bins, period=period)
+        assert np.all(result[i] == correct_result)
+
+    result2 = npairs_xy_z(data1, data2, rp_bins, pi_bins, period=period,
+        los_axes=los_axes, num_threads=2)
+    assert np.all(result == result2)
+
+
+def test_npairs_xy_z_bad_los_axes():
+    npts1, npts2 = 100, 100
+    with NumpyRNGContext(fixed_seed):
+        data1 = np.random.random((npts1, 3))
+        data2 = np.random.random((npts2, 3))
+    rp_bins = np.array((0.01, 0.05, 0.1))
+    pi_bins = np.array((0.05, 0.1))
+
+    with pytest.raises(ValueError) as err:
+        __ = npairs_xy_z(data1, data2, rp_bins, pi_bins, period=1, los_axes=('x', 'x'))
+    substr = "Input ``los_axes`` must be a non-empty sequence of distinct axes"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(ValueError) as err:
+        __ = npairs_xy_z(data1, data2, (0.1, 0.2, 0.35), pi_bins, period=1, los_axes=('x', 'z'))
+    substr = "must be less than period/3 in every dimension"
+    assert substr in err.value.args[0]
@@ -0,0 +1,111 @@
+""" Module providing unit-testing of the registration of
+compiled weighting functions with the marked pair counters.
+"""
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..marked_npairs_3d import marked_npairs_3d, _func_signature_int_from_wfunc
+from ..marked_npairs_xy_z import marked_npairs_xy_z
+from ..marked_cpairs import marking_functions
+from ..marked_cpairs.weighting_function_registry import (register_weighting_function,
+    unregister_weighting_function, _weighting_function_address)
+
+from ....custom_exceptions import HalotoolsError
+
+__all__ = ('test_registered_weighting_function_3d', )
+
+fixed_seed = 43
+
+
+def _random_sample_and_weights(npts, num_weights):
+    with NumpyRNGContext(fixed_seed):
+        sample = np.random.random((npts, 3))
+        weights = np.random.random((npts, num_weights))
+        weights[:, 0] = np.random.randint(0, 3, npts)
+    return sample, weights
+
+
+def test_registered_weighting_function_3d():
+    """ Verify that a registered copy of the inequality weights
+    agrees with the built-in function.
+    """
+    sample, weights = _random_sample_and_weights(500, 2)
+    rbins = np.linspace(0.01, 0.2, 5)
+
+    weight_func_id = register_weighting_function(
+        marking_functions.__pyx_capi__['ineqweights'], 2)
+    try:
+        assert _func_signature_int_from_wfunc(weight_func_id) == 2
+        result = marked_npairs_3d(sample, sample, rbins, period=1,
+            weights1=weights, weights2=weights, weight_func_id=weight_func_id)
+        correct_result = marked_npairs_3d(sample, sample, rbins, period=1,
+            weights1=weights, weights2=weights, weight_func_id=4)
+        assert np.all(result == correct_result)
+
+        result = marked_npairs_3d(sample, sample, rbins, period=1,
+            weights1=weights, weights2=weights, weight_func_id=weight_func_id, num_threads=2)
+        assert np.allclose(result, correct_result)
+    finally:
+        unregister_weighting_function(weight_func_id)
+
+
+def test_registered_weighting_function_xy_z():
+    """ Verify that the inlined product and equality weights agree with registered
+    copies of the same functions called through a pointer.
+    """
+    sample, weights = _random_sample_and_weights(500, 2)
+    rp_bins = np.linspace(0.01, 0.2, 5)
+    pi_bins = np.linspace(0.01, 0.2, 4)
+
+    for name, builtin_id, num_weights in (('mweights', 1, 1), ('eqweights', 3, 2)):
+        address = _weighting_function_address(marking_functions.__pyx_capi__[name])
+        weight_func_id = register_weighting_function(address, num_weights)
+        try:
+            w = weights[:, 1:] if num_weights == 1 else weights
+            result = marked_npairs_xy_z(sample, sample, rp_bins, pi_bins, period=1,
+                weights1=w, weights2=w, weight_func_id=weight_func_id)
+            correct_result = marked_npairs_xy_z(sample, sample, rp_bins, pi_bins, period=1,
+                weights1=w, weights2=w, weight_func_id=builtin_id)
+            assert np.allclose(result, correct_result, rtol=1e-10)
+        finally:
+            unregister_weighting_function(weight_func_id)
+
+
+def test_registered_weighting_function_wrong_shape():
+    sample, weights = _random_sample_and_weights(50, 2)
+    rbins = np.linspace(0.01, 0.2, 5)
+
+    weight_func_id = register_weighting_function(
+        marking_functions.__pyx_capi__['mweights'], 1)
+    try:
+        with pytest.raises(HalotoolsError):
+            __ = marked_npairs_3d(sample, sample, rbins, period=1,
+                weights1=weights, weights2=weights, weight_func_id=weight_func_id)
+    finally:
+        unregister_weighting_function(weight_func_id)
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = marked_npairs_3d(sample, sample, rbins, period=1,
+            weights1=weights, weights2=weights, weight_func_id=weight_func_id)
+    substr = "is not recognized"
+    assert substr in err.value.args[0]
+
+
+def test_register_weighting_function_exceptions():
+    with pytest.raises(HalotoolsError) as err:
+        __ = register_weighting_function(np.sum, 1)
+    substr = "The input ``func`` must be a numba cfunc"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = register_weighting_function(marking_functions.__pyx_capi__['mweights'], 0)
+    substr = "The input ``num_weights`` must be a positive integer."
+    assert substr in err.value.args[0]
+
+    with pytest.raises(HalotoolsError) as err:
+        unregister_weighting_function(100)
+    substr = "is not a registered weighting function"
+    assert substr in err.value.args[0]
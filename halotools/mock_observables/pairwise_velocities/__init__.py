@@ -9,6 +9,8 @@ from .mean_los_velocity_vs_rp import mean_los_velocity_vs_rp
 from .los_pvd_vs_rp import los_pvd_vs_rp
 from .velocity_marked_npairs_3d import velocity_marked_npairs_3d
 from .velocity_marked_npairs_xy_z import velocity_marked_npairs_xy_z
+from .velocity_moments import radial_velocity_moments_vs_r, los_velocity_moments_vs_rp
 
 __all__ = ('mean_radial_velocity_vs_r', 'radial_pvd_vs_r',
-    'mean_los_velocity_vs_rp', 'los_pvd_vs_rp')
+    'mean_los_velocity_vs_rp', 'los_pvd_vs_rp',
+    'radial_velocity_moments_vs_r', 'los_velocity_moments_vs_rp')
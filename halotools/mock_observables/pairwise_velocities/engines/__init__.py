@@ -2,3 +2,4 @@ from .velocity_marked_npairs_3d_engine import velocity_marked_npairs_3d_engine
 from .velocity_marked_npairs_xy_z_engine import velocity_marked_npairs_xy_z_engine
 from .mean_radial_velocity_vs_r_engine import mean_radial_velocity_vs_r_engine
 from .radial_pvd_vs_r_engine import radial_pvd_vs_r_engine
+from .velocity_moments_engine import velocity_moments_3d_engine, velocity_moments_xy_z_engine
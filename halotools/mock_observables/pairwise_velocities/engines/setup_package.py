@@ -6,7 +6,8 @@ SOURCES = ("velocity_marked_npairs_3d_engine.pyx",
     "velocity_marking_functions.pyx",
     "velocity_marked_npairs_xy_z_engine.pyx",
     "mean_radial_velocity_vs_r_engine.pyx",
-    "radial_pvd_vs_r_engine.pyx")
+    "radial_pvd_vs_r_engine.pyx",
+    "velocity_moments_engine.pyx")
 
 THIS_PKG_NAME = '.'.join(__name__.split('.')[:-1])
 
@@ -0,0 +1,443 @@
+"""
+Cython engines accumulating the first four moments of the distribution of
+pairwise velocities in a single traversal of the mesh.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+cimport numpy as cnp
+cimport cython
+from libc.math cimport sqrt as c_sqrt
+
+
+__author__ = ('Andrew Hearin', )
+__all__ = ('velocity_moments_3d_engine', 'velocity_moments_xy_z_engine')
+
+# Number of quantities accumulated in each bin: the number of pairs,
+# the running mean, and the sums of the 2nd, 3rd and 4th powers
+# of the deviations from the running mean
+DEF NUM_MOMENTS = 5
+
+
+@cython.cdivision(True)
+cdef inline void add_sample(cnp.float64_t* m, cnp.float64_t x) nogil:
+    """
+    Add the value x to the running moments m = (n, mean, M2, M3, M4)
+    with the one-pass update of Welford (1962), generalized to
+    the third and fourth moments by Pebay (2008).
+    """
+    cdef cnp.float64_t n1 = m[0]
+    cdef cnp.float64_t n = n1 + 1.
+    cdef cnp.float64_t delta = x - m[1]
+    cdef cnp.float64_t delta_n = delta/n
+    cdef cnp.float64_t delta_n2 = delta_n*delta_n
+    cdef cnp.float64_t term1 = delta*delta_n*n1
+
+    m[0] = n
+    m[1] += delta_n
+    m[4] += term1*delta_n2*(n*n - 3.*n + 3.) + 6.*delta_n2*m[2] - 4.*delta_n*m[3]
+    m[3] += term1*delta_n*(n - 2.) - 3.*delta_n*m[2]
+    m[2] += term1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def velocity_moments_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+    vx1in, vy1in, vz1in, vx2in, vy2in, vz2in,
+    squared_normalize_rbins_by_in, rbins_normalized, cell1_tuple):
+    """ Cython engine accumulating the moments of the pairwise radial velocity
+    in bins of three-dimensional separation.
+
+    Parameters
+    ------------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+
+    x1in, y1in, z1in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 1
+
+    x2in, y2in, z2in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 2
+
+    vx1in, vy1in, vz1in : arrays
+        Numpy arrays storing the velocities of points in sample 1
+
+    vx2in, vy2in, vz2in : arrays
+        Numpy arrays storing the velocities of points in sample 2
+
+    squared_normalize_rbins_by_in : array
+        Numpy array storing the squared length scale normalizing
+        the separation of each point in sample 1
+
+    rbins_normalized : array
+        Boundaries defining the bins of normalized separation.
+
+    cell1_tuple : tuple
+        Two-element tuple defining the first and last cells in
+        double_mesh.mesh1 that will be looped over. Intended for use with
+        python multiprocessing.
+
+    Returns
+    --------
+    moments : array
+        Array of shape (5, len(rbins_normalized)-1) storing, in each bin,
+        the number of pairs, the mean pairwise radial velocity,
+        and the sums of the 2nd, 3rd and 4th powers of the deviations from the mean.
+        Pairs are assigned to bin k if rbins_normalized[k] < r <= rbins_normalized[k+1].
+    """
+    cdef cnp.float64_t[:] rbins_normalized_squared = rbins_normalized*rbins_normalized
+    cdef cnp.float64_t xperiod = double_mesh.xperiod
+    cdef cnp.float64_t yperiod = double_mesh.yperiod
+    cdef cnp.float64_t zperiod = double_mesh.zperiod
+    cdef cnp.int64_t first_cell1_element = cell1_tuple[0]
+    cdef cnp.int64_t last_cell1_element = cell1_tuple[1]
+    cdef int PBCs = double_mesh._PBCs
+
+    cdef int num_rbins_normalized = len(rbins_normalized)
+    cdef cnp.float64_t rmax_squared = rbins_normalized_squared[num_rbins_normalized-1]
+    cdef cnp.float64_t rmin_squared = rbins_normalized_squared[0]
+    cdef cnp.float64_t[:, ::1] moments = np.zeros(
+        (num_rbins_normalized-1, NUM_MOMENTS), dtype=np.float64)
+
+    cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z1 = np.ascontiguousarray(z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] x2 = np.ascontiguousarray(x2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y2 = np.ascontiguousarray(y2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z2 = np.ascontiguousarray(z2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] vx1 = np.ascontiguousarray(vx1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] vy1 = np.ascontiguousarray(vy1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] vz1 = np.ascontiguousarray(vz1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] vx2 = np.ascontiguousarray(vx2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] vy2 = np.ascontiguousarray(vy2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] vz2 = np.ascontiguousarray(vz2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+
+    cdef cnp.float64_t[:] squared_normalize_rbins_by = np.ascontiguousarray(
+        squared_normalize_rbins_by_in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+
+    cdef cnp.int64_t icell1, icell2
+    cdef cnp.int64_t[:] cell1_indices = np.ascontiguousarray(double_mesh.mesh1.cell_id_indices, dtype=np.int64)
+    cdef cnp.int64_t[:] cell2_indices = np.ascontiguousarray(double_mesh.mesh2.cell_id_indices, dtype=np.int64)
+
+    cdef cnp.int64_t ifirst1, ilast1, ifirst2, ilast2
+
+    cdef int ix2, iy2, iz2, ix1, iy1, iz1
+    cdef int nonPBC_ix2, nonPBC_iy2, nonPBC_iz2
+
+    cdef int num_x2_covering_steps = int(np.ceil(
+        double_mesh.search_xlength / double_mesh.mesh2.xcell_size))
+    cdef int num_y2_covering_steps = int(np.ceil(
+        double_mesh.search_ylength / double_mesh.mesh2.ycell_size))
+    cdef int num_z2_covering_steps = int(np.ceil(
+        double_mesh.search_zlength / double_mesh.mesh2.zcell_size))
+
+    cdef int leftmost_ix2, rightmost_ix2
+    cdef int leftmost_iy2, rightmost_iy2
+    cdef int leftmost_iz2, rightmost_iz2
+
+    cdef int num_x1divs = double_mesh.mesh1.num_xdivs
+    cdef int num_y1divs = double_mesh.mesh1.num_ydivs
+    cdef int num_z1divs = double_mesh.mesh1.num_zdivs
+    cdef int num_x2divs = double_mesh.mesh2.num_xdivs
+    cdef int num_y2divs = double_mesh.mesh2.num_ydivs
+    cdef int num_z2divs = double_mesh.mesh2.num_zdivs
+    cdef int num_x2_per_x1 = num_x2divs // num_x1divs
+    cdef int num_y2_per_y1 = num_y2divs // num_y1divs
+    cdef int num_z2_per_z1 = num_z2divs // num_z1divs
+
+    cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dvx, dvy, dvz, drsq, normed_drsq, vrad
+    cdef cnp.float64_t x1tmp, y1tmp, z1tmp, vx1tmp, vy1tmp, vz1tmp, distance_norm1tmp
+    cdef cnp.int64_t i, j
+    cdef int k
+
+    for icell1 in range(first_cell1_element, last_cell1_element):
+
+        ifirst1 = cell1_indices[icell1]
+        ilast1 = cell1_indices[icell1+1]
+
+        if ilast1 > ifirst1:
+
+            ix1 = icell1 // (num_y1divs*num_z1divs)
+            iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
+            iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
+
+            leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
+            leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
+            leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
+
+            rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
+            rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
+            rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
+
+            for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
+                if nonPBC_ix2 < 0:
+                    x2shift = -xperiod*PBCs
+                elif nonPBC_ix2 >= num_x2divs:
+                    x2shift = +xperiod*PBCs
+                else:
+                    x2shift = 0.
+                # Now apply the PBCs
+                ix2 = nonPBC_ix2 % num_x2divs
+
+                for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
+                    if nonPBC_iy2 < 0:
+                        y2shift = -yperiod*PBCs
+                    elif nonPBC_iy2 >= num_y2divs:
+                        y2shift = +yperiod*PBCs
+                    else:
+                        y2shift = 0.
+                    # Now apply the PBCs
+                    iy2 = nonPBC_iy2 % num_y2divs
+
+                    for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
+                        if nonPBC_iz2 < 0:
+                            z2shift = -zperiod*PBCs
+                        elif nonPBC_iz2 >= num_z2divs:
+                            z2shift = +zperiod*PBCs
+                        else:
+                            z2shift = 0.
+                        #  Now apply the PBCs
+                        iz2 = nonPBC_iz2 % num_z2divs
+
+                        icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                        ifirst2 = cell2_indices[icell2]
+                        ilast2 = cell2_indices[icell2+1]
+
+                        if ilast2 > ifirst2:
+                            for i in range(ifirst1, ilast1):
+                                x1tmp = x1[i] - x2shift
+                                y1tmp = y1[i] - y2shift
+                                z1tmp = z1[i] - z2shift
+                                distance_norm1tmp = squared_normalize_rbins_by[i]
+
+                                vx1tmp = vx1[i]
+                                vy1tmp = vy1[i]
+                                vz1tmp = vz1[i]
+                                #loop over points in cell2 points
+                                for j in range(ifirst2, ilast2):
+
+                                    #  Calculate radial vector
+                                    #  Note that due to the application of the shift above,
+                                    #  dx gets a sign flip when PBCs are applied
+                                    dx = x1tmp - x2[j]
+                                    dy = y1tmp - y2[j]
+                                    dz = z1tmp - z2[j]
+
+                                    drsq = dx*dx + dy*dy + dz*dz
+                                    if drsq == 0:
+                                        continue
+                                    normed_drsq = drsq/distance_norm1tmp
+                                    if (normed_drsq <= rmin_squared) | (normed_drsq > rmax_squared):
+                                        continue
+
+                                    #  Find the bin enclosing the pair
+                                    k = num_rbins_normalized-2
+                                    while normed_drsq <= rbins_normalized_squared[k]:
+                                        k = k-1
+
+                                    dvx = vx1tmp - vx2[j]
+                                    dvy = vy1tmp - vy2[j]
+                                    dvz = vz1tmp - vz2[j]
+                                    vrad = (dx*dvx + dy*dvy + dz*dvz)/c_sqrt(drsq)
+                                    add_sample(&moments[k, 0], vrad)
+
+    return np.array(moments).T
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def velocity_moments_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+    vx1in, vy1in, vz1in, vx2in, vy2in, vz2in, rp_bins, pi_bins, cell1_tuple):
+    """ Cython engine accumulating the moments of the pairwise line-of-sight velocity
+    in bins of separation perpendicular and parallel to the line-of-sight,
+    which is taken to be the z-direction.
+
+    Parameters
+    ------------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+
+    x1in, y1in, z1in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 1
+
+    x2in, y2in, z2in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 2
+
+    vx1in, vy1in, vz1in : arrays
+        Numpy arrays storing the velocities of points in sample 1
+
+    vx2in, vy2in, vz2in : arrays
+        Numpy arrays storing the velocities of points in sample 2
+
+    rp_bins : array
+        Boundaries defining the bins of separation in the xy-plane.
+
+    pi_bins : array
+        Boundaries defining the bins of separation along the z-direction.
+
+    cell1_tuple : tuple
+        Two-element tuple defining the first and last cells in
+        double_mesh.mesh1 that will be looped over. Intended for use with
+        python multiprocessing.
+
+    Returns
+    --------
+    moments : array
+        Array of shape (5, len(rp_bins)-1, len(pi_bins)-1) storing, in each bin,
+        the number of pairs, the mean pairwise line-of-sight velocity,
+        and the sums of the 2nd, 3rd and 4th powers of the deviations from the mean.
+    """
+    cdef cnp.float64_t[:] rp_bins_squared = rp_bins*rp_bins
+    cdef cnp.float64_t[:] pi_bins_squared = pi_bins*pi_bins
+    cdef cnp.float64_t xperiod = double_mesh.xperiod
+    cdef cnp.float64_t yperiod = double_mesh.yperiod
+    cdef cnp.float64_t zperiod = double_mesh.zperiod
+    cdef cnp.int64_t first_cell1_element = cell1_tuple[0]
+    cdef cnp.int64_t last_cell1_element = cell1_tuple[1]
+    cdef int PBCs = double_mesh._PBCs
+
+    cdef int num_rp_bins = len(rp_bins)
+    cdef int num_pi_bins = len(pi_bins)
+    cdef cnp.float64_t rp_max_squared = rp_bins_squared[num_rp_bins-1]
+    cdef cnp.float64_t rp_min_squared = rp_bins_squared[0]
+    cdef cnp.float64_t pi_max_squared = pi_bins_squared[num_pi_bins-1]
+    cdef cnp.float64_t pi_min_squared = pi_bins_squared[0]
+    cdef cnp.float64_t[:, :, ::1] moments = np.zeros(
+        (num_rp_bins-1, num_pi_bins-1, NUM_MOMENTS), dtype=np.float64)
+
+    cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z1 = np.ascontiguousarray(z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] x2 = np.ascontiguousarray(x2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y2 = np.ascontiguousarray(y2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z2 = np.ascontiguousarray(z2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] vz1 = np.ascontiguousarray(vz1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] vz2 = np.ascontiguousarray(vz2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+
+    cdef cnp.int64_t icell1, icell2
+    cdef cnp.int64_t[:] cell1_indices = np.ascontiguousarray(double_mesh.mesh1.cell_id_indices, dtype=np.int64)
+    cdef cnp.int64_t[:] cell2_indices = np.ascontiguousarray(double_mesh.mesh2.cell_id_indices, dtype=np.int64)
+
+    cdef cnp.int64_t ifirst1, ilast1, ifirst2, ilast2
+
+    cdef int ix2, iy2, iz2, ix1, iy1, iz1
+    cdef int nonPBC_ix2, nonPBC_iy2, nonPBC_iz2
+
+    cdef int num_x2_covering_steps = int(np.ceil(
+        double_mesh.search_xlength / double_mesh.mesh2.xcell_size))
+    cdef int num_y2_covering_steps = int(np.ceil(
+        double_mesh.search_ylength / double_mesh.mesh2.ycell_size))
+    cdef int num_z2_covering_steps = int(np.ceil(
+        double_mesh.search_zlength / double_mesh.mesh2.zcell_size))
+
+    cdef int leftmost_ix2, rightmost_ix2
+    cdef int leftmost_iy2, rightmost_iy2
+    cdef int leftmost_iz2, rightmost_iz2
+
+    cdef int num_x1divs = double_mesh.mesh1.num_xdivs
+    cdef int num_y1divs = double_mesh.mesh1.num_ydivs
+    cdef int num_z1divs = double_mesh.mesh1.num_zdivs
+    cdef int num_x2divs = double_mesh.mesh2.num_xdivs
+    cdef int num_y2divs = double_mesh.mesh2.num_ydivs
+    cdef int num_z2divs = double_mesh.mesh2.num_zdivs
+    cdef int num_x2_per_x1 = num_x2divs // num_x1divs
+    cdef int num_y2_per_y1 = num_y2divs // num_y1divs
+    cdef int num_z2_per_z1 = num_z2divs // num_z1divs
+
+    cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dxy_sq, dz_sq, dvz
+    cdef cnp.float64_t x1tmp, y1tmp, z1tmp, vz1tmp
+    cdef cnp.int64_t i, j
+    cdef int k, g
+
+    for icell1 in range(first_cell1_element, last_cell1_element):
+
+        ifirst1 = cell1_indices[icell1]
+        ilast1 = cell1_indices[icell1+1]
+
+        if ilast1 > ifirst1:
+
+            ix1 = icell1 // (num_y1divs*num_z1divs)
+            iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
+            iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
+
+            leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
+            leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
+            leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
+
+            rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
+            rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
+            rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
+
+            for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
+                if nonPBC_ix2 < 0:
+                    x2shift = -xperiod*PBCs
+                elif nonPBC_ix2 >= num_x2divs:
+                    x2shift = +xperiod*PBCs
+                else:
+                    x2shift = 0.
+                # Now apply the PBCs
+                ix2 = nonPBC_ix2 % num_x2divs
+
+                for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
+                    if nonPBC_iy2 < 0:
+                        y2shift = -yperiod*PBCs
+                    elif nonPBC_iy2 >= num_y2divs:
+                        y2shift = +yperiod*PBCs
+                    else:
+                        y2shift = 0.
+                    # Now apply the PBCs
+                    iy2 = nonPBC_iy2 % num_y2divs
+
+                    for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
+                        if nonPBC_iz2 < 0:
+                            z2shift = -zperiod*PBCs
+                        elif nonPBC_iz2 >= num_z2divs:
+                            z2shift = +zperiod*PBCs
+                        else:
+                            z2shift = 0.
+                        #  Now apply the PBCs
+                        iz2 = nonPBC_iz2 % num_z2divs
+
+                        icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                        ifirst2 = cell2_indices[icell2]
+                        ilast2 = cell2_indices[icell2+1]
+
+                        if ilast2 > ifirst2:
+                            for i in range(ifirst1, ilast1):
+                                x1tmp = x1[i] - x2shift
+                                y1tmp = y1[i] - y2shift
+                                z1tmp = z1[i] - z2shift
+                                vz1tmp = vz1[i]
+                                #loop over points in cell2 points
+                                for j in range(ifirst2, ilast2):
+                                    dx = x1tmp - x2[j]
+                                    dy = y1tmp - y2[j]
+                                    dz = z1tmp - z2[j]
+                                    dxy_sq = dx*dx + dy*dy
+                                    dz_sq = dz*dz
+
+                                    if (dxy_sq <= rp_min_squared) | (dxy_sq > rp_max_squared):
+                                        continue
+                                    if (dz_sq <= pi_min_squared) | (dz_sq > pi_max_squared):
+                                        continue
+
+                                    #  Find the bin enclosing the pair
+                                    k = num_rp_bins-2
+                                    while dxy_sq <= rp_bins_squared[k]:
+                                        k = k-1
+                                    g = num_pi_bins-2
+                                    while dz_sq <= pi_bins_squared[g]:
+                                        g = g-1
+
+                                    #  Relative LOS velocity, positive for receding pairs.
+                                    #  Note that due to the application of the shift above,
+                                    #  dz gets a sign flip when PBCs are applied
+                                    if dz > 0:
+                                        dvz = vz1tmp - vz2[j]
+                                    else:
+                                        dvz = vz2[j] - vz1tmp
+                                    add_sample(&moments[k, g, 0], dvz)
+
+    return np.moveaxis(np.array(moments), -1, 0)
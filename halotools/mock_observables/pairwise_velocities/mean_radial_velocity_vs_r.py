@@ -18,9 +18,12 @@ from functools import partial
 from ..pair_counters.mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
 from ..pair_counters.mesh_helpers import _enclose_in_box
 from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
+from ..chunked_sample import ChunkedSample, _chunked_pair_counts
 from ..mock_observables_helpers import (enforce_sample_has_correct_shape,
     get_period, get_num_threads)
 
+from ...custom_exceptions import HalotoolsError
+
 __all__ = ('mean_radial_velocity_vs_r', )
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 
@@ -44,6 +47,12 @@ def mean_radial_velocity_vs_r(sample1, velocities1,
     sample1 : array_like
         Numpy array of shape (npts1, 3) containing the 3-D positions of points.
 
+        For samples too large to be stored in memory, ``sample1`` and ``sample2``
+        may instead be a `~halotools.mock_observables.ChunkedSample`,
+        in which case ``velocities1`` and ``velocities2`` must be the names of
+        the columns of the chunked samples storing the velocities,
+        and the bins must be passed with ``rbins_absolute``.
+
     velocities1 : array_like
         Numpy array of shape (npts1, 3) containing the 3-D velocities.
 
@@ -166,6 +175,29 @@ def mean_radial_velocity_vs_r(sample1, velocities1,
     --------
     :ref:`galaxy_catalog_analysis_tutorial6`
 
+    """
+    if isinstance(sample1, ChunkedSample) or isinstance(sample2, ChunkedSample):
+        counts, vrad_sum = _chunked_mean_radial_velocity_sums(sample1, velocities1,
+            rbins_absolute, rbins_normalized, sample2, velocities2, period,
+            num_threads, approx_cell1_size, approx_cell2_size)
+    else:
+        counts, vrad_sum = _mean_radial_velocity_sums(sample1, velocities1,
+            rbins_absolute, rbins_normalized, normalize_rbins_by, sample2, velocities2,
+            period, num_threads, approx_cell1_size, approx_cell2_size, seed)
+
+    counts = np.diff(counts)
+    vrad_sum = np.diff(vrad_sum)
+
+    mean_radial_velocity = np.zeros(len(vrad_sum))
+    mean_radial_velocity[counts > 0] = vrad_sum[counts > 0]/counts[counts > 0]
+    return mean_radial_velocity
+
+
+def _mean_radial_velocity_sums(sample1, velocities1,
+        rbins_absolute, rbins_normalized, normalize_rbins_by, sample2, velocities2,
+        period, num_threads, approx_cell1_size, approx_cell2_size, seed):
+    """ Cumulative number of pairs and sum of their radial velocities
+    for samples stored in memory.
     """
     result = _process_args(sample1, velocities1, sample2, velocities2,
         rbins_absolute, rbins_normalized, normalize_rbins_by,
@@ -220,12 +252,47 @@ def mean_radial_velocity_vs_r(sample1, velocities1,
     else:
         counts, vrad_sum = np.array(engine(cell1_tuples[0]))
 
-    counts = np.diff(counts)
-    vrad_sum = np.diff(vrad_sum)
+    return counts, vrad_sum
 
-    mean_radial_velocity = np.zeros(len(vrad_sum))
-    mean_radial_velocity[counts > 0] = vrad_sum[counts > 0]/counts[counts > 0]
-    return mean_radial_velocity
+
+def _chunked_mean_radial_velocity_sums(sample1, velocities1, rbins_absolute, rbins_normalized,
+        sample2, velocities2, period, num_threads, approx_cell1_size, approx_cell2_size):
+    """ Cumulative number of pairs and sum of their radial velocities
+    accumulated over the chunks or slabs of samples passed as a `ChunkedSample`.
+    """
+    if (rbins_absolute is None) | (rbins_normalized is not None):
+        msg = ("\nWhen passing a ChunkedSample to ``mean_radial_velocity_vs_r``,\n"
+            "you must pass ``rbins_absolute`` rather than ``rbins_normalized``\n")
+        raise HalotoolsError(msg)
+
+    if sample2 is None:
+        sample2, velocities2 = sample1, velocities1
+
+    velocity_keys, in_memory_columns = [], []
+    for sample, velocities in ((sample1, velocities1), (sample2, velocities2)):
+        if isinstance(sample, ChunkedSample):
+            try:
+                assert velocities in sample.column_names
+            except (AssertionError, TypeError):
+                msg = ("\nWhen passing a ChunkedSample to ``mean_radial_velocity_vs_r``,\n"
+                    "the corresponding velocities must be the name of a column of the ChunkedSample\n")
+                raise HalotoolsError(msg)
+            velocity_keys.append(velocities)
+            in_memory_columns.append(None)
+        else:
+            velocity_keys.append('velocities')
+            in_memory_columns.append({'velocities': np.atleast_1d(velocities)})
+
+    def counter(positions1, columns1, positions2, columns2):
+        return np.array(_mean_radial_velocity_sums(
+            positions1, columns1[velocity_keys[0]], rbins_absolute, None, None,
+            positions2, columns2[velocity_keys[1]], period,
+            num_threads, approx_cell1_size, approx_cell2_size, None))
+
+    rbins_absolute = np.atleast_1d(rbins_absolute).astype(float)
+    return _chunked_pair_counts(counter, sample1, sample2, np.max(rbins_absolute),
+        get_period(period)[0], np.zeros((2, len(rbins_absolute))),
+        columns1=in_memory_columns[0], columns2=in_memory_columns[1])
 
 
 def _process_args(sample1, velocities1, sample2, velocities2,
@@ -286,12 +353,8 @@ def _process_args(sample1, velocities1, sample2, velocities2,
             msg = "Input ``period`` must be a bounded positive number in all dimensions"
             raise ValueError(msg)
 
-    sample1[:, 0] = x1
-    sample1[:, 1] = y1
-    sample1[:, 2] = z1
-    sample2[:, 0] = x2
-    sample2[:, 1] = y2
-    sample2[:, 2] = z2
+    sample1 = np.vstack((x1, y1, z1)).T
+    sample2 = np.vstack((x2, y2, z2)).T
 
     num_threads = get_num_threads(num_threads)
 
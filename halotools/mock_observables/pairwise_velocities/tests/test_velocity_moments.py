@@ -0,0 +1,150 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+from scipy.stats import skew, kurtosis
+
+from ..velocity_moments import (radial_velocity_moments_vs_r, los_velocity_moments_vs_rp,
+    _combine_velocity_moments)
+from ..mean_radial_velocity_vs_r import mean_radial_velocity_vs_r
+from ..radial_pvd_vs_r import radial_pvd_vs_r
+
+from ....custom_exceptions import HalotoolsError
+
+__all__ = ('test_radial_velocity_moments_brute_force', )
+
+fixed_seed = 43
+
+
+def _random_points(npts, Lbox):
+    with NumpyRNGContext(fixed_seed):
+        sample = np.random.uniform(0, Lbox, npts*3).reshape((npts, 3))
+        velocities = np.random.normal(loc=0, scale=100, size=npts*3).reshape((npts, 3))
+        velocities += np.random.exponential(scale=50, size=npts*3).reshape((npts, 3))
+    return sample, velocities
+
+
+def _brute_force_separations(sample, velocities, Lbox):
+    dr = sample[:, np.newaxis, :] - sample[np.newaxis, :, :]
+    dr = dr - Lbox*np.round(dr/Lbox)
+    dv = velocities[:, np.newaxis, :] - velocities[np.newaxis, :, :]
+    return dr, dv
+
+
+def test_radial_velocity_moments_brute_force():
+    """ Compare the moments of the pairwise radial velocity
+    to a brute-force calculation on all pairs.
+    """
+    npts, Lbox = 400, 50.
+    sample, velocities = _random_points(npts, Lbox)
+    rbins = np.linspace(1, 10, 4)
+
+    counts, mean, sigma, skewness, kurt = radial_velocity_moments_vs_r(sample, velocities,
+        rbins_absolute=rbins, period=Lbox,
+        statistics=('counts', 'mean', 'dispersion', 'skewness', 'kurtosis'))
+
+    dr, dv = _brute_force_separations(sample, velocities, Lbox)
+    r = np.sqrt(np.sum(dr*dr, axis=-1))
+    np.fill_diagonal(r, np.inf)
+    vr = np.sum(dr*dv, axis=-1)/r
+    for i in range(len(rbins)-1):
+        mask = (r > rbins[i]) & (r <= rbins[i+1])
+        assert counts[i] == np.count_nonzero(mask)
+        vr_bin = vr[mask]
+        assert np.allclose(mean[i], np.mean(vr_bin))
+        assert np.allclose(sigma[i], np.std(vr_bin))
+        assert np.allclose(skewness[i], skew(vr_bin))
+        assert np.allclose(kurt[i], kurtosis(vr_bin))
+
+
+def test_radial_velocity_moments_consistency():
+    """ Verify that the mean and dispersion agree with
+    `mean_radial_velocity_vs_r` and `radial_pvd_vs_r`,
+    and that the results do not depend on ``num_threads``.
+    """
+    npts, Lbox = 1000, 100.
+    sample, velocities = _random_points(npts, Lbox)
+    rbins = np.linspace(1, 20, 5)
+
+    mean, sigma = radial_velocity_moments_vs_r(sample, velocities,
+        rbins_absolute=rbins, period=Lbox, statistics=('mean', 'dispersion'))
+    mean2 = mean_radial_velocity_vs_r(sample, velocities, rbins_absolute=rbins, period=Lbox)
+    sigma2 = radial_pvd_vs_r(sample, velocities, rbins_absolute=rbins, period=Lbox)
+    assert np.allclose(mean, mean2, rtol=1e-4)
+    assert np.allclose(sigma, sigma2, rtol=1e-4)
+
+    result = radial_velocity_moments_vs_r(sample, velocities,
+        rbins_absolute=rbins, period=Lbox)
+    result2 = radial_velocity_moments_vs_r(sample, velocities,
+        rbins_absolute=rbins, period=Lbox, num_threads=3)
+    for x, x2 in zip(result, result2):
+        assert np.allclose(x, x2)
+
+
+def test_los_velocity_moments_brute_force():
+    """ Compare the moments of the pairwise line-of-sight velocity
+    to a brute-force calculation on all pairs.
+    """
+    npts, Lbox = 400, 50.
+    sample, velocities = _random_points(npts, Lbox)
+    rp_bins = np.linspace(1, 10, 4)
+    pi_bins = np.array((0, 5, 15))
+
+    counts, mean, sigma, skewness = los_velocity_moments_vs_rp(sample, velocities,
+        rp_bins, pi_bins, period=Lbox, statistics=('counts', 'mean', 'dispersion', 'skewness'))
+    assert counts.shape == (len(rp_bins)-1, len(pi_bins)-1)
+
+    dr, dv = _brute_force_separations(sample, velocities, Lbox)
+    rp = np.sqrt(dr[..., 0]**2 + dr[..., 1]**2)
+    pi = np.abs(dr[..., 2])
+    vz = np.sign(dr[..., 2])*dv[..., 2]
+    for i in range(len(rp_bins)-1):
+        for j in range(len(pi_bins)-1):
+            mask = (rp > rp_bins[i]) & (rp <= rp_bins[i+1])
+            mask &= (pi > pi_bins[j]) & (pi <= pi_bins[j+1])
+            assert counts[i, j] == np.count_nonzero(mask)
+            assert np.allclose(mean[i, j], np.mean(vz[mask]))
+            assert np.allclose(sigma[i, j], np.std(vz[mask]))
+            assert np.allclose(skewness[i, j], skew(vz[mask]))
+
+
+def test_combine_velocity_moments():
+    """ Verify that moments accumulated separately for two sets
+    are combined into the moments of their union.
+    """
+    with NumpyRNGContext(fixed_seed):
+        x = np.random.exponential(scale=2, size=1000) + 1e4
+
+    def moments(x):
+        return np.array((len(x), np.mean(x), np.sum((x - np.mean(x))**2),
+            np.sum((x - np.mean(x))**3), np.sum((x - np.mean(x))**4)))
+
+    combined = _combine_velocity_moments(moments(x[:300]), moments(x[300:]))
+    assert np.allclose(combined, moments(x))
+
+    combined = _combine_velocity_moments(np.zeros(5), moments(x))
+    assert np.allclose(combined, moments(x))
+
+
+def test_velocity_moments_empty_bins():
+    npts, Lbox = 10, 100.
+    sample, velocities = _random_points(npts, Lbox)
+    rbins = np.array((0.001, 0.002, 0.003))
+    result = radial_velocity_moments_vs_r(sample, velocities,
+        rbins_absolute=rbins, period=Lbox)
+    for x in result:
+        assert np.all(x == 0)
+
+
+def test_velocity_moments_bad_statistics():
+    npts, Lbox = 10, 100.
+    sample, velocities = _random_points(npts, Lbox)
+    rbins = np.linspace(1, 10, 4)
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = radial_velocity_moments_vs_r(sample, velocities,
+            rbins_absolute=rbins, period=Lbox, statistics=('mean', 'median'))
+    substr = "The input ``statistics`` must be a non-empty sequence"
+    assert substr in err.value.args[0]
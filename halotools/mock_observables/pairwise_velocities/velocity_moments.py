@@ -0,0 +1,398 @@
+r"""
+Module containing the `~halotools.mock_observables.radial_velocity_moments_vs_r`
+and `~halotools.mock_observables.los_velocity_moments_vs_rp` functions
+used to calculate the mean, dispersion, skewness and kurtosis of
+pairwise velocities in a single pass over the pairs.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+from functools import partial
+
+import multiprocessing
+
+from .engines import velocity_moments_3d_engine, velocity_moments_xy_z_engine
+
+from .mean_radial_velocity_vs_r import _process_args
+
+from ..pair_counters.npairs_xy_z import _npairs_xy_z_process_args
+from ..pair_counters.mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
+from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
+from ..mock_observables_helpers import enforce_sample_has_correct_shape
+
+from ...custom_exceptions import HalotoolsError
+
+__all__ = ('radial_velocity_moments_vs_r', 'los_velocity_moments_vs_rp')
+__author__ = ('Andrew Hearin', )
+
+available_velocity_statistics = ('counts', 'mean', 'dispersion', 'skewness', 'kurtosis')
+
+
+def radial_velocity_moments_vs_r(sample1, velocities1,
+        rbins_absolute=None, rbins_normalized=None, normalize_rbins_by=None,
+        sample2=None, velocities2=None, period=None,
+        statistics=('mean', 'dispersion', 'skewness', 'kurtosis'),
+        num_threads=1, approx_cell1_size=None, approx_cell2_size=None):
+    r"""
+    Calculate the moments of the distribution of pairwise radial velocities,
+    :math:`v_{12}(r)`, as a function of absolute distance,
+    or as a function of :math:`s = r / R_{\rm vir}`.
+
+    All moments are accumulated in a single traversal of the pairs, so that
+    the mean, dispersion, skewness and kurtosis cost the same as any one of them.
+
+    Parameters
+    ----------
+    sample1 : array_like
+        Numpy array of shape (npts1, 3) containing the 3-D positions of points.
+        Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+
+    velocities1 : array_like
+        Numpy array of shape (npts1, 3) containing the 3-D velocities.
+
+    rbins_absolute : array_like, optional
+        Array of shape (num_rbins+1, ) defining the boundaries of bins in which
+        the moments are computed.
+
+        Either ``rbins_absolute`` must be passed,
+        or ``rbins_normalized`` and ``normalize_rbins_by`` must be passed.
+
+    rbins_normalized : array_like, optional
+        Array of shape (num_rbins+1, ) defining the bin boundaries *x*, where
+        :math:`x = r / R_{\rm vir}`, in which the moments are computed.
+        See `~halotools.mock_observables.radial_pvd_vs_r` for details.
+
+    normalize_rbins_by : array_like, optional
+        Numpy array of shape (npts1, ) defining how the distance between each pair of points
+        will be normalized. See `~halotools.mock_observables.radial_pvd_vs_r` for details.
+
+    sample2 : array_like, optional
+        Numpy array of shape (npts2, 3) containing the 3-D positions of points.
+
+    velocities2 : array_like, optional
+        Numpy array of shape (npts2, 3) containing the 3-D velocities.
+
+    period : array_like, optional
+        Length-3 array defining periodic boundary conditions. If only
+        one number, Lbox, is specified, period is assumed to be [Lbox, Lbox, Lbox].
+        Default is None, for no PBCs.
+
+    statistics : sequence of strings, optional
+        Statistics to return, in the order in which they are returned.
+        Any of 'counts', 'mean', 'dispersion', 'skewness' and 'kurtosis'.
+        Default is ('mean', 'dispersion', 'skewness', 'kurtosis').
+
+    num_threads : int, optional
+        number of threads to use in calculation. Default is 1. A string 'max' may be used
+        to indicate that the pair counters should use all available cores on the machine.
+
+    approx_cell1_size : array_like, optional
+        Length-3 array serving as a guess for the optimal manner by how points
+        will be apportioned into subvolumes of the simulation box.
+        Default choice is to use *max(rbins)* in each dimension.
+
+    approx_cell2_size : array_like, optional
+        Analogous to ``approx_cell1_size``, but for `sample2`.
+
+    Returns
+    -------
+    result : numpy.array or tuple
+        Numpy array of shape (num_rbins, ) for each of the requested ``statistics``.
+        If more than one statistic is requested, a tuple of arrays is returned
+        in the order of ``statistics``.
+
+    Notes
+    -----
+    The pairwise radial velocity is defined as in
+    `~halotools.mock_observables.mean_radial_velocity_vs_r`.
+    The moments of each bin are accumulated with the numerically stable one-pass
+    update of the mean and of the central moments :math:`M_p = \sum (v - \bar{v})^p`,
+    and the moments accumulated by different processes are combined exactly.
+    The returned statistics are
+
+    .. math::
+
+        \sigma = \sqrt{M_2/N}, \qquad
+        \gamma_1 = \sqrt{N} M_3 / M_2^{3/2}, \qquad
+        \gamma_2 = N M_4 / M_2^{2} - 3,
+
+    where the kurtosis :math:`\gamma_2` is the excess kurtosis.
+    The dispersion agrees with `~halotools.mock_observables.radial_pvd_vs_r`.
+    For bins in which a statistic is undefined, e.g., bins with zero pairs, zero is returned.
+
+    Examples
+    --------
+    >>> npts, Lbox = 500, 250.
+    >>> sample1 = np.random.uniform(0, Lbox, npts*3).reshape((npts, 3))
+    >>> velocities1 = np.random.normal(loc=0, scale=100, size=npts*3).reshape((npts, 3))
+    >>> rbins = np.logspace(-1, 1.5, 10)
+    >>> mean, sigma, skew, kurt = radial_velocity_moments_vs_r(sample1, velocities1, rbins_absolute=rbins, period=Lbox)
+    """
+    statistics = _process_statistics(statistics)
+
+    result = _process_args(sample1, velocities1, sample2, velocities2,
+        rbins_absolute, rbins_normalized, normalize_rbins_by,
+        period, num_threads, approx_cell1_size, approx_cell2_size, None)
+
+    sample1, velocities1, sample2, velocities2, max_rbins_absolute, period,\
+        num_threads, _sample1_is_sample2, PBCs, \
+        approx_cell1_size, approx_cell2_size, rbins_normalized, normalize_rbins_by = result
+    xperiod, yperiod, zperiod = period
+    squared_normalize_rbins_by = normalize_rbins_by*normalize_rbins_by
+    search_xlength = max_rbins_absolute
+    search_ylength = max_rbins_absolute
+    search_zlength = max_rbins_absolute
+
+    #  Compute the estimates for the cell sizes
+    approx_cell1_size, approx_cell2_size = (
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        )
+    approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
+    approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
+
+    x1in, y1in, z1in = sample1[:, 0], sample1[:, 1], sample1[:, 2]
+    x2in, y2in, z2in = sample2[:, 0], sample2[:, 1], sample2[:, 2]
+    vx1in, vy1in, vz1in = velocities1[:, 0], velocities1[:, 1], velocities1[:, 2]
+    vx2in, vy2in, vz2in = velocities2[:, 0], velocities2[:, 1], velocities2[:, 2]
+
+    # Build the rectangular mesh
+    double_mesh = RectangularDoubleMesh(x1in, y1in, z1in, x2in, y2in, z2in,
+        approx_x1cell_size, approx_y1cell_size, approx_z1cell_size,
+        approx_x2cell_size, approx_y2cell_size, approx_z2cell_size,
+        search_xlength, search_ylength, search_zlength, xperiod, yperiod, zperiod, PBCs)
+
+    # Create a function object that has a single argument, for parallelization purposes
+    engine = partial(velocity_moments_3d_engine, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in,
+        vx1in, vy1in, vz1in, vx2in, vy2in, vz2in,
+        squared_normalize_rbins_by, rbins_normalized)
+
+    moments = _run_velocity_moments_engine(engine, double_mesh, num_threads)
+    return _velocity_statistics(moments, statistics)
+
+
+def los_velocity_moments_vs_rp(sample1, velocities1, rp_bins, pi_bins,
+        sample2=None, velocities2=None, period=None,
+        statistics=('mean', 'dispersion', 'skewness', 'kurtosis'),
+        num_threads=1, approx_cell1_size=None, approx_cell2_size=None):
+    r"""
+    Calculate the moments of the distribution of pairwise line-of-sight (LOS) velocities,
+    :math:`v_{z12}(r_p, \pi)`, in bins of separation perpendicular and parallel to the
+    LOS, which is taken to be the z-direction.
+
+    All moments are accumulated in a single traversal of the pairs, so that
+    the mean, dispersion, skewness and kurtosis cost the same as any one of them.
+
+    Parameters
+    ----------
+    sample1 : array_like
+        Numpy array of shape (npts1, 3) containing the 3-D positions of points.
+        Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+
+    velocities1 : array_like
+        Numpy array of shape (npts1, 3) containing the 3-D velocities.
+
+    rp_bins : array_like
+        Array of shape (num_rp_bins+1, ) defining the boundaries of the bins of
+        separation perpendicular to the LOS, :math:`r_{\rm p}`.
+
+    pi_bins : array_like
+        Array of shape (num_pi_bins+1, ) defining the boundaries of the bins of
+        separation parallel to the LOS, :math:`\pi`. Passing ``[0, pi_max]``
+        integrates over the LOS as in `~halotools.mock_observables.los_pvd_vs_rp`.
+
+    sample2 : array_like, optional
+        Numpy array of shape (npts2, 3) containing the 3-D positions of points.
+
+    velocities2 : array_like, optional
+        Numpy array of shape (npts2, 3) containing the 3-D velocities.
+
+    period : array_like, optional
+        Length-3 array defining periodic boundary conditions. If only
+        one number, Lbox, is specified, period is assumed to be [Lbox, Lbox, Lbox].
+        Default is None, for no PBCs.
+
+    statistics : sequence of strings, optional
+        Statistics to return, in the order in which they are returned.
+        Any of 'counts', 'mean', 'dispersion', 'skewness' and 'kurtosis'.
+        Default is ('mean', 'dispersion', 'skewness', 'kurtosis').
+
+    num_threads : int, optional
+        number of threads to use in calculation. Default is 1. A string 'max' may be used
+        to indicate that the pair counters should use all available cores on the machine.
+
+    approx_cell1_size : array_like, optional
+        Length-3 array serving as a guess for the optimal manner by how points
+        will be apportioned into subvolumes of the simulation box.
+        Default choice is to use [max(rp_bins), max(rp_bins), max(pi_bins)].
+
+    approx_cell2_size : array_like, optional
+        Analogous to ``approx_cell1_size``, but for `sample2`.
+
+    Returns
+    -------
+    result : numpy.array or tuple
+        Numpy array of shape (num_rp_bins, num_pi_bins) for each of the requested ``statistics``.
+        If more than one statistic is requested, a tuple of arrays is returned
+        in the order of ``statistics``.
+
+    Notes
+    -----
+    The pairwise LOS velocity is the difference between the z-velocities of the
+    two points, with the sign chosen so that receding pairs have positive velocity,
+    as in `~halotools.mock_observables.mean_los_velocity_vs_rp`.
+    See `~halotools.mock_observables.radial_velocity_moments_vs_r` for the definitions
+    of the returned statistics.
+
+    Examples
+    --------
+    >>> npts, Lbox = 500, 250.
+    >>> sample1 = np.random.uniform(0, Lbox, npts*3).reshape((npts, 3))
+    >>> velocities1 = np.random.normal(loc=0, scale=100, size=npts*3).reshape((npts, 3))
+    >>> rp_bins = np.logspace(-1, 1.5, 10)
+    >>> pi_bins = np.linspace(0, 40, 5)
+    >>> mean, sigma = los_velocity_moments_vs_rp(sample1, velocities1, rp_bins, pi_bins, period=Lbox, statistics=('mean', 'dispersion'))
+    """
+    statistics = _process_statistics(statistics)
+
+    sample1 = enforce_sample_has_correct_shape(sample1)
+    velocities1 = np.atleast_1d(velocities1).astype('f8')
+    if sample2 is None:
+        sample2 = sample1
+        velocities2 = velocities1
+    else:
+        sample2 = enforce_sample_has_correct_shape(sample2)
+        if velocities2 is None:
+            msg = ("\n If `sample2` is passed as an argument, \n"
+                   "`velocities2` must also be specified.")
+            raise ValueError(msg)
+        velocities2 = np.atleast_1d(velocities2).astype('f8')
+
+    result = _npairs_xy_z_process_args(sample1, sample2, rp_bins, pi_bins, period,
+        False, num_threads, approx_cell1_size, approx_cell2_size)
+    x1in, y1in, z1in, x2in, y2in, z2in = result[0:6]
+    rp_bins, pi_bins, period, num_threads, PBCs, approx_cell1_size, approx_cell2_size = result[6:]
+    xperiod, yperiod, zperiod = period
+
+    rp_max = np.max(rp_bins)
+    pi_max = np.max(pi_bins)
+    search_xlength, search_ylength, search_zlength = rp_max, rp_max, pi_max
+
+    #  Compute the estimates for the cell sizes
+    approx_cell1_size, approx_cell2_size = (
+        _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period)
+        )
+    approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_size
+    approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_size
+
+    vx1in, vy1in, vz1in = velocities1[:, 0], velocities1[:, 1], velocities1[:, 2]
+    vx2in, vy2in, vz2in = velocities2[:, 0], velocities2[:, 1], velocities2[:, 2]
+
+    # Build the rectangular mesh
+    double_mesh = RectangularDoubleMesh(x1in, y1in, z1in, x2in, y2in, z2in,
+        approx_x1cell_size, approx_y1cell_size, approx_z1cell_size,
+        approx_x2cell_size, approx_y2cell_size, approx_z2cell_size,
+        search_xlength, search_ylength, search_zlength, xperiod, yperiod, zperiod, PBCs)
+
+    # Create a function object that has a single argument, for parallelization purposes
+    engine = partial(velocity_moments_xy_z_engine, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in,
+        vx1in, vy1in, vz1in, vx2in, vy2in, vz2in, rp_bins, pi_bins)
+
+    moments = _run_velocity_moments_engine(engine, double_mesh, num_threads)
+    return _velocity_statistics(moments, statistics)
+
+
+def _process_statistics(statistics):
+    """ Verify that the requested statistics are available.
+    """
+    if isinstance(statistics, str):
+        statistics = (statistics, )
+    statistics = tuple(statistics)
+    unavailable = [s for s in statistics if s not in available_velocity_statistics]
+    if (len(statistics) == 0) | (len(unavailable) > 0):
+        msg = ("\nThe input ``statistics`` must be a non-empty sequence "
+            "of the following strings:\n{0}\n".format(available_velocity_statistics))
+        raise HalotoolsError(msg)
+    return statistics
+
+
+def _run_velocity_moments_engine(engine, double_mesh, num_threads):
+    """ Loop the input engine over the cells of mesh1, in parallel if ``num_threads`` > 1,
+    and combine the moments accumulated by each process.
+    """
+    # Calculate the cell1 indices that will be looped over by the engine
+    num_threads, cell1_tuples = _cell1_parallelization_indices(
+        double_mesh.mesh1.ncells, num_threads)
+
+    if num_threads > 1:
+        pool = multiprocessing.Pool(num_threads)
+        result = pool.map(engine, cell1_tuples)
+        pool.close()
+        moments = result[0]
+        for other_moments in result[1:]:
+            moments = _combine_velocity_moments(moments, other_moments)
+    else:
+        moments = engine(cell1_tuples[0])
+    return moments
+
+
+def _combine_velocity_moments(moments_a, moments_b):
+    r""" Combine the moments accumulated for two disjoint sets of pairs.
+
+    Parameters
+    ----------
+    moments_a, moments_b : ndarrays
+        Arrays whose first axis stores :math:`(N, \bar{v}, M_2, M_3, M_4)`
+
+    Returns
+    -------
+    moments : ndarray
+        Moments of the union of the two sets, using the pairwise update
+        formulae of Chan et al. (1979) and Pebay (2008).
+    """
+    na, mean_a, m2a, m3a, m4a = moments_a
+    nb, mean_b, m2b, m3b, m4b = moments_b
+
+    n = na + nb
+    nonzero = n > 0
+    n_safe = np.where(nonzero, n, 1.)
+    delta = mean_b - mean_a
+    delta2 = delta*delta
+
+    mean = np.where(nonzero, mean_a + delta*nb/n_safe, 0.)
+    m2 = m2a + m2b + delta2*na*nb/n_safe
+    m3 = (m3a + m3b + delta*delta2*na*nb*(na - nb)/n_safe**2 +
+        3.*delta*(na*m2b - nb*m2a)/n_safe)
+    m4 = (m4a + m4b + delta2*delta2*na*nb*(na*na - na*nb + nb*nb)/n_safe**3 +
+        6.*delta2*(na*na*m2b + nb*nb*m2a)/n_safe**2 + 4.*delta*(na*m3b - nb*m3a)/n_safe)
+    return np.array((n, mean, m2, m3, m4))
+
+
+def _velocity_statistics(moments, statistics):
+    """ Compute the requested statistics from the accumulated moments.
+    """
+    n, mean, m2, m3, m4 = moments
+
+    has_pairs = n > 0
+    has_spread = has_pairs & (m2 > 0)
+    n_safe = np.where(has_pairs, n, 1.)
+    m2_safe = np.where(has_spread, m2, 1.)
+
+    result = []
+    for statistic in statistics:
+        if statistic == 'counts':
+            result.append(n.astype(int))
+        elif statistic == 'mean':
+            result.append(np.where(has_pairs, mean, 0.))
+        elif statistic == 'dispersion':
+            result.append(np.where(has_pairs, np.sqrt(np.maximum(m2, 0.)/n_safe), 0.))
+        elif statistic == 'skewness':
+            result.append(np.where(has_spread, np.sqrt(n_safe)*m3/m2_safe**1.5, 0.))
+        elif statistic == 'kurtosis':
+            result.append(np.where(has_spread, n_safe*m4/m2_safe**2 - 3., 0.))
+
+    if len(result) == 1:
+        return result[0]
+    else:
+        return tuple(result)
@@ -1,2 +1,3 @@
 from .delta_sigma import delta_sigma, delta_sigma_from_precomputed_pairs
 from .mass_in_cylinders import total_mass_enclosed_per_cylinder
+from .projected_mass_grid import ProjectedMassGrid
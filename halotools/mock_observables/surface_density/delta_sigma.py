@@ -10,11 +10,16 @@ from .surface_density_helpers import annular_area_weighted_midpoints
 from .surface_density_helpers import log_interpolation_with_inner_zero_masking as log_interp
 from .surface_density_helpers import rho_matter_comoving_in_halotools_units as rho_m_comoving
 from .mass_in_cylinders import total_mass_enclosed_in_stack_of_cylinders
+from .projected_mass_grid import ProjectedMassGrid
+
+from ..chunked_sample import ChunkedSample
 
 from ..mock_observables_helpers import (get_num_threads, get_separation_bins_array,
-    get_period, enforce_sample_respects_pbcs, enforce_sample_has_correct_shape)
+    get_period, enforce_sample_respects_pbcs, enforce_sample_has_correct_shape,
+    get_line_of_sight_axes)
 
 from ...sim_manager.sim_defaults import default_cosmology
+from ...custom_exceptions import HalotoolsError
 
 __all__ = ('delta_sigma', 'delta_sigma_from_precomputed_pairs')
 __author__ = ('Andrew Hearin', )
@@ -22,7 +27,7 @@ __author__ = ('Andrew Hearin', )
 
 def delta_sigma(galaxies, particles, particle_masses, downsampling_factor,
         rp_bins, period, cosmology=default_cosmology, num_threads=1,
-        approx_cell1_size=None, approx_cell2_size=None):
+        approx_cell1_size=None, approx_cell2_size=None, los_axes=None):
     r"""
     Calculate :math:`\Delta\Sigma(r_p)`, the galaxy-galaxy lensing signal
     as a function of projected distance.
@@ -56,6 +61,16 @@ def delta_sigma(galaxies, particles, particle_masses, downsampling_factor,
 
         Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
 
+        For particle samples too large to be stored in memory, ``particles`` may instead
+        be a `~halotools.mock_observables.ChunkedSample`, in which case the mass
+        surrounding the galaxies is accumulated one chunk of particles at a time.
+
+        When calling `delta_sigma` repeatedly with the same particles, e.g., in a likelihood
+        analysis, ``particles`` may instead be a `~halotools.mock_observables.ProjectedMassGrid`
+        built once from the particles, in which case the ``particle_masses``
+        and ``downsampling_factor`` stored in the grid are used, and the input
+        ``particle_masses`` and ``downsampling_factor`` are ignored.
+
     particle_masses : float or ndarray
         Float or array storing the mass of each particle in units of Msun with h=1 units.
 
@@ -65,6 +80,10 @@ def delta_sigma(galaxies, particles, particle_masses, downsampling_factor,
         If passing in a single float, it will be assumed that every particle
         has the same mass (as is the case in a typical DM-only simulation).
 
+        If ``particles`` is a `~halotools.mock_observables.ChunkedSample`,
+        ``particle_masses`` must be either a single float or the name of
+        the column of ``particles`` storing the particle masses.
+
     downsampling_factor : float
         Factor by which the particles have been randomly downsampled.
         Should be unity if all simulation particles have been chosen.
@@ -106,6 +125,14 @@ def delta_sigma(galaxies, particles, particle_masses, downsampling_factor,
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
         ``approx_cell1_size`` for details.
 
+    los_axes : sequence, optional
+        Sequence of Cartesian axes, each one of 'x', 'y' or 'z', to be used
+        in turn as the axis of projection, e.g., ``('x', 'y', 'z')``.
+        Default is None, in which case the z-axis is the axis of projection.
+        The ``los_axes`` option is not supported when ``particles`` is a
+        `~halotools.mock_observables.ChunkedSample` or a
+        `~halotools.mock_observables.ProjectedMassGrid`.
+
     Returns
     -------
     rp_mids : array_like
@@ -115,6 +142,8 @@ def delta_sigma(galaxies, particles, particle_masses, downsampling_factor,
     Delta_Sigma : array_like
         Numpy array of shape (num_rbins-1, ) storing :math:`\Delta\Sigma(r_p)`
         in comoving units of :math:`h M_{\odot} / {\rm Mpc}^2` assuming h=1.
+        If ``los_axes`` is not None, ``Delta_Sigma`` instead has shape
+        (len(los_axes), num_rbins-1), storing the result for each axis of projection.
 
     Examples
     --------
@@ -176,6 +205,15 @@ def delta_sigma(galaxies, particles, particle_masses, downsampling_factor,
     >>> period = model.mock.Lbox
     >>> rp_mids, ds = delta_sigma(galaxies, particles, particle_masses, downsampling_factor, rp_bins, period)
 
+    When the lensing signal of many different galaxy samples is calculated
+    using the same particles, the projected mass of the particles can be precomputed
+    once with the `~halotools.mock_observables.ProjectedMassGrid` class,
+    which is then passed to `delta_sigma` in place of the particles:
+
+    >>> from halotools.mock_observables import ProjectedMassGrid
+    >>> grid = ProjectedMassGrid(particles, particle_masses, downsampling_factor, period)
+    >>> rp_mids, ds = delta_sigma(galaxies, grid, None, None, rp_bins, period)
+
     Take care with the units. The values for :math:`\Delta\Sigma` returned by
     the `delta_sigma` functions are in *comoving* units of
     :math:`h M_{\odot} / {\rm Mpc}^2` assuming h=1,
@@ -186,16 +224,11 @@ def delta_sigma(galaxies, particles, particle_masses, downsampling_factor,
     The code shown above demonstrates how to calculate :math:`\Delta\Sigma` via the excess
     surface density of mass using the z-axis as the axis of projection. However, it may be useful
     to project along the other Cartesian axes, for example to help beat down sample variance.
-    While the `delta_sigma` function is written to always use the "third" dimension as the
-    projection axis, you can easily hack the code to project along, say, the y-axis by simply
-    transposing your y- and z-coordinates when you pack them into a 2-d array:
+    The ``los_axes`` argument projects along each of the requested axes in turn,
+    so that the signal averaged over the three axes of projection is given by:
 
-    >>> particles = np.vstack((px, pz, py)).T
-    >>> galaxies = np.vstack((x, z, y)).T
-
-    Using the above ``particles`` and ``galaxies`` and otherwise calling the `delta_sigma`
-    function as normal will instead calculate the surface mass density by projecting
-    along the y-axis.
+    >>> rp_mids, ds_xyz = delta_sigma(galaxies, particles, particle_masses, downsampling_factor, rp_bins, period, los_axes=('x', 'y', 'z'))
+    >>> ds_avg = np.mean(ds_xyz, axis=0)
 
     See also
     --------
@@ -205,15 +238,32 @@ def delta_sigma(galaxies, particles, particle_masses, downsampling_factor,
 
     #  Perform bounds-checking and error-handling in private helper functions
     args = (galaxies, particles, particle_masses, downsampling_factor,
-        rp_bins, period, num_threads)
+        rp_bins, period, num_threads, los_axes)
     result = _delta_sigma_process_args(*args)
     galaxies, particles, particle_masses, downsampling_factor, \
         rp_bins, period, num_threads, PBCs = result
 
-    total_mass_in_stack_of_cylinders = total_mass_enclosed_in_stack_of_cylinders(
-        galaxies, particles, particle_masses, downsampling_factor, rp_bins, period,
-        num_threads=num_threads, approx_cell1_size=approx_cell1_size,
-        approx_cell2_size=approx_cell2_size)
+    if los_axes is not None:
+        #  The cylinders span the entire box along the axis of projection,
+        #  so each axis requires its own traversal of the projected positions
+        excess_surface_density = []
+        for los in get_line_of_sight_axes(los_axes):
+            perm = [i for i in range(3) if i != los] + [los]
+            rp_mids, ds = delta_sigma(galaxies[:, perm], particles[:, perm], particle_masses,
+                downsampling_factor, rp_bins, period[perm], cosmology=cosmology,
+                num_threads=num_threads, approx_cell1_size=_permuted(approx_cell1_size, perm),
+                approx_cell2_size=_permuted(approx_cell2_size, perm))
+            excess_surface_density.append(ds)
+        return rp_mids, np.array(excess_surface_density)
+
+    if isinstance(particles, ProjectedMassGrid):
+        total_mass_in_stack_of_cylinders = particles.mass_enclosed_in_stack_of_cylinders(
+            galaxies, rp_bins)
+    else:
+        total_mass_in_stack_of_cylinders = total_mass_enclosed_in_stack_of_cylinders(
+            galaxies, particles, particle_masses, downsampling_factor, rp_bins, period,
+            num_threads=num_threads, approx_cell1_size=approx_cell1_size,
+            approx_cell2_size=approx_cell2_size)
     total_mass_in_stack_of_annuli = np.diff(total_mass_in_stack_of_cylinders)
 
     mean_rho_comoving = rho_m_comoving(cosmology)
@@ -430,25 +480,60 @@ def _delta_sigma_precomputed_process_args(galaxies, mass_enclosed_per_galaxy, rp
     return galaxies, mass_enclosed_per_galaxy, rp_bins, period, PBCs
 
 
+def _permuted(approx_cell_size, perm):
+    if approx_cell_size is None:
+        return None
+    else:
+        return (np.zeros(3) + approx_cell_size)[perm]
+
+
 def _delta_sigma_process_args(galaxies, particles, masses, downsampling_factor,
-        rp_bins, period, num_threads):
+        rp_bins, period, num_threads, los_axes=None):
     period, PBCs = get_period(period)
 
     galaxies = enforce_sample_has_correct_shape(galaxies)
-    particles = enforce_sample_has_correct_shape(particles)
 
-    masses = np.atleast_1d(masses)
-    if len(masses) == 1:
-        masses = np.zeros(particles.shape[0]) + masses[0]
-    else:
-        msg = "Must have same number of ``particle_masses`` as particles"
-        assert masses.shape[0] == particles.shape[0], msg
+    if los_axes is not None:
+        get_line_of_sight_axes(los_axes)
+        if isinstance(particles, (ProjectedMassGrid, ChunkedSample)):
+            msg = ("The ``los_axes`` argument is not supported when the input ``particles``\n"
+                "is a ``{0}``".format(particles.__class__.__name__))
+            raise HalotoolsError(msg)
+
+    if isinstance(particles, ProjectedMassGrid):
+        if period is None:
+            msg = ("The input ``period`` is None, but the input ``ProjectedMassGrid``\n"
+                "is periodic with period {0}. Pass the period of the grid.".format(particles.period))
+            raise ValueError(msg)
+        try:
+            assert np.allclose(particles.period, period)
+        except AssertionError:
+            msg = ("The input ``period`` = {0} does not match the period {1} \n"
+                "of the input ``ProjectedMassGrid``".format(period, particles.period))
+            raise HalotoolsError(msg)
+        galaxies = enforce_sample_has_correct_shape(galaxies)
+        enforce_sample_respects_pbcs(galaxies[:, 0], galaxies[:, 1], galaxies[:, 2], period)
+        rp_bins = get_separation_bins_array(rp_bins)
+        num_threads = get_num_threads(num_threads, enforce_max_cores=False)
+        return galaxies, particles, masses, downsampling_factor, rp_bins, period, num_threads, PBCs
+
+    # Chunked particles and their masses are checked one chunk at a time
+    if not isinstance(particles, ChunkedSample):
+        particles = enforce_sample_has_correct_shape(particles)
+
+        masses = np.atleast_1d(masses)
+        if len(masses) == 1:
+            masses = np.zeros(particles.shape[0]) + masses[0]
+        else:
+            msg = "Must have same number of ``particle_masses`` as particles"
+            assert masses.shape[0] == particles.shape[0], msg
 
     msg = "downsampling_factor = {0} < 1, which is impossible".format(downsampling_factor)
     assert downsampling_factor >= 1, msg
 
     enforce_sample_respects_pbcs(galaxies[:, 0], galaxies[:, 1], galaxies[:, 2], period)
-    enforce_sample_respects_pbcs(particles[:, 0], particles[:, 1], particles[:, 2], period)
+    if not isinstance(particles, ChunkedSample):
+        enforce_sample_respects_pbcs(particles[:, 0], particles[:, 1], particles[:, 2], period)
 
     rp_bins = get_separation_bins_array(rp_bins)
 
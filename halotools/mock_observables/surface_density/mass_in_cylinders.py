@@ -10,9 +10,12 @@ import numpy as np
 from .weighted_npairs_xy import weighted_npairs_xy
 from .weighted_npairs_per_object_xy import weighted_npairs_per_object_xy
 
+from ..chunked_sample import ChunkedSample, _chunked_pair_counts
 from ..mock_observables_helpers import (get_num_threads, get_separation_bins_array,
     get_period, enforce_sample_respects_pbcs, enforce_sample_has_correct_shape)
 
+from ...custom_exceptions import HalotoolsError
+
 
 __all__ = ('total_mass_enclosed_in_stack_of_cylinders', 'total_mass_enclosed_per_cylinder')
 __author__ = ('Andrew Hearin', )
@@ -39,10 +42,17 @@ def total_mass_enclosed_in_stack_of_cylinders(centers, particles,
 
         Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
 
+        For particle samples too large to be stored in memory, ``particles`` may instead
+        be a `~halotools.mock_observables.ChunkedSample`, in which case the mass is
+        accumulated one chunk of particles at a time.
+
     particle_masses : array_like
         Float or array of shape (num_ptcl, ) storing the mass of each particle
         in units of Msun with h=1 units. If every particle has the same mass
         (i.e., if your simulation is DM-only), you can pass in a single float.
+        If ``particles`` is a `~halotools.mock_observables.ChunkedSample`,
+        ``particle_masses`` must be either a single float or the name of
+        the column of ``particles`` storing the particle masses.
 
     downsampling_factor : float
         Factor by which the particles have been randomly downsampled.
@@ -100,6 +110,11 @@ def total_mass_enclosed_in_stack_of_cylinders(centers, particles,
     >>> mass_encl = total_mass_enclosed_in_stack_of_cylinders(centers, particles, masses, downsampling_factor, rp_bins, period)
     """
 
+    if isinstance(particles, ChunkedSample):
+        return _chunked_enclosed_mass(total_mass_enclosed_in_stack_of_cylinders, centers, particles,
+            particle_masses, downsampling_factor, rp_bins, period,
+            num_threads, approx_cell1_size, approx_cell2_size)
+
     #  Perform bounds-checking and error-handling in private helper functions
     args = (centers, particles, particle_masses, downsampling_factor,
         rp_bins, period, num_threads)
@@ -144,10 +159,17 @@ def total_mass_enclosed_per_cylinder(centers, particles,
 
         Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
 
+        For particle samples too large to be stored in memory, ``particles`` may instead
+        be a `~halotools.mock_observables.ChunkedSample`, in which case the mass is
+        accumulated one chunk of particles at a time.
+
     particle_masses : array_like
         Float or array of shape (num_ptcl, ) storing the mass of each particle
         in units of Msun with h=1 units. If every particle has the same mass
         (i.e., if your simulation is DM-only), you can pass in a single float.
+        If ``particles`` is a `~halotools.mock_observables.ChunkedSample`,
+        ``particle_masses`` must be either a single float or the name of
+        the column of ``particles`` storing the particle masses.
 
     downsampling_factor : float
         Factor by which the particles have been randomly downsampled.
@@ -208,6 +230,11 @@ def total_mass_enclosed_per_cylinder(centers, particles,
     >>> ith_cylinder_jth_radius_mass = mass_encl[i, j]  # doctest: +SKIP
     """
 
+    if isinstance(particles, ChunkedSample):
+        return _chunked_enclosed_mass(total_mass_enclosed_per_cylinder, centers, particles,
+            particle_masses, downsampling_factor, rp_bins, period,
+            num_threads, approx_cell1_size, approx_cell2_size)
+
     #  Perform bounds-checking and error-handling in private helper functions
     args = (centers, particles, particle_masses, downsampling_factor,
         rp_bins, period, num_threads)
@@ -231,6 +258,45 @@ def total_mass_enclosed_per_cylinder(centers, particles,
     return total_mass_per_cylinder
 
 
+def _chunked_enclosed_mass(func, centers, particles,
+        particle_masses, downsampling_factor, rp_bins, period,
+        num_threads, approx_cell1_size, approx_cell2_size):
+    """ Sum the enclosed mass computed by ``func`` over the chunks of ``particles``.
+    """
+    if isinstance(particle_masses, str):
+        try:
+            assert particle_masses in particles.column_names
+        except AssertionError:
+            msg = ("The input ``particle_masses`` = ``{0}`` is not a column "
+                "of the input ``particles``".format(particle_masses))
+            raise HalotoolsError(msg)
+    else:
+        try:
+            assert len(np.atleast_1d(particle_masses)) == 1
+        except AssertionError:
+            msg = ("When ``particles`` is a ChunkedSample, the input ``particle_masses`` \n"
+                "must be either a single float or the name of a column of ``particles``")
+            raise HalotoolsError(msg)
+
+    def counter(centers, __, positions, columns):
+        if isinstance(particle_masses, str):
+            masses = columns[particle_masses]
+        else:
+            masses = particle_masses
+        return func(centers, positions, masses, downsampling_factor, rp_bins, period,
+            num_threads=num_threads, approx_cell1_size=approx_cell1_size,
+            approx_cell2_size=approx_cell2_size)
+
+    centers = enforce_sample_has_correct_shape(centers)
+    rp_bins = get_separation_bins_array(rp_bins)
+    if func is total_mass_enclosed_per_cylinder:
+        empty_result = np.zeros((len(centers), len(rp_bins)))
+    else:
+        empty_result = np.zeros(len(rp_bins))
+    return _chunked_pair_counts(counter, centers, particles, np.max(rp_bins),
+        get_period(period)[0], empty_result)
+
+
 def _enclosed_mass_process_args(centers, particles, masses,
         downsampling_factor, rp_bins, period, num_threads):
     period, PBCs = get_period(period)
@@ -0,0 +1,357 @@
+"""
+Module containing the `~halotools.mock_observables.ProjectedMassGrid` class
+used to repeatedly calculate the mass enclosed in cylinders
+surrounding different samples of galaxies.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+
+from ..mock_observables_helpers import (get_separation_bins_array,
+    get_period, enforce_sample_respects_pbcs, enforce_sample_has_correct_shape)
+from ..pair_counters.mesh_helpers import _enforce_maximum_search_length
+
+from ...custom_exceptions import HalotoolsError
+
+
+__all__ = ('ProjectedMassGrid', )
+__author__ = ('Andrew Hearin', )
+
+
+class ProjectedMassGrid(object):
+    r""" Precomputed distribution of particle mass projected onto the xy-plane,
+    used to calculate the mass enclosed in cylinders of infinite length
+    surrounding arbitrary samples of points.
+
+    In a typical likelihood analysis of galaxy-galaxy lensing, the
+    particles never change while the galaxy positions change with every
+    model evaluation. The `ProjectedMassGrid` divides the xy-plane once
+    into a fine grid of ``num_cells_per_dim`` x ``num_cells_per_dim`` cells
+    and tabulates the cumulative mass along each row of cells, i.e.,
+    along each strip of constant y. The mass enclosed in a cylinder is then
+    the sum over the strips crossing the cylinder of the mass inside
+    the chord of the cylinder, each of which is a difference of two cumulative masses.
+    The cost of each query is independent of the number of particles,
+    and scales with the number of strips crossing the cylinders.
+
+    Since the length of the chord varies across the width of each strip,
+    the mass is computed in one of two ways:
+
+    * Interpolated: the chord of each strip is set to the mean width of the
+      intersection of the strip and the cylinder, and the cumulative mass is
+      interpolated linearly within each grid cell, so that no individual particle
+      is ever visited. The error vanishes as the cell size becomes small compared
+      to the radius of the cylinder: for cylinders with a radius of at least
+      a few cells, the error on the total mass enclosed by a stack of
+      cylinders is typically well below a percent.
+    * Exact: the grid cells guaranteed to lie inside the cylinder for every y
+      in the strip are counted with the tabulated cumulative mass, and only the
+      particles in the grid cells crossed by the edge of the cylinder
+      are checked individually, so that the result agrees with
+      `~halotools.mock_observables.total_mass_enclosed_per_cylinder`
+      up to floating-point round-off. The cost of this calculation grows with
+      the number of particles near the edge of the cylinder.
+
+    By default, cylinders with a radius smaller than ``min_approx_radius_in_cells``
+    grid cells are computed exactly, and larger cylinders are interpolated.
+    The accuracy/speed trade-off is controlled by ``num_cells_per_dim``: a finer grid
+    improves the accuracy of the interpolation, at the cost of a runtime that scales
+    linearly with the number of strips crossing the largest cylinder,
+    and of a memory footprint that scales as the square of ``num_cells_per_dim``.
+    Setting ``exact`` to True computes every cylinder exactly, which is
+    mostly useful to validate the choice of ``num_cells_per_dim``.
+
+    Parameters
+    ----------
+    particles : array_like
+        Numpy array of shape (num_ptcl, 3) containing 3-d positions of particles.
+
+        Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+
+    particle_masses : float or ndarray
+        Float or array of shape (num_ptcl, ) storing the mass of each particle
+        in units of Msun with h=1 units. If every particle has the same mass
+        (i.e., if your simulation is DM-only), you can pass in a single float.
+
+    downsampling_factor : float
+        Factor by which the particles have been randomly downsampled.
+        Should be unity if all simulation particles have been chosen.
+
+    period : array_like
+        Length-3 sequence defining the periodic boundary conditions
+        in each dimension. If you instead provide a single scalar, Lbox,
+        period is assumed to be the same in all Cartesian directions.
+
+        Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+
+    num_cells_per_dim : int, optional
+        Number of grid cells along each of the x- and y-axes of the box. Default is 1000.
+
+    min_approx_radius_in_cells : float, optional
+        Cylinders with a radius smaller than ``min_approx_radius_in_cells`` times the
+        size of the grid cells are computed exactly, larger cylinders are
+        interpolated from the grid. Default is 4.
+
+    exact : bool, optional
+        If True, every cylinder is computed exactly,
+        regardless of ``min_approx_radius_in_cells``. Default is False.
+
+    Examples
+    --------
+    >>> period = 100.
+    >>> num_cyl, num_ptcl = 100, 1000
+    >>> centers = np.random.random((num_cyl, 3))*period
+    >>> particles = np.random.random((num_ptcl, 3))*period
+    >>> masses = np.random.rand(num_ptcl)
+    >>> downsampling_factor = 1.
+    >>> rp_bins = np.logspace(0, 1, 15)
+
+    >>> grid = ProjectedMassGrid(particles, masses, downsampling_factor, period)
+    >>> mass_encl = grid.mass_enclosed_per_cylinder(centers, rp_bins)
+
+    The same ``grid`` can be reused for any other set of cylinders:
+
+    >>> new_centers = np.random.random((num_cyl, 3))*period
+    >>> new_mass_encl = grid.mass_enclosed_per_cylinder(new_centers, rp_bins)
+
+    The result can be passed to
+    `~halotools.mock_observables.delta_sigma_from_precomputed_pairs`,
+    or the ``grid`` can be passed to `~halotools.mock_observables.delta_sigma`
+    in place of the ``particles``.
+    """
+
+    def __init__(self, particles, particle_masses, downsampling_factor, period,
+            num_cells_per_dim=1000, min_approx_radius_in_cells=4, exact=False):
+
+        period, PBCs = get_period(period)
+        if PBCs is False:
+            msg = ("The ``ProjectedMassGrid`` requires periodic boundary conditions")
+            raise HalotoolsError(msg)
+        self.period = period
+
+        particles = enforce_sample_has_correct_shape(particles)
+        enforce_sample_respects_pbcs(particles[:, 0], particles[:, 1], particles[:, 2], period)
+
+        masses = np.atleast_1d(particle_masses).astype(float)
+        if len(masses) == 1:
+            masses = np.zeros(particles.shape[0]) + masses[0]
+        else:
+            msg = "Must have same number of ``particle_masses`` as particles"
+            assert masses.shape[0] == particles.shape[0], msg
+
+        msg = "downsampling_factor = {0} < 1, which is impossible".format(downsampling_factor)
+        assert downsampling_factor >= 1, msg
+
+        try:
+            self.num_cells_per_dim = int(num_cells_per_dim)
+            assert self.num_cells_per_dim >= 1
+        except (TypeError, ValueError, AssertionError):
+            msg = ("Input ``num_cells_per_dim`` must be a positive integer")
+            raise HalotoolsError(msg)
+        self.exact = bool(exact)
+        self.min_approx_radius_in_cells = float(min_approx_radius_in_cells)
+
+        n = self.num_cells_per_dim
+        self.cell_size = period[:2]/float(n)
+
+        x, y = particles[:, 0], particles[:, 1]
+        strip = np.clip(np.floor(y/self.cell_size[1]).astype(np.int64), 0, n-1)
+        cell = np.clip(np.floor(x/self.cell_size[0]).astype(np.int64), 0, n-1)
+
+        # particles sorted by strip and x-coordinate, so that the particles
+        # of each grid cell are contiguous
+        idx_sorted = np.lexsort((x, strip))
+        self._x = x[idx_sorted]
+        self._y = y[idx_sorted]
+        self._masses = masses[idx_sorted]*downsampling_factor
+        cell_id = strip[idx_sorted]*n + cell[idx_sorted]
+        self._cell_starts = np.searchsorted(cell_id, np.arange(n*n+1))
+        self._strip_starts = self._cell_starts[::n]
+        self._num_in_strip = np.diff(self._strip_starts)
+
+        # cumulative mass along each strip, tabulated at the edges of the grid cells
+        cumulative_mass = np.append(0., np.cumsum(self._masses))
+        self._cumulative_mass = cumulative_mass
+        edge_idx = self._cell_starts[np.arange(n)[:, np.newaxis]*n + np.arange(n+1)]
+        self._table = (cumulative_mass[edge_idx] -
+            cumulative_mass[self._strip_starts[:-1, np.newaxis]]).ravel()
+        self._strip_mass = np.diff(cumulative_mass[self._strip_starts])
+
+        self._eps = 8*np.spacing(2*n*np.max(period))
+
+    def __len__(self):
+        return len(self._x)
+
+    def mass_enclosed_per_cylinder(self, centers, rp_bins):
+        r""" Calculate the total mass enclosed in a set of cylinders of infinite length.
+
+        Parameters
+        ----------
+        centers : array_like
+            Numpy array of shape (num_cyl, 3) containing 3-d positions of galaxies.
+            Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+
+        rp_bins : array_like
+            Numpy array of shape (num_rbins, ) of projected radii of the cylinders.
+            Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+
+        Returns
+        -------
+        total_mass_enclosed : array_like
+            Numpy array of shape (num_cyl, num_rbins) storing the sum of all particle masses
+            enclosed in each of the input cylinders, accounting for the ``downsampling_factor``.
+        """
+        centers = enforce_sample_has_correct_shape(centers)
+        enforce_sample_respects_pbcs(centers[:, 0], centers[:, 1], centers[:, 2], self.period)
+        rp_bins = get_separation_bins_array(rp_bins)
+        _enforce_maximum_search_length([rp_bins.max(), rp_bins.max()], self.period[:2])
+
+        n, w = self.num_cells_per_dim, self.cell_size[1]
+        x0, y0 = centers[:, 0:1], centers[:, 1:2]
+
+        if self.exact:
+            first_approx_col = len(rp_bins)
+        else:
+            first_approx_col = np.searchsorted(rp_bins,
+                self.min_approx_radius_in_cells*np.max(self.cell_size))
+
+        result = np.zeros((len(centers), len(rp_bins)))
+        first_strip = np.floor(y0/w).astype(np.int64)
+        max_offset = int(np.ceil(rp_bins.max()/w)) + 1
+        for offset in range(-max_offset, max_offset+1):
+            # only the cylinders wider than the distance to the strip can cross it
+            first_col = np.searchsorted(rp_bins, (abs(offset)-1)*w, side='right')
+            if first_col == len(rp_bins):
+                continue
+
+            unwrapped_strip = first_strip + offset
+            strip = unwrapped_strip % n
+            ylo = unwrapped_strip*w - y0
+            yhi = ylo + w
+
+            if first_col < first_approx_col:
+                dy_min = np.where(ylo > 0, ylo, np.where(yhi < 0, -yhi, 0.))
+                dy_max = np.maximum(np.abs(ylo), np.abs(yhi))
+                rp_exact = rp_bins[np.newaxis, first_col:first_approx_col]
+                result[:, first_col:first_approx_col] += self._exact_strip_mass(x0, y0, strip,
+                    unwrapped_strip // n, dy_min, dy_max, rp_exact*rp_exact)
+            if first_approx_col < len(rp_bins):
+                rp_approx = rp_bins[np.newaxis, max(first_col, first_approx_col):]
+                chord = _mean_half_chord(ylo, yhi, rp_approx, w)
+                result[:, -rp_approx.shape[1]:] += (
+                    self._interpolated_strip_mass(strip, x0 + chord) -
+                    self._interpolated_strip_mass(strip, x0 - chord))
+
+        return result
+
+    def mass_enclosed_in_stack_of_cylinders(self, centers, rp_bins):
+        r""" Calculate the total mass enclosed by a stack of cylinders of infinite length.
+
+        Parameters
+        ----------
+        centers : array_like
+            Numpy array of shape (num_cyl, 3) containing 3-d positions of galaxies.
+            Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+
+        rp_bins : array_like
+            Numpy array of shape (num_rbins, ) of projected radii of the cylinders.
+            Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+
+        Returns
+        -------
+        total_mass_enclosed : array_like
+            Numpy array of shape (num_rbins, ) storing the sum of all particle masses
+            enclosed in the input cylinders, accounting for the ``downsampling_factor``.
+            Particles appearing in more than one cylinder are counted multiple times.
+        """
+        return np.sum(self.mass_enclosed_per_cylinder(centers, rp_bins), axis=0)
+
+    def _interpolated_strip_mass(self, strip, xmax):
+        """ Mass in ``strip`` with x < ``xmax`` interpolated from the tabulated
+        cumulative mass, where ``xmax`` may lie outside the box, in which case
+        the full strip is counted once per crossing of the periodic boundary.
+        """
+        n, Lx = self.num_cells_per_dim, self.period[0]
+        num_wraps = np.floor(xmax/Lx)
+        u = (xmax - num_wraps*Lx)/self.cell_size[0]
+        cell = np.clip(np.floor(u).astype(np.int64), 0, n-1)
+        idx = strip*(n+1) + cell
+        lo, hi = self._table[idx], self._table[idx+1]
+        return num_wraps*self._strip_mass[strip] + lo + (u - cell)*(hi - lo)
+
+    def _cell_edge(self, strip, unwrapped_edge):
+        """ Index of the first particle of ``strip`` lying beyond the input cell edge
+        in the unwrapped ordering of the particles of the strip, together with the
+        mass of the particles of the strip lying before the edge.
+        """
+        n = self.num_cells_per_dim
+        num_wraps = unwrapped_edge // n
+        edge = unwrapped_edge - num_wraps*n
+        strip_start = self._strip_starts[strip]
+        idx = num_wraps*self._num_in_strip[strip] + self._cell_starts[strip*n + edge] - strip_start
+        mass = num_wraps*self._strip_mass[strip] + self._table[strip*(n+1) + edge]
+        return idx, mass
+
+    def _exact_strip_mass(self, x0, y0, strip, y_wraps, dy_min, dy_max, rp_squared):
+        """ Exact mass enclosed in the intersection of each cylinder with the input strips.
+        The grid cells lying inside the inner chord are counted with the tabulated
+        cumulative mass, and the particles of the grid cells crossed by the edge
+        of the cylinder are checked individually.
+        """
+        eps, dx_cell = self._eps, self.cell_size[0]
+        Lx, Ly = self.period[0], self.period[1]
+        outer = np.sqrt(np.maximum(rp_squared - (np.maximum(dy_min - eps, 0))**2, 0)) + eps
+        inner = np.sqrt(np.maximum(rp_squared - (dy_max + eps)**2, 0)) - eps
+        inner = np.where((dy_max + eps)**2 < rp_squared, inner, -1.)
+
+        strip, y_wraps, __ = np.broadcast_arrays(strip, y_wraps, rp_squared)
+        outer_lo = np.floor((x0 - outer)/dx_cell).astype(np.int64)
+        outer_hi = np.floor((x0 + outer)/dx_cell).astype(np.int64) + 1
+        inner_lo = np.ceil((x0 - inner)/dx_cell).astype(np.int64)
+        inner_hi = np.floor((x0 + inner)/dx_cell).astype(np.int64)
+        no_inner_cells = (inner < 0) | (inner_hi <= inner_lo)
+        inner_lo = np.where(no_inner_cells, outer_lo, inner_lo)
+        inner_hi = np.where(no_inner_cells, outer_lo, inner_hi)
+
+        idx_outer_lo, __ = self._cell_edge(strip, outer_lo)
+        idx_inner_lo, mass_inner_lo = self._cell_edge(strip, inner_lo)
+        idx_inner_hi, mass_inner_hi = self._cell_edge(strip, inner_hi)
+        idx_outer_hi, __ = self._cell_edge(strip, outer_hi)
+        result = mass_inner_hi - mass_inner_lo
+
+        # check the particles in the cells crossed by the edge of the cylinder one by one
+        band_lo = np.concatenate((idx_outer_lo.ravel(), idx_inner_hi.ravel()))
+        band_hi = np.concatenate((idx_inner_lo.ravel(), idx_outer_hi.ravel()))
+        num_in_band = band_hi - band_lo
+        total_num_in_band = num_in_band.sum()
+        if total_num_in_band == 0:
+            return result
+
+        band = np.repeat(np.arange(len(num_in_band)), num_in_band)
+        unwrapped_idx = band_lo[band] + np.arange(total_num_in_band) - np.repeat(
+            np.cumsum(num_in_band) - num_in_band, num_in_band)
+
+        cylinder = band % result.size
+        band_strip = strip.ravel()[cylinder]
+        num_in_strip = self._num_in_strip[band_strip]
+        x_wraps = unwrapped_idx // num_in_strip
+        ptcl = self._strip_starts[band_strip] + unwrapped_idx - x_wraps*num_in_strip
+
+        icen = cylinder // result.shape[1]
+        dx = self._x[ptcl] + x_wraps*Lx - x0[icen, 0]
+        dy = self._y[ptcl] + y_wraps.ravel()[cylinder]*Ly - y0[icen, 0]
+        inside = dx*dx + dy*dy <= rp_squared.ravel()[cylinder % result.shape[1]]
+
+        result += np.bincount(cylinder[inside], weights=self._masses[ptcl[inside]],
+            minlength=result.size).reshape(result.shape)
+        return result
+
+
+def _mean_half_chord(ylo, yhi, rp, strip_width):
+    """ Mean half-width of the intersection between a circle of radius ``rp``
+    centered at the origin and the strip ylo <= y < yhi, averaged over the strip.
+    """
+    def antiderivative(t):
+        t = np.clip(t, -rp, rp)
+        return 0.5*(t*np.sqrt(np.maximum(rp*rp - t*t, 0)) + rp*rp*np.arcsin(t/rp))
+    return (antiderivative(yhi) - antiderivative(ylo))/strip_width
@@ -156,3 +156,27 @@ def test_delta_sigma_from_precomputed_pairs():
     rp_mids2, ds2 = delta_sigma_from_precomputed_pairs(galaxies, mass_encl, rp_bins, period)
 
     assert np.allclose(ds1, ds2)
+
+
+def test_delta_sigma_los_axes():
+    """ Verify that projecting along several axes at once agrees with
+    calling `delta_sigma` separately on each permutation of the coordinates.
+    """
+    num_centers, num_ptcl = 100, 2000
+    with NumpyRNGContext(fixed_seed):
+        centers = np.random.random((num_centers, 3))
+        particles = np.random.random((num_ptcl, 3))
+        particle_masses = np.random.rand(num_ptcl)
+    rp_bins = np.linspace(0.05, 0.2, 5)
+    period = np.array((1., 1., 1.))
+
+    rp_mids, ds_xyz = delta_sigma(centers, particles, particle_masses, 1, rp_bins, period,
+        los_axes=('x', 'y', 'z'))
+    assert ds_xyz.shape == (3, len(rp_bins)-1)
+
+    permutations = ([1, 2, 0], [2, 0, 1], [0, 1, 2])
+    for i, perm in enumerate(permutations):
+        rp_mids2, ds = delta_sigma(centers[:, perm], particles[:, perm], particle_masses,
+            1, rp_bins, period)
+        assert np.allclose(rp_mids, rp_mids2)
+        assert np.allclose(ds_xyz[i], ds)
@@ -0,0 +1,109 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+from astropy.utils.misc import NumpyRNGContext
+import pytest
+
+from ..projected_mass_grid import ProjectedMassGrid
+from ..mass_in_cylinders import total_mass_enclosed_per_cylinder
+from ..delta_sigma import delta_sigma
+
+from ....custom_exceptions import HalotoolsError
+
+__all__ = ('test_projected_mass_grid_exact', )
+
+fixed_seed = 43
+
+
+def _random_sample(num_cyl, num_ptcl, period):
+    with NumpyRNGContext(fixed_seed):
+        centers = np.random.random((num_cyl, 3))*period
+        particles = np.random.random((num_ptcl, 3))*period
+        masses = np.random.rand(num_ptcl)
+    return centers, particles, masses
+
+
+@pytest.mark.parametrize('num_cells_per_dim', (1, 7, 200))
+def test_projected_mass_grid_exact(num_cells_per_dim):
+    """ Verify that the exact mode agrees with `total_mass_enclosed_per_cylinder`,
+    including for cylinders overlapping the periodic boundaries.
+    """
+    period = np.array((100., 80., 60.))
+    centers, particles, masses = _random_sample(200, 5000, period)
+    centers[:4, :2] = ((0.01, 0.02), (99.99, 40.), (50., 79.995), (0., 0.))
+    rp_bins = np.logspace(-1, 1.2, 10)
+    downsampling_factor = 2.5
+
+    grid = ProjectedMassGrid(particles, masses, downsampling_factor, period,
+        num_cells_per_dim=num_cells_per_dim, exact=True)
+    result = grid.mass_enclosed_per_cylinder(centers, rp_bins)
+    correct_result = total_mass_enclosed_per_cylinder(centers, particles, masses,
+        downsampling_factor, rp_bins, period)
+    assert result.shape == correct_result.shape
+    assert np.allclose(result, correct_result)
+
+    stack = grid.mass_enclosed_in_stack_of_cylinders(centers, rp_bins)
+    assert np.allclose(stack, correct_result.sum(axis=0))
+
+
+def test_projected_mass_grid_approximate():
+    """ Verify that the default mode agrees with the exact result
+    at the sub-percent level, including for galaxies located on top of particles.
+    """
+    period = 100.
+    centers, particles, masses = _random_sample(500, 50000, period)
+    centers[:250] = particles[:250]
+    rp_bins = np.logspace(-1, 1, 8)
+
+    correct_result = total_mass_enclosed_per_cylinder(centers, particles, masses,
+        1., rp_bins, period).sum(axis=0)
+
+    for num_cells_per_dim in (100, 400):
+        grid = ProjectedMassGrid(particles, masses, 1., period,
+            num_cells_per_dim=num_cells_per_dim)
+        result = grid.mass_enclosed_in_stack_of_cylinders(centers, rp_bins)
+        assert np.allclose(result, correct_result, rtol=0.01)
+
+    #  cylinders smaller than ``min_approx_radius_in_cells`` are always exact
+    grid = ProjectedMassGrid(particles, masses, 1., period,
+        num_cells_per_dim=25, min_approx_radius_in_cells=100)
+    result = grid.mass_enclosed_in_stack_of_cylinders(centers, rp_bins)
+    assert np.allclose(result, correct_result)
+
+
+def test_delta_sigma_projected_mass_grid():
+    period = 100.
+    centers, particles, masses = _random_sample(500, 50000, period)
+    rp_bins = np.logspace(-1, 1, 8)
+
+    rp_mids, ds = delta_sigma(centers, particles, masses, 2., rp_bins, period)
+    grid = ProjectedMassGrid(particles, masses, 2., period, exact=True)
+    rp_mids2, ds2 = delta_sigma(centers, grid, None, None, rp_bins, period)
+    assert np.allclose(rp_mids, rp_mids2)
+    assert np.allclose(ds, ds2)
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = delta_sigma(centers, grid, None, None, rp_bins, 2*period)
+    substr = "does not match the period"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(ValueError) as err:
+        __ = delta_sigma(centers, grid, None, None, rp_bins, None)
+    substr = "The input ``period`` is None"
+    assert substr in err.value.args[0]
+
+
+def test_projected_mass_grid_bad_args():
+    centers, particles, masses = _random_sample(10, 100, 100.)
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = ProjectedMassGrid(particles, masses, 1., None)
+    substr = "requires periodic boundary conditions"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = ProjectedMassGrid(particles, masses, 1., 100., num_cells_per_dim=0)
+    substr = "must be a positive integer"
+    assert substr in err.value.args[0]
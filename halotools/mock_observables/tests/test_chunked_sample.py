@@ -0,0 +1,186 @@
+""" Module providing unit-testing for the
+`~halotools.mock_observables.ChunkedSample` class.
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+from ..chunked_sample import ChunkedSample
+from ..pair_counters import npairs_3d, npairs_xy_z
+from ..two_point_clustering import tpcf, wp
+from ..surface_density import delta_sigma, total_mass_enclosed_per_cylinder
+from ..pairwise_velocities import mean_radial_velocity_vs_r
+
+from ...custom_exceptions import HalotoolsError
+
+__all__ = ('test_chunked_npairs_3d', )
+
+fixed_seed = 43
+period = 100.
+
+
+def _random_sample(npts):
+    with NumpyRNGContext(fixed_seed):
+        positions = np.random.uniform(0, period, npts*3).reshape((npts, 3))
+        velocities = np.random.normal(0, 100, npts*3).reshape((npts, 3))
+        masses = np.random.uniform(1, 2, npts)
+    return positions, velocities, masses
+
+
+def test_chunked_npairs_3d():
+    """ Verify that chunked auto- and cross-counts agree with the in-memory counts
+    with and without periodic boundary conditions.
+    """
+    positions, __, __ = _random_sample(10000)
+    others = positions[:2000, ::-1]
+    rbins = np.logspace(-1, 1.2, 8)
+    chunked = ChunkedSample(positions, chunk_size=1500)
+    chunked_others = ChunkedSample(others, chunk_size=700)
+
+    for p in (period, None):
+        correct_result = npairs_3d(positions, positions, rbins, period=p)
+        assert np.all(npairs_3d(chunked, chunked, rbins, period=p) == correct_result)
+
+        correct_result = npairs_3d(positions, others, rbins, period=p)
+        assert np.all(npairs_3d(chunked, others, rbins, period=p) == correct_result)
+        assert np.all(npairs_3d(positions, chunked_others, rbins, period=p) == correct_result)
+        assert np.all(npairs_3d(chunked, chunked_others, rbins, period=p) == correct_result)
+
+
+def test_chunked_npairs_xy_z():
+    positions, __, __ = _random_sample(10000)
+    rp_bins = np.logspace(-1, 1, 6)
+    pi_bins = np.linspace(0, 20, 4)
+    chunked = ChunkedSample(positions, chunk_size=1500)
+
+    correct_result = npairs_xy_z(positions, positions, rp_bins, pi_bins, period=period)
+    result = npairs_xy_z(chunked, chunked, rp_bins, pi_bins, period=period)
+    assert np.all(result == correct_result)
+
+
+def test_chunked_data_sources(tmpdir):
+    """ Verify that memory-mapped files, lists of chunks, generator functions
+    and hdf5 datasets all give the same result.
+    """
+    positions, __, __ = _random_sample(5000)
+    rbins = np.logspace(-1, 1, 6)
+    correct_result = npairs_3d(positions, positions, rbins, period=period)
+
+    fname = os.path.join(str(tmpdir), 'positions.npy')
+    np.save(fname, positions)
+    memmap = np.load(fname, mmap_mode='r')
+
+    def chunk_generator():
+        for i in range(0, 5000, 1200):
+            yield positions[i:i+1200]
+
+    sources = [memmap, [positions[:3000], positions[3000:]], chunk_generator]
+    if HAS_H5PY:
+        hdf5_fname = os.path.join(str(tmpdir), 'positions.hdf5')
+        with h5py.File(hdf5_fname, 'w') as f:
+            f['particles/positions'] = positions
+        sources.append((hdf5_fname, 'particles/positions'))
+
+    for source in sources:
+        chunked = ChunkedSample(source, chunk_size=800)
+        assert len(chunked) == 5000
+        assert np.all(npairs_3d(chunked, chunked, rbins, period=period) == correct_result)
+
+
+def test_chunked_tpcf_and_wp():
+    positions, __, __ = _random_sample(10000)
+    randoms = positions[:5000, ::-1]
+    rbins = np.logspace(0, 1, 6)
+    chunked = ChunkedSample(positions, chunk_size=2000)
+
+    assert np.allclose(tpcf(chunked, rbins, period=period), tpcf(positions, rbins, period=period))
+    assert np.allclose(tpcf(chunked, rbins, randoms=randoms), tpcf(positions, rbins, randoms=randoms))
+    assert np.allclose(wp(chunked, rbins, 20., period=period), wp(positions, rbins, 20., period=period))
+
+    # Random catalogs may be chunked as well
+    chunked_randoms = ChunkedSample(randoms, chunk_size=1500)
+    for estimator in ('Natural', 'Landy-Szalay'):
+        assert np.allclose(
+            tpcf(positions, rbins, randoms=chunked_randoms, period=period, estimator=estimator),
+            tpcf(positions, rbins, randoms=randoms, period=period, estimator=estimator))
+    assert np.allclose(tpcf(chunked, rbins, randoms=chunked_randoms),
+        tpcf(positions, rbins, randoms=randoms))
+    assert np.allclose(wp(positions, rbins, 20., randoms=chunked_randoms, period=period),
+        wp(positions, rbins, 20., randoms=randoms, period=period))
+
+
+def test_chunked_delta_sigma():
+    particles, __, masses = _random_sample(10000)
+    galaxies = particles[:300, ::-1]
+    rp_bins = np.logspace(-1, 1, 6)
+    chunked = ChunkedSample(particles, chunk_size=3000, masses=masses)
+
+    rp, ds = delta_sigma(galaxies, chunked, 1e10, 1, rp_bins, period)
+    rp, correct_ds = delta_sigma(galaxies, particles, 1e10, 1, rp_bins, period)
+    assert np.allclose(ds, correct_ds)
+
+    rp, ds = delta_sigma(galaxies, chunked, 'masses', 1, rp_bins, period)
+    rp, correct_ds = delta_sigma(galaxies, particles, masses, 1, rp_bins, period)
+    assert np.allclose(ds, correct_ds)
+
+    result = total_mass_enclosed_per_cylinder(galaxies, chunked, 'masses', 1, rp_bins, period)
+    correct_result = total_mass_enclosed_per_cylinder(galaxies, particles, masses, 1, rp_bins, period)
+    assert np.allclose(result, correct_result)
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = delta_sigma(galaxies, chunked, 'velocities', 1, rp_bins, period)
+    substr = "is not a column of the input ``particles``"
+    assert substr in err.value.args[0]
+
+
+def test_chunked_mean_radial_velocity_vs_r():
+    positions, velocities, __ = _random_sample(10000)
+    rbins = np.logspace(-1, 1, 6)
+    chunked = ChunkedSample(positions, chunk_size=2000, velocities=velocities)
+
+    for p in (period, None):
+        result = mean_radial_velocity_vs_r(chunked, 'velocities', rbins_absolute=rbins, period=p)
+        correct_result = mean_radial_velocity_vs_r(positions, velocities,
+            rbins_absolute=rbins, period=p)
+        assert np.allclose(result, correct_result)
+
+        result = mean_radial_velocity_vs_r(positions[:500], velocities[:500],
+            rbins_absolute=rbins, sample2=chunked, velocities2='velocities', period=p)
+        correct_result = mean_radial_velocity_vs_r(positions[:500], velocities[:500],
+            rbins_absolute=rbins, sample2=positions, velocities2=velocities, period=p)
+        assert np.allclose(result, correct_result)
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = mean_radial_velocity_vs_r(chunked, velocities, rbins_absolute=rbins, period=period)
+    substr = "must be the name of a column of the ChunkedSample"
+    assert substr in err.value.args[0]
+
+
+def test_chunked_sample_exceptions():
+    positions, velocities, __ = _random_sample(100)
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = ChunkedSample(5)
+    substr = "The ``positions`` data source of a ChunkedSample must be an array-like"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = ChunkedSample(positions, velocities=velocities[:50])
+    substr = "The ``velocities`` data source has 50 points"
+    assert substr in err.value.args[0]
+
+    chunked = ChunkedSample([positions[:50], positions[50:]], velocities=[velocities])
+    with pytest.raises(HalotoolsError) as err:
+        for __ in chunked.iter_chunks():
+            pass
+    substr = "The chunks of the ``velocities`` data source do not have"
+    assert substr in err.value.args[0]
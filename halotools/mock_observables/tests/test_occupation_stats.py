@@ -4,7 +4,8 @@ import numpy as np
 import pytest
 from ...empirical_models import PrebuiltHodModelFactory
 from ...sim_manager import FakeSim
-from ..occupation_stats import hod_from_mock
+from ..occupation_stats import hod_from_mock, get_haloprop_of_galaxies
+from ...utils import CrossmatchIndex
 
 __all__ = ('test_occupation_stats1', )
 
@@ -74,3 +75,16 @@ def test_occupation_stats4():
     mean_nsat = np.where(mean_nsat < 1e-2, 0, mean_nsat)
     expected_mean_nsat = np.where(expected_mean_nsat < 1e-2, 0, mean_nsat)
     assert np.allclose(expected_mean_nsat, mean_nsat, rtol=0.02)
+
+
+def test_get_haloprop_of_galaxies_index():
+    halo_id_halos = np.array((5, 9, 2, 7))
+    haloprop_halos = np.array((1., 2., 3., 4.))
+    halo_id_galaxies = np.array((7, 7, 3, 5, 2))
+    result = get_haloprop_of_galaxies(halo_id_galaxies, halo_id_halos, haloprop_halos)
+    assert np.allclose(result[[0, 1, 3, 4]], (4, 4, 1, 3))
+    assert np.isnan(result[2])
+
+    result2 = get_haloprop_of_galaxies(halo_id_galaxies,
+        CrossmatchIndex(halo_id_halos), haloprop_halos)
+    assert np.allclose(result2, result, equal_nan=True)
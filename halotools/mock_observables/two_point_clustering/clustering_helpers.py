@@ -7,6 +7,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import numpy as np
 from warnings import warn
 
+from ..chunked_sample import ChunkedSample
 from ..mock_observables_helpers import enforce_sample_has_correct_shape
 
 __all__ = ('verify_tpcf_estimator', 'process_optional_input_sample2')
@@ -77,6 +78,13 @@ def process_optional_input_sample2(sample1, sample2, do_cross, ndim=3):
     if sample2 is None:
         sample2 = sample1
         _sample1_is_sample2 = True
+    elif isinstance(sample1, ChunkedSample) or isinstance(sample2, ChunkedSample):
+        _sample1_is_sample2 = sample1 is sample2
+        if _sample1_is_sample2:
+            msg = (u"\n `sample1` and `sample2` are exactly the same, \n"
+                   "only the auto-correlation will be returned.\n")
+            warn(msg)
+            do_cross = False
     else:
         sample2 = enforce_sample_has_correct_shape(sample2, ndim=ndim)
         if sample1.shape != sample2.shape:
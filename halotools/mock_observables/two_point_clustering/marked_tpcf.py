@@ -6,7 +6,6 @@ calculate the marked two-point correlation function.
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import numpy as np
-from astropy.utils.misc import NumpyRNGContext
 
 from .clustering_helpers import process_optional_input_sample2
 
@@ -15,7 +14,9 @@ from ..mock_observables_helpers import (enforce_sample_has_correct_shape,
 from ..pair_counters.mesh_helpers import _enforce_maximum_search_length
 
 from ..pair_counters import npairs_3d, marked_npairs_3d
+from ..pair_counters.marked_npairs_3d import _marked_npairs_3d_multi_weights
 
+from ...utils.random_streams import random_state
 from ...custom_exceptions import HalotoolsError
 
 
@@ -101,8 +102,11 @@ def marked_tpcf(sample1, rbins, sample2=None,
 
     iterations : int, optional
         integer indicating the number of times to calculate the random weights,
-        taking the mean of the outcomes.  Only applicable if ``normalize_by`` is set
-        to 'random_marks'.  See Notes for further explanation.
+        taking the median of the outcomes.  Only applicable if ``normalize_by`` is set
+        to 'random_marks'. The weighted pairs of all iterations are counted
+        with a single traversal of the pairs, so that the cost of each additional
+        iteration is only one evaluation of the marking function per pair.
+        See Notes for further explanation.
 
     randomize_marks : array_like, optional
         Boolean array of length N_marks indicating which elements should be randomized
@@ -162,7 +166,7 @@ def marked_tpcf(sample1, rbins, sample2=None,
     and marks :math:`m_i,m_j`.  :math:`f()` is the marking function, ``weight_func_id``.  The sum
     in the denominator is over an equal number of random pairs :math:`k,l`. The
     calculation of this sum can be done multiple times, by setting the ``iterations``
-    parameter. The mean of the sum is then taken amongst iterations and used in the
+    parameter. The median of the sum is then taken amongst iterations and used in the
     calculation.
 
     If ``normalize_by`` is 'number_counts', then :math:`\mathrm{XX} \equiv \mathrm{DD}`
@@ -266,6 +270,13 @@ def marked_tpcf(sample1, rbins, sample2=None,
                 \end{array}
                 \right.
 
+    The multiplicative, summed and equality weights are inlined into specialized
+    pair-counting loops, and so are the fastest choices.
+    Additional compiled marking functions, e.g., numba ``cfunc`` objects or Cython ``cdef``
+    functions, can be used without recompiling Halotools by registering them with
+    `~halotools.mock_observables.register_weighting_function`, and passing the
+    returned integer ID as ``weight_func_id``.
+
     Examples
     --------
     For demonstration purposes we create a randomly distributed set of points within a
@@ -315,32 +326,23 @@ def marked_tpcf(sample1, rbins, sample2=None,
             num_threads, do_auto, do_cross, _sample1_is_sample2, None, None)
     # calculate randomized marked pairs
     elif normalize_by == 'random_marks':
-        if iterations > 1:
-            # create storage arrays of the right shape
-            R1R1 = np.zeros((iterations, len(rbins)-1))
-            R1R2 = np.zeros((iterations, len(rbins)-1))
-            R2R2 = np.zeros((iterations, len(rbins)-1))
-            for i in range(iterations):
-                # get arrays to randomize marks
-                with NumpyRNGContext(seed):
-                    permutate1 = np.random.permutation(np.arange(0, len(sample1)))
-                    permutate2 = np.random.permutation(np.arange(0, len(sample2)))
-                R1R1[i, :], R1R2[i, :], R2R2[i, :] = random_counts(
-                    sample1, sample2, rbins, period, num_threads,
-                    do_auto, do_cross, marks1, marks2, weight_func_id,
-                    _sample1_is_sample2, permutate1, permutate2, randomize_marks)
-
+        # draw the mark permutations of all iterations from a single random stream
+        rng = random_state(seed)
+        permutations1, permutations2 = [], []
+        for i in range(iterations):
+            permutations1.append(rng.permutation(len(sample1)))
+            permutations2.append(rng.permutation(len(sample2)))
+        R1R1, R1R2, R2R2 = random_counts(sample1, sample2, rbins, period,
+            num_threads, do_auto, do_cross, marks1, marks2, weight_func_id,
+            _sample1_is_sample2, permutations1, permutations2, randomize_marks)
+
+        # take the median amongst iterations
+        if R1R1 is not None:
             R1R1 = np.median(R1R1, axis=0)
+        if R1R2 is not None:
             R1R2 = np.median(R1R2, axis=0)
+        if R2R2 is not None:
             R2R2 = np.median(R2R2, axis=0)
-        else:
-            # get arrays to randomize marks
-            with NumpyRNGContext(seed):
-                permutate1 = np.random.permutation(np.arange(0, len(sample1)))
-                permutate2 = np.random.permutation(np.arange(0, len(sample2)))
-            R1R1, R1R2, R2R2 = random_counts(sample1, sample2, rbins, period,
-                num_threads, do_auto, do_cross, marks1, marks2, weight_func_id,
-                _sample1_is_sample2, permutate1, permutate2, randomize_marks)
 
     # return results
     if _sample1_is_sample2:
@@ -400,25 +402,22 @@ def marked_pair_counts(sample1, sample2, rbins, period, num_threads,
 
 def random_counts(sample1, sample2, rbins, period, num_threads,
         do_auto, do_cross, marks1, marks2, weight_func_id,
-        _sample1_is_sample2, permutate1, permutate2, randomize_marks):
+        _sample1_is_sample2, permutations1, permutations2, randomize_marks):
     """
     Count random weighted data pairs.
-    """
 
-    permuted_marks1 = marks1
-    permuted_marks2 = marks2
-    for i in range(marks1.shape[1]):
-        if randomize_marks[i]:
-            permuted_marks1[:, i] = marks1[permutate1, i]
-    for i in range(marks2.shape[1]):
-        if randomize_marks[i]:
-            permuted_marks2[:, i] = marks2[permutate2, i]
+    The weighted pairs of all the permutations of the marks are counted
+    simultaneously with a single traversal of the mesh of each pair of samples,
+    returning arrays of shape (len(permutations1), len(rbins)-1).
+    """
+    permuted_marks1 = _permute_marks(marks1, permutations1, randomize_marks)
+    permuted_marks2 = _permute_marks(marks2, permutations2, randomize_marks)
 
     if do_auto is True:
-        R1R1 = marked_npairs_3d(sample1, sample1, rbins,
-            weights1=marks1, weights2=permuted_marks1,
+        R1R1 = _marked_npairs_3d_multi_weights(sample1, sample1, rbins,
+            permuted_marks1, permuted_marks1,
             weight_func_id=weight_func_id, period=period, num_threads=num_threads)
-        R1R1 = np.diff(R1R1)
+        R1R1 = np.diff(R1R1, axis=1)
     else:
         R1R1 = None
         R2R2 = None
@@ -428,24 +427,35 @@ def random_counts(sample1, sample2, rbins, period, num_threads,
         R2R2 = R1R1
     else:
         if do_cross is True:
-            R1R2 = marked_npairs_3d(sample1, sample2, rbins,
-                weights1=permuted_marks1,
-                weights2=permuted_marks2,
+            R1R2 = _marked_npairs_3d_multi_weights(sample1, sample2, rbins,
+                permuted_marks1, permuted_marks2,
                 weight_func_id=weight_func_id, period=period, num_threads=num_threads)
-            R1R2 = np.diff(R1R2)
+            R1R2 = np.diff(R1R2, axis=1)
         else:
             R1R2 = None
         if do_auto is True:
-            R2R2 = marked_npairs_3d(sample2, sample2, rbins,
-                weights1=marks2, weights2=permuted_marks2,
+            R2R2 = _marked_npairs_3d_multi_weights(sample2, sample2, rbins,
+                permuted_marks2, permuted_marks2,
                 weight_func_id=weight_func_id, period=period, num_threads=num_threads)
-            R2R2 = np.diff(R2R2)
+            R2R2 = np.diff(R2R2, axis=1)
         else:
             R2R2 = None
 
     return R1R1, R1R2, R2R2
 
 
+def _permute_marks(marks, permutations, randomize_marks):
+    """
+    Return an array of shape (len(permutations), len(marks), N_marks)
+    storing the marks with the ``randomize_marks`` columns shuffled by each permutation.
+    """
+    randomize_marks = np.asarray(randomize_marks, dtype=bool)
+    permuted_marks = np.repeat(marks[np.newaxis, :, :], len(permutations), axis=0)
+    for ipermutation, permutation in enumerate(permutations):
+        permuted_marks[ipermutation][:, randomize_marks] = marks[permutation][:, randomize_marks]
+    return permuted_marks
+
+
 def pair_counts(sample1, sample2, rbins, period, num_threads, do_auto, do_cross,
         _sample1_is_sample2, approx_cell1_size, approx_cell2_size):
     """
@@ -12,7 +12,9 @@ from .clustering_helpers import (process_optional_input_sample2, verify_tpcf_est
 from .tpcf_estimators import _TP_estimator, _TP_estimator_requirements
 
 from ..mock_observables_helpers import (enforce_sample_has_correct_shape,
-    get_separation_bins_array, get_line_of_sight_bins_array, get_period, get_num_threads)
+    get_separation_bins_array, get_line_of_sight_bins_array, get_period, get_num_threads,
+    get_line_of_sight_axes)
+from ..chunked_sample import ChunkedSample
 from ..pair_counters.mesh_helpers import _enforce_maximum_search_length
 from ..pair_counters import npairs_xy_z
 
@@ -27,7 +29,7 @@ np.seterr(divide='ignore', invalid='ignore')  # ignore divide by zero in e.g. DD
 def rp_pi_tpcf(sample1, rp_bins, pi_bins, sample2=None, randoms=None,
         period=None, do_auto=True, do_cross=True, estimator='Natural',
         num_threads=1, approx_cell1_size=None,
-        approx_cell2_size=None, approx_cellran_size=None, seed=None):
+        approx_cell2_size=None, approx_cellran_size=None, seed=None, los_axes=None):
     r"""
     Calculate the redshift space correlation function, :math:`\xi(r_{p}, \pi)`
 
@@ -53,6 +55,8 @@ def rp_pi_tpcf(sample1, rp_bins, pi_bins, sample2=None, randoms=None,
         your coordinate position arrays into the
         format accepted by the ``sample1`` and ``sample2`` arguments.
         Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+        For samples too large to be stored in memory, ``sample1``, ``sample2``
+        and ``randoms`` may instead be a `~halotools.mock_observables.ChunkedSample`.
 
     rp_bins : array_like
         array of boundaries defining the radial bins perpendicular to the LOS in which
@@ -72,7 +76,8 @@ def rp_pi_tpcf(sample1, rp_bins, pi_bins, sample2=None, randoms=None,
         auto-correlation function will be calculated.
 
     randoms : array_like, optional
-        Nran x 3 array containing 3-D positions of randomly distributed points.
+        Nran x 3 array containing 3-D positions of randomly distributed points,
+        or a `~halotools.mock_observables.ChunkedSample`.
         If no randoms are provided (the default option),
         calculation of the tpcf can proceed using analytical randoms
         (only valid for periodic boundary conditions).
@@ -128,6 +133,15 @@ def rp_pi_tpcf(sample1, rp_bins, pi_bins, sample2=None, randoms=None,
         Random number seed used to randomly downsample data, if applicable.
         Default is None, in which case downsampling will be stochastic.
 
+    los_axes : sequence, optional
+        Sequence of Cartesian axes, each one of 'x', 'y' or 'z', to be used
+        in turn as the line-of-sight, e.g., ``('x', 'y', 'z')``.
+        The pairs are counted for all lines-of-sight in a single pass over the data,
+        which is faster than calling `~halotools.mock_observables.rp_pi_tpcf`
+        once per permutation of the coordinates.
+        Both ``rp_max`` and ``pi_max`` must then be less than period/3 in every dimension.
+        Default is None, in which case the z-axis is the line-of-sight.
+
     Returns
     -------
     correlation_function(s) : numpy.ndarray
@@ -135,6 +149,11 @@ def rp_pi_tpcf(sample1, rp_bins, pi_bins, sample2=None, randoms=None,
         :math:`\xi(r_p, \pi)` computed in each of the bins defined by input ``rp_bins``
         and ``pi_bins``.
 
+        If ``los_axes`` is not None, each returned array instead has an additional
+        leading dimension of length *len(los_axes)* storing the result for each
+        line-of-sight, so that the average over the lines-of-sight is given by
+        ``np.mean(xi, axis=0)``.
+
         .. math::
             1 + \xi(r_{p},\pi) = \mathrm{DD}r_{p},\pi) / \mathrm{RR}r_{p},\pi)
 
@@ -180,11 +199,16 @@ def rp_pi_tpcf(sample1, rp_bins, pi_bins, sample2=None, randoms=None,
     >>> pi_bins = np.logspace(-1,1,10)
     >>> xi = rp_pi_tpcf(sample1, rp_bins, pi_bins, period=Lbox)
 
+    Using each of the three Cartesian axes as the line-of-sight:
+
+    >>> xi_xyz = rp_pi_tpcf(sample1, rp_bins, pi_bins, period=Lbox, los_axes=('x', 'y', 'z'))
+    >>> xi_avg = np.mean(xi_xyz, axis=0)
+
     """
 
     function_args = (sample1, rp_bins, pi_bins, sample2, randoms, period, do_auto,
         do_cross, estimator, num_threads,
-        approx_cell1_size, approx_cell2_size, approx_cellran_size, seed)
+        approx_cell1_size, approx_cell2_size, approx_cellran_size, seed, los_axes)
 
     sample1, rp_bins, pi_bins, sample2, randoms, period, do_auto, do_cross, num_threads,\
         _sample1_is_sample2, PBCs = _rp_pi_tpcf_process_args(*function_args)
@@ -204,40 +228,66 @@ def rp_pi_tpcf(sample1, rp_bins, pi_bins, sample2=None, randoms=None,
     # count pairs
     D1D1, D1D2, D2D2 = pair_counts(sample1, sample2, rp_bins, pi_bins,
         period, num_threads, do_auto, do_cross,
-        _sample1_is_sample2, approx_cell1_size, approx_cell2_size)
+        _sample1_is_sample2, approx_cell1_size, approx_cell2_size, los_axes)
 
     D1R, D2R, RR = random_counts(sample1, sample2, randoms, rp_bins, pi_bins,
         period, PBCs, num_threads, do_RR, do_DR,
-        _sample1_is_sample2, approx_cell1_size, approx_cell2_size, approx_cellran_size)
+        _sample1_is_sample2, approx_cell1_size, approx_cell2_size, approx_cellran_size,
+        los_axes)
 
     if _sample1_is_sample2:
-        xi_11 = _TP_estimator(D1D1, D1R, RR, N1, N1, NR, NR, estimator)
+        xi_11 = _TP_estimator_per_los(D1D1, D1R, RR, N1, N1, NR, NR,
+            estimator, los_axes)
         return xi_11
     else:
         if (do_auto is True) & (do_cross is True):
-            xi_11 = _TP_estimator(D1D1, D1R, RR, N1, N1, NR, NR, estimator)
-            xi_12 = _TP_estimator(D1D2, D1R, RR, N1, N2, NR, NR, estimator)
-            xi_22 = _TP_estimator(D2D2, D2R, RR, N2, N2, NR, NR, estimator)
+            xi_11 = _TP_estimator_per_los(D1D1, D1R, RR, N1, N1, NR, NR,
+                estimator, los_axes)
+            xi_12 = _TP_estimator_per_los(D1D2, D1R, RR, N1, N2, NR, NR,
+                estimator, los_axes)
+            xi_22 = _TP_estimator_per_los(D2D2, D2R, RR, N2, N2, NR, NR,
+                estimator, los_axes)
             return xi_11, xi_12, xi_22
         elif (do_cross is True):
-            xi_12 = _TP_estimator(D1D2, D1R, RR, N1, N2, NR, NR, estimator)
+            xi_12 = _TP_estimator_per_los(D1D2, D1R, RR, N1, N2, NR, NR,
+                estimator, los_axes)
             return xi_12
         elif (do_auto is True):
-            xi_11 = _TP_estimator(D1D1, D1R, RR, N1, N1, NR, NR, estimator)
-            xi_22 = _TP_estimator(D2D2, D2R, RR, N2, N2, NR, NR, estimator)
+            xi_11 = _TP_estimator_per_los(D1D1, D1R, RR, N1, N1, NR, NR,
+                estimator, los_axes)
+            xi_22 = _TP_estimator_per_los(D2D2, D2R, RR, N2, N2, NR, NR,
+                estimator, los_axes)
             return xi_11, xi_22
 
 
+def _TP_estimator_per_los(DD, DR, RR, ND1, ND2, NR1, NR2, estimator, los_axes):
+    """
+    Apply the estimator separately to the counts of each line-of-sight.
+    Analytical random counts do not depend on the line-of-sight and are shared.
+    """
+    if los_axes is None:
+        return _TP_estimator(DD, DR, RR, ND1, ND2, NR1, NR2, estimator)
+
+    def los_counts(counts, i):
+        if np.ndim(counts) == 3:
+            return counts[i]
+        else:
+            return counts
+
+    return np.array([_TP_estimator(los_counts(DD, i), los_counts(DR, i), los_counts(RR, i),
+        ND1, ND2, NR1, NR2, estimator) for i in range(len(DD))])
+
+
 def pair_counts(sample1, sample2, rp_bins, pi_bins, period,
         num_threads, do_auto, do_cross, _sample1_is_sample2,
-        approx_cell1_size, approx_cell2_size):
+        approx_cell1_size, approx_cell2_size, los_axes=None):
     """
     Count data pairs.
     """
     D1D1 = npairs_xy_z(sample1, sample1, rp_bins, pi_bins, period=period,
         num_threads=num_threads, approx_cell1_size=approx_cell1_size,
-        approx_cell2_size=approx_cell1_size)
-    D1D1 = np.diff(np.diff(D1D1, axis=0), axis=1)
+        approx_cell2_size=approx_cell1_size, los_axes=los_axes)
+    D1D1 = np.diff(np.diff(D1D1, axis=-2), axis=-1)
     if _sample1_is_sample2:
         D1D2 = D1D1
         D2D2 = D1D1
@@ -246,16 +296,16 @@ def pair_counts(sample1, sample2, rp_bins, pi_bins, period,
             D1D2 = npairs_xy_z(sample1, sample2, rp_bins, pi_bins, period=period,
                 num_threads=num_threads,
                 approx_cell1_size=approx_cell1_size,
-                approx_cell2_size=approx_cell2_size)
-            D1D2 = np.diff(np.diff(D1D2, axis=0), axis=1)
+                approx_cell2_size=approx_cell2_size, los_axes=los_axes)
+            D1D2 = np.diff(np.diff(D1D2, axis=-2), axis=-1)
         else:
             D1D2 = None
         if do_auto is True:
             D2D2 = npairs_xy_z(sample2, sample2, rp_bins, pi_bins,
                 period=period, num_threads=num_threads,
                 approx_cell1_size=approx_cell2_size,
-                approx_cell2_size=approx_cell2_size)
-            D2D2 = np.diff(np.diff(D2D2, axis=0), axis=1)
+                approx_cell2_size=approx_cell2_size, los_axes=los_axes)
+            D2D2 = np.diff(np.diff(D2D2, axis=-2), axis=-1)
         else:
             D2D2 = None
 
@@ -271,7 +321,7 @@ def cylinder_volume(R, h):
 
 def random_counts(sample1, sample2, randoms, rp_bins, pi_bins, period,
         PBCs, num_threads, do_RR, do_DR, _sample1_is_sample2,
-        approx_cell1_size, approx_cell2_size, approx_cellran_size):
+        approx_cell1_size, approx_cell2_size, approx_cellran_size, los_axes=None):
     r"""
     Count random pairs.  There are two high level branches:
         1. w/ or wo/ PBCs and randoms.
@@ -289,16 +339,16 @@ def random_counts(sample1, sample2, randoms, rp_bins, pi_bins, period,
             RR = npairs_xy_z(randoms, randoms, rp_bins, pi_bins,
                 period=period, num_threads=num_threads,
                 approx_cell1_size=approx_cellran_size,
-                approx_cell2_size=approx_cellran_size)
-            RR = np.diff(np.diff(RR, axis=0), axis=1)
+                approx_cell2_size=approx_cellran_size, los_axes=los_axes)
+            RR = np.diff(np.diff(RR, axis=-2), axis=-1)
         else:
             RR = None
         if do_DR is True:
             D1R = npairs_xy_z(sample1, randoms, rp_bins, pi_bins,
                 period=period, num_threads=num_threads,
                 approx_cell1_size=approx_cell1_size,
-                approx_cell2_size=approx_cellran_size)
-            D1R = np.diff(np.diff(D1R, axis=0), axis=1)
+                approx_cell2_size=approx_cellran_size, los_axes=los_axes)
+            D1R = np.diff(np.diff(D1R, axis=-2), axis=-1)
         else:
             D1R = None
         if _sample1_is_sample2:  # calculating the cross-correlation
@@ -308,8 +358,8 @@ def random_counts(sample1, sample2, randoms, rp_bins, pi_bins, period,
                 D2R = npairs_xy_z(sample2, randoms, rp_bins, pi_bins,
                     period=period, num_threads=num_threads,
                     approx_cell1_size=approx_cell2_size,
-                    approx_cell2_size=approx_cellran_size)
-                D2R = np.diff(np.diff(D2R, axis=0), axis=1)
+                    approx_cell2_size=approx_cellran_size, los_axes=los_axes)
+                D2R = np.diff(np.diff(D2R, axis=-2), axis=-1)
             else:
                 D2R = None
 
@@ -344,16 +394,17 @@ def random_counts(sample1, sample2, randoms, rp_bins, pi_bins, period,
 
 def _rp_pi_tpcf_process_args(sample1, rp_bins, pi_bins, sample2, randoms,
         period, do_auto, do_cross, estimator, num_threads,
-        approx_cell1_size, approx_cell2_size, approx_cellran_size, seed):
+        approx_cell1_size, approx_cell2_size, approx_cellran_size, seed, los_axes=None):
     """
     Private method to do bounds-checking on the arguments passed to
     `~halotools.mock_observables.redshift_space_tpcf`.
     """
-    sample1 = enforce_sample_has_correct_shape(sample1)
+    if not isinstance(sample1, ChunkedSample):
+        sample1 = enforce_sample_has_correct_shape(sample1)
     sample2, _sample1_is_sample2, do_cross = process_optional_input_sample2(
         sample1, sample2, do_cross)
 
-    if randoms is not None:
+    if (randoms is not None) and not isinstance(randoms, ChunkedSample):
         randoms = np.atleast_1d(randoms)
 
     rp_bins = get_separation_bins_array(rp_bins)
@@ -364,7 +415,11 @@ def _rp_pi_tpcf_process_args(sample1, rp_bins, pi_bins, sample2, randoms,
 
     period, PBCs = get_period(period)
 
-    _enforce_maximum_search_length([rp_max, rp_max, pi_max], period)
+    if los_axes is None:
+        _enforce_maximum_search_length([rp_max, rp_max, pi_max], period)
+    else:
+        get_line_of_sight_axes(los_axes)
+        _enforce_maximum_search_length(np.zeros(3) + max(rp_max, pi_max), period)
 
     if (randoms is None) & (PBCs is False):
         msg = "If no PBCs are specified, randoms must be provided.\n"
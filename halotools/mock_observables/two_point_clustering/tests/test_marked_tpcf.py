@@ -136,6 +136,28 @@ def test_iterations():
         period=period, num_threads=1, weight_func_id=weight_func_id, seed=fixed_seed)
     result2 = marked_tpcf(sample1, rbins, sample2=sample2, marks1=weights1, marks2=weights2,
         period=period, num_threads=1, weight_func_id=weight_func_id, seed=fixed_seed, iterations=3)
+    result3 = marked_tpcf(sample1, rbins, sample2=sample2, marks1=weights1, marks2=weights2,
+        period=period, num_threads=1, weight_func_id=weight_func_id, seed=fixed_seed, iterations=3)
+    for r2, r3 in zip(result2, result3):
+        assert np.all(r2 == r3)
+
+
+def test_iterations_leave_marks_unchanged():
+    Npts1, Npts2 = 100, 90
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((Npts1, 3))
+        sample2 = np.random.random((Npts2, 3))
+        weights1 = np.random.random(Npts1)
+        weights2 = np.random.random(Npts2)
+    weights1_copy = np.copy(weights1)
+    weights2_copy = np.copy(weights2)
+
+    rbins = np.linspace(0.001, 0.25, 5)
+    __ = marked_tpcf(sample1, rbins, sample2=sample2, marks1=weights1, marks2=weights2,
+        period=1, weight_func_id=1, seed=fixed_seed, iterations=5,
+        normalize_by='random_marks')
+    assert np.all(weights1 == weights1_copy)
+    assert np.all(weights2 == weights2_copy)
 
 
 def test_exception_handling1():
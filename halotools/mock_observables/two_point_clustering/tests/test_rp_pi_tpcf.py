@@ -117,3 +117,28 @@ def test_rp_pi_cross_consistency():
         do_auto=False, do_cross=True)
 
     assert np.allclose(result_12a, result_12b)
+
+
+def test_rp_pi_tpcf_los_axes():
+    """ Verify that the correlation function computed for several lines-of-sight at once
+    agrees with calling `rp_pi_tpcf` separately on each permutation of the coordinates,
+    both with analytical randoms and with randoms provided.
+    """
+    Npts1, Npts2, Nran = 100, 90, 300
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((Npts1, 3))
+        sample2 = np.random.random((Npts2, 3))
+        randoms = np.random.random((Nran, 3))
+
+    permutations = ([2, 0, 1], [0, 1, 2])
+    for period, ran, estimator in ((1, None, 'Natural'), (None, randoms, 'Landy-Szalay')):
+        result = rp_pi_tpcf(sample1, rp_bins, pi_bins, sample2=sample2, randoms=ran,
+            period=period, estimator=estimator, los_axes=('y', 'z'))
+        for i, perm in enumerate(permutations):
+            if ran is not None:
+                ran = randoms[:, perm]
+            correct_result = rp_pi_tpcf(sample1[:, perm], rp_bins, pi_bins,
+                sample2=sample2[:, perm], randoms=ran, period=period, estimator=estimator)
+            for xi, correct_xi in zip(result, correct_result):
+                assert np.shape(xi) == (2, len(rp_bins)-1, len(pi_bins)-1)
+                assert np.allclose(xi[i], correct_xi, equal_nan=True)
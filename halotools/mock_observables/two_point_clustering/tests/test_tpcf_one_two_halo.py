@@ -7,7 +7,10 @@ import numpy as np
 from astropy.utils.misc import NumpyRNGContext
 import pytest
 
-from ..tpcf_one_two_halo_decomp import tpcf_one_two_halo_decomp
+from ..tpcf_one_two_halo_decomp import (tpcf_one_two_halo_decomp, host_halo_pair_counts,
+    _one_halo_npairs)
+
+from ...pair_counters import marked_npairs_3d
 
 from ....custom_exceptions import HalotoolsError
 
@@ -239,3 +242,53 @@ def test_tpcf_decomposition_auto_consistency():
     assert np.allclose(result_2h_11a, result_2h_11b)
     assert np.allclose(result_1h_22a, result_1h_22b)
     assert np.allclose(result_2h_22a, result_2h_22b)
+
+
+@pytest.mark.parametrize('Lbox', (1., None))
+def test_host_halo_pair_counts_marked_npairs(Lbox):
+    """ Verify that the one- and two-halo pair counts agree with
+    `marked_npairs_3d` using the same-host and different-host weighting functions.
+    """
+    Npts1, Npts2 = 300, 200
+    with NumpyRNGContext(fixed_seed):
+        IDs1 = np.random.randint(0, 40, Npts1)
+        IDs2 = np.random.randint(20, 60, Npts2)
+        sample1 = np.random.random((Npts1, 3))
+        sample2 = np.random.random((Npts2, 3))
+    _period = None if Lbox is None else period
+
+    one_halo_counts, two_halo_counts = host_halo_pair_counts(
+        sample1, sample2, rbins, _period, 1, True, True, IDs1, IDs2, False, None, None)
+
+    for i, (s1, ids1, s2, ids2) in enumerate(((sample1, IDs1, sample1, IDs1),
+            (sample1, IDs1, sample2, IDs2), (sample2, IDs2, sample2, IDs2))):
+        marks1 = np.vstack((ids1, np.ones(len(ids1)))).T
+        marks2 = np.vstack((ids2, np.ones(len(ids2)))).T
+        for weight_func_id, counts in ((3, one_halo_counts[i]), (4, two_halo_counts[i])):
+            marked_counts = marked_npairs_3d(s1, s2, rbins, weights1=marks1, weights2=marks2,
+                weight_func_id=weight_func_id, period=_period)
+            assert np.all(counts == np.diff(marked_counts))
+
+
+@pytest.mark.parametrize('max_pairs_per_batch', (1, 7, 50, 10**6))
+def test_one_halo_npairs_large_group(max_pairs_per_batch):
+    """ Verify that the one-halo pair counts of a sample dominated by a single
+    host halo with many more pairs than ``max_pairs_per_batch``
+    agree with a brute-force calculation.
+    """
+    Npts1, Npts2 = 120, 90
+    with NumpyRNGContext(fixed_seed):
+        IDs1 = np.where(np.random.random(Npts1) < 0.8, 5, np.random.randint(0, 10, Npts1))
+        IDs2 = np.where(np.random.random(Npts2) < 0.8, 5, np.random.randint(0, 10, Npts2))
+        sample1 = np.random.random((Npts1, 3))
+        sample2 = np.random.random((Npts2, 3))
+
+    d = np.abs(sample1[:, None, :] - sample2[None, :, :])
+    d = np.minimum(d, period - d)
+    dist = np.sqrt(np.sum(d*d, axis=2))
+    same_host = IDs1[:, None] == IDs2[None, :]
+    correct_counts = np.array([np.sum(same_host & (dist <= r)) for r in rbins])
+
+    counts = _one_halo_npairs(sample1, IDs1, sample2, IDs2, rbins, period,
+        max_pairs_per_batch=max_pairs_per_batch)
+    assert np.all(counts == correct_counts)
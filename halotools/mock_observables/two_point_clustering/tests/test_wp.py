@@ -146,3 +146,21 @@ def test_wp_auto_consistency():
 
     assert np.allclose(wp_11a, wp_11b)
     assert np.allclose(wp_22a, wp_22b)
+
+
+def test_wp_los_axes():
+    """ Verify that projecting along several lines-of-sight at once agrees with
+    calling `wp` separately on each permutation of the coordinates.
+    """
+    Npts1, Npts2 = 200, 300
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((Npts1, 3))
+        sample2 = np.random.random((Npts2, 3))
+
+    result = wp(sample1, rp_bins, pi_max, sample2=sample2, period=1, los_axes=('x', 'y', 'z'))
+    permutations = ([1, 2, 0], [2, 0, 1], [0, 1, 2])
+    for i, perm in enumerate(permutations):
+        correct_result = wp(sample1[:, perm], rp_bins, pi_max, sample2=sample2[:, perm], period=1)
+        for wp_xyz, correct_wp in zip(result, correct_result):
+            assert np.shape(wp_xyz) == (3, len(rp_bins)-1)
+            assert np.allclose(wp_xyz[i], correct_wp)
@@ -14,6 +14,7 @@ from .tpcf_estimators import _TP_estimator
 
 from ..mock_observables_helpers import (enforce_sample_has_correct_shape,
     get_separation_bins_array, get_period, get_num_threads)
+from ..chunked_sample import ChunkedSample
 from ..pair_counters.mesh_helpers import _enforce_maximum_search_length
 from ..pair_counters import npairs_3d
 
@@ -173,6 +174,8 @@ def tpcf(sample1, rbins, sample2=None, randoms=None, period=None,
         your coordinate position arrays into the
         format accepted by the ``sample1`` and ``sample2`` arguments.
         Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+        For samples too large to be stored in memory, ``sample1``, ``sample2``
+        and ``randoms`` may instead be a `~halotools.mock_observables.ChunkedSample`.
 
     rbins : array_like
         array of boundaries defining the real space radial bins in which pairs are counted.
@@ -186,7 +189,8 @@ def tpcf(sample1, rbins, sample2=None, randoms=None, period=None,
         auto-correlation function will be calculated.
 
     randoms : array_like, optional
-        Nran x 3 array containing 3-D positions of randomly distributed points.
+        Nran x 3 array containing 3-D positions of randomly distributed points,
+        or a `~halotools.mock_observables.ChunkedSample`.
         If no randoms are provided (the default option),
         calculation of the tpcf can proceed using analytical randoms
         (only valid for periodic boundary conditions).
@@ -390,11 +394,12 @@ def _tpcf_process_args(sample1, rbins, sample2, randoms,
     `~halotools.mock_observables.tpcf`.
     """
 
-    sample1 = enforce_sample_has_correct_shape(sample1)
+    if not isinstance(sample1, ChunkedSample):
+        sample1 = enforce_sample_has_correct_shape(sample1)
     sample2, _sample1_is_sample2, do_cross = process_optional_input_sample2(
         sample1, sample2, do_cross)
 
-    if randoms is not None:
+    if (randoms is not None) and not isinstance(randoms, ChunkedSample):
         randoms = np.atleast_1d(randoms)
 
     rbins = get_separation_bins_array(rbins)
@@ -17,7 +17,6 @@ from ..pair_counters.mesh_helpers import _enforce_maximum_search_length
 
 from .tpcf_estimators import _TP_estimator, _TP_estimator_requirements
 from ..pair_counters import npairs_3d
-from ..pair_counters import marked_npairs_3d
 
 from ...custom_exceptions import HalotoolsError
 
@@ -208,19 +207,14 @@ def tpcf_one_two_halo_decomp(sample1, sample1_host_halo_id, rbins,
         # this is arbitrarily set, but must remain consistent!
         NR = N1
 
-    # calculate 1-halo pairs
-    weight_func_id = 3
-    one_halo_D1D1, one_halo_D1D2, one_halo_D2D2 = marked_pair_counts(
+    # calculate 1-halo and 2-halo pairs
+    one_halo_counts, two_halo_counts = host_halo_pair_counts(
             sample1, sample2, rbins, period, num_threads,
             do_auto, do_cross, sample1_host_halo_id,
-            sample2_host_halo_id, weight_func_id, _sample1_is_sample2)
-
-    # calculate 2-halo pairs
-    weight_func_id = 4
-    two_halo_D1D1, two_halo_D1D2, two_halo_D2D2 = marked_pair_counts(
-            sample1, sample2, rbins, period, num_threads,
-            do_auto, do_cross, sample1_host_halo_id,
-            sample2_host_halo_id, weight_func_id, _sample1_is_sample2)
+            sample2_host_halo_id, _sample1_is_sample2,
+            approx_cell1_size, approx_cell2_size)
+    one_halo_D1D1, one_halo_D1D2, one_halo_D2D2 = one_halo_counts
+    two_halo_D1D1, two_halo_D1D2, two_halo_D2D2 = two_halo_counts
 
     # count random pairs
     D1R, D2R, RR = random_counts(sample1, sample2, randoms, rbins, period,
@@ -335,45 +329,123 @@ def random_counts(sample1, sample2, randoms, rbins, period, PBCs, num_threads,
         return D1R, D2R, RR
 
 
-def marked_pair_counts(sample1, sample2, rbins, period, num_threads,
-        do_auto, do_cross, marks1, marks2, weight_func_id, _sample1_is_sample2):
+def host_halo_pair_counts(sample1, sample2, rbins, period, num_threads,
+        do_auto, do_cross, host_ids1, host_ids2, _sample1_is_sample2,
+        approx_cell1_size, approx_cell2_size):
     """
-    Count weighted data pairs.
+    Count data pairs, split into pairs sharing a host halo (one-halo pairs)
+    and pairs residing in different host halos (two-halo pairs).
+
+    The one-halo pairs are counted exactly by only considering pairs of points
+    within the same host halo, see `_one_halo_npairs`. The two-halo pairs are
+    then given by the difference between the total number of pairs, counted
+    with a single unweighted traversal of the mesh by `npairs_3d`,
+    and the one-halo pairs.
     """
 
-    # add ones to weights, so returned value is return 1.0*1.0
-    marks1 = np.vstack((marks1, np.ones(len(marks1)))).T
-    marks2 = np.vstack((marks2, np.ones(len(marks2)))).T
+    def split_counts(s1, s2, ids1, ids2, cell1_size, cell2_size):
+        total = npairs_3d(s1, s2, rbins, period=period, num_threads=num_threads,
+            approx_cell1_size=cell1_size, approx_cell2_size=cell2_size)
+        one_halo = _one_halo_npairs(s1, ids1, s2, ids2, rbins, period)
+        return np.diff(one_halo), np.diff(total - one_halo)
 
     if do_auto is True:
-        D1D1 = marked_npairs_3d(sample1, sample1, rbins,
-            weights1=marks1, weights2=marks1,
-            weight_func_id=weight_func_id, period=period, num_threads=num_threads)
-        D1D1 = np.diff(D1D1)
+        one_halo_D1D1, two_halo_D1D1 = split_counts(sample1, sample1,
+            host_ids1, host_ids1, approx_cell1_size, approx_cell1_size)
     else:
-        D1D1 = None
-        D2D2 = None
+        one_halo_D1D1, two_halo_D1D1 = None, None
+        one_halo_D2D2, two_halo_D2D2 = None, None
 
     if _sample1_is_sample2:
-        D1D2 = D1D1
-        D2D2 = D1D1
+        one_halo_D1D2, two_halo_D1D2 = one_halo_D1D1, two_halo_D1D1
+        one_halo_D2D2, two_halo_D2D2 = one_halo_D1D1, two_halo_D1D1
     else:
         if do_cross is True:
-            D1D2 = marked_npairs_3d(sample1, sample2, rbins,
-                weights1=marks1, weights2=marks2,
-                weight_func_id=weight_func_id, period=period, num_threads=num_threads)
-            D1D2 = np.diff(D1D2)
+            one_halo_D1D2, two_halo_D1D2 = split_counts(sample1, sample2,
+                host_ids1, host_ids2, approx_cell1_size, approx_cell2_size)
         else:
-            D1D2 = None
+            one_halo_D1D2, two_halo_D1D2 = None, None
         if do_auto is True:
-            D2D2 = marked_npairs_3d(sample2, sample2, rbins,
-                weights1=marks2, weights2=marks2,
-                weight_func_id=weight_func_id, period=period, num_threads=num_threads)
-            D2D2 = np.diff(D2D2)
+            one_halo_D2D2, two_halo_D2D2 = split_counts(sample2, sample2,
+                host_ids2, host_ids2, approx_cell2_size, approx_cell2_size)
         else:
-            D2D2 = None
+            one_halo_D2D2, two_halo_D2D2 = None, None
+
+    one_halo_counts = (one_halo_D1D1, one_halo_D1D2, one_halo_D2D2)
+    two_halo_counts = (two_halo_D1D1, two_halo_D1D2, two_halo_D2D2)
+    return one_halo_counts, two_halo_counts
 
-    return D1D1, D1D2, D2D2
+
+def _one_halo_npairs(sample1, host_ids1, sample2, host_ids2, rbins, period,
+        max_pairs_per_batch=10**6):
+    """
+    Cumulative number of pairs of points in ``sample1`` and ``sample2``
+    that share the same host halo id, following the conventions of `npairs_3d`:
+    the k-th entry counts the pairs separated by a distance r <= ``rbins[k]``.
+
+    Points are grouped by host halo id, and the separations are only computed for
+    the pairs within each group, which are generated in vectorized batches
+    of at most ``max_pairs_per_batch`` pairs. Groups with more pairs are split
+    into blocks of consecutive rows (and if need be columns) of their pairs,
+    so that the memory used does not grow with the size of the largest group.
+    """
+    max_pairs_per_batch = int(max_pairs_per_batch)
+    rbins_squared = rbins*rbins
+    counts = np.zeros(len(rbins)+1, dtype=np.int64)
+
+    idx_sorted1 = np.argsort(host_ids1)
+    idx_sorted2 = np.argsort(host_ids2)
+    unique_ids1, start1, num1 = np.unique(host_ids1[idx_sorted1],
+        return_index=True, return_counts=True)
+    unique_ids2, start2, num2 = np.unique(host_ids2[idx_sorted2],
+        return_index=True, return_counts=True)
+
+    has_match = np.in1d(unique_ids1, unique_ids2, assume_unique=True)
+    start1, num1 = start1[has_match], num1[has_match]
+    matching_idx2 = np.searchsorted(unique_ids2, unique_ids1[has_match])
+    start2, num2 = start2[matching_idx2], num2[matching_idx2]
+
+    # Split each group into blocks of at most max_pairs_per_block pairs,
+    # storing at most num_rows points of sample1 and num_cols points of sample2
+    max_pairs_per_block = max(max_pairs_per_batch // 2, 1)
+    num_cols = np.minimum(num2, max_pairs_per_block)
+    num_rows = np.maximum(max_pairs_per_block // np.maximum(num_cols, 1), 1)
+    num_row_blocks = -(-num1 // num_rows)
+    num_col_blocks = -(-num2 // num_cols)
+    num_blocks = num_row_blocks*num_col_blocks
+    block_group = np.repeat(np.arange(len(num_blocks)), num_blocks)
+    block_index = np.arange(num_blocks.sum()) - np.repeat(np.cumsum(num_blocks) - num_blocks, num_blocks)
+    row_offset = (block_index // num_col_blocks[block_group])*num_rows[block_group]
+    col_offset = (block_index % num_col_blocks[block_group])*num_cols[block_group]
+    start1 = start1[block_group] + row_offset
+    num1 = np.minimum(num_rows[block_group], num1[block_group] - row_offset)
+    start2 = start2[block_group] + col_offset
+    num2 = np.minimum(num_cols[block_group], num2[block_group] - col_offset)
+
+    npairs_per_group = num1*num2
+    # Blocks ending within the same window of pair indices form a batch,
+    # which has at most (window_size + max_pairs_per_block - 1) = max_pairs_per_batch pairs
+    window_size = max_pairs_per_batch - max_pairs_per_block + 1
+    batch_id = (np.cumsum(npairs_per_group) - 1) // window_size
+    batch_edges = np.concatenate(([0], np.flatnonzero(np.diff(batch_id)) + 1,
+        [len(npairs_per_group)]))
+
+    for first, last in zip(batch_edges[:-1], batch_edges[1:]):
+        npairs_batch = npairs_per_group[first:last]
+        group = np.repeat(np.arange(first, last), npairs_batch)
+        offset = np.arange(npairs_batch.sum()) - np.repeat(
+            np.cumsum(npairs_batch) - npairs_batch, npairs_batch)
+        i1 = idx_sorted1[start1[group] + offset // num2[group]]
+        i2 = idx_sorted2[start2[group] + offset % num2[group]]
+
+        d = np.abs(sample1[i1] - sample2[i2])
+        if period is not None:
+            d = np.minimum(d, period - d)
+        dsq = np.sum(d*d, axis=1)
+        counts += np.bincount(np.searchsorted(rbins_squared, dsq, side='left'),
+            minlength=len(rbins)+1)
+
+    return np.cumsum(counts[:-1])
 
 
 def _tpcf_one_two_halo_decomp_process_args(sample1, sample1_host_halo_id, rbins,
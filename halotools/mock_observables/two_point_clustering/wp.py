@@ -20,7 +20,7 @@ np.seterr(divide='ignore', invalid='ignore')  # ignore divide by zero in e.g. DD
 def wp(sample1, rp_bins, pi_max, sample2=None, randoms=None, period=None,
         do_auto=True, do_cross=True, estimator='Natural', num_threads=1,
         approx_cell1_size=None, approx_cell2_size=None,
-        approx_cellran_size=None, seed=None):
+        approx_cellran_size=None, seed=None, los_axes=None):
     r"""
     Calculate the projected two point correlation function, :math:`w_{p}(r_p)`,
     where :math:`r_p` is the separation perpendicular to the line-of-sight (LOS).
@@ -54,6 +54,8 @@ def wp(sample1, rp_bins, pi_max, sample2=None, randoms=None, period=None,
         your coordinate position arrays into the
         format accepted by the ``sample1`` and ``sample2`` arguments.
         Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
+        For samples too large to be stored in memory, ``sample1``, ``sample2``
+        and ``randoms`` may instead be a `~halotools.mock_observables.ChunkedSample`.
 
     rp_bins : array_like
         array of boundaries defining the radial bins perpendicular to the LOS in which
@@ -71,7 +73,8 @@ def wp(sample1, rp_bins, pi_max, sample2=None, randoms=None, period=None,
         auto-correlation function will be calculated.
 
     randoms : array_like, optional
-        Nran x 3 array containing 3-D positions of randomly distributed points.
+        Nran x 3 array containing 3-D positions of randomly distributed points,
+        or a `~halotools.mock_observables.ChunkedSample`.
         If no randoms are provided (the default option),
         calculation of the tpcf can proceed using analytical randoms
         (only valid for periodic boundary conditions).
@@ -127,6 +130,13 @@ def wp(sample1, rp_bins, pi_max, sample2=None, randoms=None, period=None,
         Random number seed used to randomly downsample data, if applicable.
         Default is None, in which case downsampling will be stochastic.
 
+    los_axes : sequence, optional
+        Sequence of Cartesian axes, each one of 'x', 'y' or 'z', to be used
+        in turn as the line-of-sight, e.g., ``('x', 'y', 'z')``.
+        The pairs are counted for all lines-of-sight in a single pass over the data.
+        Both ``rp_max`` and ``pi_max`` must then be less than period/3 in every dimension.
+        Default is None, in which case the z-axis is the line-of-sight.
+
     Returns
     -------
     correlation_function(s) : numpy.array
@@ -143,6 +153,9 @@ def wp(sample1, rp_bins, pi_max, sample2=None, randoms=None, period=None,
         and ``sample2``, and the autocorrelation of ``sample2``.  If ``do_auto`` or ``do_cross``
         is set to False, the appropriate result(s) is not returned.
 
+        If ``los_axes`` is not None, each returned array instead has shape
+        (len(los_axes), len(rp_bins)-1), storing the result for each line-of-sight.
+
     Notes
     -----
     The projected correlation function is calculated by integrating the
@@ -185,6 +198,12 @@ def wp(sample1, rp_bins, pi_max, sample2=None, randoms=None, period=None,
     >>> pi_max = 10
     >>> xi = wp(coords, rp_bins, pi_max, period=Lbox)
 
+    Projecting along each of the three Cartesian axes in turn,
+    the projected clustering averaged over the lines-of-sight is:
+
+    >>> wp_xyz = wp(coords, rp_bins, pi_max, period=Lbox, los_axes=('x', 'y', 'z'))
+    >>> wp_avg = np.mean(wp_xyz, axis=0)
+
     See also
     --------
     :ref:`galaxy_catalog_analysis_tutorial4`
@@ -198,7 +217,7 @@ def wp(sample1, rp_bins, pi_max, sample2=None, randoms=None, period=None,
     # process input parameters
     function_args = (sample1, rp_bins, pi_bins, sample2, randoms, period, do_auto,
         do_cross, estimator, num_threads,
-        approx_cell1_size, approx_cell2_size, approx_cellran_size, seed)
+        approx_cell1_size, approx_cell2_size, approx_cellran_size, seed, los_axes)
     sample1, rp_bins, pi_bins, sample2, randoms, period, do_auto, do_cross, num_threads,\
         _sample1_is_sample2, PBCs = _rp_pi_tpcf_process_args(*function_args)
 
@@ -212,29 +231,29 @@ def wp(sample1, rp_bins, pi_max, sample2=None, randoms=None, period=None,
         estimator=estimator, num_threads=num_threads,
         approx_cell1_size=approx_cell1_size,
         approx_cell2_size=approx_cell2_size,
-        approx_cellran_size=approx_cellran_size)
+        approx_cellran_size=approx_cellran_size, los_axes=los_axes)
 
     # return the results.
     if _sample1_is_sample2:
-        D1D1 = result[:, 0]
+        D1D1 = result[..., 0]
         wp_D1D1 = 2.0*D1D1*pi_max
         return wp_D1D1
     else:
         if (do_auto is True) & (do_cross is True):
-            D1D1 = result[0][:, 0]
-            D1D2 = result[1][:, 0]
-            D2D2 = result[2][:, 0]
+            D1D1 = result[0][..., 0]
+            D1D2 = result[1][..., 0]
+            D2D2 = result[2][..., 0]
             wp_D1D1 = 2.0*D1D1*pi_max
             wp_D1D2 = 2.0*D1D2*pi_max
             wp_D2D2 = 2.0*D2D2*pi_max
             return wp_D1D1, wp_D1D2, wp_D2D2
         elif (do_auto is True) & (do_cross is False):
-            D1D1 = result[0][:, 0]
-            D2D2 = result[1][:, 0]
+            D1D1 = result[0][..., 0]
+            D2D2 = result[1][..., 0]
             wp_D1D1 = 2.0*D1D1*pi_max
             wp_D2D2 = 2.0*D2D2*pi_max
             return wp_D1D1, wp_D2D2
         elif (do_auto is False) & (do_cross is True):
-            D1D2 = result[:, 0]
+            D1D2 = result[..., 0]
             wp_D1D2 = 2.0*D1D2*pi_max
             return wp_D1D2
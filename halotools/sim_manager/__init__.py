@@ -21,8 +21,12 @@ from .fake_sim import FakeSim
 from .download_manager import DownloadManager
 
 from .cached_halo_catalog import CachedHaloCatalog
+from .multi_snapshot_halo_catalog import MultiSnapshotHaloCatalog
 from .user_supplied_halo_catalog import UserSuppliedHaloCatalog
 from .user_supplied_ptcl_catalog import UserSuppliedPtclCatalog
+from .memory_mapped_ptcl_table import MemoryMappedPtclTable
+from .columnar_halo_table import (read_halo_table, write_columnar_halo_table,
+    convert_to_columnar_halo_table)
 
 from .rockstar_hlist_reader import RockstarHlistReader
 from .tabular_ascii_reader import TabularAsciiReader
@@ -0,0 +1,208 @@
+""" Module containing functions shared by the
+`~halotools.sim_manager.HaloTableCache` and `~halotools.sim_manager.PtclTableCache`
+classes to safely update the cache logs from concurrent processes,
+and to remember the results of validating the catalogs in cache.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+    _HAS_FCNTL = True
+except ImportError:
+    _HAS_FCNTL = False
+
+try:
+    import sqlite3
+    _HAS_SQLITE3 = True
+except ImportError:
+    _HAS_SQLITE3 = False
+
+from ..sim_manager import halotools_cache_dirname
+
+__all__ = ('cache_log_lock', 'atomic_write_log_table', 'CacheValidationRegistry',
+    'get_validation_registry', 'set_validation_registry')
+
+# Validation results of files modified less than racy_mtime_window seconds before
+# the validation are not reused, since later modifications within the resolution
+# of the file system clock would not change the modification time of the file
+racy_mtime_window = 2.
+
+
+@contextmanager
+def cache_log_lock(cache_log_fname):
+    """ Context manager holding an exclusive lock on the cache log
+    while it is read and rewritten, so that concurrent processes updating
+    the same log do not overwrite each other's changes.
+
+    The lock is an advisory lock of a ``.lock`` file next to the log.
+    On platforms without the `fcntl` module, no lock is taken.
+    """
+    if not _HAS_FCNTL:
+        yield
+        return
+
+    lock_fname = cache_log_fname + '.lock'
+    try:
+        lock_file = open(lock_fname, 'a')
+    except (IOError, OSError):
+        yield
+        return
+
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        yield
+    finally:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            lock_file.close()
+
+
+def atomic_write_log_table(log_table, cache_log_fname):
+    """ Write the ascii table storing the cache log to a temporary file
+    and then rename it to ``cache_log_fname``, so that processes reading
+    the log never see a partially written file.
+    """
+    tmp_fname = '{0}.tmp{1}'.format(cache_log_fname, os.getpid())
+    log_table.write(tmp_fname, format='ascii', overwrite=True)
+    try:
+        os.replace(tmp_fname, cache_log_fname)
+    except AttributeError:
+        # os.replace is not available in python 2
+        os.rename(tmp_fname, cache_log_fname)
+
+
+class CacheValidationRegistry(object):
+    """ Registry storing the outcome of the ``safe_for_cache`` checks of
+    `~halotools.sim_manager.HaloTableCacheLogEntry` and
+    `~halotools.sim_manager.PtclTableCacheLogEntry` instances in an sqlite database,
+    so that the hdf5 file of a catalog is only opened and read to validate it
+    the first time it is checked, or after it has been modified.
+
+    Each result is keyed by the type and attributes of the log entry,
+    and is only reused if the modification time and size of the file
+    are unchanged. If the `sqlite3` module is unavailable or the database
+    cannot be accessed, no results are stored and the checks are always performed.
+    """
+
+    def __init__(self, db_fname=None, timeout=30.):
+        """
+        Parameters
+        -----------
+        db_fname : string, optional
+            Absolute path of the sqlite database.
+            Default is ``cache_validation_registry.db`` in the Halotools cache directory.
+
+        timeout : float, optional
+            Number of seconds to wait for a concurrent process to release
+            the database before giving up. Default is 30.
+        """
+        if db_fname is None:
+            db_fname = os.path.join(halotools_cache_dirname, 'cache_validation_registry.db')
+        self.db_fname = db_fname
+        self.timeout = timeout
+
+    @contextmanager
+    def _connection(self):
+        conn = sqlite3.connect(self.db_fname, timeout=self.timeout)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS validations ("
+                    "entry_key TEXT PRIMARY KEY, mtime REAL, size INTEGER, "
+                    "validation_time REAL, num_failures INTEGER, message TEXT)")
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _file_stats(fname):
+        try:
+            stats = os.stat(fname)
+        except OSError:
+            return None
+        return float(stats.st_mtime), int(stats.st_size)
+
+    def retrieve(self, entry_key, fname):
+        """ Retrieve the stored ``(num_failures, message)`` validation result
+        of the log entry, or None if there is no result for the current version of the file.
+        """
+        if not _HAS_SQLITE3:
+            return None
+        stats = self._file_stats(fname)
+        if stats is None:
+            return None
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT mtime, size, validation_time, num_failures, message "
+                    "FROM validations WHERE entry_key = ?", (entry_key, )).fetchone()
+        except sqlite3.Error:
+            return None
+
+        if row is None:
+            return None
+        mtime, size, validation_time, num_failures, message = row
+        if (mtime, size) != stats:
+            return None
+        if validation_time - mtime < racy_mtime_window:
+            return None
+        return num_failures, message
+
+    def store(self, entry_key, fname, num_failures, message):
+        """ Store the validation result of the log entry for the current version of the file.
+        """
+        if not _HAS_SQLITE3:
+            return
+        stats = self._file_stats(fname)
+        if stats is None:
+            return
+        try:
+            with self._connection() as conn:
+                conn.execute("INSERT OR REPLACE INTO validations VALUES (?, ?, ?, ?, ?, ?)",
+                    (entry_key, stats[0], stats[1], time.time(), num_failures, message))
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        """ Delete all stored validation results.
+        """
+        if not _HAS_SQLITE3:
+            return
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM validations")
+        except sqlite3.Error:
+            pass
+
+
+# Registry consulted by the safe_for_cache checks of the cache log entries,
+# created the first time it is used
+_validation_registry = None
+
+
+def get_validation_registry():
+    """ Return the `CacheValidationRegistry` consulted by the ``safe_for_cache`` checks
+    of the cache log entries. Unless `set_validation_registry` has been called,
+    the registry stored in the Halotools cache directory is created the first time
+    this function is called.
+    """
+    global _validation_registry
+    if _validation_registry is None:
+        _validation_registry = CacheValidationRegistry()
+    return _validation_registry
+
+
+def set_validation_registry(registry):
+    """ Set the `CacheValidationRegistry` consulted by the ``safe_for_cache`` checks
+    of the cache log entries, e.g., to keep the validation results of temporary
+    catalogs out of the Halotools cache directory.
+
+    Parameters
+    -----------
+    registry : `CacheValidationRegistry`
+        Registry used by all subsequent checks. If None, the registry stored
+        in the Halotools cache directory is used again.
+    """
+    global _validation_registry
+    _validation_registry = registry
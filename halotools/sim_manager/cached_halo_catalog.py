@@ -20,10 +20,12 @@ except ImportError:
 
 from ..sim_manager import sim_defaults, supported_sims
 
-from ..utils import broadcast_host_halo_property, add_halo_hostid
-
 from .halo_table_cache import HaloTableCache
 from .ptcl_table_cache import PtclTableCache
+from .memory_mapped_ptcl_table import MemoryMappedPtclTable
+from .columnar_halo_table import (_halo_table_row_mask, _read_halo_table,
+    _derived_column_keys, _derived_columns_input_table, _read_derived_columns,
+    _compute_derived_columns)
 from .halo_table_cache_log_entry import get_redshift_string
 
 from ..custom_exceptions import HalotoolsError, InvalidCacheLogEntry
@@ -31,6 +33,9 @@ from ..custom_exceptions import HalotoolsError, InvalidCacheLogEntry
 
 __all__ = ('CachedHaloCatalog', )
 
+# Keyword arguments of CachedHaloCatalog specifying row cuts of the halo table
+_row_cut_kwargs = ('row_cut_min_dict', 'row_cut_max_dict', 'row_cut_eq_dict', 'row_cut_neq_dict')
+
 
 class CachedHaloCatalog(object):
     """
@@ -57,7 +62,7 @@ class CachedHaloCatalog(object):
     """
     acceptable_kwargs = ('ptcl_version_name', 'fname', 'simname',
         'halo_finder', 'redshift', 'version_name', 'dz_tol', 'update_cached_fname',
-        'preload_halo_table')
+        'preload_halo_table') + _row_cut_kwargs
 
     def __init__(self, *args, **kwargs):
         """
@@ -118,6 +123,17 @@ class CachedHaloCatalog(object):
             Halo catalogs in cache with a redshift that differs by greater
             than ``dz_tol`` will be ignored. Default is 0.05.
 
+        row_cut_min_dict, row_cut_max_dict, row_cut_eq_dict, row_cut_neq_dict : dict, optional
+            Dictionaries used to place lower-bound, upper-bound, equality and
+            inequality cuts on the rows of the ``halo_table``, with the same meaning as
+            for the `~halotools.sim_manager.TabularAsciiReader` class.
+            The cuts are applied while the halo table is read from disk
+            in chunks, so that only the selected halos are ever stored in memory.
+            The ``halo_hostid`` and ``halo_mvir_host_halo`` columns
+            are nonetheless computed from the entire catalog.
+            See `~halotools.sim_manager.read_halo_table` for details.
+            Default is to load all halos.
+
         Examples
         ---------
         If you followed the instructions in the
@@ -152,6 +168,10 @@ class CachedHaloCatalog(object):
 
         >>> halocat = CachedHaloCatalog(redshift = 1, simname = 'multidark') # doctest: +SKIP
 
+        To only load host halos above some mass into memory:
+
+        >>> halocat = CachedHaloCatalog(row_cut_eq_dict = {'halo_upid': -1}, row_cut_min_dict = {'halo_mvir': 1e12}) # doctest: +SKIP
+
         If you forget which catalogs you have stored in cache,
         you have two options for how to remind yourself.
         First, you can use the `~halotools.sim_manager.HaloTableCache` class:
@@ -186,6 +206,8 @@ class CachedHaloCatalog(object):
             update_cached_fname = False
         self._update_cached_fname = update_cached_fname
 
+        self._row_cuts = {key: kwargs[key] for key in _row_cut_kwargs if key in kwargs}
+
         self.halo_table_cache = HaloTableCache()
 
         self._disallow_catalogs_with_known_bugs(**kwargs)
@@ -542,18 +564,43 @@ class CachedHaloCatalog(object):
             return self._halo_table
         except AttributeError:
             if self.log_entry.safe_for_cache is True:
-                self._halo_table = Table.read(self.fname, path='data')
-                self._add_new_derived_columns(self._halo_table)
+                row_mask = _halo_table_row_mask(self.fname, **self._row_cuts)
+                self._halo_table = _read_halo_table(self.fname, row_mask=row_mask)
+                self._add_new_derived_columns(self._halo_table, row_mask=row_mask)
                 return self._halo_table
             else:
                 raise InvalidCacheLogEntry(self.log_entry._cache_safety_message)
 
-    def _add_new_derived_columns(self, t):
-        if 'halo_hostid' not in list(t.keys()):
-            add_halo_hostid(t)
+    def _add_new_derived_columns(self, t, row_mask=None):
+        """ Add the ``halo_hostid`` and ``halo_mvir_host_halo`` columns to the halo table.
+
+        These columns are read from the ``derived_columns`` group of the hdf5 file,
+        which is written when the catalog is stored in cache, provided the group
+        was computed from the current ``halo_id``, ``halo_upid`` and ``halo_mvir`` columns.
+        Otherwise the columns are computed in memory; the hdf5 file is never modified.
 
-        if 'halo_mvir_host_halo' not in list(t.keys()):
-            broadcast_host_halo_property(t, 'halo_mvir')
+        If the halo table only stores the rows selected by the boolean ``row_mask``,
+        the columns are computed from the entire catalog, since the host halos
+        of the selected subhalos need not be selected.
+        """
+        if row_mask is None:
+            halos = t
+        else:
+            halos = _derived_columns_input_table(self.fname)
+
+        missing_keys = [key for key in _derived_column_keys if key not in list(halos.keys())]
+        if len(missing_keys) == 0:
+            return
+
+        derived_columns = _read_derived_columns(self.fname, halos, row_mask=row_mask)
+        if not set(missing_keys).issubset(set(derived_columns.keys())):
+            derived_columns = _compute_derived_columns(halos)
+            if row_mask is not None:
+                derived_columns = {key: column[row_mask]
+                    for key, column in derived_columns.items()}
+
+        for key in missing_keys:
+            t[key] = derived_columns[key]
 
     def _bind_additional_metadata(self):
         """ Create convenience bindings of all metadata to the `CachedHaloCatalog` instance.
@@ -563,7 +610,7 @@ class CachedHaloCatalog(object):
                 self.log_entry.fname + "\n\n")
             raise InvalidCacheLogEntry(msg)
 
-        f = h5py.File(self.log_entry.fname)
+        f = h5py.File(self.log_entry.fname, 'r')
         for attr_key in list(f.attrs.keys()):
             if attr_key == 'redshift':
                 setattr(self, attr_key, float(get_redshift_string(f.attrs[attr_key])))
@@ -571,7 +618,11 @@ class CachedHaloCatalog(object):
                 self.Lbox = np.empty(3)
                 self.Lbox[:] = f.attrs['Lbox']
             else:
-                setattr(self, attr_key, f.attrs[attr_key])
+                value = f.attrs[attr_key]
+                # h5py returns string metadata as bytes in python 3
+                if isinstance(value, bytes):
+                    value = value.decode()
+                setattr(self, attr_key, value)
         f.close()
 
         matching_sim = self._retrieve_supported_sim()
@@ -616,19 +667,65 @@ class CachedHaloCatalog(object):
         try:
             return self._ptcl_table
         except AttributeError:
-            try:
-                ptcl_log_entry = self.ptcl_log_entry
-            except AttributeError:
-                self.ptcl_log_entry = (
-                    self._retrieve_matching_ptcl_cache_log_entry()
-                    )
-                ptcl_log_entry = self.ptcl_log_entry
+            ptcl_log_entry = self._safe_ptcl_log_entry()
+            self._ptcl_table = Table.read(ptcl_log_entry.fname, path='data')
+            return self._ptcl_table
 
-            if ptcl_log_entry.safe_for_cache is True:
-                self._ptcl_table = Table.read(ptcl_log_entry.fname, path='data')
-                return self._ptcl_table
-            else:
-                raise InvalidCacheLogEntry(ptcl_log_entry._cache_safety_message)
+    def ptcls_in_region(self, xmin=None, xmax=None, ymin=None, ymax=None,
+            zmin=None, zmax=None):
+        """ Retrieve the particles of the ``ptcl_table`` located inside
+        a rectangular subvolume, i.e., with ``xmin <= x < xmax``,
+        and likewise in ``y`` and ``z``.
+
+        The particles are read from a memory-mapped view of the hdf5 file
+        storing the particles (see `~halotools.sim_manager.MemoryMappedPtclTable`),
+        so the entire ``ptcl_table`` is not loaded into memory. For particle catalogs
+        cached with `~halotools.sim_manager.UserSuppliedPtclCatalog.add_ptclcat_to_cache`,
+        the particles are sorted by spatial cell on disk and
+        only the cells overlapping the subvolume are read.
+
+        Parameters
+        ------------
+        xmin, xmax, ymin, ymax, zmin, zmax : float, optional
+            Boundaries of the subvolume. Each omitted lower (upper) boundary
+            is set to the lower (upper) edge of the box, so that, e.g.,
+            passing only ``zmin`` and ``zmax`` selects a slab.
+
+        Returns
+        --------
+        ptcls : Astropy `~astropy.table.Table`
+            Table storing the particles inside the subvolume.
+
+        Examples
+        ---------
+        >>> halocat = CachedHaloCatalog() # doctest: +SKIP
+        >>> slab = halocat.ptcls_in_region(zmin=0, zmax=50) # doctest: +SKIP
+        """
+        try:
+            memory_mapped_ptcl_table = self._memory_mapped_ptcl_table
+        except AttributeError:
+            ptcl_log_entry = self._safe_ptcl_log_entry()
+            memory_mapped_ptcl_table = MemoryMappedPtclTable(ptcl_log_entry.fname)
+            self._memory_mapped_ptcl_table = memory_mapped_ptcl_table
+        return memory_mapped_ptcl_table.ptcls_in_region(xmin=xmin, xmax=xmax,
+            ymin=ymin, ymax=ymax, zmin=zmin, zmax=zmax)
+
+    def _safe_ptcl_log_entry(self):
+        """ Retrieve the cache log entry of the particle catalog,
+        raising an exception if the entry is not safe for cache.
+        """
+        try:
+            ptcl_log_entry = self.ptcl_log_entry
+        except AttributeError:
+            self.ptcl_log_entry = (
+                self._retrieve_matching_ptcl_cache_log_entry()
+                )
+            ptcl_log_entry = self.ptcl_log_entry
+
+        if ptcl_log_entry.safe_for_cache is True:
+            return ptcl_log_entry
+        else:
+            raise InvalidCacheLogEntry(ptcl_log_entry._cache_safety_message)
 
     def _disallow_catalogs_with_known_bugs(self, simname=sim_defaults.default_simname,
             version_name=sim_defaults.default_version_name, **kwargs):
@@ -0,0 +1,590 @@
+""" Module containing functions to store halo catalogs in hdf5 files
+with one chunked and compressed dataset per column, so that individual columns
+can be read without reading the entire catalog into memory.
+"""
+import os
+import zlib
+import numpy as np
+from warnings import warn
+
+from astropy.table import Table
+
+try:
+    import h5py
+except ImportError:
+    warn("Most of the functionality of the sim_manager "
+         "sub-package requires h5py to be installed,\n"
+         "which can be accomplished either with pip or conda")
+
+from ..utils import compute_halo_hostid, compute_host_halo_indices, host_halo_property
+from ..custom_exceptions import HalotoolsError
+
+__all__ = ('read_halo_table', 'write_columnar_halo_table',
+    'convert_to_columnar_halo_table', 'round_float_mantissa')
+
+# Value of the ``table_format`` attribute of the hdf5 group storing a columnar halo table
+columnar_table_format = 'columnar'
+
+# Default number of rows per hdf5 chunk of each column
+default_chunk_size = 2**16
+
+# Columns whose precision is reduced when ``float_mantissa_bits`` is an integer
+default_lossy_columns = ('halo_x', 'halo_y', 'halo_z', 'halo_vx', 'halo_vy', 'halo_vz')
+
+_num_mantissa_bits = {2: 10, 4: 23, 8: 52}
+
+# Name of the group of the hdf5 file storing the derived columns of the halo table
+_derived_columns_path = 'derived_columns'
+
+# Columns of the halo table derived from the entire catalog
+_derived_column_keys = ('halo_hostid', 'halo_mvir_host_halo')
+
+# Columns of the halo table the derived columns are computed from
+_derived_column_inputs = ('halo_id', 'halo_upid', 'halo_mvir')
+
+
+def _hdf5_compression_kwargs(compression):
+    """ Return the keyword arguments of `h5py.Group.create_dataset`
+    implementing the input ``compression``.
+    """
+    if compression is None:
+        return {}
+    elif compression == 'gzip':
+        return {'compression': 'gzip', 'compression_opts': 1, 'shuffle': True}
+    elif compression == 'lzf':
+        return {'compression': 'lzf', 'shuffle': True}
+    elif compression in ('lz4', 'blosc'):
+        try:
+            import hdf5plugin
+        except ImportError:
+            msg = ("\nThe ``" + compression + "`` compression requires the hdf5plugin package.\n"
+                "Using ``gzip`` compression instead.\n")
+            warn(msg)
+            return _hdf5_compression_kwargs('gzip')
+        if compression == 'lz4':
+            return dict(hdf5plugin.LZ4())
+        else:
+            return dict(hdf5plugin.Blosc(cname='lz4', shuffle=hdf5plugin.Blosc.SHUFFLE))
+    else:
+        msg = ("\nThe compression ``" + str(compression) + "`` is not supported.\n"
+            "The available choices are ``gzip``, ``lzf``, ``lz4``, ``blosc`` and None.\n")
+        raise HalotoolsError(msg)
+
+
+def round_float_mantissa(arr, num_mantissa_bits):
+    """ Round the floating-point values of the input array to the nearest value
+    whose mantissa only has ``num_mantissa_bits`` significant bits.
+
+    The low-order bits of the mantissa of the returned values are zero,
+    so that the array is compressed much more efficiently.
+    The relative precision of the rounded values is ``2**-(num_mantissa_bits+1)``.
+
+    Parameters
+    ------------
+    arr : array_like
+        Array of floats
+
+    num_mantissa_bits : int
+        Number of bits of the mantissa that are kept,
+        at most 23 for single precision and 52 for double precision.
+
+    Returns
+    --------
+    rounded_arr : array
+        Array with the same shape and dtype as ``arr``
+
+    Examples
+    ---------
+    >>> x = np.array((100.123456, 0.5, 249.99), dtype='f4')
+    >>> rounded_x = round_float_mantissa(x, 12)
+    >>> assert np.allclose(x, rounded_x, rtol=2**-13)
+    """
+    arr = np.asarray(arr)
+    if arr.dtype.kind != 'f':
+        msg = ("\nOnly arrays of floats can be passed to ``round_float_mantissa``.\n")
+        raise HalotoolsError(msg)
+    arr = arr.astype(arr.dtype.newbyteorder('='))
+
+    num_bits = _num_mantissa_bits[arr.dtype.itemsize]
+    num_mantissa_bits = int(num_mantissa_bits)
+    if (num_mantissa_bits < 0) or (num_mantissa_bits > num_bits):
+        msg = ("\nFor arrays of dtype ``" + str(arr.dtype) + "``, ``num_mantissa_bits``\n"
+            "must be an integer between 0 and " + str(num_bits) + ".\n")
+        raise HalotoolsError(msg)
+    num_dropped_bits = num_bits - num_mantissa_bits
+    if num_dropped_bits == 0:
+        return arr.copy()
+
+    uint_type = np.dtype('u' + str(arr.dtype.itemsize)).type
+    all_bits = 2**(8*arr.dtype.itemsize) - 1
+    half = uint_type(1 << (num_dropped_bits - 1))
+    mask = uint_type(all_bits ^ ((1 << num_dropped_bits) - 1))
+
+    rounded_arr = ((arr.view(uint_type) + half) & mask).view(arr.dtype)
+    return np.where(np.isfinite(arr), rounded_arr, arr)
+
+
+def _lossy_columns_dict(halo_table, float_mantissa_bits):
+    """ Return the dictionary storing the number of mantissa bits kept for each column.
+    """
+    if float_mantissa_bits is None:
+        return {}
+    try:
+        lossy_columns = dict(float_mantissa_bits)
+    except TypeError:
+        lossy_columns = {key: float_mantissa_bits for key in default_lossy_columns
+            if key in halo_table.keys()}
+
+    for key in lossy_columns.keys():
+        if key not in halo_table.keys():
+            msg = ("\nThe ``" + key + "`` key of ``float_mantissa_bits`` "
+                "is not a column of the halo table.\n")
+            raise HalotoolsError(msg)
+        if halo_table[key].dtype.kind != 'f':
+            msg = ("\nThe ``" + key + "`` key of ``float_mantissa_bits`` "
+                "is not a column of floats.\n")
+            raise HalotoolsError(msg)
+    return lossy_columns
+
+
+def write_columnar_halo_table(halo_table, fname, overwrite=False, compression='gzip',
+        column_compression=None, float_mantissa_bits=None, chunk_size=default_chunk_size):
+    """ Write a halo table to the ``data`` group of an hdf5 file
+    storing each column as a separate chunked and compressed dataset.
+
+    Halo catalogs stored in this format can be read with `read_halo_table`,
+    which only reads the requested columns from disk.
+
+    Parameters
+    ------------
+    halo_table : Astropy `~astropy.table.Table`
+        Table storing the halo catalog
+
+    fname : string
+        Absolute path of the hdf5 file
+
+    overwrite : bool, optional
+        If the file already exists, ``overwrite`` must be set to True
+        in order to replace it. Default is False.
+
+    compression : string, optional
+        Compression filter applied to all columns. The ``gzip`` and ``lzf`` filters
+        are always available and are used with the shuffle filter;
+        the faster ``lz4`` and ``blosc`` filters require the hdf5plugin package,
+        and ``gzip`` is used if it is not installed.
+        Set ``compression`` to None to store the columns uncompressed.
+        Default is ``gzip`` at compression level 1.
+
+    column_compression : dict, optional
+        Dictionary overriding ``compression`` for the columns used as keys.
+        For example, ``column_compression={'halo_id': None}``
+        stores the ``halo_id`` column uncompressed.
+
+    float_mantissa_bits : int or dict, optional
+        If not None, the values of some floating-point columns are rounded with
+        `round_float_mantissa` before being written, which makes them much more
+        compressible at the cost of a relative precision of ``2**-(float_mantissa_bits+1)``.
+        If an integer, the halo positions and velocities are rounded; if a dictionary,
+        the columns used as keys are rounded keeping the number of bits of the values.
+        Default is None, in which case all values are stored exactly.
+
+    chunk_size : int, optional
+        Number of rows per hdf5 chunk. Default is 2**16.
+
+    Examples
+    ---------
+    >>> from halotools.sim_manager import FakeSim
+    >>> halocat = FakeSim()
+    >>> write_columnar_halo_table(halocat.halo_table, fname, float_mantissa_bits=16) # doctest: +SKIP
+    >>> halos = read_halo_table(fname, columns=['halo_x', 'halo_mvir']) # doctest: +SKIP
+    """
+    if (os.path.isfile(fname)) & (overwrite is False):
+        msg = ("\nThe following fname already exists: \n\n" + str(fname) +
+            "\n\nEither choose a different fname or set ``overwrite`` to True.\n")
+        raise HalotoolsError(msg)
+
+    if column_compression is None:
+        column_compression = {}
+    for key in column_compression.keys():
+        if key not in halo_table.keys():
+            msg = ("\nThe ``" + key + "`` key of ``column_compression`` "
+                "is not a column of the halo table.\n")
+            raise HalotoolsError(msg)
+    compression_kwargs = {key: _hdf5_compression_kwargs(column_compression.get(key, compression))
+        for key in halo_table.keys()}
+    lossy_columns = _lossy_columns_dict(halo_table, float_mantissa_bits)
+
+    with h5py.File(fname, 'w') as f:
+        group = f.create_group('data')
+        group.attrs['table_format'] = np.string_(columnar_table_format)
+        group.attrs['column_names'] = np.array([np.string_(key) for key in halo_table.keys()])
+
+        for key in halo_table.keys():
+            data = np.asarray(halo_table[key])
+            is_unicode = data.dtype.kind == 'U'
+            if is_unicode:
+                data = np.char.encode(data, 'utf-8')
+            elif data.dtype.kind == 'O':
+                msg = ("\nThe ``" + key + "`` column stores python objects, "
+                    "which cannot be written to an hdf5 file.\n")
+                raise HalotoolsError(msg)
+            if key in lossy_columns:
+                data = round_float_mantissa(data, lossy_columns[key])
+
+            if len(data) == 0:
+                dataset = group.create_dataset(key, data=data)
+            else:
+                chunks = (min(int(chunk_size), len(data)), ) + data.shape[1:]
+                dataset = group.create_dataset(key, data=data, chunks=chunks,
+                    **compression_kwargs[key])
+            if is_unicode:
+                dataset.attrs['unicode'] = True
+            if key in lossy_columns:
+                dataset.attrs['float_mantissa_bits'] = lossy_columns[key]
+
+
+def _is_columnar(obj):
+    return isinstance(obj, h5py.Group)
+
+
+def _available_columns(obj):
+    """ Return the list of column names of the halo table stored in the input h5py object.
+    """
+    if _is_columnar(obj):
+        try:
+            return [key.decode() if isinstance(key, bytes) else str(key)
+                for key in obj.attrs['column_names']]
+        except KeyError:
+            return list(obj.keys())
+    else:
+        return list(obj.dtype.names)
+
+
+def _num_rows(obj):
+    if _is_columnar(obj):
+        keys = list(obj.keys())
+        return 0 if len(keys) == 0 else obj[keys[0]].shape[0]
+    else:
+        return obj.shape[0]
+
+
+def _read_column_rows(obj, key, first, last):
+    """ Read the rows ``first:last`` of a column of the halo table stored in the input h5py object.
+    """
+    if _is_columnar(obj):
+        dataset = obj[key]
+        data = dataset[first:last]
+        if dataset.attrs.get('unicode', False):
+            data = np.char.decode(data, 'utf-8')
+        return data
+    else:
+        return obj[key, first:last]
+
+
+def _masked_read(read_rows, row_mask, chunk_size):
+    """ Read the rows selected by the boolean ``row_mask``
+    calling ``read_rows(first, last)`` on ``chunk_size`` rows at a time,
+    so that the memory used scales with the number of selected rows.
+    """
+    chunk_size = int(chunk_size)
+    selected_rows = []
+    for first in range(0, len(row_mask), chunk_size):
+        chunk_mask = row_mask[first:first+chunk_size]
+        if np.any(chunk_mask):
+            selected_rows.append(read_rows(first, first+len(chunk_mask))[chunk_mask])
+    if len(selected_rows) == 0:
+        return read_rows(0, 0)
+    return np.concatenate(selected_rows)
+
+
+def _row_cut_mask(obj, chunk_size, row_cut_min_dict={}, row_cut_max_dict={},
+        row_cut_eq_dict={}, row_cut_neq_dict={}):
+    """ Calculate the boolean mask selecting the rows of the halo table
+    stored in the input h5py object that pass the row cuts,
+    reading only the columns used in the cuts, ``chunk_size`` rows at a time.
+    """
+    chunk_size = int(chunk_size)
+    num_rows = _num_rows(obj)
+    mask = np.ones(num_rows, dtype=bool)
+    for first in range(0, num_rows, chunk_size):
+        last = min(first + chunk_size, num_rows)
+        chunk_mask = mask[first:last]
+
+        for colname, lower_bound in row_cut_min_dict.items():
+            chunk_mask &= _read_column_rows(obj, colname, first, last) > lower_bound
+
+        for colname, upper_bound in row_cut_max_dict.items():
+            chunk_mask &= _read_column_rows(obj, colname, first, last) < upper_bound
+
+        for colname, equality_condition in row_cut_eq_dict.items():
+            chunk_mask &= _read_column_rows(obj, colname, first, last) == equality_condition
+
+        for colname, inequality_condition in row_cut_neq_dict.items():
+            chunk_mask &= _read_column_rows(obj, colname, first, last) != inequality_condition
+
+    return mask
+
+
+def _verify_columns_are_available(fname, columns, available_columns):
+    missing_columns = [key for key in columns if key not in available_columns]
+    if len(missing_columns) > 0:
+        msg = ("\nThe following requested columns are not stored in the "
+            "halo table of the file \n" + str(fname) + ":\n\n")
+        for key in missing_columns:
+            msg += "``" + key + "``\n"
+        raise HalotoolsError(msg)
+
+
+def _halo_table_row_mask(fname, chunk_size=default_chunk_size, row_cut_min_dict={},
+        row_cut_max_dict={}, row_cut_eq_dict={}, row_cut_neq_dict={}):
+    """ Calculate the boolean mask selecting the rows of the halo table
+    stored in the hdf5 file that pass the row cuts, or None if there are no cuts.
+    """
+    cut_columns = []
+    for row_cut_dict in (row_cut_min_dict, row_cut_max_dict, row_cut_eq_dict, row_cut_neq_dict):
+        cut_columns.extend(key for key in row_cut_dict.keys() if key not in cut_columns)
+    if len(cut_columns) == 0:
+        return None
+
+    with h5py.File(fname, 'r') as f:
+        obj = f['data']
+        _verify_columns_are_available(fname, cut_columns, _available_columns(obj))
+        return _row_cut_mask(obj, chunk_size, row_cut_min_dict=row_cut_min_dict,
+            row_cut_max_dict=row_cut_max_dict, row_cut_eq_dict=row_cut_eq_dict,
+            row_cut_neq_dict=row_cut_neq_dict)
+
+
+def _read_halo_table(fname, columns=None, row_mask=None, chunk_size=default_chunk_size):
+    """ Read the columns of the rows of the halo table selected by the boolean ``row_mask``,
+    or of all rows if ``row_mask`` is None.
+    """
+    with h5py.File(fname, 'r') as f:
+        obj = f['data']
+        available_columns = _available_columns(obj)
+        if columns is None:
+            columns = available_columns
+        else:
+            columns = list(columns)
+            _verify_columns_are_available(fname, columns, available_columns)
+
+        if len(columns) == 0:
+            return Table()
+
+        if not _is_columnar(obj):
+            if row_mask is not None:
+                data = _masked_read(lambda first, last: obj[first:last], row_mask, chunk_size)
+                return Table(data)[columns]
+            elif columns == available_columns:
+                return Table.read(obj)
+            else:
+                return Table([obj[key] for key in columns], names=columns)
+
+        halo_table = Table()
+        for key in columns:
+            if row_mask is None:
+                halo_table[key] = _read_column_rows(obj, key, 0, None)
+            else:
+                halo_table[key] = _masked_read(
+                    lambda first, last: _read_column_rows(obj, key, first, last),
+                    row_mask, chunk_size)
+        return halo_table
+
+
+def read_halo_table(fname, columns=None, row_cut_min_dict={}, row_cut_max_dict={},
+        row_cut_eq_dict={}, row_cut_neq_dict={}, chunk_size=default_chunk_size):
+    """ Read the halo table stored in the ``data`` path of an hdf5 file.
+
+    Both the halo tables written by `write_columnar_halo_table` and those
+    written with ``halo_table.write(fname, path='data')`` can be read.
+    For the former, only the requested ``columns`` are read from disk.
+
+    If row cuts are specified, the file is read ``chunk_size`` rows at a time
+    and only the rows passing the cuts are kept, so that the memory used
+    scales with the number of selected halos.
+
+    Parameters
+    ------------
+    fname : string
+        Absolute path of the hdf5 file
+
+    columns : list of strings, optional
+        Names of the columns to read. Default is to read all columns.
+
+    row_cut_min_dict : dict, optional
+        Dictionary used to place a lower-bound cut on the rows of the halo table.
+        For example, if row_cut_min_dict = {'halo_mvir': 1e12}, then all rows of the
+        returned table will have a mass greater than 1e12.
+
+    row_cut_max_dict : dict, optional
+        Dictionary used to place an upper-bound cut on the rows of the halo table.
+        For example, if row_cut_max_dict = {'halo_mvir': 1e15}, then all rows of the
+        returned table will have a mass less than 1e15.
+
+    row_cut_eq_dict : dict, optional
+        Dictionary used to place an equality cut on the rows of the halo table.
+        For example, if row_cut_eq_dict = {'halo_upid': -1}, then only host halos
+        will appear in the returned table.
+
+    row_cut_neq_dict : dict, optional
+        Dictionary used to place an inequality cut on the rows of the halo table.
+        For example, if row_cut_neq_dict = {'halo_upid': -1}, then only subhalos
+        will appear in the returned table.
+
+    chunk_size : int, optional
+        Number of rows read at a time when applying row cuts. Default is 2**16.
+
+    Returns
+    --------
+    halo_table : Astropy `~astropy.table.Table`
+        Table storing the requested columns of the rows passing the cuts
+
+    Notes
+    ------
+    The row cuts have the same meaning as those of the
+    `~halotools.sim_manager.TabularAsciiReader` class,
+    except that the cuts may be placed on columns that are not returned.
+    """
+    row_mask = _halo_table_row_mask(fname, chunk_size=chunk_size,
+        row_cut_min_dict=row_cut_min_dict, row_cut_max_dict=row_cut_max_dict,
+        row_cut_eq_dict=row_cut_eq_dict, row_cut_neq_dict=row_cut_neq_dict)
+    return _read_halo_table(fname, columns=columns, row_mask=row_mask, chunk_size=chunk_size)
+
+
+def _derived_columns_checksum(halo_table):
+    """ Checksum of the columns of the halo table the derived columns are computed from.
+    """
+    checksum = 0
+    for key in _derived_column_inputs:
+        data = np.ascontiguousarray(halo_table[key])
+        checksum = zlib.crc32(data.view(np.uint8), checksum)
+    return checksum & 0xffffffff
+
+
+def _compute_derived_columns(halo_table):
+    """ Compute the derived columns that are not stored in the halo table.
+    """
+    derived_columns = {}
+    if 'halo_hostid' in halo_table.keys():
+        halo_hostid = np.asarray(halo_table['halo_hostid'])
+    else:
+        halo_hostid = compute_halo_hostid(np.asarray(halo_table['halo_id']),
+            np.asarray(halo_table['halo_upid']))
+        derived_columns['halo_hostid'] = halo_hostid
+
+    if 'halo_mvir_host_halo' not in halo_table.keys():
+        host_halo_indices = compute_host_halo_indices(halo_hostid, np.asarray(halo_table['halo_id']))
+        derived_columns['halo_mvir_host_halo'] = host_halo_property(
+            np.asarray(halo_table['halo_mvir']), host_halo_indices)
+    return derived_columns
+
+
+def _derived_columns_input_table(fname):
+    """ Read the entire columns of the halo table needed to compute the derived columns,
+    together with the derived columns stored in the halo table, if any.
+    """
+    with h5py.File(fname, 'r') as f:
+        available_columns = _available_columns(f['data'])
+    columns = [key for key in _derived_column_inputs + _derived_column_keys
+        if key in available_columns]
+    return _read_halo_table(fname, columns=columns)
+
+
+def _store_derived_columns(fname):
+    """ Compute the derived columns missing from the halo table stored in the hdf5 file,
+    and store them in the ``derived_columns`` group of the file,
+    together with the checksum of the columns they are computed from.
+    This function is called when a halo catalog is written to the cache;
+    halo catalogs that lack any of the ``halo_id``, ``halo_upid`` and ``halo_mvir``
+    columns are left unchanged.
+    """
+    halo_table = _derived_columns_input_table(fname)
+    if not set(_derived_column_inputs).issubset(set(halo_table.keys())):
+        return
+    derived_columns = _compute_derived_columns(halo_table)
+
+    with h5py.File(fname, 'a') as f:
+        if _derived_columns_path in f:
+            del f[_derived_columns_path]
+        if len(derived_columns) == 0:
+            return
+        group = f.create_group(_derived_columns_path)
+        group.attrs['num_halos'] = len(halo_table)
+        group.attrs['checksum'] = _derived_columns_checksum(halo_table)
+        for key, column in derived_columns.items():
+            group.create_dataset(key, data=column)
+
+
+def _read_derived_columns(fname, halo_table, row_mask=None):
+    """ Read the derived columns stored in the hdf5 file, provided they were computed
+    from the columns of the input ``halo_table`` storing the entire catalog.
+    If ``row_mask`` is not None, only the rows selected by the mask are read.
+    Return an empty dictionary if there are no valid stored columns.
+    """
+    try:
+        with h5py.File(fname, 'r') as f:
+            if _derived_columns_path not in f:
+                return {}
+            group = f[_derived_columns_path]
+            if ((group.attrs.get('num_halos', -1) != len(halo_table)) or
+                    (group.attrs.get('checksum', -1) != _derived_columns_checksum(halo_table))):
+                return {}
+            if row_mask is None:
+                return {key: group[key][...] for key in group.keys()}
+            return {key: _masked_read(lambda first, last: group[key][first:last],
+                row_mask, default_chunk_size) for key in group.keys()}
+    except (IOError, OSError, KeyError):
+        return {}
+
+
+def convert_to_columnar_halo_table(fname, compression='gzip',
+        column_compression=None, float_mantissa_bits=None, chunk_size=default_chunk_size):
+    """ Convert the halo table stored in an existing hdf5 file,
+    e.g., a catalog already stored in the Halotools cache, to the format
+    written by `write_columnar_halo_table`.
+
+    The file is rewritten in place, preserving the metadata
+    and any other data stored in the file, so that the cache log remains valid.
+    The ``halo_hostid`` and ``halo_mvir_host_halo`` columns derived from the
+    entire catalog are recomputed and stored in the file if they are not
+    already columns of the halo table.
+
+    Parameters
+    ------------
+    fname : string
+        Absolute path of the hdf5 file
+
+    compression, column_compression, float_mantissa_bits, chunk_size : optional
+        See `write_columnar_halo_table`.
+
+    Examples
+    ---------
+    >>> from halotools.sim_manager import CachedHaloCatalog
+    >>> halocat = CachedHaloCatalog() # doctest: +SKIP
+    >>> convert_to_columnar_halo_table(halocat.fname) # doctest: +SKIP
+    """
+    halo_table = read_halo_table(fname)
+
+    tmp_fname = '{0}.tmp{1}'.format(fname, os.getpid())
+    try:
+        write_columnar_halo_table(halo_table, tmp_fname, overwrite=True,
+            compression=compression, column_compression=column_compression,
+            float_mantissa_bits=float_mantissa_bits, chunk_size=chunk_size)
+        with h5py.File(fname, 'r') as f, h5py.File(tmp_fname, 'a') as g:
+            for key, value in f.attrs.items():
+                g.attrs[key] = value
+            for key in f.keys():
+                if key not in ('data', _derived_columns_path):
+                    f.copy(key, g)
+        _store_derived_columns(tmp_fname)
+    except:
+        try:
+            os.remove(tmp_fname)
+        except OSError:
+            pass
+        raise
+
+    try:
+        os.replace(tmp_fname, fname)
+    except AttributeError:
+        # os.replace is not available in python 2
+        os.rename(tmp_fname, fname)
@@ -13,6 +13,7 @@ except ImportError:
          "requires h5py to be installed.")
 
 from .halo_table_cache_log_entry import HaloTableCacheLogEntry
+from .cache_log_utils import cache_log_lock, atomic_write_log_table
 
 from ..sim_manager import halotools_cache_dirname
 from ..custom_exceptions import InvalidCacheLogEntry, HalotoolsError
@@ -22,7 +23,14 @@ __all__ = ('HaloTableCache', )
 
 class HaloTableCache(object):
     """ Object providing a collection of halo catalogs for use with Halotools.
+
+    The log of cached catalogs is stored in an ascii file that is rewritten
+    atomically while holding a file lock, and changes made to the log are merged
+    with the current contents of the file, so that processes sharing the cache
+    can safely update the log concurrently.
     """
+    # Log attributes used to index the log entries
+    _index_attributes = ('simname', 'halo_finder', 'version_name')
 
     def __init__(self, read_log_from_standard_loc=True, **kwargs):
         self._standard_log_dirname = halotools_cache_dirname
@@ -43,15 +51,30 @@ class HaloTableCache(object):
         else:
             self.log = []
 
+        # Changes to the log that have not yet been written to disk
+        self._unwritten_additions = set()
+        self._unwritten_removals = set()
+
     def _overwrite_log_ascii(self, new_log):
         new_log.sort()
         log_table = self._log_table_from_log(new_log)
-        try:
-            os.remove(self.cache_log_fname)
-        except OSError:
-            pass
-        finally:
-            log_table.write(self.cache_log_fname, format='ascii')
+        with cache_log_lock(self.cache_log_fname):
+            atomic_write_log_table(log_table, self.cache_log_fname)
+
+    def _update_log_ascii(self):
+        """ Merge the changes made to the log with the current contents
+        of the ascii file, write the result to disk and bind it to ``self.log``.
+        The ascii file is locked while it is being read and rewritten so that changes made
+        by other processes sharing the same cache are neither lost nor overwritten.
+        """
+        with cache_log_lock(self.cache_log_fname):
+            log_on_disk = self._log_from_log_table(self._read_log_table_from_ascii())
+            new_log = set(log_on_disk) - self._unwritten_removals
+            new_log = sorted(new_log | self._unwritten_additions)
+            atomic_write_log_table(self._log_table_from_log(new_log), self.cache_log_fname)
+        self.log = new_log
+        self._unwritten_additions = set()
+        self._unwritten_removals = set()
 
     def _clean_log_of_repeated_entries(self, input_log):
         cleaned_log = list(set(input_log))
@@ -67,6 +90,8 @@ class HaloTableCache(object):
 
     def update_log_from_current_ascii(self):
         self.log = self.retrieve_log_from_ascii()
+        self._unwritten_additions = set()
+        self._unwritten_removals = set()
 
     def retrieve_log_from_ascii(self):
         """ Read '$HOME/.astropy/cache/halotools/halo_table_cache_log.txt',
@@ -127,6 +152,29 @@ class HaloTableCache(object):
                 'version_name': np.zeros(num_entries, dtype=object),
                 'fname': np.zeros(num_entries, dtype=object)})
 
+    def _indexed_log_entries(self, **kwargs):
+        """ Return the list of log entries that may match the input keyword arguments,
+        looked up in a dictionary indexing the log by ``simname``, ``halo_finder``
+        and ``version_name`` when all three are specified. The index is rebuilt
+        whenever ``self.log`` is modified.
+        """
+        if not set(self._index_attributes).issubset(set(kwargs.keys())):
+            return self.log
+
+        indexed_log, indexed_log_length = getattr(self, '_indexed_log', (None, 0))
+        if (indexed_log is not self.log) or (indexed_log_length != len(self.log)):
+            self._log_index = {}
+            for entry in self.log:
+                key = tuple(getattr(entry, attr) for attr in self._index_attributes)
+                self._log_index.setdefault(key, []).append(entry)
+            self._indexed_log = (self.log, len(self.log))
+
+        key = tuple(kwargs[attr] for attr in self._index_attributes)
+        try:
+            return self._log_index.get(key, [])
+        except TypeError:
+            return self.log
+
     def matching_log_entry_generator(self, dz_tol=0.0, **kwargs):
         """
         """
@@ -141,7 +189,7 @@ class HaloTableCache(object):
             msg = msg[:-2]
             raise KeyError(msg)
 
-        for entry in self.log:
+        for entry in self._indexed_log_entries(**kwargs):
             yield_entry = True
             for key in list(kwargs.keys()):
                 if key == 'redshift':
@@ -176,8 +224,11 @@ class HaloTableCache(object):
             warn("The cache log already contains the entry")
         self.log = list(set(self.log))
         self.log.sort()
+
+        self._unwritten_additions.add(log_entry)
+        self._unwritten_removals.discard(log_entry)
         if update_ascii is True:
-            self._overwrite_log_ascii(self.log)
+            self._update_log_ascii()
 
     def remove_entry_from_cache_log(self, simname, halo_finder,
             version_name, redshift, fname,
@@ -239,10 +290,13 @@ class HaloTableCache(object):
         msg = ''
         try:
             self.log.remove(log_entry)
+            self._indexed_log = (None, 0)
             _existing_log_entry_detected = True
 
+            self._unwritten_removals.add(log_entry)
+            self._unwritten_additions.discard(log_entry)
             if update_ascii is True:
-                self._overwrite_log_ascii(self.log)
+                self._update_log_ascii()
                 msg += ("\nThe log has been updated on disk and in memory.\n")
             else:
                 msg += ("\nThe log has been updated in memory "
@@ -317,7 +371,7 @@ class HaloTableCache(object):
             return str(msg)
 
         try:
-            f = h5py.File(fname)
+            f = h5py.File(fname, 'r')
             required_set = set(HaloTableCacheLogEntry.required_metadata)
             actual_set = set(f.attrs.keys())
             assert required_set.issubset(actual_set)
@@ -334,7 +388,7 @@ class HaloTableCache(object):
             except:
                 pass
 
-        f = h5py.File(fname)
+        f = h5py.File(fname, 'a' if overwrite_fname_metadata is True else 'r')
         constructor_kwargs = {}
 
         # We need to get rid of the byte attributes here to avoid failures
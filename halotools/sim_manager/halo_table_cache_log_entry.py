@@ -14,6 +14,8 @@ except ImportError:
         "sim_manager sub-package requires h5py to be installed,\n"
         "which can be accomplished either with pip or conda. ")
 
+from . import cache_log_utils
+from .columnar_halo_table import read_halo_table
 
 __all__ = ('HaloTableCacheLogEntry', )
 
@@ -124,7 +126,10 @@ class HaloTableCacheLogEntry(object):
         `~halotools.sim_manager.HaloTableCacheLogEntry` instance stores a valid
         halo catalog that can safely be added to the cache for future use.
         `safe_for_cache` is implemented as a property method, so that each request
-        performs all the checks from scratch. A log entry is considered valid
+        checks the current state of the file. The outcome of the checks is stored
+        in an sqlite registry in the Halotools cache directory, and is reused
+        by later requests as long as the modification time and size
+        of the file are unchanged. A log entry is considered valid
         if it passes the following tests:
 
         1. The file exists.
@@ -135,7 +140,7 @@ class HaloTableCacheLogEntry(object):
 
         4. Each value in the above metadata is consistent with the corresponding value bound to the `~halotools.sim_manager.HaloTableCacheLogEntry` instance.
 
-        5. The halo table data can be read in using the `~astropy.table.Table.read` method of the `~astropy.table.Table` class.
+        5. The halo table data can be read in using the `~halotools.sim_manager.read_halo_table` function.
 
         6. The halo table has the following columns ``halo_id``, ``halo_x``, ``halo_y``, ``halo_z``, plus at least one additional column storing a mass-like variable.
 
@@ -164,8 +169,12 @@ class HaloTableCacheLogEntry(object):
             self._cache_safety_message = message_preamble + msg
             self._num_failures = num_failures
             return False
-        else:
 
+        stored_result = cache_log_utils.get_validation_registry().retrieve(
+            str(self._key), self.fname)
+        if stored_result is not None:
+            num_failures, msg = stored_result
+        else:
             tmp_msg, num_failures = self._verify_h5py_extension(num_failures)
             msg += tmp_msg
             tmp_msg, num_failures = self._verify_hdf5_has_complete_metadata(num_failures)
@@ -185,11 +194,14 @@ class HaloTableCacheLogEntry(object):
             tmp_msg, num_failures = self._verify_halo_rvir_mpc_units(halo_table, num_failures)
             msg += tmp_msg
 
-            if num_failures > 0:
-                self._cache_safety_message = message_preamble + msg
+            cache_log_utils.get_validation_registry().store(
+                str(self._key), self.fname, num_failures, msg)
 
-            self._num_failures = num_failures
-            return num_failures == 0
+        if num_failures > 0:
+            self._cache_safety_message = message_preamble + msg
+
+        self._num_failures = num_failures
+        return num_failures == 0
 
     def _verify_table_read(self, num_failures):
         """ Enforce that the data can be read using the usual Astropy syntax
@@ -197,12 +209,12 @@ class HaloTableCacheLogEntry(object):
         msg = ''
 
         try:
-            halo_table = Table.read(self.fname, path='data')
+            halo_table = read_halo_table(self.fname)
         except:
             num_failures += 1
             msg = (str(num_failures)+". The hdf5 file must be readable with "
-                "Astropy \nusing the following syntax:\n\n"
-                ">>> halo_data = Table.read(fname, path='data')\n\n")
+                "Halotools \nusing the following syntax:\n\n"
+                ">>> halo_data = read_halo_table(fname)\n\n")
             halo_table = Table()
         return msg, num_failures, halo_table
 
@@ -217,7 +229,7 @@ class HaloTableCacheLogEntry(object):
 
         try:
             import h5py
-            f = h5py.File(self.fname)
+            f = h5py.File(self.fname, 'r')
 
             for key in HaloTableCacheLogEntry.log_attributes:
                 try:
@@ -308,7 +320,7 @@ class HaloTableCacheLogEntry(object):
         msg = ''
 
         try:
-            f = h5py.File(self.fname)
+            f = h5py.File(self.fname, 'r')
             Lbox = f.attrs['Lbox']
             f.close()
             try:
@@ -405,7 +417,7 @@ class HaloTableCacheLogEntry(object):
         msg = ''
 
         try:
-            f = h5py.File(self.fname)
+            f = h5py.File(self.fname, 'r')
             required_set = set(HaloTableCacheLogEntry.required_metadata)
             actual_set = set(f.attrs.keys())
 
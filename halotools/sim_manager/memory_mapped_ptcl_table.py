@@ -0,0 +1,246 @@
+""" Module containing the `~halotools.sim_manager.MemoryMappedPtclTable` class
+providing access to the particles stored in an hdf5 file
+that lie inside a rectangular subvolume, without reading the entire file.
+"""
+import numpy as np
+from contextlib import contextmanager
+from warnings import warn
+
+from astropy.table import Table
+
+try:
+    import h5py
+except ImportError:
+    warn("Most of the functionality of the sim_manager "
+         "sub-package requires h5py to be installed,\n"
+         "which can be accomplished either with pip or conda")
+
+from ..custom_exceptions import HalotoolsError
+
+__all__ = ('MemoryMappedPtclTable', )
+
+# Default number of spatial cells per dimension used to sort cached particles
+default_num_ptcl_cells_per_dim = 10
+
+
+def _ptcl_cell_ids(x, y, z, Lbox, num_cells_per_dim):
+    """ Calculate the index of the spatial cell of each particle,
+    with cells ordered first by x, then y, then z.
+    """
+    cell_ids = np.zeros(len(x), dtype='i8')
+    for pos, L in zip((x, y, z), Lbox):
+        idx = np.floor(np.asarray(pos)*num_cells_per_dim/L).astype('i8')
+        idx = np.clip(idx, 0, num_cells_per_dim-1)
+        cell_ids = cell_ids*num_cells_per_dim + idx
+    return cell_ids
+
+
+def spatially_sort_ptcl_table(ptcl_table, Lbox, num_cells_per_dim=default_num_ptcl_cells_per_dim):
+    """ Sort a table of particles by the index of the
+    spatial cell in which each particle is located.
+
+    Parameters
+    ------------
+    ptcl_table : Astropy `~astropy.table.Table`
+        Table storing the particles, with columns ``x``, ``y`` and ``z``.
+
+    Lbox : array_like
+        Scalar or 3-vector storing the size of the periodic box.
+
+    num_cells_per_dim : int, optional
+        Number of cells the box is divided into in each dimension.
+        Default is 10.
+
+    Returns
+    --------
+    sorted_ptcl_table : Astropy `~astropy.table.Table`
+        Table storing the particles sorted by cell.
+
+    cell_offsets : array
+        Array of length num_cells_per_dim**3 + 1 such that the particles in cell ``i``
+        are the rows ``cell_offsets[i]:cell_offsets[i+1]`` of ``sorted_ptcl_table``.
+    """
+    num_cells_per_dim = int(num_cells_per_dim)
+    if num_cells_per_dim < 1:
+        msg = ("\nThe input ``num_cells_per_dim`` must be a positive integer.\n")
+        raise HalotoolsError(msg)
+    _Lbox = np.empty(3)
+    _Lbox[:] = Lbox
+
+    cell_ids = _ptcl_cell_ids(ptcl_table['x'], ptcl_table['y'], ptcl_table['z'],
+        _Lbox, num_cells_per_dim)
+    idx_sorted = np.argsort(cell_ids, kind='mergesort')
+    cell_offsets = np.searchsorted(cell_ids[idx_sorted],
+        np.arange(num_cells_per_dim**3 + 1)).astype('i8')
+    return ptcl_table[idx_sorted], cell_offsets
+
+
+class MemoryMappedPtclTable(object):
+    """ Read-only view of the particles stored in the ``data`` dataset of an hdf5 file,
+    providing access to the particles inside a rectangular subvolume
+    via the `ptcls_in_region` method.
+
+    When the dataset is stored contiguously, as is the case for the files written by
+    `~halotools.sim_manager.UserSuppliedPtclCatalog.add_ptclcat_to_cache`,
+    the particles are accessed through a `numpy.memmap`, and otherwise
+    with slices of the h5py dataset; in neither case is the entire dataset read into memory.
+    If the file also stores the ``cell_offsets`` dataset written by
+    `~halotools.sim_manager.UserSuppliedPtclCatalog.add_ptclcat_to_cache`,
+    the particles are sorted by spatial cell and only the cells overlapping the
+    subvolume are read. Otherwise the dataset is scanned
+    ``chunk_size`` particles at a time.
+
+    Examples
+    ---------
+    >>> ptcls = MemoryMappedPtclTable(fname) # doctest: +SKIP
+    >>> slab = ptcls.ptcls_in_region(zmin=0, zmax=50) # doctest: +SKIP
+
+    The returned ``slab`` is an Astropy `~astropy.table.Table`
+    that can be passed to, e.g., `~halotools.mock_observables.delta_sigma`
+    or `~halotools.mock_observables.mean_radial_velocity_vs_r`.
+    """
+
+    def __init__(self, fname, chunk_size=int(1e6)):
+        """
+        Parameters
+        ------------
+        fname : string
+            Absolute path to the hdf5 file storing the particles.
+
+        chunk_size : int, optional
+            Number of particles read at a time when scanning a file
+            that is not sorted by spatial cell. Default is 1e6.
+        """
+        self.fname = fname
+        self.chunk_size = int(chunk_size)
+
+        try:
+            f = h5py.File(fname, 'r')
+        except (IOError, OSError):
+            msg = ("\nThe following input fname could not be opened as an hdf5 file: \n\n" +
+                str(fname) + "\n\n")
+            raise HalotoolsError(msg)
+        try:
+            try:
+                dataset = f['data']
+            except KeyError:
+                msg = ("\nThe hdf5 file does not have a ``data`` dataset storing particles.\n")
+                raise HalotoolsError(msg)
+            self.dtype = dataset.dtype
+            self.num_ptcls = dataset.shape[0]
+            offset = dataset.id.get_offset()
+
+            if 'Lbox' in f.attrs:
+                self.Lbox = np.empty(3)
+                self.Lbox[:] = f.attrs['Lbox']
+            else:
+                self.Lbox = None
+
+            if ('cell_offsets' in f) and (self.Lbox is not None):
+                self.cell_offsets = f['cell_offsets'][...]
+                self.num_cells_per_dim = int(f['cell_offsets'].attrs['num_cells_per_dim'])
+            else:
+                self.cell_offsets = None
+                self.num_cells_per_dim = None
+        finally:
+            f.close()
+
+        if (offset is None) or (self.num_ptcls == 0):
+            self._memmap = None
+        else:
+            self._memmap = np.memmap(fname, dtype=self.dtype, mode='r',
+                offset=offset, shape=(self.num_ptcls, ))
+
+    def __len__(self):
+        return self.num_ptcls
+
+    @property
+    def is_spatially_sorted(self):
+        """ Boolean indicating whether the particles are sorted by spatial cell.
+        """
+        return self.cell_offsets is not None
+
+    def ptcls_in_region(self, xmin=None, xmax=None, ymin=None, ymax=None,
+            zmin=None, zmax=None):
+        """ Retrieve the particles located inside a rectangular subvolume,
+        i.e., with ``xmin <= x < xmax``, and likewise in ``y`` and ``z``.
+
+        Parameters
+        ------------
+        xmin, xmax, ymin, ymax, zmin, zmax : float, optional
+            Boundaries of the subvolume. Each omitted lower (upper) boundary
+            is set to the lower (upper) edge of the box, so that, e.g.,
+            passing only ``zmin`` and ``zmax`` selects a slab.
+
+        Returns
+        --------
+        ptcls : Astropy `~astropy.table.Table`
+            Table storing the particles inside the subvolume.
+        """
+        lower = np.array([-np.inf if v is None else v for v in (xmin, ymin, zmin)], dtype='f8')
+        upper = np.array([np.inf if v is None else v for v in (xmax, ymax, zmax)], dtype='f8')
+
+        if self.num_ptcls == 0 or np.any(upper <= lower):
+            return Table(np.zeros(0, dtype=self.dtype))
+
+        if self.is_spatially_sorted:
+            row_ranges = self._row_ranges_of_region(lower, upper)
+        else:
+            row_ranges = [(first, min(first+self.chunk_size, self.num_ptcls))
+                for first in range(0, self.num_ptcls, self.chunk_size)]
+
+        selected = []
+        with _ptcl_reader(self) as read_rows:
+            for first, last in row_ranges:
+                rows = read_rows(first, last)
+                mask = np.ones(len(rows), dtype=bool)
+                for key, lo, hi in zip(('x', 'y', 'z'), lower, upper):
+                    mask &= (rows[key] >= lo) & (rows[key] < hi)
+                selected.append(np.array(rows[mask]))
+
+        if len(selected) == 0:
+            return Table(np.zeros(0, dtype=self.dtype))
+        return Table(np.concatenate(selected))
+
+    def _row_ranges_of_region(self, lower, upper):
+        """ Return the list of (first, last) ranges of rows storing the particles
+        in the cells overlapping the subvolume, merging adjacent ranges.
+        """
+        n = self.num_cells_per_dim
+        cell_ranges = []
+        for lo, hi, L in zip(lower, upper, self.Lbox):
+            imin = int(np.clip(np.floor(lo*n/L), 0, n-1)) if np.isfinite(lo) else 0
+            imax = int(np.clip(np.floor(hi*n/L), 0, n-1)) if np.isfinite(hi) else n-1
+            cell_ranges.append((imin, imax))
+        (ixmin, ixmax), (iymin, iymax), (izmin, izmax) = cell_ranges
+
+        row_ranges = []
+        for ix in range(ixmin, ixmax+1):
+            for iy in range(iymin, iymax+1):
+                first_cell = (ix*n + iy)*n + izmin
+                last_cell = (ix*n + iy)*n + izmax
+                first, last = self.cell_offsets[first_cell], self.cell_offsets[last_cell+1]
+                if last == first:
+                    continue
+                if (len(row_ranges) > 0) and (row_ranges[-1][1] == first):
+                    row_ranges[-1] = (row_ranges[-1][0], last)
+                else:
+                    row_ranges.append((first, last))
+        return row_ranges
+
+
+@contextmanager
+def _ptcl_reader(ptcls):
+    """ Context manager yielding a function that reads a range of rows
+    of a `MemoryMappedPtclTable`, keeping the hdf5 file open if needed.
+    """
+    if ptcls._memmap is not None:
+        memmap = ptcls._memmap
+        yield lambda first, last: memmap[first:last]
+    else:
+        f = h5py.File(ptcls.fname, 'r')
+        try:
+            dataset = f['data']
+            yield lambda first, last: dataset[first:last]
+        finally:
+            f.close()
@@ -0,0 +1,529 @@
+""" Module storing the `~halotools.sim_manager.MultiSnapshotHaloCatalog`,
+the class responsible for retrieving the halo catalogs of a simulation
+at many redshifts while sharing a bounded amount of memory between them.
+"""
+import numpy as np
+from collections import OrderedDict
+from warnings import warn
+
+from astropy.table import Table
+
+try:
+    import h5py
+    _HAS_H5PY = True
+except ImportError:
+    _HAS_H5PY = False
+    warn("Most of the functionality of the "
+        "sim_manager sub-package requires h5py to be installed,\n"
+        "which can be accomplished either with pip or conda. ")
+
+from ..sim_manager import sim_defaults, supported_sims
+
+from .cached_halo_catalog import CachedHaloCatalog
+from .columnar_halo_table import (_available_columns, _num_rows, _halo_table_row_mask,
+    _read_halo_table, _verify_columns_are_available, _derived_column_keys)
+from .halo_table_cache import HaloTableCache
+
+from ..custom_exceptions import HalotoolsError, InvalidCacheLogEntry
+
+
+__all__ = ('MultiSnapshotHaloCatalog', )
+
+# Default number of bytes of halo and particle data kept in memory
+default_max_memory = 4e9
+
+
+class _LRUColumnStore(object):
+    """ Store of read-only arrays keyed on ``(fname, column name)`` pairs.
+    When the total size of the arrays exceeds ``max_memory`` bytes,
+    the least recently used arrays are dropped from the store.
+    """
+
+    def __init__(self, max_memory):
+        self.max_memory = max_memory
+        self._arrays = OrderedDict()
+        self.memory_usage = 0
+
+    def __contains__(self, key):
+        return key in self._arrays
+
+    def retrieve(self, keys, load):
+        """ Return the list of arrays stored under ``keys``.
+        The missing arrays are read by calling ``load(missing_keys)``,
+        which returns a dictionary of arrays keyed on ``missing_keys``.
+        Repeated keys are only retrieved once, so the returned list
+        stores one array per distinct key, in order of first appearance.
+        The requested arrays are never dropped by the call that retrieves them,
+        so a single request larger than ``max_memory`` is honored.
+        """
+        keys = list(OrderedDict.fromkeys(keys))
+        missing_keys = [key for key in keys if key not in self._arrays]
+        if len(missing_keys) > 0:
+            loaded_arrays = load(missing_keys)
+            for key in missing_keys:
+                arr = np.asarray(loaded_arrays[key])
+                arr.flags.writeable = False
+                self._arrays[key] = arr
+                self.memory_usage += arr.nbytes
+
+        # Move the requested arrays to the most recently used end of the store
+        arrays = [self._arrays.pop(key) for key in keys]
+        for key, arr in zip(keys, arrays):
+            self._arrays[key] = arr
+
+        requested_keys = set(keys)
+        for key in list(self._arrays.keys()):
+            if self.memory_usage <= self.max_memory:
+                break
+            if key not in requested_keys:
+                self.memory_usage -= self._arrays.pop(key).nbytes
+
+        return arrays
+
+    def clear(self):
+        self._arrays.clear()
+        self.memory_usage = 0
+
+
+class _SnapshotHaloCatalog(CachedHaloCatalog):
+    """ `~halotools.sim_manager.CachedHaloCatalog` of a single snapshot of a
+    `~halotools.sim_manager.MultiSnapshotHaloCatalog`. The ``halo_table`` and
+    ``ptcl_table`` are assembled from the column store shared by all snapshots
+    each time they are requested, and are never stored by the instance itself.
+    """
+
+    def __init__(self, multi_snapshot_catalog, log_entry):
+        self._multi_snapshot_catalog = multi_snapshot_catalog
+        self._dz_tol = multi_snapshot_catalog._dz_tol
+        self._update_cached_fname = False
+        self._row_cuts = multi_snapshot_catalog._row_cuts
+        self.halo_table_cache = multi_snapshot_catalog.halo_table_cache
+
+        self.ptcl_version_name = multi_snapshot_catalog.ptcl_version_name
+        self._default_ptcl_version_name_choice = False
+        self._default_simname_choice = False
+        self._default_redshift_choice = False
+
+        self.log_entry = log_entry
+        self.simname = self.log_entry.simname
+        self.halo_finder = self.log_entry.halo_finder
+        self.version_name = self.log_entry.version_name
+        self.redshift = self.log_entry.redshift
+        self.fname = self.log_entry.fname
+
+        self._bind_additional_metadata()
+        self.publications = multi_snapshot_catalog.publications
+
+    @property
+    def halo_table(self):
+        """
+        Astropy `~astropy.table.Table` object storing a catalog of dark matter halos.
+        The columns are read-only views into the column store of the
+        `~halotools.sim_manager.MultiSnapshotHaloCatalog`.
+        """
+        return self._multi_snapshot_catalog._snapshot_halo_table(self)
+
+    @property
+    def ptcl_table(self):
+        """
+        Astropy `~astropy.table.Table` object storing
+        a collection of ~1e6 randomly selected dark matter particles.
+        The columns are read-only views into the column store of the
+        `~halotools.sim_manager.MultiSnapshotHaloCatalog`.
+        """
+        return self._multi_snapshot_catalog._snapshot_ptcl_table(self)
+
+
+class MultiSnapshotHaloCatalog(object):
+    """
+    Container class for the halo catalogs of a simulation
+    stored in the Halotools cache log at many different redshifts.
+
+    The cache log is read once, and the catalog of each snapshot is only opened
+    the first time it is requested. The columns of the halo and particle tables
+    of all snapshots are kept in a single store holding at most ``max_memory`` bytes:
+    when the store is full, the least recently used columns are dropped,
+    so that the columns used by every snapshot stay in memory
+    while iterating over the snapshots over and over again.
+    Each snapshot is a `~halotools.sim_manager.CachedHaloCatalog`
+    that can be passed to the ``populate_mock`` method of any model.
+    """
+
+    def __init__(self, simname=sim_defaults.default_simname,
+            halo_finder=sim_defaults.default_halo_finder,
+            version_name=sim_defaults.default_version_name,
+            ptcl_version_name=sim_defaults.default_ptcl_version_name,
+            redshifts=None, dz_tol=0.05, columns=None, max_memory=default_max_memory,
+            row_cut_min_dict={}, row_cut_max_dict={}, row_cut_eq_dict={}, row_cut_neq_dict={}):
+        """
+        Parameters
+        ------------
+        simname : string, optional
+            Nickname of the simulation. Default is set by the ``default_simname``
+            variable in the `~halotools.sim_manager.sim_defaults` module.
+
+        halo_finder : string, optional
+            Nickname of the halo-finder. Default is set by the ``default_halo_finder``
+            variable in the `~halotools.sim_manager.sim_defaults` module.
+
+        version_name : string, optional
+            Nickname of the version of the halo catalogs. Default is set by the
+            ``default_version_name`` variable in the `~halotools.sim_manager.sim_defaults` module.
+
+        ptcl_version_name : string, optional
+            Nickname of the version of the particle catalogs associated with the halos.
+            Default is set by the ``default_ptcl_version_name`` variable in the
+            `~halotools.sim_manager.sim_defaults` module.
+
+        redshifts : sequence of floats, optional
+            Redshifts of the snapshots. Each redshift must match exactly one
+            catalog in cache within ``dz_tol``. Default is None, in which case
+            all matching catalogs in cache are used.
+
+        dz_tol : float, optional
+            Tolerance within to search for a catalog with a matching redshift.
+            Default is 0.05.
+
+        columns : sequence of strings, optional
+            Columns of the ``halo_table`` of each snapshot. Restricting the columns to
+            those used by your model reduces the memory taken by each snapshot,
+            so that more snapshots fit in ``max_memory``. The ``halo_hostid`` and
+            ``halo_mvir_host_halo`` columns may be included.
+            Default is None, in which case all columns are used.
+
+        max_memory : float, optional
+            Number of bytes of halo and particle data kept in memory
+            by the column store shared by all snapshots. Default is 4e9.
+
+        row_cut_min_dict, row_cut_max_dict, row_cut_eq_dict, row_cut_neq_dict : dict, optional
+            Dictionaries used to place cuts on the rows of the ``halo_table``
+            of every snapshot, with the same meaning as for the
+            `~halotools.sim_manager.CachedHaloCatalog` class.
+            Default is to load all halos.
+
+        Examples
+        ---------
+        >>> halocats = MultiSnapshotHaloCatalog(simname='bolplanck', redshifts=(0, 0.5, 1)) # doctest: +SKIP
+        >>> print(halocats.redshifts) # doctest: +SKIP
+        [ 0.   0.5  1. ]
+
+        The catalog of a single snapshot is a `~halotools.sim_manager.CachedHaloCatalog`:
+
+        >>> halocat = halocats.snapshot(redshift=0.5) # doctest: +SKIP
+        >>> halos = halocat.halo_table # doctest: +SKIP
+
+        Iterating over the container yields the snapshots in order of increasing redshift.
+        Each ``halo_table`` is assembled from the shared column store,
+        so repeated iterations only read from disk the columns that were
+        dropped to stay within ``max_memory``:
+
+        >>> for halocat in halocats: # doctest: +SKIP
+        ...     print(halocat.redshift, len(halocat.halo_table)) # doctest: +SKIP
+
+        The `populate_mocks` method populates a model built for the redshift
+        of each snapshot in turn:
+
+        >>> from halotools.empirical_models import PrebuiltHodModelFactory
+        >>> model_factory = lambda redshift: PrebuiltHodModelFactory('zheng07', redshift=redshift)
+        >>> for halocat, model in halocats.populate_mocks(model_factory): # doctest: +SKIP
+        ...     print(halocat.redshift, len(model.mock.galaxy_table)) # doctest: +SKIP
+
+        The ``halo_table`` of each snapshot shares memory with the column store,
+        so its columns are read-only: copy a column before modifying it.
+        Note that dropping a column from the store only frees its memory
+        once no other table references it.
+        """
+        assert _HAS_H5PY, "Must have h5py package installed to use MultiSnapshotHaloCatalog objects"
+
+        self.simname = str(simname)
+        self.halo_finder = str(halo_finder)
+        self.version_name = str(version_name)
+        self.ptcl_version_name = str(ptcl_version_name)
+        self._dz_tol = dz_tol
+        self.columns = None if columns is None else list(columns)
+        self._row_cuts = {'row_cut_min_dict': row_cut_min_dict,
+            'row_cut_max_dict': row_cut_max_dict, 'row_cut_eq_dict': row_cut_eq_dict,
+            'row_cut_neq_dict': row_cut_neq_dict}
+        self._has_row_cuts = any(len(d) > 0 for d in self._row_cuts.values())
+
+        self._column_store = _LRUColumnStore(max_memory)
+
+        self.halo_table_cache = HaloTableCache()
+        self._log_entries = self._retrieve_matching_log_entries(redshifts)
+        self.redshifts = np.array([float(entry.redshift) for entry in self._log_entries])
+
+        # Snapshots, halo table layouts and particle table columns keyed on fname
+        self._snapshots = {}
+        self._halo_table_layouts = {}
+        self._ptcl_table_columns = {}
+
+        # Metadata shared by the snapshots of the simulation
+        self.publications = []
+        self._set_publication_list()
+
+    @property
+    def max_memory(self):
+        """ Number of bytes of halo and particle data kept in memory by the column store.
+        """
+        return self._column_store.max_memory
+
+    @property
+    def memory_usage(self):
+        """ Number of bytes of halo and particle data currently held by the column store.
+        """
+        return self._column_store.memory_usage
+
+    def __len__(self):
+        return len(self._log_entries)
+
+    def __iter__(self):
+        for log_entry in self._log_entries:
+            yield self._snapshot_from_log_entry(log_entry)
+
+    def snapshot(self, redshift):
+        """ Retrieve the catalog of the snapshot with the input redshift.
+
+        Parameters
+        ------------
+        redshift : float
+            Redshift of the snapshot, within ``dz_tol`` of the redshift of the catalog.
+
+        Returns
+        --------
+        halocat : `~halotools.sim_manager.CachedHaloCatalog`
+            Catalog of the snapshot. The same instance is returned by each call.
+        """
+        matching_entries = [entry for entry in self._log_entries
+            if abs(float(entry.redshift) - float(redshift)) <= self._dz_tol]
+
+        if len(matching_entries) == 0:
+            msg = ("\nThere is no snapshot within dz_tol = " + str(self._dz_tol) +
+                " of redshift = " + str(redshift) + ".\n"
+                "The available redshifts are:\n" + str(self.redshifts) + "\n")
+            raise HalotoolsError(msg)
+        elif len(matching_entries) > 1:
+            msg = ("\nThere are multiple snapshots within dz_tol = " + str(self._dz_tol) +
+                " of redshift = " + str(redshift) + ".\n"
+                "Try using the exact redshift.\n"
+                "The available redshifts are:\n" + str(self.redshifts) + "\n")
+            raise HalotoolsError(msg)
+
+        return self._snapshot_from_log_entry(matching_entries[0])
+
+    def halo_table(self, redshift, columns=None):
+        """ Retrieve the halos of the snapshot with the input redshift.
+
+        Parameters
+        ------------
+        redshift : float
+            Redshift of the snapshot, within ``dz_tol`` of the redshift of the catalog.
+
+        columns : sequence of strings, optional
+            Columns of the returned table. Default is None, in which case the
+            ``columns`` passed to the constructor are used.
+
+        Returns
+        --------
+        halos : Astropy `~astropy.table.Table`
+            Table of halos with read-only columns.
+        """
+        return self._snapshot_halo_table(self.snapshot(redshift), columns=columns)
+
+    def populate_mocks(self, models, redshifts=None, **kwargs):
+        """ Generator calling the ``populate_mock`` method of the model
+        of each snapshot in turn, yielding the catalog of the snapshot and the model
+        after the ``mock`` bound to the model has been populated.
+
+        Parameters
+        ------------
+        models : callable, dict or object
+            Models populated into the snapshots. Since the ``populate_mock`` method of
+            a model with a ``redshift`` attribute only accepts snapshots with a matching
+            redshift, one model is used per snapshot. ``models`` can either be
+            a callable taking the redshift of a snapshot as input and returning its model,
+            e.g., ``lambda redshift: PrebuiltHodModelFactory('zheng07', redshift=redshift)``,
+            or a dictionary of models keyed by the redshifts of the snapshots
+            within ``dz_tol``. A single model with a ``populate_mock`` method
+            is populated into every snapshot, which is only possible
+            for models without a ``redshift`` attribute.
+
+        redshifts : sequence of floats, optional
+            Redshifts of the snapshots to populate.
+            Default is None, in which case all snapshots are populated.
+
+        **kwargs : optional
+            Keyword arguments passed to ``populate_mock``.
+
+        Returns
+        --------
+        generator : generator
+            Generator of ``(halocat, model)`` pairs storing the
+            `~halotools.sim_manager.CachedHaloCatalog` of each snapshot
+            and the model populated into it.
+        """
+        if redshifts is None:
+            halocats = iter(self)
+        else:
+            halocats = (self.snapshot(redshift) for redshift in redshifts)
+
+        for halocat in halocats:
+            model = self._snapshot_model(models, halocat)
+            model.populate_mock(halocat, **kwargs)
+            yield halocat, model
+
+    def clear(self):
+        """ Drop all columns from the column store.
+        """
+        self._column_store.clear()
+
+    def _snapshot_model(self, models, halocat):
+        """ Retrieve the model of the snapshot from the ``models`` argument of `populate_mocks`.
+        """
+        if hasattr(models, 'populate_mock'):
+            return models
+        elif isinstance(models, dict):
+            matching_redshifts = [redshift for redshift in models.keys()
+                if abs(float(redshift) - float(halocat.redshift)) <= self._dz_tol]
+            if len(matching_redshifts) != 1:
+                msg = ("\nThe dictionary of models passed to ``populate_mocks`` has " +
+                    str(len(matching_redshifts)) + " models within dz_tol = " +
+                    str(self._dz_tol) + " of the snapshot redshift = " +
+                    str(halocat.redshift) + ".\nThe dictionary keys are:\n" +
+                    str(sorted(models.keys())) + "\n")
+                raise HalotoolsError(msg)
+            return models[matching_redshifts[0]]
+        elif callable(models):
+            return models(float(halocat.redshift))
+        else:
+            msg = ("\nThe ``models`` argument of ``populate_mocks`` must be "
+                "a callable, a dictionary of models, or a model with a ``populate_mock`` method.\n")
+            raise HalotoolsError(msg)
+
+    def _retrieve_matching_log_entries(self, redshifts):
+        """ Retrieve the cache log entries of the snapshots,
+        sorted in order of increasing redshift.
+        """
+        all_entries = list(self.halo_table_cache.matching_log_entry_generator(
+            simname=self.simname, halo_finder=self.halo_finder,
+            version_name=self.version_name))
+
+        msg = ("\nYou tried to load the cached halo catalogs "
+            "with the following characteristics:\n\n"
+            "simname = ``" + self.simname + "``\n"
+            "halo_finder = ``" + self.halo_finder + "``\n"
+            "version_name = ``" + self.version_name + "``\n")
+
+        if len(all_entries) == 0:
+            msg += "\nThere are no matching catalogs in cache.\n"
+            raise InvalidCacheLogEntry(msg)
+
+        if redshifts is None:
+            log_entries = all_entries
+        else:
+            log_entries = []
+            for redshift in redshifts:
+                matching_entries = [entry for entry in all_entries
+                    if abs(float(entry.redshift) - float(redshift)) <= self._dz_tol]
+                if len(matching_entries) != 1:
+                    msg += ("\nThere are " + str(len(matching_entries)) + " catalogs in cache "
+                        "within dz_tol = " + str(self._dz_tol) + " of redshift = " +
+                        str(redshift) + ".\nThe following matching catalogs are in cache:\n\n")
+                    for entry in all_entries:
+                        msg += str(entry) + "\n\n"
+                    raise InvalidCacheLogEntry(msg)
+                if matching_entries[0] not in log_entries:
+                    log_entries.append(matching_entries[0])
+
+        return sorted(log_entries, key=lambda entry: float(entry.redshift))
+
+    def _set_publication_list(self):
+        try:
+            simclass = supported_sims.supported_sim_dict[self.simname]
+            self.publications = simclass().publications
+        except (KeyError, AttributeError):
+            self.publications = []
+
+    def _snapshot_from_log_entry(self, log_entry):
+        try:
+            return self._snapshots[log_entry.fname]
+        except KeyError:
+            halocat = _SnapshotHaloCatalog(self, log_entry)
+            self._snapshots[log_entry.fname] = halocat
+            return halocat
+
+    def _halo_table_layout(self, halocat):
+        """ Return the columns stored in the hdf5 file of the snapshot, the number of halos,
+        and the boolean mask selecting the rows passing the row cuts, or None.
+        The hdf5 file is validated and read the first time each snapshot is used.
+        """
+        try:
+            return self._halo_table_layouts[halocat.fname]
+        except KeyError:
+            pass
+
+        if halocat.log_entry.safe_for_cache is not True:
+            raise InvalidCacheLogEntry(halocat.log_entry._cache_safety_message)
+
+        with h5py.File(halocat.fname, 'r') as f:
+            obj = f['data']
+            stored_columns = _available_columns(obj)
+            num_halos = _num_rows(obj)
+
+        if self._has_row_cuts:
+            row_mask = _halo_table_row_mask(halocat.fname, **self._row_cuts)
+        else:
+            row_mask = None
+
+        self._halo_table_layouts[halocat.fname] = (stored_columns, num_halos, row_mask)
+        return self._halo_table_layouts[halocat.fname]
+
+    def _snapshot_halo_table(self, halocat, columns=None):
+        """ Assemble the halo table of the snapshot from the column store,
+        reading the missing columns from disk.
+        """
+        stored_columns, num_halos, row_mask = self._halo_table_layout(halocat)
+        available_columns = stored_columns + [key for key in _derived_column_keys
+            if key not in stored_columns]
+        if columns is None:
+            columns = available_columns if self.columns is None else self.columns
+        columns = list(OrderedDict.fromkeys(columns))
+        _verify_columns_are_available(halocat.fname, columns, available_columns)
+
+        def load(keys):
+            colnames = [colname for __, colname in keys]
+            stored_colnames = [key for key in colnames if key in stored_columns]
+            halos = _read_halo_table(halocat.fname, columns=stored_colnames, row_mask=row_mask)
+            if len(stored_colnames) < len(colnames):
+                # The derived columns are computed from the entire catalog
+                mask = np.ones(num_halos, dtype=bool) if row_mask is None else row_mask
+                derived_columns = Table()
+                halocat._add_new_derived_columns(derived_columns, row_mask=mask)
+                for key in _derived_column_keys:
+                    if key not in stored_columns:
+                        halos[key] = derived_columns[key]
+            return {(halocat.fname, key): halos[key].data for key in colnames}
+
+        keys = [(halocat.fname, key) for key in columns]
+        arrays = self._column_store.retrieve(keys, load)
+        return Table(arrays, names=columns, copy=False)
+
+    def _snapshot_ptcl_table(self, halocat):
+        """ Assemble the particle table of the snapshot from the column store,
+        reading the missing columns from disk.
+        """
+        ptcl_fname = halocat._safe_ptcl_log_entry().fname
+        try:
+            columns = self._ptcl_table_columns[ptcl_fname]
+        except KeyError:
+            with h5py.File(ptcl_fname, 'r') as f:
+                columns = _available_columns(f['data'])
+            self._ptcl_table_columns[ptcl_fname] = columns
+
+        def load(keys):
+            colnames = [colname for __, colname in keys]
+            ptcls = _read_halo_table(ptcl_fname, columns=colnames)
+            return {(ptcl_fname, key): ptcls[key].data for key in colnames}
+
+        keys = [(ptcl_fname, key) for key in columns]
+        arrays = self._column_store.retrieve(keys, load)
+        return Table(arrays, names=columns, copy=False)
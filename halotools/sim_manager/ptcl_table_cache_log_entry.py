@@ -6,6 +6,7 @@ import numpy as np
 from warnings import warn
 
 from .halo_table_cache_log_entry import get_redshift_string
+from . import cache_log_utils
 
 try:
     import h5py
@@ -121,7 +122,10 @@ class PtclTableCacheLogEntry(object):
         `~halotools.sim_manager.PtclTableCacheLogEntry` instance stores a valid
         particle catalog that can safely be added to the cache for future use.
         `safe_for_cache` is implemented as a property method, so that each request
-        performs all the checks from scratch. A log entry is considered valid
+        checks the current state of the file. The outcome of the checks is stored
+        in an sqlite registry in the Halotools cache directory, and is reused
+        by later requests as long as the modification time and size
+        of the file are unchanged. A log entry is considered valid
         if it passes the following tests:
 
         1. The file exists.
@@ -155,8 +159,12 @@ class PtclTableCacheLogEntry(object):
             self._cache_safety_message = message_preamble + msg
             self._num_failures = num_failures
             return False
-        else:
 
+        stored_result = cache_log_utils.get_validation_registry().retrieve(
+            str(self._key), self.fname)
+        if stored_result is not None:
+            num_failures, msg = stored_result
+        else:
             verification_sequence = ('_verify_h5py_extension',
                                      '_verify_hdf5_has_complete_metadata',
                                      '_verify_metadata_consistency',
@@ -168,11 +176,14 @@ class PtclTableCacheLogEntry(object):
                 func = getattr(self, verification_function)
                 msg, num_failures = func(msg, num_failures)
 
-            if num_failures > 0:
-                self._cache_safety_message = message_preamble + msg
+            cache_log_utils.get_validation_registry().store(
+                str(self._key), self.fname, num_failures, msg)
 
-            self._num_failures = num_failures
-            return num_failures == 0
+        if num_failures > 0:
+            self._cache_safety_message = message_preamble + msg
+
+        self._num_failures = num_failures
+        return num_failures == 0
 
     def _verify_table_read(self, msg, num_failures):
         """ Enforce that the data can be read using the usual Astropy syntax
@@ -196,7 +207,7 @@ class PtclTableCacheLogEntry(object):
         """
 
         try:
-            f = h5py.File(self.fname)
+            f = h5py.File(self.fname, 'r')
 
             for key in PtclTableCacheLogEntry.log_attributes:
                 try:
@@ -264,7 +275,7 @@ class PtclTableCacheLogEntry(object):
         """
         try:
             data = Table.read(self.fname, path='data')
-            f = h5py.File(self.fname)
+            f = h5py.File(self.fname, 'r')
             Lbox = np.empty(3)
             Lbox[:] = f.attrs['Lbox']
 
@@ -319,7 +330,7 @@ class PtclTableCacheLogEntry(object):
         """
 
         try:
-            f = h5py.File(self.fname)
+            f = h5py.File(self.fname, 'r')
             required_set = set(PtclTableCacheLogEntry.required_metadata)
             actual_set = set(f.attrs.keys())
 
@@ -25,6 +25,7 @@ except ImportError:
 from .tabular_ascii_reader import TabularAsciiReader
 from .halo_table_cache import HaloTableCache
 from .halo_table_cache_log_entry import HaloTableCacheLogEntry, get_redshift_string
+from .columnar_halo_table import write_columnar_halo_table, _store_derived_columns
 
 from ..sim_manager import halotools_cache_dirname
 from ..custom_exceptions import HalotoolsError
@@ -684,20 +685,45 @@ class RockstarHlistReader(TabularAsciiReader):
         """
         return TabularAsciiReader.read_ascii(self, **kwargs)
 
-    def write_to_disk(self):
+    def write_to_disk(self, compression='gzip', column_compression=None,
+            float_mantissa_bits=None):
         """ Method writes ``self.halo_table`` to ``self.output_fname``
         and also calls the ``self._write_metadata`` method to place the
         hdf5 file into standard form.
 
+        Each column of the halo table is stored as a separate compressed dataset
+        using `~halotools.sim_manager.write_columnar_halo_table`.
+        The ``halo_mvir_host_halo`` column is also computed and stored in the file,
+        so that `~halotools.sim_manager.CachedHaloCatalog` does not need to
+        compute it each time the catalog is loaded.
+
         It is likely that you will want to call the ``update_cache_log`` method
         after calling ``write_to_disk`` so that you can take advantage of the convenient
         syntax provided by the `~halotools.sim_manager.CachedHaloCatalog` class.
+
+        Parameters
+        -----------
+        compression : string, optional
+            Compression filter applied to all columns,
+            one of ``gzip``, ``lzf``, ``lz4``, ``blosc`` or None. Default is ``gzip``.
+
+        column_compression : dict, optional
+            Dictionary overriding ``compression`` for the columns used as keys.
+
+        float_mantissa_bits : int or dict, optional
+            Number of mantissa bits kept when storing the halo positions and velocities,
+            or dictionary storing the number of bits kept for the columns used as keys.
+            Default is None, in which case all values are stored exactly.
+            See `~halotools.sim_manager.write_columnar_halo_table` for details.
         """
         if not _HAS_H5PY:
             raise HalotoolsError(uninstalled_h5py_msg)
 
-        self.halo_table.write(
-            self.output_fname, path='data', overwrite=self.overwrite)
+        write_columnar_halo_table(self.halo_table, self.output_fname,
+            overwrite=self.overwrite, compression=compression,
+            column_compression=column_compression,
+            float_mantissa_bits=float_mantissa_bits)
+        _store_derived_columns(self.output_fname)
         self._write_metadata()
 
     def _write_metadata(self):
@@ -0,0 +1,182 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function
+
+from unittest import TestCase
+import pytest
+from astropy.table import Table
+import os
+import shutil
+import time
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+from . import helper_functions
+
+from .. import cache_log_utils, halotools_cache_dirname
+from ..cache_log_utils import CacheValidationRegistry
+from ..halo_table_cache_log_entry import HaloTableCacheLogEntry, get_redshift_string
+from ..halo_table_cache import HaloTableCache
+
+__all__ = ('TestCacheLogUtils', )
+
+
+class TestCacheLogUtils(TestCase):
+    """ Class providing tests of the file locking, atomic writes and
+    validation registry used by the `~halotools.sim_manager.HaloTableCache`.
+    """
+
+    def setUp(self):
+        self.dummy_cache_baseloc = helper_functions.dummy_cache_baseloc
+        try:
+            shutil.rmtree(self.dummy_cache_baseloc)
+        except:
+            pass
+        os.makedirs(self.dummy_cache_baseloc)
+
+        self.cache_log_fname = os.path.join(self.dummy_cache_baseloc, 'dummy_cache_log.txt')
+
+        self._standard_registry = cache_log_utils.get_validation_registry()
+        cache_log_utils.set_validation_registry(CacheValidationRegistry(
+            os.path.join(self.dummy_cache_baseloc, 'dummy_validation_registry.db')))
+
+    def _good_log_entry(self, simname, halo_finder='rockstar', version_name='dummy_version'):
+        fname = os.path.join(self.dummy_cache_baseloc, simname + version_name + '.hdf5')
+        t = Table({'halo_id': [1, 2, 3], 'halo_x': [1, 2, 3], 'halo_y': [1, 2, 3],
+            'halo_z': [1, 2, 3], 'halo_mass': [1, 2, 3]})
+        t.write(fname, path='data')
+
+        log_entry = HaloTableCacheLogEntry(simname, halo_finder, version_name,
+            get_redshift_string(0.0), fname)
+        f = h5py.File(fname)
+        for attr_name in log_entry.log_attributes:
+            f.attrs.create(attr_name, getattr(log_entry, attr_name).encode('ascii'))
+        f.attrs.create('Lbox', 100.)
+        f.attrs.create('particle_mass', 1e8)
+        f.close()
+        return log_entry
+
+    @staticmethod
+    def _count_table_reads(log_entry):
+        calls = []
+        verify_table_read = log_entry._verify_table_read
+
+        def counting_verify_table_read(num_failures):
+            calls.append(1)
+            return verify_table_read(num_failures)
+        log_entry._verify_table_read = counting_verify_table_read
+        return calls
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_validation_results_are_reused(self):
+        log_entry = self._good_log_entry('dummy_simname')
+        mtime = time.time() - 100.
+        os.utime(log_entry.fname, (mtime, mtime))
+
+        calls = self._count_table_reads(log_entry)
+        assert log_entry.safe_for_cache is True
+        assert log_entry.safe_for_cache is True
+        assert len(calls) == 1
+
+        # Modifying the file invalidates the stored result
+        os.utime(log_entry.fname, (mtime + 10., mtime + 10.))
+        assert log_entry.safe_for_cache is True
+        assert len(calls) == 2
+
+        # Failures are stored along with the message explaining them
+        bad_entry = HaloTableCacheLogEntry('dummy_simname', 'rockstar', 'another_version',
+            get_redshift_string(0.0), log_entry.fname)
+        assert bad_entry.safe_for_cache is False
+        msg = bad_entry._cache_safety_message
+        calls = self._count_table_reads(bad_entry)
+        assert bad_entry.safe_for_cache is False
+        assert bad_entry._cache_safety_message == msg
+        assert "does not match" in msg
+        assert len(calls) == 0
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_recently_modified_files_are_revalidated(self):
+        log_entry = self._good_log_entry('dummy_simname')
+        calls = self._count_table_reads(log_entry)
+        assert log_entry.safe_for_cache is True
+        assert log_entry.safe_for_cache is True
+        assert len(calls) == 2
+
+    def test_default_registry(self):
+        cache_log_utils.set_validation_registry(None)
+        registry = cache_log_utils.get_validation_registry()
+        assert registry.db_fname == os.path.join(
+            halotools_cache_dirname, 'cache_validation_registry.db')
+        assert cache_log_utils.get_validation_registry() is registry
+
+    def test_unavailable_registry(self):
+        fname = os.path.join(self.dummy_cache_baseloc, 'some_file.txt')
+        with open(fname, 'w') as f:
+            f.write('abc')
+        registry = CacheValidationRegistry(
+            os.path.join(self.dummy_cache_baseloc, 'non_existent_dir', 'registry.db'))
+        registry.store('key', fname, 0, '')
+        assert registry.retrieve('key', fname) is None
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_concurrent_cache_log_updates(self):
+        """ Two caches sharing the same log each add an entry
+        without losing the entry added by the other.
+        """
+        entry1 = self._good_log_entry('dummy_simname1')
+        entry2 = self._good_log_entry('dummy_simname2')
+
+        cache1 = HaloTableCache(cache_log_fname=self.cache_log_fname)
+        cache2 = HaloTableCache(cache_log_fname=self.cache_log_fname)
+        cache1.add_entry_to_cache_log(entry1)
+        cache2.add_entry_to_cache_log(entry2)
+        assert cache2.log == [entry1, entry2]
+        assert HaloTableCache(cache_log_fname=self.cache_log_fname).log == [entry1, entry2]
+
+        cache1.remove_entry_from_cache_log(entry1.simname, entry1.halo_finder,
+            entry1.version_name, entry1.redshift, entry1.fname)
+        assert cache1.log == [entry2]
+        assert HaloTableCache(cache_log_fname=self.cache_log_fname).log == [entry2]
+
+        # Changes made with update_ascii=False are written by the next update
+        cache2.remove_entry_from_cache_log(entry2.simname, entry2.halo_finder,
+            entry2.version_name, entry2.redshift, entry2.fname, update_ascii=False)
+        cache2.add_entry_to_cache_log(entry1)
+        assert HaloTableCache(cache_log_fname=self.cache_log_fname).log == [entry1]
+
+        # No temporary files are left behind by the atomic writes
+        assert not any('.tmp' in basename for basename in os.listdir(self.dummy_cache_baseloc))
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_indexed_matching_log_entries(self):
+        entries = [self._good_log_entry('dummy_simname' + str(i), version_name=v)
+            for i in range(3) for v in ('v1', 'v2')]
+        cache = HaloTableCache(read_log_from_standard_loc=False)
+        for entry in entries:
+            cache.add_entry_to_cache_log(entry, update_ascii=False)
+
+        def matches(**kwargs):
+            return list(cache.matching_log_entry_generator(**kwargs))
+
+        kwargs = {'simname': 'dummy_simname1', 'halo_finder': 'rockstar', 'version_name': 'v2'}
+        assert matches(**kwargs) == [entries[3]]
+        assert matches(redshift=0.0, **kwargs) == [entries[3]]
+        assert matches(redshift=1.0, **kwargs) == []
+        assert matches(simname='dummy_simname1') == entries[2:4]
+
+        cache.remove_entry_from_cache_log(entries[3].simname, entries[3].halo_finder,
+            entries[3].version_name, entries[3].redshift, entries[3].fname, update_ascii=False)
+        assert matches(**kwargs) == []
+        cache.add_entry_to_cache_log(entries[3], update_ascii=False)
+        assert matches(**kwargs) == [entries[3]]
+
+    def tearDown(self):
+        cache_log_utils.set_validation_registry(self._standard_registry)
+        try:
+            shutil.rmtree(self.dummy_cache_baseloc)
+        except:
+            pass
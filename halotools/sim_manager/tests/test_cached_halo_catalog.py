@@ -509,6 +509,110 @@ class TestCachedHaloCatalog(TestCase):
         assert ptclcat.log_entry not in ptcl_cache.log
         assert os.path.isfile(ptclcat.log_entry.fname) is False
 
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_persisted_derived_columns(self):
+        """ Verify that the derived columns stored in the hdf5 file when the catalog
+        is cached are read back by subsequent loads, that stale stored columns
+        are ignored, and that loading the halo table never modifies the file.
+        """
+        from ..user_supplied_halo_catalog import UserSuppliedHaloCatalog
+
+        num_halos = 100
+        halo_id = np.arange(5, 5+num_halos)
+        halo_upid = np.where(halo_id % 4 == 0, 5, -1)
+        halocat = UserSuppliedHaloCatalog(Lbox=100, particle_mass=1e8, redshift=0.,
+            halo_x=np.linspace(0, 100, num_halos), halo_y=np.zeros(num_halos),
+            halo_z=np.zeros(num_halos), halo_id=halo_id, halo_upid=halo_upid,
+            halo_mvir=np.logspace(10, 15, num_halos))
+        fname = os.path.join(self.dummy_cache_baseloc, 'derived_columns.hdf5')
+        halocat.add_halocat_to_cache(fname, 'dummy_simname', 'dummy_halo_finder',
+            'dummy_version_name', 'dummy processing notes', overwrite=True)
+
+        try:
+            with h5py.File(fname, 'r') as f:
+                group = f['derived_columns']
+                assert group.attrs['num_halos'] == num_halos
+                assert set(group.keys()) == set(('halo_hostid', 'halo_mvir_host_halo'))
+
+            mtime = os.path.getmtime(fname) - 100.
+            os.utime(fname, (mtime, mtime))
+            halos = CachedHaloCatalog(fname=fname).halo_table
+            assert np.all(halos['halo_hostid'] == np.where(halo_upid == -1, halo_id, 5))
+            assert np.all(halos['halo_mvir_host_halo'][halo_upid == 5] == halos['halo_mvir'][0])
+            assert os.path.getmtime(fname) == mtime
+
+            # Subsequent loads read the stored columns instead of recomputing them
+            with h5py.File(fname, 'a') as f:
+                f['derived_columns/halo_mvir_host_halo'][...] = -1.
+            halos2 = CachedHaloCatalog(fname=fname).halo_table
+            assert np.all(halos2['halo_hostid'] == halos['halo_hostid'])
+            assert np.all(halos2['halo_mvir_host_halo'] == -1)
+
+            # Stored columns computed from different halos are recomputed in memory
+            with h5py.File(fname, 'a') as f:
+                f['data/halo_upid'][...] = -1
+            mtime = os.path.getmtime(fname) - 100.
+            os.utime(fname, (mtime, mtime))
+            halos3 = CachedHaloCatalog(fname=fname).halo_table
+            assert np.all(halos3['halo_hostid'] == halo_id)
+            assert np.all(halos3['halo_mvir_host_halo'] == halos3['halo_mvir'])
+            assert os.path.getmtime(fname) == mtime
+            with h5py.File(fname, 'r') as f:
+                assert np.all(f['derived_columns/halo_mvir_host_halo'][...] == -1)
+        finally:
+            cache = HaloTableCache()
+            cache.remove_entry_from_cache_log(halocat.log_entry.simname,
+                halocat.log_entry.halo_finder, halocat.log_entry.version_name,
+                halocat.log_entry.redshift, halocat.log_entry.fname,
+                raise_non_existence_exception=False, update_ascii=True,
+                delete_corresponding_halo_catalog=True)
+
+    def test_row_cuts(self):
+        """ Verify that the row cuts select the correct halos and that the host halo
+        properties of the selected subhalos are computed from the entire catalog.
+        """
+        from ..user_supplied_halo_catalog import UserSuppliedHaloCatalog
+
+        num_halos = 100
+        halo_id = np.arange(5, 5+num_halos)
+        halo_upid = np.where(halo_id % 4 == 0, 5, -1)
+        halo_mvir = np.logspace(10, 15, num_halos)
+        halocat = UserSuppliedHaloCatalog(Lbox=100, particle_mass=1e8, redshift=0.,
+            halo_x=np.linspace(0, 100, num_halos), halo_y=np.zeros(num_halos),
+            halo_z=np.zeros(num_halos), halo_id=halo_id, halo_upid=halo_upid,
+            halo_mvir=halo_mvir)
+        fname = os.path.join(self.dummy_cache_baseloc, 'row_cuts.hdf5')
+        halocat.add_halocat_to_cache(fname, 'dummy_simname', 'dummy_halo_finder',
+            'dummy_version_name', 'dummy processing notes', overwrite=True)
+
+        try:
+            halos = CachedHaloCatalog(fname=fname, row_cut_min_dict={'halo_mvir': 1e12},
+                row_cut_neq_dict={'halo_upid': -1}).halo_table
+            mask = (halo_mvir > 1e12) & (halo_upid != -1)
+            assert np.all(halos['halo_id'] == halo_id[mask])
+            assert np.all(halos['halo_hostid'] == 5)
+            assert np.all(halos['halo_mvir_host_halo'] == halo_mvir[0])
+
+            # The derived columns stored by the first load are read for the selected rows
+            hosts = CachedHaloCatalog(fname=fname, row_cut_eq_dict={'halo_upid': -1},
+                row_cut_max_dict={'halo_mvir': 1e14}).halo_table
+            mask = (halo_mvir < 1e14) & (halo_upid == -1)
+            assert np.all(hosts['halo_id'] == halo_id[mask])
+            assert np.all(hosts['halo_hostid'] == halo_id[mask])
+            assert np.all(hosts['halo_mvir_host_halo'] == halo_mvir[mask])
+
+            with pytest.raises(HalotoolsError) as err:
+                __ = CachedHaloCatalog(fname=fname, row_cut_min_dict={'halo_vmax': 100}).halo_table
+            substr = "``halo_vmax``"
+            assert substr in err.value.args[0]
+        finally:
+            cache = HaloTableCache()
+            cache.remove_entry_from_cache_log(halocat.log_entry.simname,
+                halocat.log_entry.halo_finder, halocat.log_entry.version_name,
+                halocat.log_entry.redshift, halocat.log_entry.fname,
+                raise_non_existence_exception=False, update_ascii=True,
+                delete_corresponding_halo_catalog=True)
+
     def tearDown(self):
         try:
             shutil.rmtree(self.dummy_cache_baseloc)
@@ -0,0 +1,244 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function
+
+from unittest import TestCase
+import os
+import shutil
+import warnings
+
+import pytest
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+try:
+    import hdf5plugin
+    HAS_HDF5PLUGIN = True
+except ImportError:
+    HAS_HDF5PLUGIN = False
+
+import numpy as np
+from astropy.table import Table
+from astropy.utils.misc import NumpyRNGContext
+
+from . import helper_functions
+
+from ..fake_sim import FakeSim
+from ..columnar_halo_table import (read_halo_table, write_columnar_halo_table,
+    convert_to_columnar_halo_table, round_float_mantissa)
+
+from ...custom_exceptions import HalotoolsError
+
+__all__ = ('TestColumnarHaloTable', )
+
+fixed_seed = 43
+
+
+class TestColumnarHaloTable(TestCase):
+    """ Class providing tests of the `~halotools.sim_manager.write_columnar_halo_table`
+    and `~halotools.sim_manager.read_halo_table` functions.
+    """
+
+    def setUp(self):
+        self.halo_table = FakeSim(num_halos_per_massbin=20).halo_table
+        self.halo_table['halo_designation'] = np.where(
+            self.halo_table['halo_upid'] == -1, 'central', 'satellite')
+
+        self.dummy_cache_baseloc = helper_functions.dummy_cache_baseloc
+        try:
+            shutil.rmtree(self.dummy_cache_baseloc)
+        except:
+            pass
+        os.makedirs(self.dummy_cache_baseloc)
+        self.fname = os.path.join(self.dummy_cache_baseloc, 'halos.hdf5')
+
+    def _check_equal_tables(self, t1, t2):
+        assert t1.keys() == t2.keys()
+        for key in t1.keys():
+            assert np.all(t1[key] == t2[key])
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_columnar_round_trip(self):
+        write_columnar_halo_table(self.halo_table, self.fname,
+            column_compression={'halo_id': None, 'halo_mvir': 'lzf'})
+        self._check_equal_tables(read_halo_table(self.fname), self.halo_table)
+
+        with h5py.File(self.fname, 'r') as f:
+            assert isinstance(f['data'], h5py.Group)
+            assert f['data/halo_x'].chunks is not None
+            assert f['data/halo_x'].compression == 'gzip'
+            assert f['data/halo_id'].compression is None
+            assert f['data/halo_mvir'].compression == 'lzf'
+
+        columns = ['halo_mvir', 'halo_designation', 'halo_x']
+        halos = read_halo_table(self.fname, columns=columns)
+        assert halos.keys() == columns
+        for key in columns:
+            assert np.all(halos[key] == self.halo_table[key])
+
+        with pytest.raises(HalotoolsError) as err:
+            write_columnar_halo_table(self.halo_table, self.fname)
+        substr = "Either choose a different fname or set ``overwrite`` to True"
+        assert substr in err.value.args[0]
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_read_row_oriented_halo_table(self):
+        t = self.halo_table.copy()
+        del t['halo_designation']
+        t.write(self.fname, path='data')
+        self._check_equal_tables(read_halo_table(self.fname), t)
+
+        halos = read_halo_table(self.fname, columns=['halo_mvir', 'halo_id'])
+        assert halos.keys() == ['halo_mvir', 'halo_id']
+        assert np.all(halos['halo_id'] == t['halo_id'])
+
+        halos = read_halo_table(self.fname, columns=['halo_id'])
+        assert halos.keys() == ['halo_id']
+        assert np.all(halos['halo_id'] == t['halo_id'])
+
+        with pytest.raises(HalotoolsError) as err:
+            __ = read_halo_table(self.fname, columns=['halo_mvir', 'halo_nonsense'])
+        substr = "``halo_nonsense``"
+        assert substr in err.value.args[0]
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_row_cuts(self):
+        t = self.halo_table.copy()
+        del t['halo_designation']
+        mask = (t['halo_mvir'] > 1e12) & (t['halo_mvir'] < 1e14) & (t['halo_upid'] != -1)
+        correct_ids = t['halo_id'][mask]
+        assert 0 < len(correct_ids) < len(t)
+
+        row_oriented_fname = os.path.join(self.dummy_cache_baseloc, 'row_oriented_halos.hdf5')
+        t.write(row_oriented_fname, path='data')
+        write_columnar_halo_table(t, self.fname, chunk_size=5)
+
+        for fname in (self.fname, row_oriented_fname):
+            halos = read_halo_table(fname, columns=['halo_id', 'halo_x'],
+                row_cut_min_dict={'halo_mvir': 1e12}, row_cut_max_dict={'halo_mvir': 1e14},
+                row_cut_neq_dict={'halo_upid': -1}, chunk_size=7)
+            assert halos.keys() == ['halo_id', 'halo_x']
+            assert np.all(halos['halo_id'] == correct_ids)
+            assert np.all(halos['halo_x'] == t['halo_x'][mask])
+
+            hosts = read_halo_table(fname, row_cut_eq_dict={'halo_upid': -1}, chunk_size=7)
+            self._check_equal_tables(hosts, t[t['halo_upid'] == -1])
+
+            no_halos = read_halo_table(fname, row_cut_min_dict={'halo_mvir': 1e20})
+            assert len(no_halos) == 0
+            assert no_halos.keys() == t.keys()
+
+            with pytest.raises(HalotoolsError) as err:
+                __ = read_halo_table(fname, row_cut_eq_dict={'halo_nonsense': -1})
+            substr = "``halo_nonsense``"
+            assert substr in err.value.args[0]
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_lossy_float_compression(self):
+        with NumpyRNGContext(fixed_seed):
+            t = Table({'halo_id': np.arange(int(1e5)),
+                'halo_x': np.random.uniform(0, 250, int(1e5)),
+                'halo_mvir': np.random.uniform(1e10, 1e15, int(1e5))})
+
+        write_columnar_halo_table(t, self.fname)
+        lossless_size = os.path.getsize(self.fname)
+
+        write_columnar_halo_table(t, self.fname, overwrite=True, float_mantissa_bits=10)
+        halos = read_halo_table(self.fname)
+        assert np.allclose(halos['halo_x'], t['halo_x'], rtol=2**-11, atol=0)
+        assert not np.all(halos['halo_x'] == t['halo_x'])
+        assert np.all(halos['halo_mvir'] == t['halo_mvir'])
+        assert os.path.getsize(self.fname) < 0.8*lossless_size
+
+        write_columnar_halo_table(t, self.fname, overwrite=True,
+            float_mantissa_bits={'halo_mvir': 20})
+        halos = read_halo_table(self.fname)
+        assert np.all(halos['halo_x'] == t['halo_x'])
+        assert np.allclose(halos['halo_mvir'], t['halo_mvir'], rtol=2**-21, atol=0)
+
+        with pytest.raises(HalotoolsError) as err:
+            write_columnar_halo_table(t, self.fname, overwrite=True,
+                float_mantissa_bits={'halo_id': 20})
+        substr = "is not a column of floats"
+        assert substr in err.value.args[0]
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_convert_to_columnar_halo_table(self):
+        t = self.halo_table.copy()
+        del t['halo_designation']
+        t.write(self.fname, path='data')
+        with h5py.File(self.fname, 'a') as f:
+            f.attrs['simname'] = np.string_('fake')
+            f.attrs['Lbox'] = 250.
+            f.create_dataset('ptcl_ids', data=np.arange(5))
+
+        convert_to_columnar_halo_table(self.fname, compression='lzf')
+        self._check_equal_tables(read_halo_table(self.fname), t)
+        with h5py.File(self.fname, 'r') as f:
+            assert isinstance(f['data'], h5py.Group)
+            assert f['data/halo_x'].compression == 'lzf'
+            assert f.attrs['simname'] == b'fake'
+            assert f.attrs['Lbox'] == 250.
+            assert np.all(f['ptcl_ids'][...] == np.arange(5))
+            # The derived columns are already columns of the halo table
+            assert 'derived_columns' not in f
+
+        # Derived columns missing from the halo table are stored by the conversion
+        del t['halo_hostid'], t['halo_mvir_host_halo']
+        t.write(self.fname, path='data', overwrite=True)
+        convert_to_columnar_halo_table(self.fname)
+        with h5py.File(self.fname, 'r') as f:
+            assert np.all(f['derived_columns/halo_hostid'][...] == self.halo_table['halo_hostid'])
+            assert np.all(f['derived_columns/halo_mvir_host_halo'][...] ==
+                self.halo_table['halo_mvir_host_halo'])
+        assert os.listdir(self.dummy_cache_baseloc) == ['halos.hdf5']
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_compression_choices(self):
+        with pytest.raises(HalotoolsError) as err:
+            write_columnar_halo_table(self.halo_table, self.fname, compression='zip')
+        substr = "is not supported"
+        assert substr in err.value.args[0]
+
+        if not HAS_HDF5PLUGIN:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                write_columnar_halo_table(self.halo_table, self.fname,
+                    overwrite=True, compression='lz4')
+                assert any("requires the hdf5plugin package" in str(wi.message) for wi in w)
+            with h5py.File(self.fname, 'r') as f:
+                assert f['data/halo_x'].compression == 'gzip'
+        else:
+            write_columnar_halo_table(self.halo_table, self.fname,
+                overwrite=True, compression='lz4')
+        self._check_equal_tables(read_halo_table(self.fname), self.halo_table)
+
+    def test_round_float_mantissa(self):
+        x = np.array((1., 1.2, 3.999, -0.1, 1e10, np.inf, np.nan), dtype='f4')
+        rounded_x = round_float_mantissa(x, 4)
+        assert rounded_x.dtype == x.dtype
+        assert np.allclose(rounded_x[:5], x[:5], rtol=2**-5, atol=0)
+        assert rounded_x[0] == 1.
+        assert rounded_x[2] == 4.
+        assert np.isinf(rounded_x[5]) and np.isnan(rounded_x[6])
+        assert np.all(round_float_mantissa(x[:5], 23) == x[:5])
+
+        with pytest.raises(HalotoolsError) as err:
+            __ = round_float_mantissa(x, 24)
+        substr = "must be an integer between 0 and 23"
+        assert substr in err.value.args[0]
+
+        with pytest.raises(HalotoolsError) as err:
+            __ = round_float_mantissa(np.arange(5), 10)
+        substr = "Only arrays of floats"
+        assert substr in err.value.args[0]
+
+    def tearDown(self):
+        try:
+            shutil.rmtree(self.dummy_cache_baseloc)
+        except:
+            pass
@@ -0,0 +1,142 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function
+
+from unittest import TestCase
+import os
+import shutil
+
+import pytest
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+import numpy as np
+from astropy.table import Table
+from astropy.utils.misc import NumpyRNGContext
+
+from . import helper_functions
+
+from ..user_supplied_ptcl_catalog import UserSuppliedPtclCatalog
+from ..ptcl_table_cache import PtclTableCache
+from ..memory_mapped_ptcl_table import MemoryMappedPtclTable, spatially_sort_ptcl_table
+
+from ...custom_exceptions import HalotoolsError
+
+__all__ = ('TestMemoryMappedPtclTable', )
+
+fixed_seed = 43
+
+
+class TestMemoryMappedPtclTable(TestCase):
+    """ Class providing tests of the `~halotools.sim_manager.MemoryMappedPtclTable`.
+    """
+
+    def setUp(self):
+        self.Nptcls = int(2e4)
+        self.Lbox = np.array((100., 120., 80.))
+        with NumpyRNGContext(fixed_seed):
+            self.x = np.random.uniform(0, self.Lbox[0], self.Nptcls)
+            self.y = np.random.uniform(0, self.Lbox[1], self.Nptcls)
+            self.z = np.random.uniform(0, self.Lbox[2], self.Nptcls)
+            self.vz = np.random.normal(0, 100, self.Nptcls)
+        self.ptcl_id = np.arange(self.Nptcls)
+
+        self.regions = ({}, {'zmin': 20, 'zmax': 40.}, {'xmin': 0, 'xmax': 10.},
+            {'xmin': 33.3, 'xmax': 71.1, 'ymin': 5., 'ymax': 119.9, 'zmin': 79., 'zmax': 80.},
+            {'xmin': 50., 'xmax': 50.}, {'ymin': 200.})
+
+        self.dummy_cache_baseloc = helper_functions.dummy_cache_baseloc
+        try:
+            shutil.rmtree(self.dummy_cache_baseloc)
+        except:
+            pass
+        os.makedirs(self.dummy_cache_baseloc)
+
+    def _correct_ptcl_ids(self, xmin=-np.inf, xmax=np.inf, ymin=-np.inf, ymax=np.inf,
+            zmin=-np.inf, zmax=np.inf):
+        mask = (self.x >= xmin) & (self.x < xmax)
+        mask &= (self.y >= ymin) & (self.y < ymax)
+        mask &= (self.z >= zmin) & (self.z < zmax)
+        return self.ptcl_id[mask]
+
+    def _check_regions(self, ptcls):
+        for region in self.regions:
+            result = ptcls.ptcls_in_region(**region)
+            assert set(result.keys()) == set(('x', 'y', 'z', 'vz', 'ptcl_id'))
+            correct_ids = self._correct_ptcl_ids(**region)
+            assert np.all(np.sort(result['ptcl_id']) == correct_ids)
+            assert np.all(result['vz'] == self.vz[result['ptcl_id']])
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_spatially_sorted_ptcl_cache(self):
+        ptclcat = UserSuppliedPtclCatalog(Lbox=self.Lbox, particle_mass=100, redshift=0.,
+            x=self.x, y=self.y, z=self.z, vz=self.vz, ptcl_id=self.ptcl_id)
+        fname = os.path.join(self.dummy_cache_baseloc, 'sorted_ptcls.hdf5')
+        ptclcat.add_ptclcat_to_cache(fname, 'dummy_simname', 'dummy_version_name',
+            'dummy processing notes', overwrite=True, num_ptcl_cells_per_dim=7)
+
+        try:
+            ptcls = MemoryMappedPtclTable(fname)
+            assert ptcls.is_spatially_sorted
+            assert ptcls.num_cells_per_dim == 7
+            assert ptcls._memmap is not None
+            assert len(ptcls) == self.Nptcls
+            assert ptcls.cell_offsets[-1] == self.Nptcls
+            self._check_regions(ptcls)
+
+            # a slab only reads the rows of the overlapping cells
+            row_ranges = ptcls._row_ranges_of_region(
+                np.array((-np.inf, -np.inf, 0.)), np.array((np.inf, np.inf, 10.)))
+            num_rows_read = sum(last - first for first, last in row_ranges)
+            assert num_rows_read < self.Nptcls/3.
+        finally:
+            cache = PtclTableCache()
+            cache.remove_entry_from_cache_log(ptclcat.log_entry.simname,
+                ptclcat.log_entry.version_name, ptclcat.log_entry.redshift,
+                ptclcat.log_entry.fname, raise_non_existence_exception=False,
+                update_ascii=True, delete_corresponding_ptcl_catalog=True)
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_unsorted_ptcl_table(self):
+        """ Files without the ``cell_offsets`` dataset, including chunked datasets
+        that cannot be memory-mapped, are scanned in chunks.
+        """
+        t = Table({'x': self.x, 'y': self.y, 'z': self.z, 'vz': self.vz, 'ptcl_id': self.ptcl_id})
+        fname = os.path.join(self.dummy_cache_baseloc, 'unsorted_ptcls.hdf5')
+        t.write(fname, path='data')
+        ptcls = MemoryMappedPtclTable(fname, chunk_size=3000)
+        assert not ptcls.is_spatially_sorted
+        self._check_regions(ptcls)
+
+        fname2 = os.path.join(self.dummy_cache_baseloc, 'chunked_ptcls.hdf5')
+        with h5py.File(fname2, 'w') as f:
+            f.create_dataset('data', data=t.as_array(), chunks=(1000, ), compression='gzip')
+        ptcls = MemoryMappedPtclTable(fname2, chunk_size=3000)
+        assert ptcls._memmap is None
+        self._check_regions(ptcls)
+
+    def test_spatially_sort_ptcl_table(self):
+        t = Table({'x': self.x, 'y': self.y, 'z': self.z})
+        sorted_t, cell_offsets = spatially_sort_ptcl_table(t, self.Lbox, num_cells_per_dim=4)
+        assert len(cell_offsets) == 4**3 + 1
+        for icell in (0, 17, 63):
+            cell = sorted_t[cell_offsets[icell]:cell_offsets[icell+1]]
+            ix, iy, iz = icell // 16, (icell // 4) % 4, icell % 4
+            for key, i, L in zip(('x', 'y', 'z'), (ix, iy, iz), self.Lbox):
+                assert np.all(cell[key] >= i*L/4.)
+                assert np.all(cell[key] <= (i+1)*L/4.)
+
+        with pytest.raises(HalotoolsError) as err:
+            __ = spatially_sort_ptcl_table(t, self.Lbox, num_cells_per_dim=0)
+        substr = "must be a positive integer"
+        assert substr in err.value.args[0]
+
+    def tearDown(self):
+        try:
+            shutil.rmtree(self.dummy_cache_baseloc)
+        except:
+            pass
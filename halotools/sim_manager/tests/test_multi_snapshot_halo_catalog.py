@@ -0,0 +1,251 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function
+
+from unittest import TestCase
+import os
+import shutil
+
+import pytest
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+import numpy as np
+from astropy.utils.misc import NumpyRNGContext
+
+from . import helper_functions
+
+from ..fake_sim import FakeSim
+from ..user_supplied_halo_catalog import UserSuppliedHaloCatalog
+from ..user_supplied_ptcl_catalog import UserSuppliedPtclCatalog
+from ..cached_halo_catalog import CachedHaloCatalog
+from ..multi_snapshot_halo_catalog import MultiSnapshotHaloCatalog, _LRUColumnStore
+from ..halo_table_cache import HaloTableCache
+from ..ptcl_table_cache import PtclTableCache
+
+from ...empirical_models import PrebuiltHodModelFactory
+
+from ...custom_exceptions import HalotoolsError, InvalidCacheLogEntry
+
+__all__ = ('TestMultiSnapshotHaloCatalog', )
+
+snapshot_redshifts = (1., 0., 0.5)
+
+
+class TestMultiSnapshotHaloCatalog(TestCase):
+    """ Class providing tests of the `~halotools.sim_manager.MultiSnapshotHaloCatalog`.
+    """
+
+    def setUp(self):
+        self.dummy_cache_baseloc = helper_functions.dummy_cache_baseloc
+        try:
+            shutil.rmtree(self.dummy_cache_baseloc)
+        except:
+            pass
+        os.makedirs(self.dummy_cache_baseloc)
+
+        self.simname = 'dummy_multi_snapshot_simname'
+        self.halocats = []
+        for i, redshift in enumerate(snapshot_redshifts):
+            t = FakeSim(num_halos_per_massbin=20, seed=i).halo_table
+            halo_columns = {key: t[key].data for key in t.keys()
+                if key not in ('halo_hostid', 'halo_mvir_host_halo')}
+            halocat = UserSuppliedHaloCatalog(Lbox=250., particle_mass=1e8,
+                redshift=redshift, **halo_columns)
+            fname = os.path.join(self.dummy_cache_baseloc, 'snapshot' + str(i) + '.hdf5')
+            halocat.add_halocat_to_cache(fname, self.simname, 'dummy_halo_finder',
+                'dummy_version_name', 'dummy processing notes', overwrite=True)
+            self.halocats.append(halocat)
+
+        self.kwargs = {'simname': self.simname, 'halo_finder': 'dummy_halo_finder',
+            'version_name': 'dummy_version_name'}
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_snapshots(self):
+        halocats = MultiSnapshotHaloCatalog(**self.kwargs)
+        assert len(halocats) == 3
+        assert np.all(halocats.redshifts == (0., 0.5, 1.))
+        assert [halocat.redshift for halocat in halocats] == [0., 0.5, 1.]
+        assert halocats.snapshot(0.51) is halocats.snapshot(0.5)
+
+        for redshift in snapshot_redshifts:
+            halocat = halocats.snapshot(redshift)
+            assert isinstance(halocat, CachedHaloCatalog)
+            assert halocat.Lbox[0] == 250.
+            halos = halocat.halo_table
+            correct_halos = CachedHaloCatalog(fname=halocat.fname).halo_table
+            assert halos.keys() == correct_halos.keys()
+            for key in correct_halos.keys():
+                assert np.all(halos[key] == correct_halos[key])
+
+        with pytest.raises(ValueError):
+            halos['halo_mvir'][0] = 1.
+
+        with pytest.raises(HalotoolsError) as err:
+            __ = halocats.snapshot(2.)
+        substr = "There is no snapshot within dz_tol"
+        assert substr in err.value.args[0]
+
+        halocats = MultiSnapshotHaloCatalog(redshifts=(1, 0), **self.kwargs)
+        assert np.all(halocats.redshifts == (0., 1.))
+
+        with pytest.raises(InvalidCacheLogEntry) as err:
+            __ = MultiSnapshotHaloCatalog(redshifts=(2, ), **self.kwargs)
+        substr = "There are 0 catalogs in cache"
+        assert substr in err.value.args[0]
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_column_store(self):
+        columns = ['halo_id', 'halo_mvir', 'halo_hostid']
+        correct_halos = CachedHaloCatalog(fname=self.halocats[0].log_entry.fname).halo_table
+        snapshot_nbytes = sum(correct_halos[key].nbytes for key in columns)
+        halocats = MultiSnapshotHaloCatalog(columns=columns,
+            max_memory=2.5*snapshot_nbytes, **self.kwargs)
+
+        halos = halocats.halo_table(0.)
+        assert halos.keys() == columns
+        assert halocats.memory_usage == snapshot_nbytes
+        assert halocats.halo_table(0.)['halo_id'] is not halos['halo_id']
+        assert np.shares_memory(halocats.halo_table(0.)['halo_id'], halos['halo_id'])
+
+        # The least recently used columns are dropped to stay within max_memory
+        __ = halocats.halo_table(0.5)
+        __ = halocats.halo_table(0., columns=['halo_mvir'])
+        __ = halocats.halo_table(1.)
+        assert halocats.memory_usage <= halocats.max_memory
+        store = halocats._column_store
+        assert (halocats.snapshot(0.).fname, 'halo_mvir') in store
+        assert (halocats.snapshot(0.).fname, 'halo_id') not in store
+
+        halocats.clear()
+        assert halocats.memory_usage == 0
+
+        with pytest.raises(HalotoolsError) as err:
+            __ = halocats.halo_table(0., columns=['halo_nonsense'])
+        substr = "``halo_nonsense``"
+        assert substr in err.value.args[0]
+
+        halos = halocats.halo_table(0., columns=['halo_id', 'halo_mvir', 'halo_id'])
+        assert halos.keys() == ['halo_id', 'halo_mvir']
+        assert halocats.memory_usage == correct_halos['halo_id'].nbytes + correct_halos['halo_mvir'].nbytes
+
+    def test_lru_column_store(self):
+        loaded_keys = []
+
+        def load(keys):
+            loaded_keys.append(keys)
+            return {key: np.zeros(10) for key in keys}
+
+        store = _LRUColumnStore(max_memory=160)
+        arrays = store.retrieve(['a', 'b', 'a'], load)
+        assert len(arrays) == 2
+        assert loaded_keys == [['a', 'b']]
+        assert store.memory_usage == 160
+
+        # Only the missing arrays are loaded, and the least recently used array is dropped
+        __ = store.retrieve(['b', 'c'], load)
+        assert loaded_keys[-1] == ['c']
+        assert 'a' not in store
+        assert store.memory_usage == 160
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_row_cuts(self):
+        halocats = MultiSnapshotHaloCatalog(row_cut_neq_dict={'halo_upid': -1},
+            columns=['halo_id', 'halo_hostid', 'halo_mvir_host_halo'], **self.kwargs)
+        for halocat in halocats:
+            halos = halocat.halo_table
+            correct_halos = CachedHaloCatalog(fname=halocat.fname).halo_table
+            correct_halos = correct_halos[correct_halos['halo_upid'] != -1]
+            assert len(halos) == len(correct_halos) > 0
+            for key in halos.keys():
+                assert np.all(halos[key] == correct_halos[key])
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_ptcl_table(self):
+        halocat = self.halocats[1]
+        with NumpyRNGContext(43):
+            ptcl_columns = {key: np.random.uniform(0, 250, int(1e4))
+                for key in ('x', 'y', 'z', 'vx', 'vy', 'vz')}
+        ptclcat = UserSuppliedPtclCatalog(redshift=halocat.redshift, Lbox=250.,
+            particle_mass=1e8, **ptcl_columns)
+        ptcl_fname = os.path.join(self.dummy_cache_baseloc, 'particles.hdf5')
+        ptclcat.add_ptclcat_to_cache(ptcl_fname, self.simname,
+            'dummy_ptcl_version_name', 'dummy processing notes', overwrite=True)
+        self.ptclcat = ptclcat
+
+        halos_nbytes = 2*halocat.halo_table['halo_id'].nbytes
+        ptcls_nbytes = sum(arr.nbytes for arr in ptcl_columns.values())
+        halocats = MultiSnapshotHaloCatalog(redshifts=(0., ),
+            ptcl_version_name='dummy_ptcl_version_name', columns=['halo_id', 'halo_mvir'],
+            max_memory=ptcls_nbytes + halos_nbytes/2, **self.kwargs)
+
+        correct_ptcls = CachedHaloCatalog(redshift=0.,
+            ptcl_version_name='dummy_ptcl_version_name', **self.kwargs).ptcl_table
+
+        def check_ptcls(ptcls):
+            assert ptcls.keys() == correct_ptcls.keys()
+            for key in correct_ptcls.keys():
+                assert np.all(ptcls[key] == correct_ptcls[key])
+
+        check_ptcls(halocats.snapshot(0.).ptcl_table)
+
+        # Loading the halos drops some particle columns, which are read again on demand
+        __ = halocats.halo_table(0.)
+        check_ptcls(halocats.snapshot(0.).ptcl_table)
+        assert halocats.memory_usage <= halocats.max_memory + halos_nbytes
+
+    @pytest.mark.skipif('not HAS_H5PY')
+    def test_populate_mocks(self):
+        halocats = MultiSnapshotHaloCatalog(**self.kwargs)
+
+        def model_factory(redshift):
+            return PrebuiltHodModelFactory('zheng07', redshift=redshift)
+
+        populated_redshifts = []
+        for halocat, model in halocats.populate_mocks(model_factory, seed=43):
+            assert model.redshift == halocat.redshift
+            assert model.mock.redshift == halocat.redshift
+            assert len(model.mock.galaxy_table) > 0
+            populated_redshifts.append(model.mock.redshift)
+        assert populated_redshifts == [0., 0.5, 1.]
+
+        models = {redshift: model_factory(redshift) for redshift in (0., 0.5, 1.)}
+        for halocat, model in halocats.populate_mocks(models, seed=43):
+            assert model is models[halocat.redshift]
+            assert model.mock.redshift == halocat.redshift
+
+        for halocat, model in halocats.populate_mocks(models[0.5], redshifts=(0.5, ), seed=43):
+            assert halocat is halocats.snapshot(0.5)
+            assert model is models[0.5]
+
+        with pytest.raises(HalotoolsError) as err:
+            for __ in halocats.populate_mocks({0.: models[0.]}):
+                pass
+        substr = "has 0 models within dz_tol"
+        assert substr in err.value.args[0]
+
+    def tearDown(self):
+        try:
+            log_entry = self.ptclcat.log_entry
+            PtclTableCache().remove_entry_from_cache_log(log_entry.simname,
+                log_entry.version_name, log_entry.redshift, log_entry.fname,
+                raise_non_existence_exception=False, update_ascii=True,
+                delete_corresponding_ptcl_catalog=True)
+        except AttributeError:
+            pass
+
+        cache = HaloTableCache()
+        for halocat in self.halocats:
+            cache.remove_entry_from_cache_log(halocat.log_entry.simname,
+                halocat.log_entry.halo_finder, halocat.log_entry.version_name,
+                halocat.log_entry.redshift, halocat.log_entry.fname,
+                raise_non_existence_exception=False, update_ascii=True,
+                delete_corresponding_halo_catalog=True)
+        try:
+            shutil.rmtree(self.dummy_cache_baseloc)
+        except:
+            pass
@@ -11,6 +11,7 @@ from astropy.table import Table, Column
 
 from .halo_table_cache import HaloTableCache
 from .halo_table_cache_log_entry import HaloTableCacheLogEntry, get_redshift_string
+from .columnar_halo_table import write_columnar_halo_table, _store_derived_columns
 from .user_supplied_ptcl_catalog import UserSuppliedPtclCatalog
 
 from ..utils.array_utils import custom_len
@@ -317,7 +318,8 @@ class UserSuppliedHaloCatalog(object):
 
     def add_halocat_to_cache(self,
             fname, simname, halo_finder, version_name, processing_notes,
-            overwrite=False, **additional_metadata):
+            overwrite=False, compression='gzip', column_compression=None,
+            float_mantissa_bits=None, **additional_metadata):
         """
         Parameters
         ------------
@@ -349,6 +351,20 @@ class UserSuppliedHaloCatalog(object):
             If the chosen ``fname`` already exists, then you must set ``overwrite``
             to True in order to write the file to disk. Default is False.
 
+        compression : string, optional
+            Each column of the halo table is stored as a separate chunked dataset
+            compressed with the ``compression`` filter,
+            one of ``gzip``, ``lzf``, ``lz4``, ``blosc`` or None. Default is ``gzip``.
+            See `~halotools.sim_manager.write_columnar_halo_table` for details.
+
+        column_compression : dict, optional
+            Dictionary overriding ``compression`` for the columns used as keys.
+
+        float_mantissa_bits : int or dict, optional
+            Number of mantissa bits kept when storing the halo positions and velocities,
+            or dictionary storing the number of bits kept for the columns used as keys.
+            Default is None, in which case all values are stored exactly.
+
         **additional_metadata : sequence of strings, optional
             Each keyword of ``additional_metadata`` defines the name
             of a piece of metadata stored in the hdf5 file. The
@@ -357,6 +373,12 @@ class UserSuppliedHaloCatalog(object):
             will be stored as an attribute of the
             `~halotools.sim_manager.CachedHaloCatalog` instance.
 
+        Notes
+        ------
+        If the halo table has ``halo_id``, ``halo_upid`` and ``halo_mvir`` columns,
+        the ``halo_hostid`` and ``halo_mvir_host_halo`` columns are also computed
+        and stored in the hdf5 file, so that `~halotools.sim_manager.CachedHaloCatalog`
+        does not need to compute them each time the catalog is loaded.
         """
         try:
             import h5py
@@ -410,7 +432,10 @@ class UserSuppliedHaloCatalog(object):
         ############################################################
         # Now write the file to disk and add the appropriate metadata
 
-        self.halo_table.write(fname, path='data', overwrite=overwrite)
+        write_columnar_halo_table(self.halo_table, fname, overwrite=overwrite,
+            compression=compression, column_compression=column_compression,
+            float_mantissa_bits=float_mantissa_bits)
+        _store_derived_columns(fname)
 
         f = h5py.File(fname)
 
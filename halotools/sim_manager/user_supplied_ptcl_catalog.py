@@ -17,6 +17,7 @@ except ImportError:
 from .ptcl_table_cache import PtclTableCache
 from .ptcl_table_cache_log_entry import PtclTableCacheLogEntry
 from .halo_table_cache_log_entry import get_redshift_string
+from .memory_mapped_ptcl_table import spatially_sort_ptcl_table, default_num_ptcl_cells_per_dim
 
 from ..utils.array_utils import custom_len
 from ..custom_exceptions import HalotoolsError
@@ -230,7 +231,8 @@ class UserSuppliedPtclCatalog(object):
             raise HalotoolsError(msg)
 
     def add_ptclcat_to_cache(self, fname, simname, version_name,
-                             processing_notes, overwrite=False):
+                             processing_notes, overwrite=False,
+                             num_ptcl_cells_per_dim=default_num_ptcl_cells_per_dim):
 
         """
         Parameters
@@ -258,6 +260,14 @@ class UserSuppliedPtclCatalog(object):
             If the chosen ``fname`` already exists, then you must set ``overwrite``
             to True in order to write the file to disk. Default is False.
 
+        num_ptcl_cells_per_dim : int, optional
+            The particles are stored on disk sorted by the index of the cell
+            they occupy in a grid of ``num_ptcl_cells_per_dim`` cells per dimension,
+            together with a ``cell_offsets`` dataset storing the first row of each cell.
+            This allows the particles in a subvolume to be retrieved without reading
+            the entire file with the `~halotools.sim_manager.CachedHaloCatalog.ptcls_in_region`
+            method. Default is 10.
+
         """
 
         ############################################################
@@ -294,10 +304,15 @@ class UserSuppliedPtclCatalog(object):
         ############################################################
         # Now write the file to disk and add the appropriate metadata
 
-        self.ptcl_table.write(fname, path='data', overwrite=overwrite)
+        sorted_ptcl_table, cell_offsets = spatially_sort_ptcl_table(
+            self.ptcl_table, self.Lbox, num_ptcl_cells_per_dim)
+        sorted_ptcl_table.write(fname, path='data', overwrite=overwrite)
 
         f = h5py.File(fname)
 
+        f.create_dataset('cell_offsets', data=cell_offsets)
+        f['cell_offsets'].attrs.create('num_cells_per_dim', int(num_ptcl_cells_per_dim))
+
         redshift_string = get_redshift_string(self.redshift)
 
         f.attrs.create('simname', simname.encode('ascii'))
@@ -8,7 +8,9 @@ from .io_utils import *
 from .table_utils import *
 from .value_added_halo_table_functions import *
 from .group_member_generator import group_member_generator
-from .crossmatch import crossmatch
+from .group_aggregate import group_aggregate
+from .crossmatch import crossmatch, CrossmatchIndex
 from .array_indexing_manipulations import *
 from .inverse_transformation_sampling import *
 from .distribution_matching import *
+from .random_streams import *
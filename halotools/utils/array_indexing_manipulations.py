@@ -3,7 +3,8 @@
 from __future__ import division, print_function, absolute_import, unicode_literals
 
 import numpy as np
-from astropy.utils.misc import NumpyRNGContext
+
+from .random_streams import random_state
 
 __all__ = ('calculate_first_idx_unique_array_vals',
     'calculate_last_idx_unique_array_vals', 'sum_in_bins',
@@ -237,8 +238,7 @@ def random_indices_within_bin(binned_multiplicity, desired_binned_occupations,
         "the host halo mass bins should be broader.\n".format(min_required_entries_per_bin))
         raise ValueError(msg)
 
-    with NumpyRNGContext(seed):
-        uniform_random = np.random.rand(num_draws)
+    uniform_random = random_state(seed).random_sample(num_draws)
 
     num_available_subs = np.repeat(binned_multiplicity.astype(int),
         desired_binned_occupations.astype(int))
@@ -4,6 +4,8 @@ sharing a common objectID.
 """
 import numpy as np
 
+__all__ = ('crossmatch', 'CrossmatchIndex')
+
 
 def crossmatch(x, y, skip_bounds_checking=False):
     """
@@ -33,8 +35,11 @@ def crossmatch(x, y, skip_bounds_checking=False):
     x : integer array
         Array of integers with possibly repeated entries.
 
-    y : integer array
+    y : integer array or `CrossmatchIndex`
         Array of unique integers.
+        If you will crossmatch several arrays against the same ``y``,
+        you can instead pass in a `CrossmatchIndex` built once from ``y``,
+        in which case ``y`` is neither validated nor sorted again.
 
     skip_bounds_checking : bool, optional
         The first step in the `crossmatch` function is to test that the input
@@ -61,6 +66,9 @@ def crossmatch(x, y, skip_bounds_checking=False):
     this is that x[idx_x] and y[idx_y] will generally be a subset of ``x`` and ``y`` in 
     sorted order.
 
+    When ``y`` is a `CrossmatchIndex`, the returned ``idx_x`` is instead
+    in ascending order, i.e., in the order the matching elements appear in ``x``.
+
     Examples
     --------
     Let's create some fake data to demonstrate basic usage of the function.
@@ -122,11 +130,16 @@ def crossmatch(x, y, skip_bounds_checking=False):
 
     See also
     ---------
+    `CrossmatchIndex`
+
     :ref:`crossmatching_halo_catalogs`
 
     :ref:`crossmatching_galaxy_catalogs`
 
     """
+    if isinstance(y, CrossmatchIndex):
+        return y.crossmatch(x, skip_bounds_checking=skip_bounds_checking)
+
     # Ensure inputs are Numpy arrays
     x = np.atleast_1d(x)
     y = np.atleast_1d(y)
@@ -172,3 +185,155 @@ def crossmatch(x, y, skip_bounds_checking=False):
 
     # Undo the original sorting and return the result
     return idx_x_sorted[idx_x], idx_y_sorted[idx_y]
+
+
+class CrossmatchIndex(object):
+    """
+    Index built once over an array of unique integer IDs, e.g., the ``halo_id``
+    column of a halo catalog, used to repeatedly find where the elements of
+    other arrays appear in the indexed array.
+
+    Building the index costs at most a single sort of the indexed IDs.
+    Each subsequent query neither validates nor sorts the indexed array again,
+    nor does it sort the query array. When the indexed IDs are densely packed,
+    e.g., ``np.arange(num_halos)``, queries use a direct-address lookup table
+    and run in linear time; otherwise they are a binary search through the
+    cached sorted IDs.
+
+    A `CrossmatchIndex` can be passed in place of the ``y`` argument
+    of `crossmatch`, as well as to `~halotools.utils.broadcast_host_halo_property`
+    and `~halotools.mock_observables.get_haloprop_of_galaxies`.
+
+    Examples
+    --------
+    >>> halo_id = np.random.permutation(np.arange(5, 10**5, 3))
+    >>> halo_index = CrossmatchIndex(halo_id)
+
+    >>> galaxy_halo_id = np.random.choice(halo_id, 10**4)
+    >>> idx_galaxies, idx_halos = halo_index.crossmatch(galaxy_halo_id)
+    >>> assert np.all(galaxy_halo_id[idx_galaxies] == halo_id[idx_halos])
+
+    The `lookup` method returns one index per element of the query array,
+    with -1 for elements with no match:
+
+    >>> idx = halo_index.lookup(np.array((5, 6, 8)))
+    >>> assert np.all(idx[1:] == (-1, np.flatnonzero(halo_id == 8)[0]))
+
+    """
+
+    # Densely packed IDs are indexed by a lookup table of
+    # (max_id - min_id + 1) entries, provided this is at most
+    # dense_table_size_factor times the number of IDs.
+    dense_table_size_factor = 4
+
+    def __init__(self, y, skip_bounds_checking=False):
+        """
+        Parameters
+        ----------
+        y : integer array
+            Array of unique integers.
+
+        skip_bounds_checking : bool, optional
+            If True, do not verify that ``y`` is a 1d sequence of unique integers.
+            Default is False.
+        """
+        y = np.atleast_1d(y)
+        if skip_bounds_checking is False:
+            try:
+                assert np.shape(y) == (len(y), )
+                assert np.all(np.array(y, dtype=np.int64) == y)
+            except:
+                msg = ("Input array y must be a 1d sequence of unique integers")
+                raise ValueError(msg)
+
+        y = y.astype(np.int64)
+        self.num_ids = len(y)
+        self._lookup_table = None
+        self._idx_y_sorted, self._y_sorted = None, None
+        if self.num_ids == 0:
+            return
+
+        self.min_id, self.max_id = np.min(y), np.max(y)
+        table_size = self.max_id - self.min_id + 1
+        if table_size <= self.dense_table_size_factor*self.num_ids:
+            self._lookup_table = np.zeros(table_size, dtype=np.int64) - 1
+            self._lookup_table[y - self.min_id] = np.arange(self.num_ids)
+            ids_are_unique = np.count_nonzero(self._lookup_table >= 0) == self.num_ids
+        else:
+            self._idx_y_sorted = np.argsort(y)
+            self._y_sorted = y[self._idx_y_sorted]
+            ids_are_unique = np.all(self._y_sorted[1:] != self._y_sorted[:-1])
+
+        if skip_bounds_checking is False:
+            try:
+                assert ids_are_unique
+            except AssertionError:
+                msg = ("Input array y must be a 1d sequence of unique integers")
+                raise ValueError(msg)
+
+    def __len__(self):
+        return self.num_ids
+
+    def lookup(self, x):
+        """ Find the index of each element of ``x`` in the indexed array.
+
+        Parameters
+        ----------
+        x : integer array
+            Array of integers with possibly repeated entries.
+
+        Returns
+        -------
+        idx_y : integer array
+            Array of shape (len(x), ) such that ``y[idx_y[i]] == x[i]``
+            for every element of ``x`` with a match, and ``idx_y[i] = -1``
+            for every element with no match.
+        """
+        x = np.atleast_1d(x).astype(np.int64)
+        idx_y = np.zeros(len(x), dtype=np.int64) - 1
+        if self.num_ids == 0:
+            return idx_y
+
+        in_range = (x >= self.min_id) & (x <= self.max_id)
+        if self._lookup_table is not None:
+            idx_y[in_range] = self._lookup_table[x[in_range] - self.min_id]
+        else:
+            x_in_range = x[in_range]
+            pos = np.searchsorted(self._y_sorted, x_in_range)
+            has_match = self._y_sorted[pos] == x_in_range
+            idx_y[np.flatnonzero(in_range)[has_match]] = self._idx_y_sorted[pos[has_match]]
+        return idx_y
+
+    def crossmatch(self, x, skip_bounds_checking=False):
+        """ Find where the elements of ``x`` appear in the indexed array,
+        with the same return values as `crossmatch`.
+
+        Parameters
+        ----------
+        x : integer array
+            Array of integers with possibly repeated entries.
+
+        skip_bounds_checking : bool, optional
+            If True, do not verify that ``x`` is a 1d sequence of integers.
+            Default is False.
+
+        Returns
+        -------
+        idx_x : integer array
+            Integer array in ascending order such that x[idx_x] == y[idx_y]
+
+        idx_y : integer array
+            Integer array such that x[idx_x] == y[idx_y]
+        """
+        x = np.atleast_1d(x)
+        if skip_bounds_checking is False:
+            try:
+                assert np.all(np.array(x, dtype=np.int64) == x)
+                assert np.shape(x) == (len(x), )
+            except:
+                msg = ("Input array x must be a 1d sequence of integers")
+                raise ValueError(msg)
+
+        idx_y = self.lookup(x)
+        idx_x = np.flatnonzero(idx_y >= 0)
+        return idx_x, idx_y[idx_x]
@@ -0,0 +1,257 @@
+""" Module containing the `group_aggregate` function, a vectorized
+alternative to looping over the `group_member_generator`
+for the common intra-group reductions.
+"""
+from __future__ import division, print_function, absolute_import, unicode_literals
+
+from collections import OrderedDict
+import numpy as np
+
+__all__ = ('group_aggregate', )
+
+available_group_reductions = ('sum', 'mean', 'min', 'max', 'first', 'last',
+    'count', 'argmin', 'argmax', 'weighted_mean')
+
+
+def group_aggregate(data, grouping_key, reductions, broadcast=True):
+    """
+    Compute reductions of the properties of the members of each group
+    of the input ``data`` with a single vectorized pass over each column.
+
+    `group_aggregate` covers the calculations most commonly performed
+    with a python loop over the `group_member_generator`, e.g.,
+    computing host halo mass, group richness, total stellar mass,
+    mass-weighted spin, or the index of the brightest group member.
+    Each reduction is carried out on contiguous segments of the
+    sorted data with ufunc kernels such as `numpy.add.reduceat`,
+    so that the cost is that of a handful of passes over the column
+    rather than one python-level iteration per group.
+
+    Parameters
+    ------------
+    data : Structured Numpy `~numpy.ndarray` or Astropy `~astropy.table.Table`
+
+    grouping_key : string
+        Name of the column that defines how the input ``data`` are grouped,
+        e.g., ``group_id`` or ``halo_hostid``.
+        The input ``data`` need not be sorted, but when ``data[grouping_key]``
+        is already monotonic the argsort of the grouping key is skipped.
+
+    reductions : dict
+        Dictionary whose keys are column names of the input ``data``
+        and whose values specify the reduction(s) applied to that column.
+        Each value is either a single reduction or a list of reductions.
+        A reduction is one of the strings
+        ``sum``, ``mean``, ``min``, ``max``, ``first``, ``last``, ``count``,
+        ``argmin`` and ``argmax``, or a tuple ``('weighted_mean', weight_key)``
+        where ``weight_key`` is the name of the column storing the weights.
+        The ``first`` and ``last`` reductions refer to the order in which the
+        members of a group appear in the input ``data``.
+        The ``argmin`` and ``argmax`` reductions return the row index of the
+        input ``data`` storing the extremal member of each group;
+        in case of ties, the first such member is selected.
+
+    broadcast : bool, optional
+        If True, each returned array has one entry per row of the input ``data``,
+        storing the result of the group to which the row belongs.
+        If False, each returned array has one entry per group,
+        and the returned dictionary additionally stores the
+        sorted unique values of ``data[grouping_key]`` under the key ``grouping_key``.
+        Default is True.
+
+    Returns
+    ---------
+    result : OrderedDict
+        Dictionary storing one array per requested reduction.
+        The key of each array is the column name followed by the reduction,
+        e.g., ``halo_mvir_sum`` or ``halo_spin_weighted_mean``.
+
+    Examples
+    ---------
+    Let's use a fake halo catalog to compute the host halo mass,
+    the number of members and the mass-weighted spin of each host halo,
+    as in the examples of the `group_member_generator` docstring.
+
+    >>> from halotools.sim_manager import FakeSim
+    >>> halocat = FakeSim()
+    >>> halos = halocat.halo_table
+
+    >>> reductions = {'halo_upid': 'count', 'halo_spin': [('weighted_mean', 'halo_mvir')],
+    ...     'halo_mvir': ['max', 'argmax']}
+    >>> result = group_aggregate(halos, 'halo_hostid', reductions)
+    >>> halos['halo_richness'] = result['halo_upid_count']
+    >>> halos['halo_mass_weighted_avg_spin'] = result['halo_spin_weighted_mean']
+
+    Every member of a group receives the mass of the most massive group member,
+    and the index of the row storing this member, from which any other property
+    of the host halo can be broadcast to its subhalos:
+
+    >>> halos['halo_mhost'] = result['halo_mvir_max']
+    >>> halos['halo_vmax_host'] = halos['halo_vmax'][result['halo_mvir_argmax']]
+
+    With ``broadcast`` set to False, there is one entry per group instead:
+
+    >>> result = group_aggregate(halos, 'halo_hostid', {'halo_mvir': 'sum'}, broadcast=False)
+    >>> group_ids, group_masses = result['halo_hostid'], result['halo_mvir_sum']
+
+    """
+    try:
+        available_columns = data.dtype.names
+    except AttributeError:
+        msg = ("The input ``data`` must be an Astropy Table or Numpy Structured Array")
+        raise TypeError(msg)
+
+    try:
+        assert grouping_key in available_columns
+    except AssertionError:
+        msg = ("Input ``grouping_key`` must be a column name of the input ``data``")
+        raise KeyError(msg)
+
+    requested_reductions = _process_reductions(reductions, available_columns)
+
+    group_id_array = np.asarray(data[grouping_key])
+    ndata = len(group_id_array)
+    is_increasing = np.all(group_id_array[1:] >= group_id_array[:-1])
+    is_decreasing = (not is_increasing) and np.all(group_id_array[1:] <= group_id_array[:-1])
+    if is_increasing or is_decreasing:
+        idx_sorted = None
+        sorted_group_ids = group_id_array
+    else:
+        idx_sorted = np.argsort(group_id_array, kind='mergesort')
+        sorted_group_ids = group_id_array[idx_sorted]
+
+    if ndata > 0:
+        group_starts = np.insert(np.flatnonzero(sorted_group_ids[1:] != sorted_group_ids[:-1]) + 1, 0, 0)
+    else:
+        group_starts = np.zeros(0, dtype=int)
+    group_richness = np.diff(np.append(group_starts, ndata))
+
+    def sorted_column(key):
+        arr = np.asarray(data[key])
+        if idx_sorted is None:
+            return arr
+        else:
+            return arr[idx_sorted]
+
+    result = OrderedDict()
+    if not broadcast:
+        group_ids = sorted_group_ids[group_starts]
+        if is_decreasing:
+            result[grouping_key] = group_ids[::-1]
+        else:
+            result[grouping_key] = group_ids
+
+    for key, reduction, weight_key in requested_reductions:
+        if weight_key is None:
+            outname = key + '_' + reduction
+            weights = None
+        else:
+            outname = key + '_weighted_mean'
+            weights = sorted_column(weight_key)
+
+        group_values = _segmented_reduction(sorted_column(key), reduction,
+            group_starts, group_richness, weights)
+
+        if reduction in ('argmin', 'argmax') and idx_sorted is not None:
+            group_values = idx_sorted[group_values]
+
+        if broadcast:
+            sorted_values = np.repeat(group_values, group_richness)
+            if idx_sorted is None:
+                result[outname] = sorted_values
+            else:
+                member_values = np.empty_like(sorted_values)
+                member_values[idx_sorted] = sorted_values
+                result[outname] = member_values
+        elif is_decreasing:
+            result[outname] = group_values[::-1]
+        else:
+            result[outname] = group_values
+
+    return result
+
+
+def _process_reductions(reductions, available_columns):
+    """ Convert the input ``reductions`` dictionary into a list of
+    (column, reduction, weight_key) triples, raising an informative exception
+    for unrecognized columns and reductions.
+    """
+    try:
+        items = reductions.items()
+    except AttributeError:
+        msg = ("The input ``reductions`` must be a dictionary")
+        raise TypeError(msg)
+
+    result = []
+    for key, requested in items:
+        if key not in available_columns:
+            msg = ("Each key of the input ``reductions`` must be \n"
+                "an existing column name of the input ``data``.\n"
+                "The ``{0}`` column does not exist".format(key))
+            raise KeyError(msg)
+
+        if isinstance(requested, (str, tuple)):
+            requested = [requested]
+
+        for reduction in requested:
+            if isinstance(reduction, tuple):
+                try:
+                    assert len(reduction) == 2
+                    assert reduction[0] == 'weighted_mean'
+                except AssertionError:
+                    msg = ("The only reduction that may be specified by a tuple is\n"
+                        "``('weighted_mean', weight_key)``")
+                    raise ValueError(msg)
+                weight_key = reduction[1]
+                if weight_key not in available_columns:
+                    msg = ("The weight column ``{0}`` of the ``weighted_mean`` reduction\n"
+                        "is not a column name of the input ``data``".format(weight_key))
+                    raise KeyError(msg)
+                result.append((key, 'weighted_mean', weight_key))
+            elif reduction in available_group_reductions and reduction != 'weighted_mean':
+                result.append((key, reduction, None))
+            else:
+                msg = ("The ``{0}`` reduction requested for the ``{1}`` column is not recognized.\n"
+                    "Available reductions are {2}, \nwhere ``weighted_mean`` "
+                    "must be specified as ``('weighted_mean', weight_key)``")
+                raise ValueError(msg.format(reduction, key, available_group_reductions))
+    return result
+
+
+def _segmented_reduction(arr, reduction, group_starts, group_richness, weights=None):
+    """ Reduce the contiguous segments of ``arr`` beginning at ``group_starts``.
+    """
+    if len(group_starts) == 0:
+        if reduction in ('count', 'argmin', 'argmax'):
+            return np.zeros(0, dtype=int)
+        elif reduction in ('mean', 'weighted_mean'):
+            return np.zeros(0, dtype=float)
+        else:
+            return np.zeros(0, dtype=arr.dtype)
+
+    if reduction == 'sum':
+        return np.add.reduceat(arr, group_starts)
+    elif reduction == 'mean':
+        return np.add.reduceat(arr, group_starts, dtype=float)/group_richness
+    elif reduction == 'weighted_mean':
+        weights = np.asarray(weights, dtype=float)
+        return np.add.reduceat(arr*weights, group_starts)/np.add.reduceat(weights, group_starts)
+    elif reduction == 'min':
+        return np.minimum.reduceat(arr, group_starts)
+    elif reduction == 'max':
+        return np.maximum.reduceat(arr, group_starts)
+    elif reduction == 'first':
+        return arr[group_starts]
+    elif reduction == 'last':
+        return arr[group_starts + group_richness - 1]
+    elif reduction == 'count':
+        return group_richness
+    elif reduction in ('argmin', 'argmax'):
+        if reduction == 'argmin':
+            extrema = np.minimum.reduceat(arr, group_starts)
+        else:
+            extrema = np.maximum.reduceat(arr, group_starts)
+        candidates = np.flatnonzero(arr == np.repeat(extrema, group_richness))
+        group_index = np.repeat(np.arange(len(group_starts)), group_richness)
+        first_candidate = np.searchsorted(group_index[candidates], np.arange(len(group_starts)))
+        return candidates[first_candidate]
@@ -31,6 +31,10 @@ def group_member_generator(data, grouping_key, requested_columns):
     galaxy group analysis (e.g., calculating total stellar mass
     or group-centric position). See the Examples section for further details.
 
+    For sums, means, extrema and other standard reductions,
+    `~halotools.utils.group_aggregate` computes the same quantities
+    without a python loop over the groups, and is much faster on large catalogs.
+
     Parameters
     ------------
     data : Structured Numpy `~numpy.ndarray` or Astropy `~astropy.table.Table`
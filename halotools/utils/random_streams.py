@@ -0,0 +1,89 @@
+"""
+Module providing the random number streams used in the Monte Carlo
+population of mock galaxy catalogs.
+
+Rather than seeding the global state of `numpy.random`,
+each stochastic calculation draws from its own
+`numpy.random.RandomState` instance. The seed of each instance is
+derived from a single user-supplied seed together with a set of integer
+counters labeling the calculation, e.g., the stage of the mock-population
+calling sequence and the chunk of the halo catalog being populated.
+Random streams labeled by different counters are statistically independent,
+do not share any global state, and can therefore be generated in any order,
+in separate threads, or in separate processes, always producing the
+same numbers for the same seed.
+"""
+import numpy as np
+
+__all__ = ('random_state', 'substream_seed')
+
+
+def random_state(seed=None):
+    """ Method returns the `numpy.random.RandomState` instance
+    associated with the input ``seed``.
+
+    Parameters
+    ----------
+    seed : int, sequence of ints, or `numpy.random.RandomState`, optional
+        If ``seed`` is an integer or a sequence of non-negative integers,
+        a new `numpy.random.RandomState` seeded by ``seed`` will be returned.
+        For an integer seed, the returned stream is identical to the one produced by
+        ``numpy.random`` after calling ``numpy.random.seed(seed)``.
+        If ``seed`` is already an instance of `numpy.random.RandomState`,
+        it will be returned unchanged.
+        Default is None, in which case a new `numpy.random.RandomState` seeded
+        from fresh operating-system entropy is returned, so that results are stochastic
+        and the global random state of `numpy.random` is left untouched.
+
+    Returns
+    -------
+    rng : `numpy.random.RandomState`
+
+    Examples
+    --------
+    >>> rng = random_state(43)
+    >>> uran = rng.uniform(0, 1, 5)
+    """
+    if seed is None:
+        return np.random.RandomState()
+    elif isinstance(seed, np.random.RandomState):
+        return seed
+    else:
+        return np.random.RandomState(seed)
+
+
+def substream_seed(seed, *counters):
+    """ Method returns the seed of the random stream labeled by
+    the input ``counters`` that derives from the input ``seed``.
+
+    Parameters
+    ----------
+    seed : int or sequence of ints
+        Seed from which the sub-stream derives.
+        If None, the returned seed is also None,
+        so that stochastic calculations remain stochastic.
+
+    *counters : ints
+        Any number of non-negative integers labeling the sub-stream,
+        e.g., the position of a function in the mock-population calling sequence,
+        and the index of the chunk of halos being populated.
+
+    Returns
+    -------
+    derived_seed : tuple or None
+        Tuple of integers that can be passed as the ``seed`` argument
+        of `random_state`. Sub-streams with different counters can themselves be
+        used as the seed of further sub-streams.
+
+    Examples
+    --------
+    >>> seed = 43
+    >>> stage_seed = substream_seed(seed, 2)
+    >>> chunk_seed = substream_seed(stage_seed, 10)
+    >>> assert chunk_seed == substream_seed(seed, 2, 10)
+    >>> uran = random_state(chunk_seed).uniform(0, 1, 5)
+    """
+    if seed is None:
+        return None
+    seed = tuple(int(s) for s in np.atleast_1d(seed))
+    return seed + tuple(int(c) for c in counters)
@@ -4,7 +4,7 @@ import numpy as np
 import pytest
 from astropy.utils.misc import NumpyRNGContext
 
-from ..crossmatch import crossmatch
+from ..crossmatch import crossmatch, CrossmatchIndex
 
 __all__ = ('test_crossmatch1', )
 
@@ -137,3 +137,59 @@ def test_error_handling5():
         result = crossmatch(x, y)
     substr = "Input array x must be a 1d sequence of integers"
     assert substr in err.value.args[0]
+
+
+@pytest.mark.parametrize('spacing', (1, 3, 1000))
+def test_crossmatch_index_agrees_with_crossmatch(spacing):
+    """ Verify that the `CrossmatchIndex` finds the same matches as `crossmatch`,
+    both for densely packed IDs indexed by a lookup table and for sparse IDs.
+    """
+    with NumpyRNGContext(fixed_seed):
+        y = np.random.permutation(np.arange(-50, 10**4, spacing))
+        x = np.random.randint(-100, 10**4 + 100, 5*10**4)
+
+    index = CrossmatchIndex(y)
+    assert (index._lookup_table is not None) == (spacing < 1000)
+
+    idx_x, idx_y = crossmatch(x, y)
+    idx_x2, idx_y2 = index.crossmatch(x)
+    assert np.all(x[idx_x2] == y[idx_y2])
+    assert np.all(np.diff(idx_x2) > 0)
+    assert set(idx_x) == set(idx_x2)
+
+    idx_x3, idx_y3 = crossmatch(x, index)
+    assert np.all(idx_x3 == idx_x2)
+    assert np.all(idx_y3 == idx_y2)
+
+    idx = index.lookup(x)
+    assert np.all(idx[idx_x2] == idx_y2)
+    no_match = np.ones(len(x), dtype=bool)
+    no_match[idx_x2] = False
+    assert np.all(idx[no_match] == -1)
+
+
+def test_crossmatch_index_edge_cases():
+    index = CrossmatchIndex(np.zeros(0, dtype=int))
+    assert np.all(index.lookup(np.arange(3)) == -1)
+    idx_x, idx_y = index.crossmatch(np.arange(3))
+    assert len(idx_x) == len(idx_y) == 0
+
+    index = CrossmatchIndex(np.array((7, )))
+    assert np.all(index.lookup(np.array((6, 7, 8, 7))) == (-1, 0, -1, 0))
+
+
+def test_crossmatch_index_error_handling():
+    with pytest.raises(ValueError) as err:
+        __ = CrossmatchIndex(np.array((1, 2, 2)))
+    substr = "Input array y must be a 1d sequence of unique integers"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(ValueError) as err:
+        __ = CrossmatchIndex(np.array((1, 2.5)))
+    assert substr in err.value.args[0]
+
+    index = CrossmatchIndex(np.arange(5))
+    with pytest.raises(ValueError) as err:
+        __ = index.crossmatch(np.array((1, 2.5)))
+    substr = "Input array x must be a 1d sequence of integers"
+    assert substr in err.value.args[0]
@@ -0,0 +1,132 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+import pytest
+from astropy.table import Table
+from astropy.utils.misc import NumpyRNGContext
+
+from ..group_aggregate import group_aggregate
+from ..group_member_generator import group_member_generator
+
+from ...sim_manager import FakeSim
+
+__all__ = ('test_group_aggregate_agrees_with_generator', )
+
+fixed_seed = 43
+
+
+def _sorted_halo_table():
+    halos = FakeSim().halo_table
+    halos.sort('halo_hostid')
+    return halos
+
+
+def test_group_aggregate_agrees_with_generator():
+    """ Verify that each reduction agrees with the corresponding
+    calculation done in a loop over the `group_member_generator`.
+    """
+    halos = _sorted_halo_table()
+    reductions = {'halo_mvir': ['sum', 'mean', 'min', 'max', 'first', 'last', 'count',
+        'argmin', 'argmax'], 'halo_spin': ('weighted_mean', 'halo_mvir')}
+    result = group_aggregate(halos, 'halo_hostid', reductions)
+
+    group_gen = group_member_generator(halos, 'halo_hostid', ['halo_mvir', 'halo_spin'])
+    for first, last, (mass, spin) in group_gen:
+        assert np.allclose(result['halo_mvir_sum'][first:last], np.sum(mass))
+        assert np.allclose(result['halo_mvir_mean'][first:last], np.mean(mass))
+        assert np.all(result['halo_mvir_min'][first:last] == np.min(mass))
+        assert np.all(result['halo_mvir_max'][first:last] == np.max(mass))
+        assert np.all(result['halo_mvir_first'][first:last] == mass[0])
+        assert np.all(result['halo_mvir_last'][first:last] == mass[-1])
+        assert np.all(result['halo_mvir_count'][first:last] == last-first)
+        assert np.all(result['halo_mvir_argmin'][first:last] == first + np.argmin(mass))
+        assert np.all(result['halo_mvir_argmax'][first:last] == first + np.argmax(mass))
+        assert np.allclose(result['halo_spin_weighted_mean'][first:last],
+            np.sum(mass*spin)/np.sum(mass))
+
+
+def test_group_aggregate_unsorted_data():
+    """ Verify that shuffling the input data permutes the results accordingly.
+    """
+    halos = _sorted_halo_table()
+    reductions = {'halo_mvir': ['sum', 'max', 'first', 'argmax']}
+    result = group_aggregate(halos, 'halo_hostid', reductions)
+
+    with NumpyRNGContext(fixed_seed):
+        idx_shuffled = np.random.permutation(len(halos))
+    shuffled_halos = halos[idx_shuffled]
+    result2 = group_aggregate(shuffled_halos, 'halo_hostid', reductions)
+
+    assert np.allclose(result2['halo_mvir_sum'], result['halo_mvir_sum'][idx_shuffled])
+    assert np.all(shuffled_halos['halo_mvir'][result2['halo_mvir_argmax']] ==
+        result['halo_mvir_max'][idx_shuffled])
+    hostids = shuffled_halos['halo_hostid']
+    for hostid in np.unique(hostids)[:10]:
+        mask = hostids == hostid
+        first_member_mass = shuffled_halos['halo_mvir'][np.flatnonzero(mask)[0]]
+        assert np.all(result2['halo_mvir_first'][mask] == first_member_mass)
+
+
+def test_group_aggregate_no_broadcast():
+    data = Table()
+    data['group_id'] = np.array((4, 4, 1, 1, 1, 7))
+    data['mass'] = np.array((1., 3., 2., 5., 5., 9.))
+    result = group_aggregate(data, 'group_id', {'mass': ['sum', 'argmax', 'count']},
+        broadcast=False)
+    assert np.all(result['group_id'] == (1, 4, 7))
+    assert np.all(result['mass_sum'] == (12, 4, 9))
+    assert np.all(result['mass_argmax'] == (3, 1, 5))
+    assert np.all(result['mass_count'] == (3, 2, 1))
+
+
+def test_group_aggregate_decreasing_and_empty():
+    data = np.zeros(5, dtype=[('group_id', 'i8'), ('mass', 'f8')])
+    data['group_id'] = (3, 3, 2, 1, 1)
+    data['mass'] = (1, 2, 3, 4, 5)
+    result = group_aggregate(data, 'group_id', {'mass': ['sum', 'first']}, broadcast=False)
+    assert np.all(result['group_id'] == (1, 2, 3))
+    assert np.all(result['mass_sum'] == (9, 3, 3))
+    assert np.all(result['mass_first'] == (4, 3, 1))
+
+    result = group_aggregate(data, 'group_id', {'mass': 'sum'})
+    assert np.all(result['mass_sum'] == (3, 3, 3, 9, 9))
+
+    result = group_aggregate(data[:0], 'group_id', {'mass': ['sum', 'argmax']})
+    assert len(result['mass_sum']) == 0
+    assert len(result['mass_argmax']) == 0
+
+
+def test_group_aggregate_argument_checks():
+    halos = _sorted_halo_table()
+
+    with pytest.raises(TypeError) as err:
+        __ = group_aggregate(4, 'halo_hostid', {'halo_mvir': 'sum'})
+    substr = "The input ``data`` must be an Astropy Table or Numpy Structured Array"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(KeyError) as err:
+        __ = group_aggregate(halos, 'xxx', {'halo_mvir': 'sum'})
+    substr = "Input ``grouping_key`` must be a column name of the input ``data``"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(KeyError) as err:
+        __ = group_aggregate(halos, 'halo_hostid', {'xxx': 'sum'})
+    substr = "The ``xxx`` column does not exist"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(ValueError) as err:
+        __ = group_aggregate(halos, 'halo_hostid', {'halo_mvir': 'median'})
+    substr = "The ``median`` reduction requested for the ``halo_mvir`` column is not recognized"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(ValueError) as err:
+        __ = group_aggregate(halos, 'halo_hostid', {'halo_mvir': 'weighted_mean'})
+    substr = "is not recognized"
+    assert substr in err.value.args[0]
+
+    with pytest.raises(KeyError) as err:
+        __ = group_aggregate(halos, 'halo_hostid', {'halo_spin': ('weighted_mean', 'xxx')})
+    substr = "The weight column ``xxx``"
+    assert substr in err.value.args[0]
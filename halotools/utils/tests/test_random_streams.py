@@ -0,0 +1,65 @@
+"""
+"""
+import numpy as np
+from astropy.utils.misc import NumpyRNGContext
+
+from ..random_streams import random_state, substream_seed
+
+__all__ = ('test_random_state_int_seed', )
+
+fixed_seed = 43
+
+
+def test_random_state_int_seed():
+    """ Verify that an integer seed reproduces the stream of the seeded global state.
+    """
+    with NumpyRNGContext(fixed_seed):
+        x = np.random.random(10)
+    y = random_state(fixed_seed).random_sample(10)
+    assert np.all(x == y)
+
+
+def test_random_state_passthrough():
+    rng = np.random.RandomState(fixed_seed)
+    assert random_state(rng) is rng
+
+
+def test_random_state_none():
+    rng1, rng2 = random_state(None), random_state(None)
+    assert isinstance(rng1, np.random.RandomState)
+    assert rng1 is not rng2
+    assert rng1 is not np.random.mtrand._rand
+    assert not np.all(rng1.random_sample(10) == rng2.random_sample(10))
+
+    with NumpyRNGContext(fixed_seed):
+        x = np.random.random(5)
+    with NumpyRNGContext(fixed_seed):
+        __ = random_state(None).random_sample(100)
+        y = np.random.random(5)
+    assert np.all(x == y)
+
+
+def test_random_state_does_not_touch_global_state():
+    with NumpyRNGContext(fixed_seed):
+        x = np.random.random(5)
+    with NumpyRNGContext(fixed_seed):
+        __ = random_state(fixed_seed+1).random_sample(100)
+        y = np.random.random(5)
+    assert np.all(x == y)
+
+
+def test_substream_seed():
+    assert substream_seed(None, 1, 2) is None
+    assert substream_seed(fixed_seed, 1, 2) == (fixed_seed, 1, 2)
+    assert substream_seed(substream_seed(fixed_seed, 1), 2) == substream_seed(fixed_seed, 1, 2)
+
+
+def test_substreams_are_distinct():
+    x1 = random_state(substream_seed(fixed_seed, 0)).random_sample(100)
+    x2 = random_state(substream_seed(fixed_seed, 1)).random_sample(100)
+    x3 = random_state(substream_seed(fixed_seed+1, 0)).random_sample(100)
+    assert not np.any(x1 == x2)
+    assert not np.any(x1 == x3)
+
+    x4 = random_state(substream_seed(fixed_seed, 0)).random_sample(100)
+    assert np.all(x1 == x4)
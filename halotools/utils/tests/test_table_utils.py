@@ -5,10 +5,12 @@ from unittest import TestCase
 import pytest
 from astropy.table import Table
 from astropy.utils.misc import NumpyRNGContext
+from scipy.stats import rankdata
 
 from ..table_utils import SampleSelector, compute_conditional_percentiles
 
 from ...sim_manager import FakeSim
+from ...custom_exceptions import HalotoolsError
 
 __all__ = ('test_split_sample1', 'TestComputeConditionalPercentiles')
 
@@ -174,3 +176,68 @@ class TestComputeConditionalPercentiles(TestCase):
     def tearDown(self):
         del self.fake_halo_table
         del self.custom_halo_table
+
+
+def test_compute_conditional_percentiles_brute_force():
+    """ Verify that the vectorized percentiles agree with a
+    brute-force calculation looping over the bins of the primary property.
+    """
+    with NumpyRNGContext(fixed_seed):
+        prim_haloprop = 10**np.random.uniform(10, 15, 5000)
+        sec_haloprop = np.random.random(5000)
+    bin_boundaries = np.logspace(10, 15, 12)
+
+    percentiles = compute_conditional_percentiles(prim_haloprop=prim_haloprop,
+        sec_haloprop=sec_haloprop, prim_haloprop_bin_boundaries=bin_boundaries)
+
+    prim_haloprop_bins = np.digitize(prim_haloprop, bin_boundaries)
+    correct_percentiles = np.zeros_like(percentiles)
+    for ibin in set(prim_haloprop_bins):
+        idx_bin = np.where(prim_haloprop_bins == ibin)[0]
+        idx_sorted = np.argsort(sec_haloprop[idx_bin])
+        correct_percentiles[idx_bin[idx_sorted]] = (
+            np.arange(len(idx_bin)) + 1.0) / float(len(idx_bin))
+    assert np.allclose(percentiles, correct_percentiles)
+
+    empty = compute_conditional_percentiles(prim_haloprop=np.zeros(0), sec_haloprop=np.zeros(0),
+        prim_haloprop_bin_boundaries=bin_boundaries)
+    assert len(empty) == 0
+
+
+def test_compute_conditional_percentiles_midrank():
+    """ Verify that the ``midrank`` treatment of ties agrees with
+    `scipy.stats.rankdata` in each bin of the primary property.
+    """
+    with NumpyRNGContext(fixed_seed):
+        prim_haloprop = 10**np.random.uniform(10, 15, 5000)
+        sec_haloprop = np.random.randint(0, 20, 5000)
+    bin_boundaries = np.logspace(10, 15, 12)
+
+    percentiles = compute_conditional_percentiles(prim_haloprop=prim_haloprop,
+        sec_haloprop=sec_haloprop, prim_haloprop_bin_boundaries=bin_boundaries,
+        ties='midrank')
+
+    prim_haloprop_bins = np.digitize(prim_haloprop, bin_boundaries)
+    for ibin in set(prim_haloprop_bins):
+        idx_bin = np.where(prim_haloprop_bins == ibin)[0]
+        correct_percentiles = rankdata(sec_haloprop[idx_bin])/float(len(idx_bin))
+        assert np.allclose(percentiles[idx_bin], correct_percentiles)
+
+    ordinal_percentiles = compute_conditional_percentiles(prim_haloprop=prim_haloprop,
+        sec_haloprop=sec_haloprop, prim_haloprop_bin_boundaries=bin_boundaries)
+    assert not np.allclose(ordinal_percentiles, percentiles)
+
+    # Ordinal ranks of tied points follow their order in the input, as with np.lexsort
+    correct_ordinal_percentiles = np.zeros_like(ordinal_percentiles)
+    for ibin in set(prim_haloprop_bins):
+        idx_bin = np.where(prim_haloprop_bins == ibin)[0]
+        idx_sorted = np.lexsort((sec_haloprop[idx_bin], ))
+        correct_ordinal_percentiles[idx_bin[idx_sorted]] = (
+            np.arange(len(idx_bin)) + 1.0) / float(len(idx_bin))
+    assert np.all(ordinal_percentiles == correct_ordinal_percentiles)
+
+    with pytest.raises(HalotoolsError) as err:
+        __ = compute_conditional_percentiles(prim_haloprop=prim_haloprop,
+            sec_haloprop=sec_haloprop, ties='dense')
+    substr = "must be either ``ordinal`` or ``midrank``"
+    assert substr in err.value.args[0]
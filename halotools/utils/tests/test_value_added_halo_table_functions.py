@@ -10,10 +10,14 @@ from collections import Counter
 import numpy as np
 
 import pytest
+from astropy.table import Table
+from astropy.utils.misc import NumpyRNGContext
 from astropy.extern.six.moves import xrange as range
 
 from ..value_added_halo_table_functions import broadcast_host_halo_property, add_halo_hostid
-from ..crossmatch import crossmatch
+from ..value_added_halo_table_functions import (compute_halo_hostid,
+    compute_host_halo_indices, host_halo_property)
+from ..crossmatch import crossmatch, CrossmatchIndex
 
 from ...sim_manager import FakeSim
 
@@ -21,6 +25,8 @@ from ...custom_exceptions import HalotoolsError
 
 __all__ = ('test_broadcast_host_halo_mass1', )
 
+fixed_seed = 43
+
 
 def test_broadcast_host_halo_mass1():
     """
@@ -94,6 +100,70 @@ def test_broadcast_host_halo_mass4():
     broadcast_host_halo_property(t, 'halo_mvir', delete_possibly_existing_column=True)
 
 
+def test_broadcast_host_halo_mass_index():
+    """ Verify that passing in a `CrossmatchIndex` of the ``halo_id`` column
+    gives the same result as the default calculation.
+    """
+    fake_sim = FakeSim()
+    t = fake_sim.halo_table
+    broadcast_host_halo_property(t, 'halo_mvir', delete_possibly_existing_column=True)
+    correct_result = np.copy(t['halo_mvir_host_halo'])
+
+    halo_id_index = CrossmatchIndex(t['halo_id'])
+    broadcast_host_halo_property(t, 'halo_mvir',
+        delete_possibly_existing_column=True, halo_id_index=halo_id_index)
+    assert np.all(t['halo_mvir_host_halo'] == correct_result)
+
+    with pytest.raises(HalotoolsError) as err:
+        broadcast_host_halo_property(t, 'halo_mvir',
+            delete_possibly_existing_column=True, halo_id_index=CrossmatchIndex(t['halo_id'][:5]))
+    substr = "The input ``halo_id_index`` must be a `CrossmatchIndex` object"
+    assert substr in err.value.args[0]
+
+
+def test_host_halo_indices():
+    """ Verify that the array-level functions agree with a brute-force calculation,
+    including for halos whose host is not in the catalog.
+    """
+    num_halos = 1000
+    with NumpyRNGContext(fixed_seed):
+        halo_id = np.random.permutation(np.arange(5, 10*num_halos, 7))[:num_halos]
+        is_sub = np.random.rand(num_halos) < 0.3
+        halo_upid = np.where(is_sub, np.random.choice(halo_id, num_halos), -1)
+        halo_mvir = 10**np.random.uniform(10, 15, num_halos)
+    is_sub[:10] = True
+    halo_upid[:10] = -5  # hosts that are not in the catalog
+
+    halo_hostid = compute_halo_hostid(halo_id, halo_upid)
+    assert np.all(halo_hostid[~is_sub] == halo_id[~is_sub])
+    assert np.all(halo_hostid[is_sub][10:] == halo_upid[is_sub][10:])
+
+    host_halo_indices = compute_host_halo_indices(halo_hostid, halo_id)
+    assert np.all(host_halo_indices[:10] == -1)
+    assert np.all(halo_id[host_halo_indices[10:]] == halo_hostid[10:])
+
+    correct_result = np.zeros(num_halos)
+    for i, hostid in enumerate(halo_hostid):
+        mask = halo_id == hostid
+        if np.any(mask):
+            correct_result[i] = halo_mvir[mask][0]
+    assert np.all(host_halo_property(halo_mvir, host_halo_indices) == correct_result)
+
+    halo_id_index = CrossmatchIndex(halo_id)
+    assert np.all(compute_host_halo_indices(halo_hostid, halo_id,
+        halo_id_index=halo_id_index) == host_halo_indices)
+
+    t = Table({'halo_id': halo_id, 'halo_upid': halo_upid, 'halo_mvir': halo_mvir})
+    add_halo_hostid(t)
+    broadcast_host_halo_property(t, 'halo_mvir', host_halo_indices=host_halo_indices)
+    assert np.all(t['halo_mvir_host_halo'] == correct_result)
+
+    with pytest.raises(HalotoolsError) as err:
+        host_halo_property(halo_mvir[:5], host_halo_indices)
+    substr = "must have the same length as ``halo_property``"
+    assert substr in err.value.args[0]
+
+
 def test_add_halo_hostid1():
     """
     """
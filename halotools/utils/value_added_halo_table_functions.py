@@ -8,15 +8,139 @@ import numpy as np
 from astropy.table import Table
 
 from .group_member_generator import group_member_generator
-from .crossmatch import crossmatch
+from .crossmatch import CrossmatchIndex
 
 from ..custom_exceptions import HalotoolsError
 
-__all__ = ('broadcast_host_halo_property', 'add_halo_hostid')
+__all__ = ('broadcast_host_halo_property', 'add_halo_hostid',
+    'compute_halo_hostid', 'compute_host_halo_indices', 'host_halo_property')
+
+
+def compute_halo_hostid(halo_id, halo_upid):
+    """ Calculate the ``halo_hostid`` of each halo:
+    for halos with ``halo_upid`` = -1, ``halo_hostid`` = ``halo_id``. Otherwise,
+    ``halo_hostid`` = ``halo_upid``.
+
+    Parameters
+    -----------
+    halo_id : integer array
+        Array of shape (num_halos, ) storing the ID of each halo.
+
+    halo_upid : integer array
+        Array of shape (num_halos, ) storing the ID of the host of each halo,
+        with -1 for host halos.
+
+    Returns
+    --------
+    halo_hostid : integer array
+        Array of shape (num_halos, ) and dtype int64.
+
+    Examples
+    ---------
+    >>> halo_id = np.array((1, 2, 3, 4))
+    >>> halo_upid = np.array((-1, 1, -1, 3))
+    >>> halo_hostid = compute_halo_hostid(halo_id, halo_upid)
+    >>> assert np.all(halo_hostid == (1, 1, 3, 3))
+    """
+    halo_id = np.atleast_1d(halo_id)
+    halo_upid = np.atleast_1d(halo_upid)
+    if np.shape(halo_id) != np.shape(halo_upid):
+        msg = ("\nThe input ``halo_id`` and ``halo_upid`` must have the same shape\n")
+        raise HalotoolsError(msg)
+    return np.where(halo_upid == -1, halo_id, halo_upid).astype('i8')
+
+
+def compute_host_halo_indices(halo_hostid, halo_id, halo_id_index=None):
+    """ Calculate the index of the host of each halo.
+
+    The calculation requires a single sort of ``halo_id``, or none at all
+    if ``halo_id`` is densely packed or if a `~halotools.utils.CrossmatchIndex`
+    built from ``halo_id`` is passed in. The returned indices can be stored and
+    passed to `host_halo_property` to broadcast any number of host halo properties
+    without repeating the calculation.
+
+    Parameters
+    -----------
+    halo_hostid : integer array
+        Array of shape (num_halos, ) storing the ID of the host of each halo.
+
+    halo_id : integer array
+        Array of shape (num_halos, ) storing the unique ID of each halo.
+
+    halo_id_index : `~halotools.utils.CrossmatchIndex`, optional
+        Index built from ``halo_id``. Default is None,
+        in which case the index is built from ``halo_id``.
+
+    Returns
+    --------
+    host_halo_indices : integer array
+        Array of shape (num_halos, ) such that
+        ``halo_id[host_halo_indices[i]] == halo_hostid[i]``,
+        with -1 for halos whose host does not appear in ``halo_id``.
+
+    Examples
+    ---------
+    >>> halo_id = np.array((1, 2, 3, 4))
+    >>> halo_hostid = np.array((1, 1, 3, 5))
+    >>> host_halo_indices = compute_host_halo_indices(halo_hostid, halo_id)
+    >>> assert np.all(host_halo_indices == (0, 0, 2, -1))
+    """
+    if halo_id_index is None:
+        halo_id_index = CrossmatchIndex(halo_id)
+    else:
+        try:
+            assert isinstance(halo_id_index, CrossmatchIndex)
+            assert len(halo_id_index) == len(np.atleast_1d(halo_id))
+        except AssertionError:
+            msg = ("\nThe input ``halo_id_index`` must be a `CrossmatchIndex` object\n"
+                "built from the input ``halo_id``\n")
+            raise HalotoolsError(msg)
+    return halo_id_index.lookup(halo_hostid)
+
+
+def host_halo_property(halo_property, host_halo_indices):
+    """ Broadcast a property of the host of each halo to all halos.
+
+    Parameters
+    -----------
+    halo_property : array
+        Array of shape (num_halos, ) storing the property of each halo.
+
+    host_halo_indices : integer array
+        Array of shape (num_halos, ) storing the index of the host of each halo,
+        with -1 for halos whose host is not in the catalog,
+        as returned by `compute_host_halo_indices`.
+
+    Returns
+    --------
+    result : array
+        Array of shape (num_halos, ) storing the property of the host of each halo,
+        with zero for halos whose host is not in the catalog.
+
+    Examples
+    ---------
+    >>> halo_mvir = np.array((1e14, 1e11, 1e13, 1e12))
+    >>> host_halo_indices = np.array((0, 0, 2, -1))
+    >>> halo_mvir_host_halo = host_halo_property(halo_mvir, host_halo_indices)
+    >>> assert np.all(halo_mvir_host_halo == (1e14, 1e14, 1e13, 0))
+    """
+    halo_property = np.asarray(halo_property)
+    host_halo_indices = np.atleast_1d(host_halo_indices)
+    if len(host_halo_indices) != len(halo_property):
+        msg = ("\nThe input ``host_halo_indices`` must have the same length as ``halo_property``\n")
+        raise HalotoolsError(msg)
+
+    has_host = host_halo_indices >= 0
+    if np.all(has_host):
+        return halo_property[host_halo_indices]
+    result = np.zeros(len(halo_property), dtype=halo_property.dtype)
+    result[has_host] = halo_property[host_halo_indices[has_host]]
+    return result
 
 
 def broadcast_host_halo_property(table, halo_property_key,
-        delete_possibly_existing_column=False):
+        delete_possibly_existing_column=False, halo_id_index=None,
+        host_halo_indices=None):
     """ Calculate a property of the host of a group system
     and broadcast that property to all group members,
     e.g., calculate host halo mass.
@@ -36,6 +160,19 @@ def broadcast_host_halo_property(table, halo_property_key,
         and no action will be taken if it does not exist.
         Default is False.
 
+    halo_id_index : `~halotools.utils.CrossmatchIndex`, optional
+        Index built from the ``halo_id`` column of the input ``table``.
+        When broadcasting several properties of the same table,
+        passing in the same index each time avoids re-sorting the ``halo_id`` column.
+        Default is None, in which case the index is not used.
+
+    host_halo_indices : integer array, optional
+        Index of the host of each halo in the input ``table``,
+        as returned by `compute_host_halo_indices`. When broadcasting several
+        properties of the same table, passing in the same indices each time
+        avoids crossmatching the ``halo_hostid`` and ``halo_id`` columns again.
+        Default is None, in which case the indices are computed.
+
     Notes
     --------
     This function is primarily for use with Halotools-formatted halo tables.
@@ -49,6 +186,12 @@ def broadcast_host_halo_property(table, halo_property_key,
     >>> broadcast_host_halo_property(halocat.halo_table, 'halo_spin')
 
     The ``halo_table`` now has a column called ``halo_spin_host_halo``.
+
+    >>> from halotools.utils import CrossmatchIndex
+    >>> halo_id_index = CrossmatchIndex(halocat.halo_table['halo_id'])
+    >>> for key in ('halo_mvir', 'halo_vmax'):
+    ...     broadcast_host_halo_property(halocat.halo_table, key,
+    ...         delete_possibly_existing_column=True, halo_id_index=halo_id_index)
     """
 
     try:
@@ -73,9 +216,10 @@ def broadcast_host_halo_property(table, halo_property_key,
     elif (new_colname in list(table.keys())) & (delete_possibly_existing_column is True):
         del table[new_colname]
 
-    idx_halos, idx_hosts = crossmatch(table['halo_hostid'].data, table['halo_id'].data)
-    table[new_colname] = np.zeros(len(table), dtype=table[halo_property_key].dtype)
-    table[new_colname][idx_halos] = table[halo_property_key][idx_hosts]
+    if host_halo_indices is None:
+        host_halo_indices = compute_host_halo_indices(table['halo_hostid'].data,
+            table['halo_id'].data, halo_id_index=halo_id_index)
+    table[new_colname] = host_halo_property(table[halo_property_key].data, host_halo_indices)
 
 
 def add_halo_hostid(table, delete_possibly_existing_column=False):
@@ -123,8 +267,4 @@ def add_halo_hostid(table, delete_possibly_existing_column=False):
     elif ('halo_hostid' in list(table.keys())) & (delete_possibly_existing_column is True):
         del table['halo_hostid']
 
-    host_mask = table['halo_upid'] == -1
-    halo_hostid = np.zeros(len(table), dtype='i8')
-    halo_hostid[host_mask] = table['halo_id'][host_mask]
-    halo_hostid[~host_mask] = table['halo_upid'][~host_mask]
-    table['halo_hostid'] = halo_hostid
+    table['halo_hostid'] = compute_halo_hostid(table['halo_id'].data, table['halo_upid'].data)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+"""Command-line script to benchmark the scaling of HOD mock population
+with the number of processes, using a fake halo catalog of adjustable size.
+"""
+
+import argparse
+from time import time
+from multiprocessing import cpu_count
+
+from halotools.sim_manager import FakeSim
+from halotools.empirical_models import PrebuiltHodModelFactory
+
+parser = argparse.ArgumentParser()
+
+parser.add_argument("-model", type=str, default='zheng07',
+    help="Nickname of the prebuilt HOD model to populate. Default is zheng07.")
+parser.add_argument("-num_halos", type=float, default=1e6,
+    help="Approximate number of halos in the fake catalog. Default is 1e6.")
+parser.add_argument("-halo_chunk_size", type=float, default=1e5,
+    help="Number of halos per chunk. Default is 1e5.")
+parser.add_argument("-max_threads", type=int, default=cpu_count(),
+    help="Largest number of processes to benchmark. Default is the number of available cores.")
+parser.add_argument("-num_repeats", type=int, default=3,
+    help="Number of times each population is repeated. The fastest run is reported. Default is 3.")
+parser.add_argument("-seed", type=int, default=43,
+    help="Seed used to populate the mocks. Default is 43.")
+
+args = parser.parse_args()
+
+
+def cluster_mass_cut(halo_table):
+    """ Exclude the unrealistically massive halos of the fake catalog,
+    which would otherwise host most of the satellites.
+    """
+    return halo_table['halo_mvir'] < 1e14
+
+num_massbins = 10
+halocat = FakeSim(num_massbins=num_massbins,
+    num_halos_per_massbin=int(args.num_halos/num_massbins))
+model = PrebuiltHodModelFactory(args.model)
+model.populate_mock(halocat, seed=args.seed, halo_chunk_size=int(args.halo_chunk_size),
+    masking_function=cluster_mass_cut)
+
+print("\nPopulating {0} halos with the {1} model, using {2} halos per chunk\n".format(
+    len(model.mock.halo_table), args.model, int(args.halo_chunk_size)))
+print("{0:>12} {1:>12} {2:>12} {3:>12}".format('num_threads', 'runtime [s]', 'speedup', 'Ngals'))
+
+num_threads_list = sorted(set([1] +
+    [2**i for i in range(args.max_threads.bit_length()) if 2**i <= args.max_threads] +
+    [args.max_threads]))
+
+serial_runtime = None
+for num_threads in num_threads_list:
+    runtime = float('inf')
+    for __ in range(args.num_repeats):
+        start = time()
+        model.mock.populate(seed=args.seed, num_threads=num_threads,
+            halo_chunk_size=int(args.halo_chunk_size), masking_function=cluster_mass_cut)
+        runtime = min(runtime, time() - start)
+    if serial_runtime is None:
+        serial_runtime = runtime
+    print("{0:>12d} {1:>12.3f} {2:>12.2f} {3:>12d}".format(
+        num_threads, runtime, serial_runtime/runtime, len(model.mock.galaxy_table)))